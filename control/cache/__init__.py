@@ -0,0 +1,180 @@
+# control/cache/__init__.py
+# -*- coding: utf-8 -*-
+"""
+공유 캐시 도구(백엔드는 settings.CACHES — 기본은 호스트 로컬 SQLite, control/cache/sqlite.py)
+- 네임스페이스 버전 키: key(ns, name, scope) = "gf:{ns}:{scope}:v{버전}:{name}"
+  · bump(ns, scope) 로 버전만 올리면 그 범위의 이전 키는 모두 무효(만료는 TTL/정리에 맡김)
+- get_or_set(): 단일 계산(single-flight)
+  · 같은 프로세스: 키별 threading.Lock
+  · 다른 워커: cache.add 잠금 — 잠금을 못 잡은 쪽은 GF_CACHE_LOCK_WAIT 초까지 결과를 기다린다
+    (기다려도 없으면 직접 계산 — 느린 계산이 다른 요청을 무한정 막지 않도록)
+- 네임스페이스별 적중/미스/대기 카운터: 프로세스 안에서 모았다가 GF_CACHE_STATS_INTERVAL 초마다 캐시에 합산
+  → `manage.py gf_cache_stats`
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+LOCK_TIMEOUT = getattr(settings, "GF_CACHE_LOCK_TIMEOUT", 30)      # 계산 중 잠금 수명(초)
+LOCK_WAIT = getattr(settings, "GF_CACHE_LOCK_WAIT", 5.0)           # 다른 워커 계산 대기 한도(초)
+STATS_INTERVAL = getattr(settings, "GF_CACHE_STATS_INTERVAL", 10)
+
+STAT_FIELDS = ("hit", "miss", "wait")
+
+_MISS = object()
+
+
+def _cache(alias: str):
+    return caches[alias]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 버전 키
+
+def _version_key(ns: str, scope: str) -> str:
+    return f"gf:{ns}:ver:{scope}"
+
+
+def version(ns: str, scope: str = "", alias: str = "default") -> int:
+    return int(_cache(alias).get(_version_key(ns, scope)) or 0)
+
+
+def bump(ns: str, scope: str = "", alias: str = "default") -> None:
+    """ns/scope 아래 키를 모두 무효화(버전 +1)."""
+    key = _version_key(ns, scope)
+    c = _cache(alias)
+    try:
+        c.incr(key)
+    except ValueError:
+        c.set(key, 1, None)
+
+
+def key(ns: str, name: str, scope: str = "", alias: str = "default") -> str:
+    return f"gf:{ns}:{scope}:v{version(ns, scope, alias)}:{name}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 단일 계산
+
+_key_locks: Dict[str, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+
+def _local_lock(k: str) -> threading.Lock:
+    with _key_locks_guard:
+        lock = _key_locks.get(k)
+        if lock is None:
+            lock = _key_locks[k] = threading.Lock()
+        return lock
+
+
+def _release_local_lock(k: str, lock: threading.Lock) -> None:
+    with _key_locks_guard:
+        if _key_locks.get(k) is lock and not lock.locked():
+            del _key_locks[k]
+
+
+def get_or_set(ns: str, name: str, loader: Callable[[], Any], timeout: Optional[int] = None,
+               scope: str = "", alias: str = "default") -> Any:
+    """ns/scope 현재 버전의 name 값. 없으면 loader() 결과를 한 번만 계산해 저장."""
+    c = _cache(alias)
+    k = key(ns, name, scope, alias)
+    value = c.get(k, _MISS)
+    if value is not _MISS:
+        _count(ns, "hit", alias)
+        return value
+
+    lock = _local_lock(k)
+    try:
+        with lock:
+            value = c.get(k, _MISS)                      # 같은 프로세스의 다른 스레드가 채웠으면 그대로
+            if value is not _MISS:
+                _count(ns, "hit", alias)
+                return value
+            lock_key = k + ":lock"
+            if not c.add(lock_key, 1, LOCK_TIMEOUT):
+                _count(ns, "wait", alias)
+                deadline = time.monotonic() + LOCK_WAIT
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    value = c.get(k, _MISS)
+                    if value is not _MISS:
+                        return value
+            _count(ns, "miss", alias)
+            try:
+                value = loader()
+                c.set(k, value, timeout)
+            finally:
+                c.delete(lock_key)
+            return value
+    finally:
+        _release_local_lock(k, lock)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 적중/미스 카운터
+
+_stats: Dict[tuple, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+_stats_lock = threading.Lock()
+_stats_flushed = time.monotonic()
+
+
+def _stats_key(ns: str, field: str) -> str:
+    return f"gf:cachestats:{ns}:{field}"
+
+
+_NS_KEY = "gf:cachestats:namespaces"
+
+
+def _count(ns: str, field: str, alias: str) -> None:
+    with _stats_lock:
+        _stats[(alias, ns)][field] += 1
+        due = time.monotonic() - _stats_flushed >= STATS_INTERVAL
+    if due:
+        publish_stats()
+
+
+def publish_stats() -> None:
+    """프로세스 카운터를 공유 캐시에 합산하고 0으로."""
+    global _stats_flushed
+    with _stats_lock:
+        pending = {k: dict(v) for k, v in _stats.items()}
+        _stats.clear()
+        _stats_flushed = time.monotonic()
+    for (alias, ns), counts in pending.items():
+        c = _cache(alias)
+        names = c.get(_NS_KEY) or []
+        if ns not in names:
+            c.set(_NS_KEY, sorted(set(names) | {ns}), None)
+        for field, n in counts.items():
+            if not n:
+                continue
+            try:
+                c.incr(_stats_key(ns, field), n)
+            except ValueError:
+                if not c.add(_stats_key(ns, field), n, None):
+                    c.incr(_stats_key(ns, field), n)
+
+
+def stats(alias: str = "default") -> Dict[str, Dict[str, int]]:
+    """{ns: {hit, miss, wait}} — 모든 워커 합계(각 워커의 마지막 합산 시점까지)."""
+    publish_stats()
+    c = _cache(alias)
+    out = {}
+    for ns in c.get(_NS_KEY) or []:
+        values = c.get_many([_stats_key(ns, f) for f in STAT_FIELDS])
+        out[ns] = {f: int(values.get(_stats_key(ns, f)) or 0) for f in STAT_FIELDS}
+    return out
+
+
+def reset_stats(alias: str = "default") -> None:
+    c = _cache(alias)
+    for ns in c.get(_NS_KEY) or []:
+        c.delete_many([_stats_key(ns, f) for f in STAT_FIELDS])
+    c.delete(_NS_KEY)
@@ -0,0 +1,176 @@
+# control/cache/sqlite.py
+# -*- coding: utf-8 -*-
+"""
+호스트 로컬 공유 캐시 백엔드(SQLite WAL)
+- 같은 호스트의 모든 워커 프로세스가 파일 하나(LOCATION)를 같이 쓴다 → 워커 간 캐시/무효화 공유
+- 외부 캐시 서비스(Redis/Memcached) 없이 동작(온프레미스 설치용)
+- 정수 값은 INTEGER 로 그대로 저장 → incr/decr 는 UPDATE 한 문장(원자적)
+  그 밖의 값은 pickle BLOB
+- 만료 행은 읽을 때 무시하고, set CULL_EVERY 번에 한 번꼴로 정리 + MAX_ENTRIES 초과분 삭제
+  초과분은 가장 오래전에 쓴(written) 것부터 → 방금 잡은 잠금/스로틀 카운터는 남는다
+- 연결은 스레드/프로세스(fork)별로 하나
+
+CACHES = {"default": {"BACKEND": "control.cache.sqlite.SQLiteCache",
+                      "LOCATION": "/var/cache/geoflow/cache.sqlite3",
+                      "OPTIONS": {"MAX_ENTRIES": 100000, "CULL_EVERY": 100}}}
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import random
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS gf_cache ("
+    " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL, written REAL"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS gf_cache_expires ON gf_cache(expires)",
+)
+# written 열이 없던 캐시 파일(이전 버전)에 덧붙인다
+_ADD_WRITTEN = "ALTER TABLE gf_cache ADD COLUMN written REAL"
+_WRITTEN_INDEX = "CREATE INDEX IF NOT EXISTS gf_cache_written ON gf_cache(written)"
+
+_LIVE = "(expires IS NULL OR expires > ?)"
+
+
+def _dump(value):
+    if type(value) is int:                      # bool 은 pickle(타입 보존)
+        return value
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _load(raw):
+    if isinstance(raw, int):
+        return raw
+    return pickle.loads(raw)
+
+
+class SQLiteCache(BaseCache):
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        options = params.get("OPTIONS") or {}
+        self._busy_timeout = float(options.get("BUSY_TIMEOUT", 5.0))
+        self._cull_every = int(options.get("CULL_EVERY", 100))
+        self._local = threading.local()
+
+    # -- 연결 -------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == pid:
+            return conn
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for ddl in _SCHEMA:
+            conn.execute(ddl)
+        try:
+            conn.execute(_ADD_WRITTEN)
+        except sqlite3.OperationalError:        # duplicate column: 이미 있다
+            pass
+        conn.execute(_WRITTEN_INDEX)
+        self._local.conn, self._local.pid = conn, pid
+        return conn
+
+    def _expiry(self, timeout):
+        return self.get_backend_timeout(timeout)  # 절대 시각(초) 또는 None(만료 없음)
+
+    # -- 기본 연산 ----------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._conn().execute(
+            f"SELECT value FROM gf_cache WHERE key = ? AND {_LIVE}", (key, time.time())
+        ).fetchone()
+        return default if row is None else _load(row[0])
+
+    def get_many(self, keys, version=None):
+        keymap = {self.make_and_validate_key(k, version=version): k for k in keys}
+        if not keymap:
+            return {}
+        marks = ",".join("?" * len(keymap))
+        rows = self._conn().execute(
+            f"SELECT key, value FROM gf_cache WHERE key IN ({marks}) AND {_LIVE}",
+            (*keymap, time.time()),
+        ).fetchall()
+        return {keymap[k]: _load(v) for k, v in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO gf_cache(key, value, expires, written) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires, "
+            "written = excluded.written",
+            (key, _dump(value), self._expiry(timeout), time.time()),
+        )
+        if self._cull_every > 0 and random.randrange(self._cull_every) == 0:
+            self._cull(conn)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        """없거나 만료된 키에만 쓴다. 쓴 경우 True(프로세스 간 잠금에 쓸 수 있다)."""
+        key = self.make_and_validate_key(key, version=version)
+        cur = self._conn().execute(
+            "INSERT INTO gf_cache(key, value, expires, written) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires, "
+            "written = excluded.written "
+            "WHERE gf_cache.expires IS NOT NULL AND gf_cache.expires <= excluded.written",
+            (key, _dump(value), self._expiry(timeout), time.time()),
+        )
+        return cur.rowcount == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cur = self._conn().execute(
+            f"UPDATE gf_cache SET expires = ?, written = ? WHERE key = ? AND {_LIVE}",
+            (self._expiry(timeout), time.time(), key, time.time()),
+        )
+        return cur.rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._conn().execute("DELETE FROM gf_cache WHERE key = ?", (key,)).rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._conn().execute(
+            f"SELECT 1 FROM gf_cache WHERE key = ? AND {_LIVE}", (key, time.time())
+        ).fetchone() is not None
+
+    def incr(self, key, delta=1, version=None):
+        """정수 값만. 없거나 만료됐거나 정수가 아니면 ValueError(Django 규약)."""
+        vkey = self.make_and_validate_key(key, version=version)
+        row = self._conn().execute(
+            f"UPDATE gf_cache SET value = value + ?, written = ? "
+            f"WHERE key = ? AND typeof(value) = 'integer' AND {_LIVE} RETURNING value",
+            (delta, time.time(), vkey, time.time()),
+        ).fetchone()
+        if row is None:
+            raise ValueError("Key '%s' not found" % key)
+        return row[0]
+
+    def clear(self):
+        self._conn().execute("DELETE FROM gf_cache")
+
+    # -- 정리 ---------------------------------------------------------------
+
+    def _cull(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM gf_cache WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        (count,) = conn.execute("SELECT count(*) FROM gf_cache").fetchone()
+        excess = count - self._max_entries
+        if excess > 0:
+            # 가장 오래전에 쓴 것부터(written 이 없는 이전 버전 행이 먼저)
+            conn.execute(
+                "DELETE FROM gf_cache WHERE key IN ("
+                " SELECT key FROM gf_cache ORDER BY written LIMIT ?)",
+                (excess,),
+            )
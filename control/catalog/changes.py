@@ -0,0 +1,179 @@
+# control/catalog/changes.py
+# -*- coding: utf-8 -*-
+"""
+카탈로그 변경 피드 / 무효화 버스
+- 관리자 쓰기마다 publish() → catalog.version +1, catalog.change_log INSERT + pg_notify('gf_catalog', 버전)
+- 카탈로그 버전 = catalog.version 단일 행 카운터
+  · 같은 트랜잭션에서 올리므로 행 잠금으로 직렬화 → 버전 순서 = 커밋 순서
+    (bigserial MAX(id) 는 먼저 할당되고 늦게 커밋된 id 를 이미 앞서 간 워커가 놓친다)
+- 각 워커는 버전이 올라가면 등록된 무효화 함수(스냅샷/규칙 비트맵 등)를 실행
+  · poll  : 요청 때 GF_CATALOG_POLL_INTERVAL초마다 버전 1회 조회 (기본)
+  · listen: 워커당 LISTEN 스레드 1개, 재연결 시 poll로 따라잡기
+  · off   : 자기 워커에서 publish한 변경만 반영(TTL에 의존)
+"""
+from __future__ import annotations
+
+import logging
+import select
+import threading
+import time
+from typing import Callable, List, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .services_tenant import CENTRAL_ALIAS
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "gf_catalog"
+MODE = getattr(settings, "GF_CATALOG_SUBSCRIBER", "poll")          # poll | listen | off
+POLL_INTERVAL = getattr(settings, "GF_CATALOG_POLL_INTERVAL", 2.0)  # 초
+
+_PUBLISH_SQL = """
+    WITH v AS (
+        INSERT INTO catalog.version (id, version) VALUES (1, 1)
+        ON CONFLICT (id) DO UPDATE SET version = catalog.version.version + 1, updated_at = now()
+        RETURNING version
+    ), ins AS (
+        INSERT INTO catalog.change_log (entity, action, entity_id, l2_id, actor, version)
+        SELECT %s, %s, %s, %s, %s, v.version FROM v
+        RETURNING version
+    )
+    SELECT version, pg_notify(%s, version::text) FROM ins
+"""
+
+_VERSION_SQL = "SELECT COALESCE((SELECT version FROM catalog.version WHERE id = 1), 0)"
+
+_lock = threading.Lock()
+_version = 0
+_checked_at = 0.0
+_invalidators: List[Callable[[], None]] = []
+_listener: Optional[threading.Thread] = None
+
+
+def register_invalidator(func: Callable[[], None]) -> Callable[[], None]:
+    """카탈로그 버전이 바뀌면 호출될 함수 등록(데코레이터로도 사용)."""
+    if func not in _invalidators:
+        _invalidators.append(func)
+    return func
+
+
+def catalog_version() -> int:
+    """이 워커가 알고 있는 최신 카탈로그 버전(ETag/캐시 키용)."""
+    return _version
+
+
+def advance(version: int) -> bool:
+    """버전이 올라갔으면 무효화 함수를 실행. 실행했으면 True."""
+    global _version
+    with _lock:
+        if version <= _version:
+            return False
+        _version = version
+    for func in list(_invalidators):
+        try:
+            func()
+        except Exception:
+            logger.exception("CATALOG: invalidator %r failed", func)
+    logger.info("CATALOG: version -> %s", version)
+    return True
+
+
+def _actor_of(request) -> Optional[str]:
+    user = getattr(request, "user", None)
+    if user is not None and getattr(user, "is_authenticated", False):
+        return getattr(user, "email", None) or getattr(user, "username", None)
+    return None
+
+
+def publish(entity: str, action: str, entity_id=None, l2_id=None, request=None) -> int:
+    """
+    변경 1건 기록. 현재 트랜잭션(중앙) 안에서 호출하면 커밋 시점에 NOTIFY가 나가고
+    이 워커의 캐시도 커밋 직후 무효화된다. 새 버전을 돌려준다.
+    """
+    with connections[CENTRAL_ALIAS].cursor() as cur:
+        cur.execute(_PUBLISH_SQL, [
+            entity, action,
+            str(entity_id) if entity_id else None,
+            str(l2_id) if l2_id else None,
+            _actor_of(request) if request is not None else None,
+            CHANNEL,
+        ])
+        version = int(cur.fetchone()[0])
+    transaction.on_commit(lambda: advance(version), using=CENTRAL_ALIAS)
+    return version
+
+
+def poll(force: bool = False) -> int:
+    """POLL_INTERVAL마다 최대 1회 버전을 읽어 따라잡는다."""
+    global _checked_at
+    now = time.monotonic()
+    if not force and now - _checked_at < POLL_INTERVAL:
+        return _version
+    _checked_at = now
+    try:
+        with connections[CENTRAL_ALIAS].cursor() as cur:
+            cur.execute(_VERSION_SQL)
+            advance(int(cur.fetchone()[0]))
+    except Exception:
+        logger.exception("CATALOG: version poll failed")
+    return _version
+
+
+def sync() -> None:
+    """요청마다 호출(미들웨어). 모드에 맞게 버전을 맞춘다."""
+    if MODE == "listen":
+        ensure_listener()
+    elif MODE == "poll":
+        poll()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LISTEN 구독 스레드
+
+def _listen_forever() -> None:
+    conn_wrapper = connections[CENTRAL_ALIAS]
+    while True:
+        raw = None
+        try:
+            raw = conn_wrapper.get_new_connection(conn_wrapper.get_connection_params())
+            raw.autocommit = True
+            with raw.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+                cur.execute(_VERSION_SQL)      # 연결이 끊긴 동안 놓친 변경 따라잡기
+                advance(int(cur.fetchone()[0]))
+            while True:
+                if select.select([raw], [], [], 30.0) == ([], [], []):
+                    continue
+                raw.poll()
+                latest = 0
+                while raw.notifies:
+                    n = raw.notifies.pop(0)
+                    try:
+                        latest = max(latest, int(n.payload))
+                    except (TypeError, ValueError):
+                        pass
+                if latest:
+                    advance(latest)
+        except Exception:
+            logger.exception("CATALOG: listener error, reconnecting")
+            time.sleep(5.0)
+        finally:
+            if raw is not None:
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+
+
+def ensure_listener() -> None:
+    global _listener
+    if _listener is not None and _listener.is_alive():
+        return
+    with _lock:
+        if _listener is not None and _listener.is_alive():
+            return
+        _listener = threading.Thread(target=_listen_forever, name="gf-catalog-listen", daemon=True)
+        _listener.start()
+
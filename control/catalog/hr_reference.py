@@ -0,0 +1,174 @@
+# control/catalog/hr_reference.py
+# -*- coding: utf-8 -*-
+"""
+중앙 HR 참조값(ref.hr_reference) + 테넌트 덮어쓰기(ref.tenant_enabled_values)
+- 카탈로그 버전마다 두 테이블을 1회씩 읽어 프로세스 메모리에 보관
+- 그룹(테넌트)별 옵션 응답(JSON 바이트 + ETag)은 처음 요청 때 한 번 컴파일해 두고 그대로 돌려준다
+  → 요청 때 하는 일은 dict 조회뿐(기존 상수 dict 와 같은 비용)
+- 쓰기는 set_value / set_tenant_value 로 → changes.publish('hr_reference') 로 모든 워커 무효화
+- 덮어쓰기 규칙: enabled=false 면 숨김, enabled=true 면 중앙에서 비활성이어도 노출, ord 가 있으면 순서 대체
+- ref 테이블이 없거나 비어 있으면 DEFAULT_OPTIONS(예전 로컬 상수)로 응답
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from .changes import publish, register_invalidator
+from .models import HrReference, TenantHrValue
+from .services_tenant import CENTRAL_ALIAS
+
+logger = logging.getLogger(__name__)
+
+# 구독 모드가 off 이거나 적재에 실패했을 때의 재적재 간격(초)
+HR_REF_TTL = getattr(settings, "GF_HR_REF_CATALOG_TTL", 300)
+
+CATEGORIES = ("position_grade", "employment_type", "status")
+
+# 중앙 테이블이 준비되기 전/비어 있을 때 쓰는 기본값(마이그레이션 0004 의 초기값과 같다)
+DEFAULT_OPTIONS = {
+    "position_grade": [
+        ("임원", "임원", 10), ("부장", "부장", 20), ("차장", "차장", 30), ("과장", "과장", 40),
+        ("대리", "대리", 50), ("주임", "주임", 60), ("사원", "사원", 70), ("인턴", "인턴", 80),
+    ],
+    "employment_type": [
+        ("정규직", "정규직", 10), ("계약직", "계약직", 20), ("파견", "파견", 30),
+        ("용역", "용역", 40), ("프리랜서", "프리랜서", 50), ("인턴", "인턴", 60),
+    ],
+    "status": [
+        ("재직", "재직", 10), ("휴직", "휴직", 20), ("퇴사", "퇴사", 30),
+    ],
+}
+
+Value = Tuple[str, str, int, bool]               # (code, name, ord, active)
+Override = Tuple[bool, Optional[int]]            # (enabled, ord)
+
+
+@dataclass(frozen=True)
+class CompiledOptions:
+    results: Tuple[dict, ...]
+    body: bytes                                  # {"results": [...]} 직렬화 결과
+    etag: str                                    # 따옴표 포함(HTTP ETag 형식)
+
+
+@dataclass
+class _State:
+    values: Dict[str, List[Value]]               # category → 중앙 값(ord, name 순)
+    overrides: Dict[str, Dict[Tuple[str, str], Override]]   # group_id → {(category, code): override}
+    compiled: Dict[Tuple[str, str], CompiledOptions] = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+_lock = threading.Lock()
+_state: Optional[_State] = None
+
+
+@register_invalidator
+def reset() -> None:
+    """카탈로그 버전이 바뀌면 다음 요청에서 다시 적재."""
+    global _state
+    _state = None
+
+
+def _defaults() -> Dict[str, List[Value]]:
+    return {c: [(code, name, o, True) for code, name, o in rows] for c, rows in DEFAULT_OPTIONS.items()}
+
+
+def _load() -> _State:
+    try:
+        values: Dict[str, List[Value]] = {}
+        for category, code, name, o, active in (
+            HrReference.objects.using(CENTRAL_ALIAS)
+            .order_by("category", "ord", "name")
+            .values_list("category", "code", "name", "ord", "active")
+        ):
+            values.setdefault(category, []).append((code, name, o, active))
+        overrides: Dict[str, Dict[Tuple[str, str], Override]] = {}
+        for group_id, category, code, enabled, o in (
+            TenantHrValue.objects.using(CENTRAL_ALIAS)
+            .values_list("group_id", "category", "code", "enabled", "ord")
+        ):
+            overrides.setdefault(str(group_id), {})[(category, code)] = (enabled, o)
+    except Exception:
+        logger.exception("HR_REF: load failed, using defaults")
+        return _State(values=_defaults(), overrides={})
+    return _State(values=values or _defaults(), overrides=overrides)
+
+
+def _current() -> _State:
+    global _state
+    st = _state
+    if st is not None and time.monotonic() - st.loaded_at < HR_REF_TTL:
+        return st
+    with _lock:
+        st = _state
+        if st is None or time.monotonic() - st.loaded_at >= HR_REF_TTL:
+            st = _state = _load()
+    return st
+
+
+def _compile(st: _State, group_id: str, category: str) -> CompiledOptions:
+    ov = st.overrides.get(group_id, {})
+    items = []
+    for code, name, o, active in st.values.get(category, []):
+        enabled, o2 = ov.get((category, code), (active, None))
+        if enabled:
+            items.append((o if o2 is None else o2, code, name))
+    items.sort(key=lambda x: x[0])               # 안정 정렬: 같은 ord 는 중앙 순서 유지
+    results = tuple({"id": code, "text": name, "code": code, "ord": o} for o, code, name in items)
+    body = json.dumps({"results": list(results)}).encode("utf-8")
+    etag = '"hr-%s"' % hashlib.sha1(body).hexdigest()[:16]
+    return CompiledOptions(results=results, body=body, etag=etag)
+
+
+_EMPTY = CompiledOptions(results=(), body=b'{"results": []}', etag='"hr-empty"')
+
+
+def options(group_id: Optional[str], category: str) -> CompiledOptions:
+    """그룹(테넌트)의 카테고리 옵션. 그룹이 없으면 중앙 기본값. 모르는 카테고리는 빈 목록(캐시하지 않음)."""
+    if category not in CATEGORIES:
+        return _EMPTY
+    st = _current()
+    key = (str(group_id or ""), category)
+    hit = st.compiled.get(key)
+    if hit is None:
+        hit = st.compiled[key] = _compile(st, key[0], category)
+    return hit
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 쓰기
+
+def set_value(category: str, code: str, name: str, ord: int = 0, active: bool = True, request=None) -> None:
+    """중앙 참조값 추가/수정."""
+    if category not in CATEGORIES:
+        raise ValueError(f"알 수 없는 HR 참조 분류: {category}")
+    with transaction.atomic(using=CENTRAL_ALIAS):
+        HrReference.objects.using(CENTRAL_ALIAS).update_or_create(
+            category=category, code=code, defaults={"name": name, "ord": ord, "active": active},
+        )
+        publish("hr_reference", "update", request=request)
+
+
+def set_tenant_value(group_id: str, category: str, code: str, enabled: Optional[bool],
+                     ord: Optional[int] = None, request=None) -> None:
+    """테넌트 덮어쓰기. enabled=None 이면 덮어쓰기를 지워 중앙 값으로 되돌린다."""
+    if category not in CATEGORIES:
+        raise ValueError(f"알 수 없는 HR 참조 분류: {category}")
+    qs = TenantHrValue.objects.using(CENTRAL_ALIAS)
+    with transaction.atomic(using=CENTRAL_ALIAS):
+        if enabled is None:
+            qs.filter(group_id=group_id, category=category, code=code).delete()
+        else:
+            qs.update_or_create(
+                group_id=group_id, category=category, code=code, defaults={"enabled": enabled, "ord": ord},
+            )
+        publish("hr_reference", "delete" if enabled is None else "update", entity_id=group_id, request=request)
@@ -0,0 +1,13 @@
+# control/catalog/middleware.py
+from .changes import sync
+
+
+class CatalogSyncMiddleware:
+    """요청 진입 시 카탈로그 버전을 맞춘다(poll은 간격 제한, listen은 스레드 보장만)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sync()
+        return self.get_response(request)
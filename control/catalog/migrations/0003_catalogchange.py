@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS catalog.change_log (
+    id          bigserial PRIMARY KEY,
+    entity      text        NOT NULL,
+    action      text        NOT NULL,
+    entity_id   uuid        NULL,
+    l2_id       uuid        NULL,
+    actor       text        NULL,
+    changed_at  timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS change_log_changed_at_idx ON catalog.change_log (changed_at);
+"""
+
+DROP_SQL = "DROP TABLE IF EXISTS catalog.change_log;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_categoryoptionpick_alter_categoryparent_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity', models.TextField()),
+                ('action', models.TextField()),
+                ('entity_id', models.UUIDField(blank=True, null=True)),
+                ('l2_id', models.UUIDField(blank=True, null=True)),
+                ('actor', models.TextField(blank=True, null=True)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'catalog"."change_log',
+                'ordering': ['-id'],
+                'managed': False,
+            },
+        ),
+        # 비관리 모델이라 테이블은 직접 만든다
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
@@ -0,0 +1,102 @@
+from django.db import migrations, models
+import uuid
+
+
+CREATE_SQL = """
+CREATE SCHEMA IF NOT EXISTS ref;
+CREATE TABLE IF NOT EXISTS ref.hr_reference (
+    id          uuid        PRIMARY KEY DEFAULT gen_random_uuid(),
+    category    text        NOT NULL,
+    code        text        NOT NULL,
+    name        text        NOT NULL,
+    ord         integer     NOT NULL DEFAULT 0,
+    active      boolean     NOT NULL DEFAULT true,
+    created_at  timestamptz NOT NULL DEFAULT now(),
+    updated_at  timestamptz NOT NULL DEFAULT now(),
+    UNIQUE (category, code)
+);
+CREATE TABLE IF NOT EXISTS ref.tenant_enabled_values (
+    id          uuid        PRIMARY KEY DEFAULT gen_random_uuid(),
+    group_id    uuid        NOT NULL,
+    category    text        NOT NULL,
+    code        text        NOT NULL,
+    enabled     boolean     NOT NULL DEFAULT true,
+    ord         integer     NULL,
+    updated_at  timestamptz NOT NULL DEFAULT now(),
+    UNIQUE (group_id, category, code)
+);
+
+-- 기존 로컬 상수(HR_LOCAL_OPTIONS)를 초기값으로
+INSERT INTO ref.hr_reference (category, code, name, ord) VALUES
+    ('position_grade',  '임원',     '임원',     10),
+    ('position_grade',  '부장',     '부장',     20),
+    ('position_grade',  '차장',     '차장',     30),
+    ('position_grade',  '과장',     '과장',     40),
+    ('position_grade',  '대리',     '대리',     50),
+    ('position_grade',  '주임',     '주임',     60),
+    ('position_grade',  '사원',     '사원',     70),
+    ('position_grade',  '인턴',     '인턴',     80),
+    ('employment_type', '정규직',   '정규직',   10),
+    ('employment_type', '계약직',   '계약직',   20),
+    ('employment_type', '파견',     '파견',     30),
+    ('employment_type', '용역',     '용역',     40),
+    ('employment_type', '프리랜서', '프리랜서', 50),
+    ('employment_type', '인턴',     '인턴',     60),
+    ('status',          '재직',     '재직',     10),
+    ('status',          '휴직',     '휴직',     20),
+    ('status',          '퇴사',     '퇴사',     30)
+ON CONFLICT (category, code) DO NOTHING;
+"""
+
+DROP_SQL = """
+DROP TABLE IF EXISTS ref.tenant_enabled_values;
+DROP TABLE IF EXISTS ref.hr_reference;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_catalogchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HrReference',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('category', models.TextField()),
+                ('code', models.TextField()),
+                ('name', models.TextField()),
+                ('ord', models.IntegerField(default=0)),
+                ('active', models.BooleanField(default=True)),
+            ],
+            options={
+                'db_table': 'ref"."hr_reference',
+                'ordering': ['category', 'ord', 'name'],
+                'managed': False,
+                'unique_together': {('category', 'code')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TenantHrValue',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('group_id', models.UUIDField()),
+                ('category', models.TextField()),
+                ('code', models.TextField()),
+                ('enabled', models.BooleanField(default=True)),
+                ('ord', models.IntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'ref"."tenant_enabled_values',
+                'managed': False,
+                'unique_together': {('group_id', 'category', 'code')},
+            },
+        ),
+        # 비관리 모델이라 테이블은 직접 만든다
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
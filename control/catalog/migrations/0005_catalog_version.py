@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+# 카탈로그 버전 카운터(단일 행). publish 가 같은 트랜잭션에서 +1 하므로
+# 행 잠금 때문에 버전 순서 = 커밋 순서(MAX(id) 는 늦게 커밋된 작은 id 를 놓칠 수 있다).
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS catalog.version (
+    id          smallint    PRIMARY KEY CHECK (id = 1),
+    version     bigint      NOT NULL,
+    updated_at  timestamptz NOT NULL DEFAULT now()
+);
+INSERT INTO catalog.version (id, version)
+SELECT 1, COALESCE(MAX(id), 0) FROM catalog.change_log
+ON CONFLICT (id) DO NOTHING;
+
+ALTER TABLE catalog.change_log ADD COLUMN IF NOT EXISTS version bigint NULL;
+UPDATE catalog.change_log SET version = id WHERE version IS NULL;
+"""
+
+DROP_SQL = """
+ALTER TABLE catalog.change_log DROP COLUMN IF EXISTS version;
+DROP TABLE IF EXISTS catalog.version;
+"""
+
+
+class Migration(migrations.Migration):
+
+    # 카탈로그 변경 로그(0003)에만 의존 — HR 참조(0004)와는 무관하고 0006 에서 합쳐진다
+    dependencies = [
+        ('catalog', '0003_catalogchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalogchange',
+            name='version',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        # 비관리 모델이라 테이블/컬럼은 직접 만든다
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
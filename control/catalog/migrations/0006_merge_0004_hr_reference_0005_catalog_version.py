@@ -0,0 +1,14 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_hr_reference'),
+        ('catalog', '0005_catalog_version'),
+    ]
+
+    operations = [
+    ]
@@ -103,4 +103,51 @@ class CategoryOptionPick(models.Model):
         unique_together = (('l2', 'level_no', 'option'),)
         indexes = [
             models.Index(fields=['l2', 'level_no'], name='cop_l2_level_idx'),
-        ]
\ No newline at end of file
+        ]
+class CatalogChange(models.Model):
+    """카탈로그 변경 로그. version = 이 변경으로 올라간 카탈로그 버전(catalog.version 카운터, 커밋 순서)."""
+    id = models.BigAutoField(primary_key=True)
+    entity = models.TextField()                      # l1 / l2 / option_set / option_rule / facet / option / pick / hr_reference
+    action = models.TextField()                      # create / update / delete / replace / patch
+    entity_id = models.UUIDField(null=True, blank=True)
+    l2_id = models.UUIDField(null=True, blank=True)  # 영향을 받는 L2(알 수 있을 때)
+    actor = models.TextField(null=True, blank=True)
+    changed_at = models.DateTimeField(auto_now_add=True)
+    version = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        managed = False
+        db_table = 'catalog"."change_log'
+        ordering = ['-id']
+
+
+class HrReference(TimeStampedModel):
+    """중앙 HR 참조값(직급/고용형태/재직상태). category+code 가 키."""
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    category = models.TextField()                    # position_grade / employment_type / status
+    code = models.TextField()
+    name = models.TextField()
+    ord = models.IntegerField(default=0)
+    active = models.BooleanField(default=True)
+
+    class Meta:
+        managed = False
+        db_table = 'ref"."hr_reference'
+        unique_together = (('category', 'code'),)
+        ordering = ['category', 'ord', 'name']
+
+
+class TenantHrValue(models.Model):
+    """테넌트(중앙 그룹)별 HR 참조값 사용 여부/순서 덮어쓰기. 행이 없으면 중앙 값 그대로."""
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    group_id = models.UUIDField()
+    category = models.TextField()
+    code = models.TextField()
+    enabled = models.BooleanField(default=True)
+    ord = models.IntegerField(null=True, blank=True)  # NULL 이면 중앙 ord
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = 'ref"."tenant_enabled_values'
+        unique_together = (('group_id', 'category', 'code'),)
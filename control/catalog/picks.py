@@ -0,0 +1,215 @@
+# control/catalog/picks.py
+# -*- coding: utf-8 -*-
+"""
+L2 × level(3/4) 옵션 pick 관리
+- pick 목록은 (L2, level) 단위로 '정렬된 전체 목록'을 받아 한 번에 교체한다
+  · 보드의 한 건 추가/이동/삭제는 그 한 건만 검증·변경(add_pick / move_pick / delete_pick)
+- 검증은 연결된 옵션팩 기준 1쿼리, 교체는 DELETE 1회 + bulk INSERT 1회(트랜잭션)
+- 보드 화면 데이터는 L2 선택 시 고정 3쿼리(옵션팩/옵션/pick)로 구성
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from uuid import uuid4
+
+from django.db import transaction
+from django.db.models import Max
+
+from .changes import publish
+from .models import CategoryFacetOption, CategoryOptionPick, CategoryOptionSet
+from .services_tenant import CENTRAL_ALIAS
+
+LEVELS = (3, 4)
+
+
+class PickError(ValueError):
+    """pick 목록 검증 실패. invalid에는 거부된 option_id가 담긴다."""
+
+    def __init__(self, msg: str, invalid: Optional[List[str]] = None):
+        super().__init__(msg)
+        self.invalid = invalid or []
+
+
+def normalize_option_ids(raw: Iterable) -> List[str]:
+    """순서를 유지한 채 중복 제거."""
+    if raw is None:
+        return []
+    if isinstance(raw, (str, bytes)) or not hasattr(raw, "__iter__"):
+        raise PickError("option_ids는 배열이어야 합니다.")
+    seen: Dict[str, None] = {}
+    for x in raw:
+        if x:
+            seen.setdefault(str(x), None)
+    return list(seen)
+
+
+def validate_option_ids(l2_id, level_no: int, option_ids: List[str]) -> None:
+    """(L2, level)에 연결된 옵션팩의 옵션인지 1쿼리로 확인(비활성 옵션은 스냅샷 마스크에서 걸러진다)."""
+    if level_no not in LEVELS:
+        raise PickError("level_no는 3 또는 4여야 합니다.")
+    if not option_ids:
+        return
+    facet_ids = (CategoryOptionSet.objects.using(CENTRAL_ALIAS)
+                 .filter(l2_id=l2_id, level_no=level_no)
+                 .values("facet_id"))
+    try:
+        ok = set(str(x) for x in (CategoryFacetOption.objects.using(CENTRAL_ALIAS)
+                                  .filter(id__in=option_ids, facet_id__in=facet_ids)
+                                  .values_list("id", flat=True)))
+    except Exception:  # uuid 형식 오류 등
+        raise PickError("잘못된 옵션 id가 포함되어 있습니다.", option_ids)
+    invalid = [x for x in option_ids if x not in ok]
+    if invalid:
+        raise PickError("연결된 옵션팩에 없는 옵션이 포함되어 있습니다.", invalid)
+
+
+def replace_picks(l2_id, level_no: int, option_ids: List[str], request=None) -> None:
+    """
+    (L2, level)의 pick을 option_ids 순서(ord=1..n)로 통째로 교체.
+    빈 목록이면 pick을 모두 지워 '전체 사용 모드'로 돌아간다.
+    """
+    option_ids = normalize_option_ids(option_ids)
+    validate_option_ids(l2_id, level_no, option_ids)
+    with transaction.atomic(using=CENTRAL_ALIAS):
+        (CategoryOptionPick.objects.using(CENTRAL_ALIAS)
+         .filter(l2_id=l2_id, level_no=level_no).delete())
+        if option_ids:
+            CategoryOptionPick.objects.using(CENTRAL_ALIAS).bulk_create([
+                CategoryOptionPick(id=uuid4(), l2_id=l2_id, level_no=level_no, option_id=oid, ord=i)
+                for i, oid in enumerate(option_ids, start=1)
+            ])
+        publish("pick", "replace", l2_id=l2_id, request=request)
+
+
+def delete_pick(l2_id, pick_id, request=None) -> bool:
+    """
+    pick 1건 삭제. 남은 pick은 검증하지 않는다(옵션팩에서 빠진 옵션이 남아 있어도 삭제는 된다).
+    순서(ord)의 빈 자리는 정렬에 영향이 없으므로 그대로 둔다.
+    """
+    with transaction.atomic(using=CENTRAL_ALIAS):
+        deleted, _ = (CategoryOptionPick.objects.using(CENTRAL_ALIAS)
+                      .filter(id=pick_id, l2_id=l2_id).delete())
+        if deleted:
+            publish("pick", "delete", l2_id=l2_id, request=request)
+    return bool(deleted)
+
+
+def add_pick(l2_id, level_no: int, option_id: str, request=None) -> bool:
+    """
+    pick 1건을 맨 뒤에 추가. 추가하는 옵션만 검증한다(기존 pick 중 옵션팩에서 빠진 것이 있어도 추가는 된다).
+    이미 있으면 False.
+    """
+    option_id = str(option_id)
+    validate_option_ids(l2_id, level_no, [option_id])
+    qs = CategoryOptionPick.objects.using(CENTRAL_ALIAS).filter(l2_id=l2_id, level_no=level_no)
+    with transaction.atomic(using=CENTRAL_ALIAS):
+        if qs.filter(option_id=option_id).exists():
+            return False
+        last = qs.aggregate(m=Max("ord"))["m"] or 0
+        CategoryOptionPick.objects.using(CENTRAL_ALIAS).create(
+            id=uuid4(), l2_id=l2_id, level_no=level_no, option_id=option_id, ord=last + 1,
+        )
+        publish("pick", "create", l2_id=l2_id, request=request)
+    return True
+
+
+def move_pick(l2_id, level_no: int, option_id: str, up: bool, request=None) -> bool:
+    """
+    pick 1건을 한 칸 위/아래로. 옮기는 옵션만 검증하고, 순서는 ord=1..n 으로 다시 매긴다.
+    맨 끝이라 못 옮기면 False.
+    """
+    option_id = str(option_id)
+    validate_option_ids(l2_id, level_no, [option_id])
+    with transaction.atomic(using=CENTRAL_ALIAS):
+        rows = list(CategoryOptionPick.objects.using(CENTRAL_ALIAS)
+                    .select_for_update()
+                    .filter(l2_id=l2_id, level_no=level_no)
+                    .order_by("ord", "option__name"))
+        i = next((k for k, p in enumerate(rows) if str(p.option_id) == option_id), None)
+        j = None if i is None else (i - 1 if up else i + 1)
+        if j is None or not 0 <= j < len(rows):
+            return False
+        rows[i], rows[j] = rows[j], rows[i]
+        for k, p in enumerate(rows, start=1):
+            p.ord = k
+        CategoryOptionPick.objects.using(CENTRAL_ALIAS).bulk_update(rows, ["ord"])
+        publish("pick", "update", l2_id=l2_id, request=request)
+    return True
+
+
+def current_option_ids(l2_id, level_no: int) -> List[str]:
+    return [str(x) for x in (CategoryOptionPick.objects.using(CENTRAL_ALIAS)
+                             .filter(l2_id=l2_id, level_no=level_no)
+                             .order_by("ord", "option__name")
+                             .values_list("option_id", flat=True))]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 보드 상태(화면/JSON 공용)
+
+@dataclass
+class LevelState:
+    level_no: int
+    sets: list           # CategoryOptionSet (facet select_related)
+    all_options: list    # 연결된 팩의 활성 옵션 (ord, name)
+    picks: list          # CategoryOptionPick (option 채워짐, ord 순)
+    candidates: list     # 아직 pick되지 않은 옵션
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.picks)
+
+    @property
+    def effective(self) -> list:
+        """실제 사용 옵션(pick이 있으면 pick만, 없으면 전체)."""
+        return [p.option for p in self.picks] if self.picks else self.all_options
+
+    def as_dict(self) -> Dict[str, object]:
+        opt = lambda o: {"id": str(o.id), "code": o.code, "name": o.name}  # noqa: E731
+        return {
+            "level_no": self.level_no,
+            "mode": "partial" if self.partial else "all",
+            "facets": [{"id": str(s.facet_id), "code": s.facet.code, "name": s.facet.name} for s in self.sets],
+            "picks": [{"id": str(p.id), "ord": p.ord, **opt(p.option)} for p in self.picks],
+            "candidates": [opt(o) for o in self.candidates],
+        }
+
+
+def load_board_levels(l2_id) -> Dict[int, LevelState]:
+    """옵션팩 1 + 옵션 1 + pick 1 = 3쿼리로 Lv3/Lv4 상태를 모두 구성."""
+    sets = list(CategoryOptionSet.objects.using(CENTRAL_ALIAS)
+                .filter(l2_id=l2_id)
+                .select_related("facet")
+                .order_by("level_no", "ord", "facet__name"))
+    facet_level: Dict[str, List[int]] = {}
+    for s in sets:
+        facet_level.setdefault(str(s.facet_id), []).append(int(s.level_no))
+
+    options_by_level: Dict[int, list] = {lv: [] for lv in LEVELS}
+    if facet_level:
+        for o in (CategoryFacetOption.objects.using(CENTRAL_ALIAS)
+                  .filter(facet_id__in=list(facet_level), active=True)
+                  .order_by("ord", "name")):
+            for lv in facet_level.get(str(o.facet_id), ()):
+                if lv in options_by_level:
+                    options_by_level[lv].append(o)
+
+    picks_by_level: Dict[int, list] = {lv: [] for lv in LEVELS}
+    for p in (CategoryOptionPick.objects.using(CENTRAL_ALIAS)
+              .filter(l2_id=l2_id, level_no__in=LEVELS)
+              .select_related("option")
+              .order_by("level_no", "ord", "option__name")):
+        picks_by_level[int(p.level_no)].append(p)
+
+    out: Dict[int, LevelState] = {}
+    for lv in LEVELS:
+        picked = {str(p.option_id) for p in picks_by_level[lv]}
+        out[lv] = LevelState(
+            level_no=lv,
+            sets=[s for s in sets if s.level_no == lv],
+            all_options=options_by_level[lv],
+            picks=picks_by_level[lv],
+            candidates=[o for o in options_by_level[lv] if str(o.id) not in picked],
+        )
+    return out
@@ -0,0 +1,206 @@
+# control/catalog/rules.py
+# -*- coding: utf-8 -*-
+"""
+L2별 (L3옵션 × L4옵션) 허용 규칙 매트릭스
+- 연결된 L3/L4 옵션팩(각 첫 번째)의 활성 옵션 순서를 행/열 비트 위치로 고정
+- 행(L3)마다 허용된 L4 열을 int 비트맵으로 보관 → is_allowed / allowed_l4_for는 비트 연산 1회
+- 일괄 변경은 UNNEST 배열로 INSERT ... ON CONFLICT 1회 + 정확한 페어 DELETE 1회
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.db import connections
+
+from .models import CategoryFacetOption, CategoryOptionRule, CategoryOptionSet
+from .services_tenant import CENTRAL_ALIAS, FacetDTO, OptionDTO
+from .changes import register_invalidator
+from .snapshot import SNAPSHOT_TTL, iter_bits
+
+Pair = Tuple[str, str]  # (facet3_opt_id, facet4_opt_id)
+
+
+@dataclass(frozen=True)
+class RulesMatrix:
+    l2_id: str
+    facet3: Optional[FacetDTO]
+    facet4: Optional[FacetDTO]
+    l3_options: Tuple[OptionDTO, ...]
+    l4_options: Tuple[OptionDTO, ...]
+    l3_pos: Dict[str, int]
+    l4_pos: Dict[str, int]
+    rows: Tuple[int, ...]                 # rows[i] = L3 i번째 옵션에 허용된 L4 비트
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def ready(self) -> bool:
+        return self.facet3 is not None and self.facet4 is not None
+
+    def is_allowed(self, l3_id: str, l4_id: str) -> bool:
+        i = self.l3_pos.get(str(l3_id))
+        j = self.l4_pos.get(str(l4_id))
+        if i is None or j is None:
+            return False
+        return bool(self.rows[i] >> j & 1)
+
+    def allowed_mask_for(self, l3_id: str) -> int:
+        i = self.l3_pos.get(str(l3_id))
+        return self.rows[i] if i is not None else 0
+
+    def allowed_l4_for(self, l3_id: str) -> List[OptionDTO]:
+        return [self.l4_options[j] for j in iter_bits(self.allowed_mask_for(l3_id))]
+
+    def pairs(self) -> Set[Pair]:
+        return {
+            (self.l3_options[i].id, self.l4_options[j].id)
+            for i, row in enumerate(self.rows)
+            for j in iter_bits(row)
+        }
+
+    def count(self) -> int:
+        return sum(bin(row).count("1") for row in self.rows)
+
+    def accepts(self, pair: Pair) -> bool:
+        """현재 매트릭스의 행/열에 속한 페어인지(규칙으로 저장 가능한지)."""
+        return pair[0] in self.l3_pos and pair[1] in self.l4_pos
+
+
+def _facet_dto(f) -> FacetDTO:
+    return FacetDTO(id=str(f.id), code=f.code, name=f.name, ord=f.ord, active=f.active)
+
+
+def build_rules_matrix(l2_id: str) -> RulesMatrix:
+    """옵션팩 / 옵션 / 규칙 3개 쿼리로 매트릭스 구성."""
+    l2_id = str(l2_id)
+    sets = list(CategoryOptionSet.objects.using(CENTRAL_ALIAS)
+                .filter(l2_id=l2_id)
+                .select_related("facet")
+                .order_by("level_no", "ord", "facet__name"))
+    f3 = next((s.facet for s in sets if s.level_no == 3), None)
+    f4 = next((s.facet for s in sets if s.level_no == 4), None)
+    if not (f3 and f4):
+        return RulesMatrix(
+            l2_id=l2_id,
+            facet3=_facet_dto(f3) if f3 else None,
+            facet4=_facet_dto(f4) if f4 else None,
+            l3_options=(), l4_options=(), l3_pos={}, l4_pos={}, rows=(),
+        )
+
+    by_facet: Dict[str, List[OptionDTO]] = {str(f3.id): [], str(f4.id): []}
+    for o in (CategoryFacetOption.objects.using(CENTRAL_ALIAS)
+              .filter(facet_id__in=[f3.id, f4.id], active=True)
+              .order_by("ord", "name")):
+        by_facet[str(o.facet_id)].append(OptionDTO(
+            id=str(o.id), code=o.code, name=o.name, ord=o.ord, active=o.active,
+            default_unit=o.default_unit, geom_hint=o.geom_hint,
+        ))
+    l3 = tuple(by_facet[str(f3.id)])
+    # 같은 옵션팩을 L3/L4 양쪽에 연결한 경우에도 행/열은 각자 전체 목록을 쓴다
+    l4 = tuple(by_facet[str(f4.id)])
+    l3_pos = {o.id: i for i, o in enumerate(l3)}
+    l4_pos = {o.id: j for j, o in enumerate(l4)}
+
+    rows = [0] * len(l3)
+    for a, b in (CategoryOptionRule.objects.using(CENTRAL_ALIAS)
+                 .filter(l2_id=l2_id, active=True)
+                 .values_list("facet3_opt_id", "facet4_opt_id")):
+        i = l3_pos.get(str(a))
+        j = l4_pos.get(str(b))
+        if i is not None and j is not None:
+            rows[i] |= 1 << j
+
+    return RulesMatrix(
+        l2_id=l2_id,
+        facet3=_facet_dto(f3),
+        facet4=_facet_dto(f4),
+        l3_options=l3,
+        l4_options=l4,
+        l3_pos=l3_pos,
+        l4_pos=l4_pos,
+        rows=tuple(rows),
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 프로세스 단위 캐시(L2별, TTL)
+
+_lock = threading.Lock()
+_matrices: Dict[str, RulesMatrix] = {}
+
+
+def get_rules_matrix(l2_id: str) -> RulesMatrix:
+    key = str(l2_id)
+    m = _matrices.get(key)
+    if m is not None and time.monotonic() - m.loaded_at < SNAPSHOT_TTL:
+        return m
+    m = build_rules_matrix(key)
+    with _lock:
+        _matrices[key] = m
+    return m
+
+
+def reset_rules_matrix(l2_id: Optional[str] = None) -> None:
+    """l2_id가 없으면 전체를 버린다(옵션팩/옵션 변경 등)."""
+    with _lock:
+        if l2_id is None:
+            _matrices.clear()
+        else:
+            _matrices.pop(str(l2_id), None)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 일괄 변경
+
+_UPSERT_SQL = """
+    INSERT INTO catalog.category_option_rule (id, l2_id, facet3_opt_id, facet4_opt_id, active)
+    SELECT gen_random_uuid(), %s, t.a, t.b, TRUE
+      FROM unnest(%s::uuid[], %s::uuid[]) AS t(a, b)
+    ON CONFLICT (l2_id, facet3_opt_id, facet4_opt_id) DO UPDATE SET active = TRUE
+"""
+
+_DELETE_SQL = """
+    DELETE FROM catalog.category_option_rule r
+     USING unnest(%s::uuid[], %s::uuid[]) AS t(a, b)
+     WHERE r.l2_id = %s
+       AND r.facet3_opt_id = t.a
+       AND r.facet4_opt_id = t.b
+"""
+
+
+def normalize_pairs(raw: Iterable[Sequence[str]]) -> List[Pair]:
+    """[[a, b], ...] → 중복 제거된 (str, str) 목록. 형식이 틀린 항목은 ValueError."""
+    seen: Dict[Pair, None] = {}
+    for item in raw or []:
+        if not isinstance(item, (list, tuple)) or len(item) != 2:
+            raise ValueError("페어는 [l3_opt_id, l4_opt_id] 형식이어야 합니다.")
+        seen[(str(item[0]), str(item[1]))] = None
+    return list(seen)
+
+
+def apply_rules_patch(matrix: RulesMatrix, allow: List[Pair], disallow: List[Pair]) -> Dict[str, int]:
+    """
+    allow는 upsert(active=TRUE), disallow는 정확히 그 페어만 삭제.
+    같은 페어가 양쪽에 있으면 disallow가 이긴다. 매트릭스 밖 페어는 건너뛴다.
+    호출자가 트랜잭션을 연다.
+    """
+    deny = set(disallow)
+    allow = [p for p in allow if p not in deny]
+    allow_ok = [p for p in allow if matrix.accepts(p)]
+    deny_ok = [p for p in disallow if matrix.accepts(p)]
+    skipped = (len(allow) - len(allow_ok)) + (len(disallow) - len(deny_ok))
+
+    allowed = removed = 0
+    with connections[CENTRAL_ALIAS].cursor() as cur:
+        if allow_ok:
+            cur.execute(_UPSERT_SQL, [matrix.l2_id, [a for a, _ in allow_ok], [b for _, b in allow_ok]])
+            allowed = cur.rowcount
+        if deny_ok:
+            cur.execute(_DELETE_SQL, [[a for a, _ in deny_ok], [b for _, b in deny_ok], matrix.l2_id])
+            removed = cur.rowcount
+    return {"allowed": allowed, "removed": removed, "skipped": skipped}
+
+
+register_invalidator(reset_rules_matrix)
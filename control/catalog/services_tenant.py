@@ -24,7 +24,6 @@ from .models import (
     CategoryFacet,
     CategoryFacetOption,
     CategoryOptionRule,
-    CategoryOptionPick,
 )
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -83,6 +82,12 @@ class OptionDTO:
     geom_hint: str
 
 
+def get_catalog_snapshot():
+    """중앙 카탈로그 스냅샷(control.catalog.snapshot). snapshot이 위 DTO를 import하므로 지연 import."""
+    from .snapshot import get_catalog_snapshot as _get
+    return _get()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 5) L1/L2 계산 로직 (※ level 컬럼 없이 처리)
 
@@ -112,59 +117,17 @@ def _get_l2_ids() -> List[str]:
 
 def fetch_l1_list(only_active: bool = True) -> List[NodeDTO]:
     """
-    중앙 카탈로그 L1 목록(루트 노드)
+    중앙 카탈로그 L1 목록(루트 노드) — 카탈로그 스냅샷에서 읽는다.
     """
-    child_ids = CategoryParent.objects.using(CENTRAL_ALIAS)\
-        .values_list("child_id", flat=True)
-    qs = CategoryNode.objects.using(CENTRAL_ALIAS)\
-        .exclude(id__in=child_ids)
-    if only_active:
-        qs = qs.filter(active=True)
-    qs = qs.order_by("ord", "name")
-
-    out: List[NodeDTO] = []
-    for n in qs:
-        out.append(
-            NodeDTO(
-                id=str(n.id),
-                code=n.code,
-                name=n.name,
-                ord=n.ord,
-                active=n.active,
-                level=1,
-            )
-        )
-    return out
+    return get_catalog_snapshot().l1_list(only_active=only_active)
 
 
 def fetch_l2_list_for_l1(l1_id: str, only_active: bool = True) -> List[NodeDTO]:
     """
     중앙 카탈로그에서 특정 L1에 연결된 L2 목록
-    - CategoryParent.parent_id = l1_id, child → L2 node
+    - CategoryParent.parent_id = l1_id, child → L2 node (스냅샷 기준)
     """
-    child_ids = CategoryParent.objects.using(CENTRAL_ALIAS)\
-        .filter(parent_id=l1_id)\
-        .values_list("child_id", flat=True)
-
-    qs = CategoryNode.objects.using(CENTRAL_ALIAS)\
-        .filter(id__in=child_ids)
-    if only_active:
-        qs = qs.filter(active=True)
-    qs = qs.order_by("ord", "name")
-
-    out: List[NodeDTO] = []
-    for n in qs:
-        out.append(
-            NodeDTO(
-                id=str(n.id),
-                code=n.code,
-                name=n.name,
-                ord=n.ord,
-                active=n.active,
-                level=2,
-            )
-        )
-    return out
+    return get_catalog_snapshot().l2_list(l1_id, only_active=only_active)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -177,33 +140,9 @@ def get_enabled_node_ids(
 ) -> Set[str]:
     """
     테넌트 DB에서 level(1 or 2)의 '선택된' 노드 id 집합을 돌려준다.
-    - 중앙 CategoryNode에는 level 컬럼이 없으므로,
-      level=1 → L1 후보(id 집합), level=2 → L2 후보(id 집합)와 교집합으로 제한.
+    - L1/L2 후보 집합은 카탈로그 스냅샷에 미리 계산되어 있음
     """
-    try:
-        # 실제 경로에 맞게 수정해서 사용:
-        from geoflow_ops.tenant_models import TenantL1L2Selection
-    except Exception:
-        # 아직 테이블/모델이 없으면 빈 집합
-        return set()
-
-    if level == 1:
-        candidate_ids = set(_get_l1_ids())
-    elif level == 2:
-        candidate_ids = set(_get_l2_ids())
-    else:
-        return set()
-
-    qs = TenantL1L2Selection.objects.using(tenant_alias).filter(selected=True)
-    if project_id:
-        qs = qs.filter(project_id=project_id)
-
-    picked: Set[str] = set()
-    for sid in qs.values_list("node_id", flat=True):
-        sid = str(sid)
-        if sid in candidate_ids:
-            picked.add(sid)
-    return picked
+    return TenantOptionResolver(tenant_alias, project_id).enabled_node_ids(level)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -295,15 +234,10 @@ def get_effective_options(
     """
     1) CategoryOptionPick 으로 L2 + level_no 에 대해 pick된 옵션만 가져온다.
     2) 테넌트 비활성 목록을 빼준다.
+    (여러 L2를 볼 때는 TenantOptionResolver 하나를 만들어 재사용할 것)
     """
-    # 1) 중앙 pick 기준 옵션 목록
-    all_opts = get_picked_options_for_l2(l2_id, int(level_no), only_active=only_active)
-
-    # 2) 테넌트 비활성 (OFF 스위치)
-    disabled = get_disabled_option_ids(tenant_alias, l2_id, int(level_no), project_id)
-
-    # 3) 비활성 목록을 제외한 최종 옵션
-    return [o for o in all_opts if o.id not in disabled]
+    resolver = TenantOptionResolver(tenant_alias, project_id)
+    return resolver.effective_options(l2_id, int(level_no), only_active=only_active)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -312,11 +246,13 @@ def get_effective_options(
 def get_rules_pairs(l2_id: str, only_active: bool = True) -> Set[Tuple[str, str]]:
     """
     규칙은 (facet3_opt_id, facet4_opt_id) 페어 집합으로 반환.
+    only_active=True면 L2 규칙 매트릭스(비트맵 캐시)에서 바로 꺼낸다.
     """
+    if only_active:
+        from .rules import get_rules_matrix
+        return get_rules_matrix(l2_id).pairs()
     qs = CategoryOptionRule.objects.using(CENTRAL_ALIAS).filter(l2_id=l2_id)
-    if hasattr(CategoryOptionRule, "active") and only_active:
-        qs = qs.filter(active=True)
-    return set((str(r.facet3_opt_id), str(r.facet4_opt_id)) for r in qs)
+    return set((str(a), str(b)) for a, b in qs.values_list("facet3_opt_id", "facet4_opt_id"))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -327,41 +263,29 @@ def build_l2_panel_data(
     l1_id: str,
     project_id: Optional[str] = None,
     only_active: bool = True,
+    resolver: Optional["TenantOptionResolver"] = None,
 ) -> Dict[str, object]:
     """
     - L2 리스트(중앙) + 테넌트 선택 여부
     - 각 L2별 Lv3/Lv4 옵션팩, Effective 옵션 목록(비활성 제외)
+    - resolver를 넘기면 여러 L1에 대해 테넌트 상태를 다시 읽지 않는다
     """
-    l2_list = fetch_l2_list_for_l1(l1_id, only_active=only_active)
-    enabled_l2_ids = get_enabled_node_ids(tenant_alias, level=2, project_id=project_id)
+    resolver = resolver or TenantOptionResolver(tenant_alias, project_id)
+    snap = resolver.snapshot
+    enabled_l2_ids = resolver.enabled_node_ids(2)
 
     out = {
         "l2": [],  # [{node, selected, sets:{3:facetDTO,4:facetDTO}, options:{3:[...],4:[...]}}...]
     }
-    for n in l2_list:
-        sets = get_option_sets_for_l2(n.id)
-        opts3 = get_effective_options(
-            tenant_alias,
-            n.id,
-            level_no=3,
-            project_id=project_id,
-            only_active=only_active,
-        )
-        opts4 = get_effective_options(
-            tenant_alias,
-            n.id,
-            level_no=4,
-            project_id=project_id,
-            only_active=only_active,
-        )
+    for n in snap.l2_list(l1_id, only_active=only_active):
         out["l2"].append(
             {
                 "node": n,
                 "selected": (n.id in enabled_l2_ids),
-                "sets": {k: v for k, v in sets.items()},
+                "sets": dict(snap.sets.get(n.id, {})),
                 "options": {
-                    3: opts3,
-                    4: opts4,
+                    3: resolver.effective_options(n.id, 3, only_active=only_active),
+                    4: resolver.effective_options(n.id, 4, only_active=only_active),
                 },
             }
         )
@@ -379,30 +303,75 @@ def get_picked_options_for_l2(
     """
     catalog.category_option_pick 을 기준으로
     - 특정 L2 + level_no(3 or 4)에 대해
-    - 중앙에서 '선택(pick)'된 옵션만 반환.
+    - 중앙에서 '선택(pick)'된 옵션만 반환. (스냅샷의 pick 순서 그대로)
     """
-    picks = (
-        CategoryOptionPick.objects
-        .using(CENTRAL_ALIAS)
-        .filter(l2_id=l2_id, level_no=level_no)
-        .select_related("option")
-        .order_by("ord", "option__ord", "option__name")
-    )
+    snap = get_catalog_snapshot()
+    return snap.options_for_mask(l2_id, level_no, snap.full_mask(l2_id, level_no, only_active))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 14) 테넌트 Effective 옵션 리졸버 (비트셋)
+
+class TenantOptionResolver:
+    """
+    테넌트의 선택/비활성 상태를 쿼리 2회로 한 번에 적재하고,
+    (L2, level)별 비활성 옵션을 스냅샷 옵션 순서에 맞춘 정수 비트셋으로 보관한다.
+      effective = 스냅샷 활성 마스크 & ~비활성 비트셋
+    조회 비용은 화면에 보이는 옵션 수에만 비례한다.
+    """
+
+    def __init__(self, tenant_alias: str, project_id: Optional[str] = None, snapshot=None):
+        self.tenant_alias = tenant_alias
+        self.project_id = project_id
+        self.snapshot = snapshot or get_catalog_snapshot()
+        self._selected: frozenset = frozenset()
+        self._disabled: Dict[Tuple[str, int], int] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            # 실제 경로에 맞게 수정해서 사용:
+            from geoflow_ops.tenant_models import TenantL1L2Selection, TenantOptionDisable
+        except Exception:
+            # 아직 테이블/모델이 없으면 선택/비활성 없음
+            return
+
+        # (1) 선택된 L1/L2
+        qs = TenantL1L2Selection.objects.using(self.tenant_alias).filter(selected=True)
+        if self.project_id:
+            qs = qs.filter(project_id=self.project_id)
+        self._selected = frozenset(str(x) for x in qs.values_list("node_id", flat=True))
+
+        # (2) 비활성 옵션 → (L2, level)별 비트셋
+        qs = TenantOptionDisable.objects.using(self.tenant_alias).all()
+        if self.project_id:
+            qs = qs.filter(project_id=self.project_id)
+        pos_map = self.snapshot.option_pos
+        disabled: Dict[Tuple[str, int], int] = {}
+        for l2_id, level_no, option_id in qs.values_list("l2_id", "level_no", "option_id"):
+            key = (str(l2_id), int(level_no))
+            pos = pos_map.get(key, {}).get(str(option_id))
+            if pos is not None:  # 스냅샷에 없는(=pick 해제된) 옵션은 무시
+                disabled[key] = disabled.get(key, 0) | (1 << pos)
+        self._disabled = disabled
+
+    def enabled_node_ids(self, level: int) -> Set[str]:
+        if level == 1:
+            candidates = self.snapshot.l1_ids
+        elif level == 2:
+            candidates = self.snapshot.l2_ids
+        else:
+            return set()
+        return set(self._selected & candidates)
+
+    def disabled_mask(self, l2_id: str, level_no: int) -> int:
+        return self._disabled.get((str(l2_id), int(level_no)), 0)
+
+    def effective_mask(self, l2_id: str, level_no: int, only_active: bool = True) -> int:
+        full = self.snapshot.full_mask(l2_id, level_no, only_active=only_active)
+        return full & ~self.disabled_mask(l2_id, level_no)
+
+    def effective_options(self, l2_id: str, level_no: int, only_active: bool = True) -> List[OptionDTO]:
+        mask = self.effective_mask(l2_id, level_no, only_active=only_active)
+        return self.snapshot.options_for_mask(l2_id, level_no, mask)
 
-    out: List[OptionDTO] = []
-    for p in picks:
-        opt = p.option  # 🔹 CategoryOptionPick.option 이 FK 여야 함
-        if only_active and not opt.active:
-            continue
-        out.append(
-            OptionDTO(
-                id=str(opt.id),
-                code=opt.code,
-                name=opt.name,
-                ord=opt.ord,
-                active=opt.active,
-                default_unit=opt.default_unit,
-                geom_hint=opt.geom_hint,
-            )
-        )
-    return out
\ No newline at end of file
@@ -0,0 +1,162 @@
+# control/catalog/snapshot.py
+# -*- coding: utf-8 -*-
+"""
+중앙 카탈로그 스냅샷(읽기 전용, 프로세스 메모리)
+- 노드/부모링크/옵션팩/픽 4개 쿼리로 전체 카탈로그를 한 번에 적재
+- (L2, level)별 옵션은 pick 순서로 고정 → 이 순서가 비트셋의 비트 위치가 된다
+- 테넌트 리졸버(services_tenant.TenantOptionResolver)가 이 순서를 기준으로 마스크 연산
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from django.conf import settings
+
+from .models import (
+    CategoryNode,
+    CategoryParent,
+    CategoryOptionSet,
+    CategoryOptionPick,
+)
+from .changes import register_invalidator
+from .services_tenant import CENTRAL_ALIAS, NodeDTO, FacetDTO, OptionDTO
+
+SNAPSHOT_TTL = getattr(settings, "GF_CATALOG_SNAPSHOT_TTL", 60)
+
+OptionKey = Tuple[str, int]  # (l2_id, level_no)
+
+
+def iter_bits(mask: int):
+    """mask에서 켜진 비트 위치를 낮은 순서대로 돌려준다(켜진 비트 수만큼만 반복)."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    l1: Tuple[NodeDTO, ...]                               # 루트 노드(ord, name 순)
+    l2_by_l1: Dict[str, Tuple[NodeDTO, ...]]              # L1 id → L2 목록(ord, name 순)
+    l1_ids: FrozenSet[str]
+    l2_ids: FrozenSet[str]
+    sets: Dict[str, Dict[int, FacetDTO]]                  # L2 id → {3: facet, 4: facet}
+    options: Dict[OptionKey, Tuple[OptionDTO, ...]]       # (L2, level) → pick 순서 옵션
+    option_pos: Dict[OptionKey, Dict[str, int]]           # (L2, level) → {option_id: 비트 위치}
+    active_mask: Dict[OptionKey, int]                     # 활성 옵션 비트
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    # ── 조회 헬퍼
+    def l1_list(self, only_active: bool = True) -> List[NodeDTO]:
+        return [n for n in self.l1 if n.active or not only_active]
+
+    def l2_list(self, l1_id: str, only_active: bool = True) -> List[NodeDTO]:
+        return [n for n in self.l2_by_l1.get(str(l1_id), ()) if n.active or not only_active]
+
+    def full_mask(self, l2_id: str, level_no: int, only_active: bool = True) -> int:
+        key = (str(l2_id), int(level_no))
+        if only_active:
+            return self.active_mask.get(key, 0)
+        return (1 << len(self.options.get(key, ()))) - 1
+
+    def options_for_mask(self, l2_id: str, level_no: int, mask: int) -> List[OptionDTO]:
+        opts = self.options.get((str(l2_id), int(level_no)), ())
+        return [opts[i] for i in iter_bits(mask)]
+
+
+def _node_dto(n: CategoryNode, level: int) -> NodeDTO:
+    return NodeDTO(id=str(n.id), code=n.code, name=n.name, ord=n.ord, active=n.active, level=level)
+
+
+def build_snapshot() -> CatalogSnapshot:
+    """중앙 DB에서 카탈로그 전체를 4개 쿼리로 적재."""
+    nodes = {str(n.id): n for n in CategoryNode.objects.using(CENTRAL_ALIAS).all()}
+    links = list(CategoryParent.objects.using(CENTRAL_ALIAS).values_list("parent_id", "child_id"))
+
+    child_ids = {str(c) for _, c in links}
+    sort_key = lambda n: (n.ord, n.name)  # noqa: E731
+
+    l1 = tuple(_node_dto(n, 1) for n in sorted(
+        (n for nid, n in nodes.items() if nid not in child_ids), key=sort_key))
+
+    l2_raw: Dict[str, List[CategoryNode]] = {}
+    for parent_id, child_id in links:
+        child = nodes.get(str(child_id))
+        if child is not None:
+            l2_raw.setdefault(str(parent_id), []).append(child)
+    l2_by_l1 = {
+        pid: tuple(_node_dto(n, 2) for n in sorted(children, key=sort_key))
+        for pid, children in l2_raw.items()
+    }
+
+    sets: Dict[str, Dict[int, FacetDTO]] = {}
+    for s in (CategoryOptionSet.objects.using(CENTRAL_ALIAS)
+              .select_related("facet").order_by("level_no", "ord")):
+        f = s.facet
+        sets.setdefault(str(s.l2_id), {})[int(s.level_no)] = FacetDTO(
+            id=str(f.id), code=f.code, name=f.name, ord=f.ord, active=f.active,
+        )
+
+    options: Dict[OptionKey, List[OptionDTO]] = {}
+    for p in (CategoryOptionPick.objects.using(CENTRAL_ALIAS)
+              .select_related("option")
+              .order_by("l2_id", "level_no", "ord", "option__ord", "option__name")):
+        o = p.option
+        options.setdefault((str(p.l2_id), int(p.level_no)), []).append(OptionDTO(
+            id=str(o.id), code=o.code, name=o.name, ord=o.ord, active=o.active,
+            default_unit=o.default_unit, geom_hint=o.geom_hint,
+        ))
+
+    option_pos: Dict[OptionKey, Dict[str, int]] = {}
+    active_mask: Dict[OptionKey, int] = {}
+    for key, opts in options.items():
+        option_pos[key] = {o.id: i for i, o in enumerate(opts)}
+        mask = 0
+        for i, o in enumerate(opts):
+            if o.active:
+                mask |= 1 << i
+        active_mask[key] = mask
+
+    return CatalogSnapshot(
+        l1=l1,
+        l2_by_l1=l2_by_l1,
+        l1_ids=frozenset(n.id for n in l1),
+        l2_ids=frozenset(child_ids),
+        sets=sets,
+        options={k: tuple(v) for k, v in options.items()},
+        option_pos=option_pos,
+        active_mask=active_mask,
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 프로세스 단위 캐시(TTL)
+
+_lock = threading.Lock()
+_current: Optional[CatalogSnapshot] = None
+
+
+def get_catalog_snapshot() -> CatalogSnapshot:
+    global _current
+    snap = _current
+    if snap is not None and time.monotonic() - snap.loaded_at < SNAPSHOT_TTL:
+        return snap
+    with _lock:
+        snap = _current
+        if snap is None or time.monotonic() - snap.loaded_at >= SNAPSHOT_TTL:
+            snap = build_snapshot()
+            _current = snap
+    return snap
+
+
+def reset_catalog_snapshot() -> None:
+    """다음 조회 때 다시 적재하도록 스냅샷을 버린다."""
+    global _current
+    with _lock:
+        _current = None
+
+
+register_invalidator(reset_catalog_snapshot)
@@ -7,6 +7,7 @@ urlpatterns = [
     # NEW: 4-컬럼 SSR 보드
     path('admin/board/', views.categories_board, name='categories_board'),
     path('admin/categories/', views.categories_board, name='categories_admin'),
+    path('admin/nodes/<uuid:node_id>/picks/<int:level_no>/', views.option_picks_api, name='option_picks_api'),
 
     # L1
     # path('admin/l1/', views.l1_admin_list, name='l1_admin_list'),
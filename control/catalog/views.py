@@ -1,5 +1,6 @@
 from uuid import uuid4
 from django.db import connection, transaction
+from django.core.exceptions import ValidationError
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
@@ -7,13 +8,17 @@ from django.contrib import messages
 from django.urls import reverse
 from urllib.parse import urlencode
 from django.views.decorators.http import require_GET, require_http_methods, require_POST
-from django.db.models import Max, Prefetch
+from django.db.models import Prefetch
 import json
 from .models import (
     CategoryNode, CategoryParent, CategoryFacet, CategoryFacetOption,
     CategoryOptionSet, CategoryOptionRule, CategoryOptionPick
 )
 from .forms import L1Form, L2Form, FacetForm, FacetOptionForm, OptionSetForm, OptionRuleForm
+from . import picks as pick_svc
+from .changes import publish
+from .rules import get_rules_matrix, normalize_pairs, apply_rules_patch
+from .services_tenant import CENTRAL_ALIAS
 
 
 def _ok(data): return JsonResponse({'ok': True, 'results': data}, json_dumps_params={'ensure_ascii': False})
@@ -24,54 +29,50 @@ def categories_board(request):
     l1_id = request.GET.get('l1')
     l2_id = request.GET.get('l2')
 
-    # ── POST: 옵션 개별 pick 추가/삭제/초기화
+    # ── POST: 옵션 pick 추가/삭제/이동/초기화 → (L2, level) 목록 통째 교체
     if request.method == "POST" and l2_id:
         l2_sel = get_object_or_404(CategoryNode, pk=l2_id, level=2)
         action   = request.POST.get("action")
         level_no = int(request.POST.get("level_no") or 0)
 
-        # 이 Lv2에 연결된 facet(팩) 집합
-        sets = CategoryOptionSet.objects.filter(l2=l2_sel).order_by('level_no','ord')
-        facet_ids_lv3 = [s.facet_id for s in sets if s.level_no == 3]
-        facet_ids_lv4 = [s.facet_id for s in sets if s.level_no == 4]
-
-        def is_valid_option(opt_id: str) -> bool:
-            facet_id = CategoryFacetOption.objects.filter(pk=opt_id).values_list('facet_id', flat=True).first()
-            if not facet_id: return False
-            return (facet_id in facet_ids_lv3) if level_no == 3 else (facet_id in facet_ids_lv4)
-
-        if action == "add_pick" and level_no in (3,4):
-            opt_id = request.POST.get("option_id")
-            if opt_id and is_valid_option(opt_id):
-                exists = CategoryOptionPick.objects.filter(l2=l2_sel, level_no=level_no, option_id=opt_id).exists()
-                if not exists:
-                    max_ord = CategoryOptionPick.objects.filter(l2=l2_sel, level_no=level_no).aggregate(m=Max("ord"))["m"] or 0
-                    CategoryOptionPick.objects.create(l2=l2_sel, level_no=level_no, option_id=opt_id, ord=max_ord+1)
-
-        elif action == "del_pick":
+        if action == "del_pick":
+            # 한 건만 지운다(남은 pick 검증 없음 — 옵션팩에서 빠진 옵션이 남아 있어도 삭제 가능)
             pick_id = request.POST.get("pick_id")
             if pick_id:
-                CategoryOptionPick.objects.filter(id=pick_id, l2=l2_sel).delete()
-
-        elif action == "clear_picks" and level_no in (3,4):
-            CategoryOptionPick.objects.filter(l2=l2_sel, level_no=level_no).delete()
+                try:
+                    pick_svc.delete_pick(l2_sel.id, pick_id, request=request)
+                except ValidationError:
+                    messages.error(request, "잘못된 pick id 입니다.")
+
+        elif action in ("add_pick", "move_pick", "clear_picks") and level_no in pick_svc.LEVELS:
+            # 추가/이동은 그 한 건만 검증 — 옵션팩에서 빠진 pick 이 남아 있어도 막히지 않는다
+            opt_id = request.POST.get("option_id") or ""
+            try:
+                if action == "add_pick" and opt_id:
+                    pick_svc.add_pick(l2_sel.id, level_no, opt_id, request=request)
+                elif action == "move_pick" and opt_id:
+                    pick_svc.move_pick(l2_sel.id, level_no, opt_id, request.POST.get("dir") == "up",
+                                       request=request)
+                elif action == "clear_picks":
+                    pick_svc.replace_picks(l2_sel.id, level_no, [], request=request)
+            except pick_svc.PickError as e:
+                messages.error(request, str(e))
 
         # PRG
         return redirect(f"{reverse('catalog:categories_board')}?l1={l1_id or ''}&l2={l2_id or ''}")
 
-    # ── GET: 렌더
-    l1_list = CategoryNode.objects.filter(level=1, active=True).order_by('ord','name')
+    # ── GET: 렌더 (L2 선택 시에도 쿼리 수 고정)
+    l1_list = list(CategoryNode.objects.filter(level=1, active=True).order_by('ord','name'))
     l1_sel = get_object_or_404(CategoryNode, pk=l1_id, level=1) if l1_id else None
 
     if l1_sel:
-        child_ids = CategoryParent.objects.filter(parent=l1_sel).values_list('child_id', flat=True)
-        l2_list = CategoryNode.objects.filter(id__in=child_ids, level=2, active=True).order_by('ord','name')
+        child_ids = CategoryParent.objects.filter(parent=l1_sel).values('child_id')
+        l2_list = list(CategoryNode.objects.filter(id__in=child_ids, level=2, active=True).order_by('ord','name'))
     else:
-        l2_list = CategoryNode.objects.none()
+        l2_list = []
 
     l2_sel = get_object_or_404(CategoryNode, pk=l2_id, level=2) if l2_id else None
 
-    facet3 = facet4 = None
     picks3 = picks4 = []
     eff_opts3 = eff_opts4 = []   # 실제 사용 옵션(픽이 없으면 전체 옵션)
     add_candidates3 = add_candidates4 = []  # 추가 가능 후보
@@ -80,39 +81,15 @@ def categories_board(request):
     sets_lv3 = sets_lv4 = []
 
     if l2_sel:
-        sets = (CategoryOptionSet.objects
-                .filter(l2=l2_sel)
-                .select_related('facet')
-                .order_by('level_no','ord','facet__name'))
-        sets_lv3 = [s for s in sets if s.level_no == 3]
-        sets_lv4 = [s for s in sets if s.level_no == 4]
-        facet_ids_lv3 = [s.facet_id for s in sets_lv3]
-        facet_ids_lv4 = [s.facet_id for s in sets_lv4]
-
-        # 연결된 팩에서 뽑을 수 있는 전체 옵션(기본 후보)
-        all_lv3_opts = CategoryFacetOption.objects.filter(facet_id__in=facet_ids_lv3, active=True).order_by('ord','name')
-        all_lv4_opts = CategoryFacetOption.objects.filter(facet_id__in=facet_ids_lv4, active=True).order_by('ord','name')
-
-        # 현재 pick
-        picks3 = list(CategoryOptionPick.objects.filter(l2=l2_sel, level_no=3).select_related('option').order_by('ord','option__name'))
-        picks4 = list(CategoryOptionPick.objects.filter(l2=l2_sel, level_no=4).select_related('option').order_by('ord','option__name'))
-
-        # 실제 사용 옵션(픽이 있으면 pick만, 없으면 전체)
-        if picks3:
-            eff_opts3 = [p.option for p in picks3]
-            add_candidates3 = all_lv3_opts.exclude(id__in=[p.option_id for p in picks3])
-        else:
-            eff_opts3 = list(all_lv3_opts)
-            add_candidates3 = all_lv3_opts  # '부분선택 모드'로 바꾸고 싶을 때 고르는 초기 후보
-
-        if picks4:
-            eff_opts4 = [p.option for p in picks4]
-            add_candidates4 = all_lv4_opts.exclude(id__in=[p.option_id for p in picks4])
-        else:
-            eff_opts4 = list(all_lv4_opts)
-            add_candidates4 = all_lv4_opts
-
-        rules_count = CategoryOptionRule.objects.filter(l2=l2_sel, active=True).count()
+        levels = pick_svc.load_board_levels(l2_sel.id)
+        lv3, lv4 = levels[3], levels[4]
+        sets_lv3, sets_lv4 = lv3.sets, lv4.sets
+        picks3, picks4 = lv3.picks, lv4.picks
+        eff_opts3, eff_opts4 = lv3.effective, lv4.effective
+        # pick이 없을 때 후보 = 전체 옵션('부분선택 모드'로 바꾸고 싶을 때 고르는 초기 후보)
+        add_candidates3, add_candidates4 = lv3.candidates, lv4.candidates
+
+        rules_count = get_rules_matrix(l2_sel.id).count()
 
     ctx = dict(
         l1_list=l1_list, l1_sel=l1_sel,
@@ -125,6 +102,36 @@ def categories_board(request):
     )
     return render(request, 'catalog/categories_board.html', ctx)
 
+
+@login_required
+@require_http_methods(["GET", "POST", "PUT"])
+def option_picks_api(request, node_id, level_no):
+    """
+    (L2, level)의 pick 목록 조회/일괄 교체(JSON)
+      GET        → 현재 상태
+      POST/PUT   → {"option_ids": [id, ...]}  (배열 순서 = ord, 빈 배열 = 전체 사용 모드)
+    응답은 두 경우 모두 {"ok": true, "results": {level_no, mode, facets, picks, candidates}}
+    """
+    l2 = get_object_or_404(CategoryNode, pk=node_id, level=2)
+    if level_no not in pick_svc.LEVELS:
+        return _err('level_no는 3 또는 4여야 합니다.', 400)
+
+    if request.method != 'GET':
+        try:
+            payload = json.loads(request.body or '{}')
+        except json.JSONDecodeError:
+            return _err('잘못된 JSON', 400)
+        if not isinstance(payload, dict):
+            return _err('본문은 {"option_ids": [...]} 형태의 객체여야 합니다.', 400)
+        try:
+            pick_svc.replace_picks(l2.id, level_no, payload.get('option_ids'), request=request)
+        except pick_svc.PickError as e:
+            return JsonResponse({'ok': False, 'error': str(e), 'invalid': e.invalid},
+                                status=400, json_dumps_params={'ensure_ascii': False})
+
+    state = pick_svc.load_board_levels(l2.id)[level_no]
+    return _ok(state.as_dict())
+
 # ─────────────────────────────────────────────
 # L1(대분류) 관리
 
@@ -136,6 +143,7 @@ def l1_admin_create(request):
             obj = form.save(commit=False)
             obj.level = 1   # 고정
             obj.save()
+            publish('l1', 'create', obj.id, request=request)
             messages.success(request, '대분류가 추가되었습니다.')
             return redirect('catalog:categories_board')
         messages.error(request, '입력값을 확인하세요.')
@@ -153,6 +161,7 @@ def l1_admin_update(request, pk):
         form = L1Form(request.POST, instance=obj)
         if form.is_valid():
             form.save()
+            publish('l1', 'update', obj.id, request=request)
             messages.success(request, '대분류가 수정되었습니다.')
             return redirect('catalog:categories_board')
         messages.error(request, '입력값을 확인하세요.')
@@ -164,6 +173,7 @@ def l1_admin_update(request, pk):
 def l1_admin_delete(request, pk):
     obj = get_object_or_404(CategoryNode, pk=pk, level=1)
     obj.delete()
+    publish('l1', 'delete', pk, request=request)
     messages.success(request, '대분류가 삭제되었습니다.')
     return redirect('catalog:categories_board')
 
@@ -208,6 +218,7 @@ def l2_admin_create(request):
                 obj.save()                      # Node 저장
                 # L1-L2 링크
                 CategoryParent.objects.create(parent=l1, child=obj)
+                publish('l2', 'create', obj.id, l2_id=obj.id, request=request)
             messages.success(request, '중분류가 추가되었습니다.')
             return redirect(f"{reverse('catalog:categories_board')}?l1={l1.id}&l2={obj.id}")
         messages.error(request, '입력값을 확인하세요.')
@@ -230,6 +241,7 @@ def l2_admin_update(request, pk):
         form = L2Form(request.POST, instance=l2)
         if form.is_valid():
             form.save()
+            publish('l2', 'update', l2.id, l2_id=l2.id, request=request)
             messages.success(request, '중분류가 수정되었습니다.')
             if from_board and l1_id:
                 qs = urlencode({'l1': l1_id, 'l2': str(l2.id)})
@@ -265,6 +277,7 @@ def l2_admin_delete(request, pk):
     CategoryParent.objects.filter(child=l2).delete()
     l1_id = request.POST.get('l1')  # 보드로 돌아가기용
     l2.delete()
+    publish('l2', 'delete', pk, l2_id=pk, request=request)
     messages.success(request, '중분류가 삭제되었습니다.')
     return redirect(f"{reverse('catalog:categories_board')}?l1={l1_id or ''}")
 
@@ -281,6 +294,7 @@ def option_set_create(request, node_id):
             last = CategoryOptionSet.objects.filter(l2=obj.l2, level_no=obj.level_no).order_by('-ord').first()
             obj.ord = obj.ord or ((last.ord + 1) if last else 1)
             obj.save()
+            publish('option_set', 'create', obj.id, l2_id=obj.l2_id, request=request)
             messages.success(request, '옵션팩이 연결되었습니다.')
             return redirect(reverse('catalog:node_link_admin', args=[l2.id]))
         messages.error(request, '입력값을 확인하세요.')
@@ -294,6 +308,7 @@ def option_set_delete(request, set_id):
     obj = get_object_or_404(CategoryOptionSet, pk=set_id)
     node_id = obj.l2_id
     obj.delete()
+    publish('option_set', 'delete', set_id, l2_id=node_id, request=request)
     return redirect(reverse('catalog:node_link_admin', args=[node_id]))
 
 # 규칙 목록/추가/삭제
@@ -310,7 +325,8 @@ def option_rule_create(request, node_id):
     if request.method == 'POST':
         form = OptionRuleForm(request.POST, l2=l2)
         if form.is_valid():
-            form.save()
+            rule = form.save()
+            publish('option_rule', 'create', rule.id, l2_id=l2.id, request=request)
             return redirect(reverse('option_rule_list', args=[l2.id]))
     else:
         form = OptionRuleForm(initial={'l2': l2}, l2=l2)
@@ -320,6 +336,7 @@ def option_rule_delete(request, rule_id):
     obj = get_object_or_404(CategoryOptionRule, pk=rule_id)
     node_id = obj.l2_id
     obj.delete()
+    publish('option_rule', 'delete', rule_id, l2_id=node_id, request=request)
     return redirect(reverse('option_rule_list', args=[node_id]))
 
 
@@ -343,19 +360,12 @@ def rules_matrix(request, node_id):
       - 연결된 L3/L4 옵션팩 1쌍(각 1개) 선택
       - 각 옵션팩의 옵션 목록
       - 현재 허용된 (L3옵션, L4옵션) 페어 리스트
-    를 JSON으로 반환
+    를 JSON으로 반환 (rules.get_rules_matrix 캐시 사용)
     """
     l2 = get_object_or_404(CategoryNode, pk=node_id, level=2)
+    m = get_rules_matrix(l2.id)
 
-    # 연결된 L3/L4 옵션팩 조회
-    sets = (CategoryOptionSet.objects
-            .filter(l2=l2)
-            .select_related('facet')
-            .order_by('level_no', 'ord', 'facet__name'))
-    facet3 = next((s.facet for s in sets if s.level_no == 3), None)
-    facet4 = next((s.facet for s in sets if s.level_no == 4), None)
-
-    if not (facet3 and facet4):
+    if not m.ready:
         return JsonResponse({
             'ok': True,
             'l3_facet': None, 'l4_facet': None,
@@ -364,30 +374,16 @@ def rules_matrix(request, node_id):
             'message': 'L3/L4 옵션팩이 모두 연결되어 있어야 규칙을 설정할 수 있습니다.'
         }, json_dumps_params={'ensure_ascii': False})
 
-    l3_opts = list(CategoryFacetOption.objects
-                   .filter(facet=facet3, active=True)
-                   .order_by('ord', 'name')
-                   .values('id', 'code', 'name'))
-    l4_opts = list(CategoryFacetOption.objects
-                   .filter(facet=facet4, active=True)
-                   .order_by('ord', 'name')
-                   .values('id', 'code', 'name'))
-
-    rules = list(CategoryOptionRule.objects
-                 .filter(l2=l2, active=True)
-                 .values_list('facet3_opt_id', 'facet4_opt_id'))
-
     return JsonResponse({
         'ok': True,
-        'l3_facet': {'id': str(facet3.id), 'code': facet3.code, 'name': facet3.name},
-        'l4_facet': {'id': str(facet4.id), 'code': facet4.code, 'name': facet4.name},
-        'l3_options': [{'id': str(x['id']), 'code': x['code'], 'name': x['name']} for x in l3_opts],
-        'l4_options': [{'id': str(x['id']), 'code': x['code'], 'name': x['name']} for x in l4_opts],
-        'allowed': [[str(a), str(b)] for (a, b) in rules]
+        'l3_facet': {'id': m.facet3.id, 'code': m.facet3.code, 'name': m.facet3.name},
+        'l4_facet': {'id': m.facet4.id, 'code': m.facet4.code, 'name': m.facet4.name},
+        'l3_options': [{'id': o.id, 'code': o.code, 'name': o.name} for o in m.l3_options],
+        'l4_options': [{'id': o.id, 'code': o.code, 'name': o.name} for o in m.l4_options],
+        'allowed': [[o3.id, o4.id] for o3 in m.l3_options for o4 in m.allowed_l4_for(o3.id)],
     }, json_dumps_params={'ensure_ascii': False})
 
 @require_http_methods(["POST"])
-@transaction.atomic
 def rules_matrix_patch(request, node_id):
     """
     요청 바디(JSON):
@@ -395,46 +391,30 @@ def rules_matrix_patch(request, node_id):
         "allow":    [ [l3_opt_id, l4_opt_id], ... ],
         "disallow": [ [l3_opt_id, l4_opt_id], ... ]
       }
-    allow  : 규칙 없으면 생성(active=True), 비활성화돼 있으면 활성화
-    disallow: 해당 규칙 삭제(또는 active=False로 바꾸고 싶다면 여기서 변경)
+    allow  : INSERT ... ON CONFLICT 1회로 생성/재활성화
+    disallow: 정확히 그 (l3, l4) 페어만 DELETE 1회
+    매트릭스(현재 옵션팩의 활성 옵션) 밖의 페어는 건너뛰고 skipped로 알려준다.
     """
     l2 = get_object_or_404(CategoryNode, pk=node_id, level=2)
     try:
         payload = json.loads(request.body or '{}')
-    except json.JSONDecodeError:
+        allow_list = normalize_pairs(payload.get('allow'))
+        disallow_list = normalize_pairs(payload.get('disallow'))
+    except (json.JSONDecodeError, AttributeError):
         return _err('잘못된 JSON', 400)
+    except ValueError as e:
+        return _err(str(e), 400)
 
-    allow_list = payload.get('allow', []) or []
-    disallow_list = payload.get('disallow', []) or []
-
-    # L3/L4 옵션팩(각 1개) 확인
-    sets = CategoryOptionSet.objects.filter(l2=l2).select_related('facet')
-    facet3 = next((s.facet for s in sets if s.level_no == 3), None)
-    facet4 = next((s.facet for s in sets if s.level_no == 4), None)
-    if not (facet3 and facet4):
+    m = get_rules_matrix(l2.id)
+    if not m.ready:
         return _err('L3/L4 옵션팩이 모두 연결되어 있어야 합니다.', 400)
 
-    # 허용: upsert
-    for l3_id, l4_id in allow_list:
-        obj, created = CategoryOptionRule.objects.get_or_create(
-            l2=l2,
-            facet3_opt_id=l3_id,
-            facet4_opt_id=l4_id,
-            defaults={'active': True}
-        )
-        if not created and not obj.active:
-            obj.active = True
-            obj.save(update_fields=['active'])
-
-    # 비허용: delete
-    if disallow_list:
-        CategoryOptionRule.objects.filter(
-            l2=l2,
-            facet3_opt_id__in=[a for a, _ in disallow_list],
-            facet4_opt_id__in=[b for _, b in disallow_list]
-        ).delete()
-
-    return _ok({'updated': True})
+    with transaction.atomic(using=CENTRAL_ALIAS):
+        result = apply_rules_patch(m, allow_list, disallow_list)
+        if result['allowed'] or result['removed']:
+            publish('option_rule', 'patch', l2_id=l2.id, request=request)
+
+    return _ok({'updated': True, **result})
 
 # ─────────────────────────────────────────────
 # 옵션 목록
@@ -462,6 +442,7 @@ def facet_admin_create(request):
         next_url = request.POST.get('next') or request.GET.get('next')
         if form.is_valid():
             obj = form.save()
+            publish('facet', 'create', obj.id, request=request)
             # ✅ next가 오면 그쪽으로, 없으면 기본 목록으로
             if next_url:
                 return redirect(next_url)
@@ -477,6 +458,7 @@ def facet_admin_update(request, pk):
         form = FacetForm(request.POST, instance=obj)
         if form.is_valid():
             form.save()
+            publish('facet', 'update', obj.id, request=request)
             messages.success(request, "옵션팩이 수정되었습니다.")
             return redirect('facet_admin_list')
         messages.error(request, "입력값을 확인하세요.")
@@ -488,6 +470,7 @@ def facet_admin_update(request, pk):
 def facet_admin_delete(request, pk):
     obj = get_object_or_404(CategoryFacet, pk=pk)
     obj.delete()
+    publish('facet', 'delete', pk, request=request)
     messages.success(request, "옵션팩을 삭제했습니다.")
     return redirect('facet_admin_list')
 
@@ -506,7 +489,8 @@ def option_admin_create(request, facet_id):
     if request.method == 'POST':
         form = FacetOptionForm(request.POST, facet=facet)
         if form.is_valid():
-            form.save()
+            opt = form.save()
+            publish('option', 'create', opt.id, request=request)
             messages.success(request, '옵션이 추가되었습니다.')
             return redirect('catalog:option_admin_list', facet_id=facet.id)
         messages.error(request, '입력값을 확인하세요.')
@@ -525,6 +509,7 @@ def option_admin_update(request, pk):
         form = FacetOptionForm(request.POST, instance=obj, facet=obj.facet)
         if form.is_valid():
             form.save()
+            publish('option', 'update', obj.id, request=request)
             messages.success(request, '옵션이 수정되었습니다.')
             return redirect('catalog:option_admin_list', facet_id=obj.facet_id)
         messages.error(request, '입력값을 확인하세요.')
@@ -538,5 +523,6 @@ def option_admin_delete(request, pk):
     obj = get_object_or_404(CategoryFacetOption, pk=pk)
     facet_id = obj.facet_id
     obj.delete()
+    publish('option', 'delete', pk, request=request)
     messages.success(request, '옵션을 삭제했습니다.')
     return redirect('catalog:option_admin_list', facet_id=facet_id)
\ No newline at end of file
@@ -1,8 +1,7 @@
 # control/decorators.py
 from functools import wraps
 from django.http import HttpResponseForbidden
-from django.db import connections
-from control.services_identity import ensure_user_from_request
+from control.services_identity import ensure_user_from_request, is_central_staff
 from control.templatetags.acl_tags import has_perm as _has_perm_tag
 import logging
 logger = logging.getLogger(__name__)
@@ -11,34 +10,29 @@ def require_central_admin(view_func):
     @wraps(view_func)
     def _wrap(request, *args, **kwargs):
         uid = ensure_user_from_request(request)
-        if not uid:
-            return HttpResponseForbidden("권한이 없습니다.")
-        with connections["default"].cursor() as cur:
-            cur.execute("SELECT is_staff FROM users WHERE id=%s", [uid])
-            row = cur.fetchone()
-        if not row or not row[0]:
+        if not uid or not is_central_staff(request):
             return HttpResponseForbidden("권한이 없습니다.")
         return view_func(request, *args, **kwargs)
     return _wrap
 
-def _is_staff(email: str) -> bool:
-    if not email:
-        return False
-    with connections["default"].cursor() as cur:
-        cur.execute("SELECT COALESCE(is_staff, FALSE) FROM users WHERE email=%s LIMIT 1", [email])
-        row = cur.fetchone()
-    return bool(row and row[0])
-
 def require_staff(view):
     @wraps(view)
     def _wrap(request, *args, **kwargs):
         if not request.user.is_authenticated:
             return HttpResponseForbidden("로그인이 필요합니다.")
-        if _is_staff(request.user.username):
+        if is_central_staff(request):
             return view(request, *args, **kwargs)
         return HttpResponseForbidden("중앙 관리자만 접근 가능합니다.")
     return _wrap
 
+def has_perm(request, perm_code: str) -> bool:
+    """require_perm과 같은 규칙의 함수형 검사(뷰 안에서 분기할 때)"""
+    if not request.user.is_authenticated:
+        return False
+    if is_central_staff(request):
+        return True
+    return bool(_has_perm_tag({"request": request}, perm_code))
+
 def require_perm(perm_code: str):
     """
     세션 기반 권한 검사 데코레이터.
@@ -49,7 +43,7 @@ def require_perm(perm_code: str):
         @wraps(view)
         def _wrap(request, *args, **kwargs):
             # 1) 중앙 관리자는 우선 통과
-            if request.user.is_authenticated and _is_staff(request.user.username):
+            if request.user.is_authenticated and is_central_staff(request):
                 return view(request, *args, **kwargs)
 
             # 2) 동일 로직 재사용(acl_tags.has_perm)
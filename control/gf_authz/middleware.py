@@ -17,9 +17,7 @@ class GFAuthzContextMiddleware(MiddlewareMixin):
             ctx = request.session.get("gf_authz_ctx")
             if not ctx:
                 ctx = gf_load_user_context(request)
-                request.session["gf_authz_ctx"] = ctx
-                request.session["gf_perms"] = ctx.get("perms", [])
-                request.session["gf_roles"] = ctx.get("roles", [])
+                request.session["gf_authz_ctx"] = ctx   # gf_perms/gf_roles 는 세션 엔진이 ctx 에서 계산
 
             # request 주입 (캐시)
             request.gf_tenant_id = ctx.get("tenant_id")
@@ -0,0 +1,13 @@
+# control/hashers.py
+"""
+비밀번호 해셔 정책
+- TunedPBKDF2PasswordHasher: 알고리즘 이름은 pbkdf2_sha256 그대로(기존 해시 호환), 반복 횟수만 GF_PBKDF2_ITERATIONS
+  → 횟수를 바꾸면 다음 로그인 때 login_service 가 백그라운드에서 다시 해시한다
+- Argon2 를 쓰려면 settings.GF_PASSWORD_HASHER = "argon2"(argon2-cffi 설치 필요)
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = getattr(settings, "GF_PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations)
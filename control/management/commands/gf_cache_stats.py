@@ -0,0 +1,29 @@
+# control/management/commands/gf_cache_stats.py
+"""
+공유 캐시 네임스페이스별 적중/미스/대기 카운터
+  python manage.py gf_cache_stats            # 표 출력
+  python manage.py gf_cache_stats --reset    # 출력 후 0으로
+- 워커는 GF_CACHE_STATS_INTERVAL 초마다 합산하므로 최근 몇 초는 빠질 수 있다
+"""
+from django.core.management.base import BaseCommand
+
+from control import cache as shared_cache
+
+
+class Command(BaseCommand):
+    help = "공유 캐시 네임스페이스별 적중률"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--alias", default="default", help="CACHES 별칭")
+        parser.add_argument("--reset", action="store_true", help="출력 후 카운터 초기화")
+
+    def handle(self, *args, **opts):
+        rows = shared_cache.stats(opts["alias"])
+        if not rows:
+            self.stdout.write("기록 없음")
+        for ns, s in sorted(rows.items()):
+            total = s["hit"] + s["miss"]
+            ratio = f"{100 * s['hit'] / total:.1f}%" if total else "-"
+            self.stdout.write(f"{ns:<20} hit={s['hit']:<8} miss={s['miss']:<8} wait={s['wait']:<6} 적중률={ratio}")
+        if opts["reset"]:
+            shared_cache.reset_stats(opts["alias"])
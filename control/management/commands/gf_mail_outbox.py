@@ -0,0 +1,34 @@
+# control/management/commands/gf_mail_outbox.py
+"""
+메일 발송 큐(email_outbox) 처리기
+  python manage.py gf_mail_outbox            # 대기 메일을 모두 보내고 종료
+  python manage.py gf_mail_outbox --loop     # 계속 대기하며 발송
+- 배치마다 SMTP 연결 1개를 재사용, 실패는 백오프 후 재시도(GF_MAIL_MAX_ATTEMPTS)
+- 여러 워커를 띄워도 FOR UPDATE SKIP LOCKED로 같은 메일을 잡지 않는다
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from control.services import mail_outbox
+
+
+class Command(BaseCommand):
+    help = "메일 발송 큐 처리"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="종료하지 않고 계속 처리")
+        parser.add_argument("--sleep", type=float, default=5.0, help="--loop 대기 간격(초)")
+        parser.add_argument("--limit", type=int, default=None, help="이번 실행에서 보낼 최대 건수")
+
+    def handle(self, *args, **opts):
+        while True:
+            sent, failed = mail_outbox.drain(opts["limit"])
+            if sent or failed:
+                self.stdout.write(f"발송 {sent}건, 실패 {failed}건")
+            if not opts["loop"]:
+                break
+            if not (sent or failed):
+                connections.close_all()
+                time.sleep(opts["sleep"])
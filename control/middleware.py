@@ -37,6 +37,17 @@ def get_current_tenant() -> Optional[str]:
     """
     return getattr(_tlocal, "tenant_id", None)
 
+def _remember_alias(request: HttpRequest, alias: str, central_alias: str) -> None:
+    """
+    세션에 alias 기록. scope 는 세션 엔진(control.session_store)이 alias 로 계산하므로 쓰지 않는다.
+    - 같은 값이면 세션 엔진이 저장하지 않음
+    - 세션이 없는 익명 요청에 중앙 alias 를 쓰려고 세션 행을 만들지 않는다(비어 있으면 어차피 중앙)
+    """
+    if request.session.session_key is None and alias == central_alias:
+        return
+    request.session["tenant_db_alias"] = alias
+
+
 class TenantMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -48,16 +59,14 @@ class TenantMiddleware:
         # ✅ /control/ 진입은 무조건 중앙으로
         if path.startswith("/control/"):
             _set_threadlocal(central_alias, True, None)
-            request.session["tenant_db_alias"] = central_alias
-            request.session["scope"] = "central"     # ✅ 추가
+            _remember_alias(request, central_alias, central_alias)
             logger.info("MW: force-central path=%s alias=%s", path, central_alias)
             return self.get_response(request)
 
         # 세션이 있으면 사용, 없으면 중앙
         alias = request.session.get("tenant_db_alias") or central_alias
         _set_threadlocal(alias, alias == central_alias, request.session.get("group_id"))
-        request.session["tenant_db_alias"] = alias
-        request.session["scope"] = "central" if alias == central_alias else "tenant"  # ✅ 추가
+        _remember_alias(request, alias, central_alias)
 
         logger.info("MW: resolved alias=%s is_central=%s path=%s", alias, alias == central_alias, path)
         return self.get_response(request)
@@ -98,15 +107,13 @@ class TenantSelectorMiddleware(MiddlewareMixin):
         central = getattr(settings, "CENTRAL_DB_ALIAS", "default")
 
         if request.path.startswith('/control/'):
-            request.session['scope'] = 'central'
-            request.session['tenant_db_alias'] = central
+            _remember_alias(request, central, central)
             logger.info("MW: force-central path=%s alias=%s", request.path, central)
             return None
 
         # 세션에 alias 없으면 중앙을 기본으로(런타임 기본=중앙)
         alias = request.session.get('tenant_db_alias') or central
-        request.session['tenant_db_alias'] = alias
-        request.session['scope'] = 'tenant' if alias != central else 'central'
+        _remember_alias(request, alias, central)
         logger.info("MW: resolved alias=%s is_central=%s path=%s",
                     alias, alias == central, request.path)
         return None
@@ -0,0 +1,54 @@
+from django.db import migrations, models
+
+
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id               bigserial   PRIMARY KEY,
+    kind             text        NOT NULL,
+    to_email         text        NOT NULL,
+    subject          text        NOT NULL,
+    body             text        NOT NULL,
+    status           text        NOT NULL DEFAULT 'queued',
+    attempts         integer     NOT NULL DEFAULT 0,
+    last_error       text        NULL,
+    next_attempt_at  timestamptz NOT NULL DEFAULT now(),
+    locked_at        timestamptz NULL,
+    created_at       timestamptz NOT NULL DEFAULT now(),
+    sent_at          timestamptz NULL
+);
+CREATE INDEX IF NOT EXISTS email_outbox_due_idx ON email_outbox (next_attempt_at) WHERE status = 'queued';
+"""
+
+DROP_SQL = "DROP TABLE IF EXISTS email_outbox;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('control', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.TextField()),
+                ('to_email', models.TextField()),
+                ('subject', models.TextField()),
+                ('body', models.TextField()),
+                ('status', models.TextField(default='queued')),
+                ('attempts', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('next_attempt_at', models.DateTimeField()),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'email_outbox',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
@@ -74,3 +74,22 @@ class GroupDBConfig(models.Model):
     class Meta:
         db_table = "group_db_config"
         managed = False
+
+class EmailOutbox(models.Model):
+    """발송 대기 메일(요청 중에 SMTP를 기다리지 않도록 큐에 넣고 워커가 보냄)"""
+    id = models.BigAutoField(primary_key=True)
+    kind = models.TextField()
+    to_email = models.TextField()
+    subject = models.TextField()
+    body = models.TextField()
+    status = models.TextField(default="queued")      # queued | sending | sent | failed
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    next_attempt_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "email_outbox"
+        managed = False
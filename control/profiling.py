@@ -0,0 +1,287 @@
+# control/profiling.py
+# -*- coding: utf-8 -*-
+"""
+운영 중 느린 요청 프로파일링(필요할 때만)
+- 켜는 방법(둘 다 GF_PROFILE_VIEWS 허용 목록의 뷰만 — url_name 또는 "ns:url_name", "*" 이면 전부)
+  · 중앙 관리자가 ?_profile=1 또는 헤더 X-GF-Profile: 1 → 응답 헤더 X-GF-Profile 에 보고서 id
+  · 표본 추출: GF_PROFILE_SAMPLE_RATE(0~1) 확률로 아무 요청이나
+- 방식(GF_PROFILE_MODE, 요청에서 ?_profile=cprofile 로 바꿀 수 있음)
+  · "sample": 별도 스레드가 GF_PROFILE_INTERVAL 초마다 요청 스레드의 스택을 찍는다(부하 작음)
+  · "cprofile": 결정적 프로파일(cProfile) — 느려지지만 호출 수/누적 시간이 정확
+- SQL: 요청 동안 모든 alias 에 execute_wrapper → 호출한 파이썬 스택 + SQL 지문을 같이 기록
+- 보고서: GF_PROFILE_DIR/<id>/
+  · cpu.collapsed  — flamegraph.pl / speedscope 형식(스택;스택 표본수), sample 모드
+  · sql.collapsed  — 스택;SQL 지문 마이크로초
+  · cprofile.prof  — pstats(cprofile 모드)
+  · meta.json      — 뷰/경로/상태/소요/SQL 지문별 합계
+  · 보관: 최근 GF_PROFILE_KEEP 개, GF_PROFILE_RETENTION_DAYS 일 — 새 보고서를 쓸 때 정리
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+from control.sql_metrics import fingerprint
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = getattr(settings, "GF_PROFILE_DIR", os.path.join(settings.BASE_DIR, "var", "profiles"))
+PROFILE_VIEWS = tuple(getattr(settings, "GF_PROFILE_VIEWS", ()))
+SAMPLE_RATE = float(getattr(settings, "GF_PROFILE_SAMPLE_RATE", 0.0))
+MODE = getattr(settings, "GF_PROFILE_MODE", "sample")
+INTERVAL = float(getattr(settings, "GF_PROFILE_INTERVAL", 0.005))
+KEEP = int(getattr(settings, "GF_PROFILE_KEEP", 50))
+RETENTION_DAYS = float(getattr(settings, "GF_PROFILE_RETENTION_DAYS", 7))
+
+QUERY_FLAG = "_profile"
+HEADER = "X-GF-Profile"
+MODES = ("sample", "cprofile")
+
+_STOP_MODULES = ("django.core.handlers",)      # 이보다 바깥(WSGI/미들웨어 입구) 프레임은 생략
+
+
+def _frame_label(frame) -> str:
+    mod = frame.f_globals.get("__name__", "?")
+    return f"{mod}.{frame.f_code.co_qualname}"
+
+
+def _collapse(frame) -> str:
+    """현재 프레임부터 바깥으로 → 'a;b;c'(바깥이 왼쪽)"""
+    labels: List[str] = []
+    while frame is not None:
+        mod = frame.f_globals.get("__name__", "")
+        if mod.startswith(_STOP_MODULES) and labels:
+            break
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 수집기
+
+class _Sampler(threading.Thread):
+    """대상 스레드의 스택을 INTERVAL 마다 찍는다."""
+
+    def __init__(self, target_ident: int, interval: float):
+        super().__init__(name="gf-profile-sampler", daemon=True)
+        self.target = target_ident
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+class _SqlTrace:
+    def __init__(self, alias: str, sink: List[Dict[str, Any]]):
+        self.alias = alias
+        self.sink = sink
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sink.append({
+                "alias": self.alias,
+                "sql": fingerprint(sql),
+                "us": int((time.perf_counter() - start) * 1_000_000),
+                "stack": _collapse(sys._getframe(1)),
+            })
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 보고서 저장/보관
+
+def _prune() -> None:
+    try:
+        entries = sorted(
+            (e for e in os.scandir(PROFILE_DIR) if e.is_dir()),
+            key=lambda e: e.stat().st_mtime, reverse=True,
+        )
+    except FileNotFoundError:
+        return
+    cutoff = time.time() - RETENTION_DAYS * 86400
+    for i, e in enumerate(entries):
+        if i >= KEEP or e.stat().st_mtime < cutoff:
+            shutil.rmtree(e.path, ignore_errors=True)
+
+
+def _write_report(report_id: str, meta: Dict[str, Any], cpu: Optional[Counter],
+                  prof: Optional[cProfile.Profile], sql: List[Dict[str, Any]]) -> None:
+    path = os.path.join(PROFILE_DIR, report_id)
+    os.makedirs(path, exist_ok=True)
+    if cpu:
+        with open(os.path.join(path, "cpu.collapsed"), "w", encoding="utf-8") as f:
+            for stack, n in cpu.most_common():
+                f.write(f"{stack} {n}\n")
+    if prof is not None:
+        prof.dump_stats(os.path.join(path, "cprofile.prof"))
+    if sql:
+        folded: Counter = Counter()
+        by_fp: Dict[str, Dict[str, Any]] = {}
+        for q in sql:
+            folded[f"{q['stack']};SQL[{q['alias']}] {q['sql'][:300]}"] += q["us"]
+            agg = by_fp.setdefault(q["sql"], {"alias": q["alias"], "sql": q["sql"], "count": 0, "ms": 0.0})
+            agg["count"] += 1
+            agg["ms"] += q["us"] / 1000
+        with open(os.path.join(path, "sql.collapsed"), "w", encoding="utf-8") as f:
+            for stack, us in folded.most_common():
+                f.write(f"{stack.replace(chr(10), ' ')} {us}\n")
+        meta["sql"] = sorted(by_fp.values(), key=lambda a: a["ms"], reverse=True)[:50]
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1, default=str)
+    _prune()
+
+
+def list_reports() -> List[Dict[str, Any]]:
+    out = []
+    try:
+        entries = sorted(os.scandir(PROFILE_DIR), key=lambda e: e.name, reverse=True)
+    except FileNotFoundError:
+        return out
+    for e in entries:
+        try:
+            with open(os.path.join(e.path, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        meta.pop("sql", None)
+        meta["files"] = sorted(os.listdir(e.path))
+        out.append(meta)
+    return out
+
+
+def report_file(report_id: str, name: str) -> Optional[str]:
+    """다운로드용 경로(id/파일명 검증). 없으면 None."""
+    if not report_id.replace("-", "").replace("_", "").isalnum() or os.sep in name or name.startswith("."):
+        return None
+    path = os.path.join(PROFILE_DIR, report_id, name)
+    return path if os.path.isfile(path) else None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 미들웨어
+
+def _allowed(match) -> bool:
+    if "*" in PROFILE_VIEWS:
+        return True
+    return bool(match.url_name) and (match.url_name in PROFILE_VIEWS or match.view_name in PROFILE_VIEWS)
+
+
+def _requested(request) -> Optional[str]:
+    """요청 플래그 값(없으면 None). '1' 이면 기본 방식."""
+    flag = request.GET.get(QUERY_FLAG) or request.headers.get(HEADER)
+    if not flag:
+        return None
+    return flag if flag in MODES else MODE
+
+
+class ProfilingMiddleware:
+    """AuthenticationMiddleware 뒤에 둔다(중앙 관리자 확인)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = self._decide(request)
+        if mode is None:
+            return self.get_response(request)
+        return self._profile(request, mode)
+
+    def _decide(self, request) -> Optional[str]:
+        asked = _requested(request)
+        sampled = SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+        if not asked and not sampled:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if not _allowed(match):
+            return None
+        request._gf_profile_view = match.view_name
+        if asked:
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                from control.services_identity import is_central_staff      # 순환 import 회피
+                if is_central_staff(request):
+                    request._gf_profile_asked = True
+                    return asked
+        return MODE if sampled else None
+
+    def _profile(self, request, mode: str):
+        report_id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        sql: List[Dict[str, Any]] = []
+        sampler = prof = None
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(_SqlTrace(alias, sql)))
+            if mode == "cprofile":
+                prof = cProfile.Profile()
+                prof.enable()
+            else:
+                sampler = _Sampler(threading.get_ident(), INTERVAL)
+                sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                if prof is not None:
+                    prof.disable()
+                cpu = sampler.stop() if sampler is not None else None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        meta = {
+            "id": report_id,
+            "view": getattr(request, "_gf_profile_view", "-"),
+            "path": request.get_full_path(),
+            "method": request.method,
+            "status": response.status_code,
+            "mode": mode,
+            "trigger": "flag" if getattr(request, "_gf_profile_asked", False) else "sample",
+            "user": getattr(getattr(request, "user", None), "username", None),
+            "ms": round(elapsed_ms, 1),
+            "samples": sum(cpu.values()) if cpu else 0,
+            "interval": INTERVAL,
+            "queries": len(sql),
+            "sql_ms": round(sum(q["us"] for q in sql) / 1000, 1),
+            "at": datetime.now().isoformat(timespec="seconds"),
+        }
+        try:
+            _write_report(report_id, meta, cpu, prof, sql)
+        except OSError:
+            logger.exception("PROFILE: failed to write report %s", report_id)
+            return response
+        logger.info("PROFILE: %s view=%s mode=%s ms=%.1f queries=%d",
+                    report_id, meta["view"], mode, elapsed_ms, len(sql))
+        if meta["trigger"] == "flag":
+            response[HEADER] = report_id
+        return response
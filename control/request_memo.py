@@ -0,0 +1,108 @@
+# control/request_memo.py
+# -*- coding: utf-8 -*-
+"""
+요청 범위 메모이제이션(중앙 조회 중복 제거)
+- @memoize: (함수, 인자) 키로 결과를 요청 1회 동안만 기억
+  · 한 요청 안에서 ensure_user_from_request / has_perm / perms_context / 데코레이터가
+    같은 "이메일 → 중앙 사용자" 조회를 반복하던 것을 1회로
+  · 요청 밖(관리 명령, 백그라운드 스레드)에서는 그냥 호출
+  · None 결과는 기억하지 않는다(같은 요청에서 만든 뒤 다시 찾는 흐름: get_or_create)
+  · 기억한 결과는 호출부끼리 공유하므로 고치지 말 것(복사해서 쓸 것)
+- @invalidates: 중앙 쓰기 함수에 붙인다 → 호출 뒤 이 요청의 기억을 비운다
+- RequestMemoMiddleware: 요청마다 저장소를 열고 닫는다.
+  GF_REQUEST_MEMO_HEADER(기본 DEBUG)면 응답 헤더 X-GF-Memo 에 적중/미스 수를 싣는다
+    X-GF-Memo: hits=4 misses=2; get_user_by_email=3/1, list_roles_for_user_in_group=1/1
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+
+HEADER = "X-GF-Memo"
+
+_MISSING = object()
+
+
+class _Memo:
+    __slots__ = ("values", "hits", "misses")
+
+    def __init__(self):
+        self.values: Dict[tuple, Any] = {}
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def summary(self) -> str:
+        names = sorted(set(self.hits) | set(self.misses))
+        detail = ", ".join(f"{n}={self.hits[n]}/{self.misses[n]}" for n in names)
+        head = f"hits={sum(self.hits.values())} misses={sum(self.misses.values())}"
+        return f"{head}; {detail}" if detail else head
+
+
+_current: contextvars.ContextVar[Optional[_Memo]] = contextvars.ContextVar("gf_request_memo", default=None)
+
+
+def memoize(func: Callable) -> Callable:
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        memo = _current.get()
+        if memo is None:
+            return func(*args, **kwargs)
+        try:
+            key = (func, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:                               # 해시 불가 인자는 그대로 호출
+            return func(*args, **kwargs)
+        value = memo.values.get(key, _MISSING)
+        if value is not _MISSING:
+            memo.hits[name] += 1
+            return value
+        memo.misses[name] += 1
+        value = func(*args, **kwargs)
+        if value is not None:
+            memo.values[key] = value
+        return value
+
+    return wrapper
+
+
+def invalidate() -> None:
+    """현재 요청의 기억을 비운다(카운터는 유지)."""
+    memo = _current.get()
+    if memo is not None:
+        memo.values.clear()
+
+
+def invalidates(func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            invalidate()
+
+    return wrapper
+
+
+class RequestMemoMiddleware:
+    """세션/인증 미들웨어보다 앞에 둔다(이후 미들웨어의 중앙 조회도 포함)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = getattr(settings, "GF_REQUEST_MEMO_HEADER", settings.DEBUG)
+
+    def __call__(self, request):
+        memo = _Memo()
+        token = _current.set(memo)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        if self.header:
+            response[HEADER] = memo.summary()
+        return response
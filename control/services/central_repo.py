@@ -7,6 +7,9 @@ from typing import Optional, Dict, Any, List, Tuple
 from django.conf import settings
 from django.db import connections, transaction
 
+from control import request_memo
+from control.services import cross_db
+
 log = logging.getLogger(__name__)
 
 # -------------------------------------------------------------------
@@ -42,6 +45,7 @@ def _dictfetchall(cur) -> List[Dict[str, Any]]:
 # -------------------------------------------------------------------
 # 중앙 --->테넌트 매핑
 # -------------------------------------------------------------------
+@request_memo.memoize
 def get_tenant_by_host(host: str) -> dict | None:
     host = (host or "").split(":")[0].lower().strip()
     with connections[_central_alias()].cursor() as cur:
@@ -54,6 +58,7 @@ def get_tenant_by_host(host: str) -> dict | None:
         row = cur.fetchone()
         return {"id": row[0], "code": row[1], "name": row[2], "db_alias": row[3]} if row else None
 
+@request_memo.memoize
 def list_tenants_for_user(user_id: str) -> list[dict]:
     with connections[_central_alias()].cursor() as cur:
         cur.execute("""
@@ -71,6 +76,16 @@ def list_tenants_for_user(user_id: str) -> list[dict]:
 # Roles / Users
 # -------------------------------------------------------------------
 
+def role_ids_by_code(codes: List[str]) -> Dict[str, str]:
+    """roles.code 목록 → {code: roles.id} (쿼리 1회)"""
+    codes = sorted({c for c in codes if c})
+    if not codes:
+        return {}
+    with connections[_central_alias()].cursor() as cur:
+        cur.execute("SELECT code, id::text FROM roles WHERE code = ANY(%s)", [codes])
+        return dict(cur.fetchall())
+
+@request_memo.memoize
 def get_role_id_by_code(code: str) -> Optional[str]:
     """roles.code → roles.id"""
     if not code:
@@ -80,6 +95,7 @@ def get_role_id_by_code(code: str) -> Optional[str]:
         row = cur.fetchone()
         return row[0] if row else None
 
+@request_memo.memoize
 def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     if not email:
         return None
@@ -93,6 +109,7 @@ def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
             return None
         return {"id": row[0], "email": row[1]}
 
+@request_memo.invalidates
 def create_user(email: str, name: Optional[str] = None) -> str:
     """최소 필드로 사용자 생성. 이미 있으면 기존 id 반환."""
     with transaction.atomic(using=_central_alias()):
@@ -123,10 +140,48 @@ def get_or_create_user_by_email(email: str, name: Optional[str] = None) -> str:
     found = get_user_by_email(email)
     return found["id"] if found else create_user(email, name=name)
 
+@request_memo.invalidates
+def bulk_get_or_create_users(people: List[Tuple[str, Optional[str]]]) -> Dict[str, str]:
+    """
+    [(email, name)] → {소문자 email: users.id}
+    기존 사용자는 조회, 없는 사용자만 INSERT ... ON CONFLICT ... RETURNING (문장 1개)
+    """
+    emails = [(e or "").strip().lower() for e, _ in people]
+    names = [n or "" for _, n in people]
+    if not any(emails):
+        return {}
+    with connections[_central_alias()].cursor() as cur:
+        cur.execute(
+            """
+            WITH src AS (
+                SELECT DISTINCT ON (email) email, name
+                  FROM unnest(%s::text[], %s::text[]) AS t(email, name)
+                 WHERE email <> ''
+                 ORDER BY email
+            ), found AS (
+                SELECT src.email, u.id
+                  FROM src JOIN users u ON lower(u.email) = src.email
+            ), created AS (
+                INSERT INTO users (id, email, name, created_at, updated_at)
+                SELECT gen_random_uuid(), s.email, s.name, now(), now()
+                  FROM src s
+                 WHERE NOT EXISTS (SELECT 1 FROM found f WHERE f.email = s.email)
+                ON CONFLICT (email) DO UPDATE SET updated_at = users.updated_at  -- 동시 생성 시에도 id 반환
+                RETURNING lower(email) AS email, id
+            )
+            SELECT email, id::text FROM found
+            UNION ALL
+            SELECT email, id::text FROM created
+            """,
+            [emails, names],
+        )
+        return dict(cur.fetchall())
+
 # -------------------------------------------------------------------
 # Group membership (user_group_map 표준)
 # -------------------------------------------------------------------
 
+@request_memo.invalidates
 def upsert_user_group_membership(
     user_id: str, group_id: str, role_id: str, status: str = "active"
 ) -> None:
@@ -142,6 +197,60 @@ def upsert_user_group_membership(
                 [user_id, group_id, role_id, status, status],
             )
 
+@request_memo.invalidates
+def bulk_upsert_memberships(
+    triples: List[Tuple[str, str, str]], status: str = "active"
+) -> int:
+    """[(user_id, group_id, role_id)] 일괄 upsert(문장 1개). 같은 (사용자, 그룹)이 여러 번 오면 마지막 값."""
+    latest = {(u, g): r for u, g, r in triples}
+    if not latest:
+        return 0
+    keys = list(latest.keys())
+    with transaction.atomic(using=_central_alias()):
+        with connections[_central_alias()].cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO user_group_map (id, user_id, group_id, role_id, status, created_at, updated_at)
+                SELECT gen_random_uuid(), t.user_id, t.group_id, t.role_id, %s, now(), now()
+                  FROM unnest(%s::uuid[], %s::uuid[], %s::uuid[]) AS t(user_id, group_id, role_id)
+                ON CONFLICT (user_id, group_id)
+                DO UPDATE SET role_id=EXCLUDED.role_id, status=EXCLUDED.status, updated_at=now()
+                """,
+                [status, [k[0] for k in keys], [k[1] for k in keys], list(latest.values())],
+            )
+            return cur.rowcount
+
+@request_memo.invalidates
+def bulk_upsert_user_group_memberships(
+    group_id: str, pairs: List[Tuple[str, str]], status: str = "active"
+) -> int:
+    """[(user_id, role_id)] 를 한 그룹에 일괄 upsert."""
+    return bulk_upsert_memberships([(u, group_id, r) for u, r in pairs], status=status)
+
+@request_memo.memoize
+def group_id_for_db_alias(db_alias: str) -> Optional[str]:
+    """
+    resolve_group_db_alias의 역방향: 테넌트 DB alias → groups.id
+    (group_db_config → TENANT_DB_ALIAS_MAP → '{code}_db' 순)
+    """
+    alias = _central_alias()
+    if _table_exists(alias, "group_db_config"):
+        with connections[alias].cursor() as cur:
+            cur.execute("SELECT group_id::text FROM group_db_config WHERE db_alias=%s LIMIT 1", [db_alias])
+            r = cur.fetchone()
+            if r:
+                return r[0]
+    m: Dict[str, str] = getattr(settings, "TENANT_DB_ALIAS_MAP", {})
+    codes = [code for code, a in m.items() if a == db_alias]
+    if db_alias.endswith("_db"):
+        codes.append(db_alias[:-3])
+    if not codes:
+        return None
+    with connections[alias].cursor() as cur:
+        cur.execute("SELECT id::text, code FROM groups WHERE code = ANY(%s)", [codes])
+        found = dict((code, gid) for gid, code in cur.fetchall())
+    return next((found[c] for c in codes if c in found), None)
+
 # -------------------------------------------------------------------
 # Join Requests
 # -------------------------------------------------------------------
@@ -177,6 +286,7 @@ def get_join_request(req_id: str) -> Optional[Dict[str, Any]]:
             "created_at": row[6],
         }
 
+@request_memo.invalidates
 def mark_join_request_status(req_id: str, status: str, decided_by: Optional[str] = None):
     with connections[_central_alias()].cursor() as cur:
         if _column_exists(_central_alias(), "join_requests", "decided_by"):
@@ -196,6 +306,55 @@ def mark_join_request_status(req_id: str, status: str, decided_by: Optional[str]
                  WHERE id=%s
             """, [status, req_id])
 
+def lock_pending_join_requests(req_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    대기(pending) 요청을 잠그고(FOR UPDATE) 역할 id까지 함께 반환. 트랜잭션 안에서 호출.
+    이미 처리됐거나 다른 관리자가 처리 중인 요청은 빠진다(SKIP LOCKED).
+    """
+    if not req_ids:
+        return []
+    with connections[_central_alias()].cursor() as cur:
+        cur.execute(
+            """
+            SELECT jr.id::text, jr.group_id::text, lower(jr.requested_email),
+                   jr.requested_role_code, r.id::text
+              FROM join_requests jr
+              LEFT JOIN roles r ON r.code = jr.requested_role_code
+             WHERE jr.id = ANY(%s::uuid[]) AND jr.status = 'pending'
+             ORDER BY jr.created_at
+               FOR UPDATE OF jr SKIP LOCKED
+            """,
+            [list(req_ids)],
+        )
+        return [
+            {"id": r[0], "group_id": r[1], "requested_email": r[2], "requested_role_code": r[3], "role_id": r[4]}
+            for r in cur.fetchall()
+        ]
+
+@request_memo.invalidates
+def bulk_mark_join_request_status(req_ids: List[str], status: str, decided_by: Optional[str] = None) -> int:
+    """mark_join_request_status의 일괄판(UPDATE 1회)"""
+    if not req_ids:
+        return 0
+    with connections[_central_alias()].cursor() as cur:
+        if _column_exists(_central_alias(), "join_requests", "decided_by"):
+            cur.execute("""
+                UPDATE join_requests
+                   SET status=%s,
+                       decided_by=%s,
+                       decided_at=now(),
+                       updated_at=now()
+                 WHERE id = ANY(%s::uuid[]) AND status='pending'
+            """, [status, decided_by, list(req_ids)])
+        else:
+            cur.execute("""
+                UPDATE join_requests
+                   SET status=%s,
+                       updated_at=now()
+                 WHERE id = ANY(%s::uuid[]) AND status='pending'
+            """, [status, list(req_ids)])
+        return cur.rowcount
+
 def list_pending_join_requests() -> List[Dict[str, Any]]:
     with connections[_central_alias()].cursor() as cur:
         cur.execute(
@@ -321,6 +480,7 @@ def list_groups_admin() -> List[Tuple[str, str, str, str, Optional[str], Optiona
         result.append((rid, code, name, status, domains, owner_email, db_alias))
     return result
 
+@request_memo.invalidates
 def add_or_update_join_request(user_id: str, group_id: str, requested_email: str, role_code: str) -> None:
     with connections[_central_alias()].cursor() as cur:
         cur.execute("""
@@ -357,6 +517,7 @@ def list_my_join_requests(user_id: str) -> list[dict]:
         "status": r[5], "created_at": r[6],
     } for r in rows]
 
+@request_memo.memoize
 def role_code_for_email(group_id: str, email: str) -> str | None:
     if not email:
         return None
@@ -377,19 +538,8 @@ def role_code_for_email(group_id: str, email: str) -> str | None:
 def roles_by_email_for_group(group_id: str, emails: list[str]) -> dict[str, str]:
     if not emails:
         return {}
-    lowered = [ (e or "").strip().lower() for e in emails if e ]
-    with connections[_central_alias()].cursor() as cur:
-        cur.execute("""
-            SELECT lower(u.email) AS email, r.code
-              FROM user_group_map ugm
-              JOIN users u ON u.id = ugm.user_id
-              JOIN roles r ON r.id = ugm.role_id
-             WHERE ugm.group_id = %s
-               AND ugm.status   = 'active'
-               AND lower(u.email) = ANY(%s)
-        """, [group_id, lowered])
-        rows = cur.fetchall()
-    return { e: code for (e, code) in rows }
+    found = cross_db.central_roles_by_email(group_id, emails)
+    return {e: r["role_code"] for e, r in found.items()}
 
 # def list_active_roles() -> list[dict]:
 #     alias = _central_alias()
@@ -434,6 +584,49 @@ def create_set_password_token(user_id: str, ttl_minutes: int = 60*24) -> str:
         """, [user_id, token, expires])
     return token
 
+def bulk_create_set_password_tokens(user_ids: List[str], ttl_minutes: int = 60*24) -> Dict[str, str]:
+    """{user_id: token} 을 INSERT 1회로 발급"""
+    user_ids = list(dict.fromkeys(u for u in user_ids if u))
+    if not user_ids:
+        return {}
+    tokens = {uid: secrets.token_urlsafe(32) for uid in user_ids}
+    expires = timezone.now() + timedelta(minutes=ttl_minutes)
+    with connections[_central_alias()].cursor() as cur:
+        cur.execute("""
+            INSERT INTO user_tokens (user_id, token, kind, expires_at, created_at)
+            SELECT t.user_id, t.token, 'set_password', %s, now()
+              FROM unnest(%s::uuid[], %s::text[]) AS t(user_id, token)
+        """, [expires, list(tokens.keys()), list(tokens.values())])
+    return tokens
+
+def users_without_password(user_ids: List[str]) -> List[str]:
+    """user_has_password의 일괄판: 비밀번호가 없는 user_id 목록"""
+    alias = _central_alias()
+    if not user_ids:
+        return []
+    if not _column_exists(alias, "users", "password_hash"):
+        return list(user_ids)
+    with connections[alias].cursor() as cur:
+        cur.execute("""
+            SELECT id::text
+              FROM users
+             WHERE id = ANY(%s::uuid[])
+               AND (password_hash IS NULL OR length(trim(password_hash)) = 0)
+        """, [list(user_ids)])
+        return [r[0] for r in cur.fetchall()]
+
+def users_with_pending_token(user_ids: List[str], kind: str) -> set:
+    """아직 쓰지 않았고 만료되지 않은 kind 토큰이 있는 user_id 집합"""
+    if not user_ids:
+        return set()
+    with connections[_central_alias()].cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT user_id::text
+              FROM user_tokens
+             WHERE user_id = ANY(%s::uuid[]) AND kind=%s AND used_at IS NULL AND now() < expires_at
+        """, [list(user_ids), kind])
+        return {r[0] for r in cur.fetchall()}
+
 def get_valid_token(token: str, kind: str) -> dict | None:
     with connections[_central_alias()].cursor() as cur:
         cur.execute("""
@@ -451,6 +644,7 @@ def mark_token_used(token: str) -> None:
     with connections[_central_alias()].cursor() as cur:
         cur.execute("UPDATE user_tokens SET used_at=now() WHERE token=%s", [token])
 
+@request_memo.invalidates
 def set_user_password(user_id: str, password_hash: str) -> None:
     with connections[_central_alias()].cursor() as cur:
         if not _column_exists(_central_alias(), "users", "password_hash"):
@@ -483,6 +677,7 @@ GeoFlow에 접근하실 수 있도록 비밀번호 설정 링크를 보내드립
 """
     send_mail(subject, body, getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@geoflow.local"), [to_email], fail_silently=False)
 
+@request_memo.memoize
 def list_permissions_for_user_in_group(user_id: str, group_id: str) -> list[str]:
     """
     중앙 DB에서 (user_id, group_id) 기준으로 부여된 권한 코드 목록을 반환.
@@ -504,6 +699,7 @@ def list_permissions_for_user_in_group(user_id: str, group_id: str) -> list[str]
         rows = cur.fetchall()
     return [r[0] for r in rows]
 
+@request_memo.memoize
 def list_roles_for_user_in_group(user_id: str, group_id: str) -> list[dict]:
     """
     (user_id, group_id) 기준으로 모든 역할을 반환.
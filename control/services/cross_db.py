@@ -0,0 +1,143 @@
+# control/services/cross_db.py
+"""
+중앙 DB(users/user_group_map) ↔ 테넌트 DB(hr.employee_profile / people_profile) 조인 도우미
+- DB가 달라 SQL JOIN이 안 되므로: 한쪽 행을 먼저 읽고 → 다른 쪽을 `= ANY(%s)` 한 번(큰 그룹은 청크)으로 읽고 → 메모리에서 합친다
+- 행마다 쿼리하던 패턴(N+1)을 대신한다
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import connections
+
+CHUNK_SIZE = getattr(settings, "GF_CROSS_DB_CHUNK_SIZE", 1000)
+
+_IDENT_RE = re.compile(r"^[a-z_][a-z0-9_]*(\.[a-z_][a-z0-9_]*)?$")
+
+
+def _ident(name: str) -> str:
+    if not _IDENT_RE.match(name):
+        raise ValueError(f"잘못된 식별자: {name}")
+    return name
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def fetch_keyed(
+    alias: str,
+    sql: str,
+    keys: Iterable[Any],
+    *,
+    params_before: Sequence[Any] = (),
+    key_of: Callable[[Dict[str, Any]], Any] = lambda r: r["k"],
+    chunk_size: Optional[int] = None,
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    sql 은 `= ANY(%s)` 자리를 하나 가진 SELECT(앞쪽 자리는 params_before).
+    키를 청크로 나눠 실행하고 {key_of(row): row dict} 로 돌려준다(같은 키는 첫 행).
+    """
+    uniq = [k for k in dict.fromkeys(keys) if k not in (None, "")]
+    out: Dict[Any, Dict[str, Any]] = {}
+    if not uniq:
+        return out
+    with connections[alias].cursor() as cur:
+        for part in _chunks(uniq, chunk_size or CHUNK_SIZE):
+            cur.execute(sql, [*params_before, part])
+            cols = [c[0] for c in cur.description]
+            for row in cur.fetchall():
+                d = dict(zip(cols, row))
+                out.setdefault(key_of(d), d)
+    return out
+
+
+def attach(
+    rows: List[Dict[str, Any]],
+    lookup: Dict[Any, Dict[str, Any]],
+    *,
+    key: Callable[[Dict[str, Any]], Any],
+    fields: Sequence[str],
+) -> List[Dict[str, Any]]:
+    """rows 각 행에 lookup[key(row)] 의 fields 를 붙인다(없으면 None). rows 를 그대로 돌려준다."""
+    for r in rows:
+        found = lookup.get(key(r)) or {}
+        for f in fields:
+            r[f] = found.get(f)
+    return rows
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 자주 쓰는 조합
+
+def profiles_by_user_id(alias: str, user_ids: Iterable[str], columns: Sequence[str],
+                        relation: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """테넌트 프로필(기본 TENANT_PROFILE_VIEW)을 user_id 로. {user_id: {...}}"""
+    rel = _ident(relation or getattr(settings, "TENANT_PROFILE_VIEW", "people_profile"))
+    cols = ", ".join(_ident(c) for c in columns)
+    return fetch_keyed(
+        alias,
+        f"SELECT user_id::text AS k, {cols} FROM {rel} WHERE user_id = ANY(%s::uuid[])",
+        [str(u) for u in user_ids if u],
+    )
+
+
+def employees_by_email(alias: str, emails: Iterable[str], columns: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """hr.employee_profile 을 소문자 이메일로. {email: {...}}"""
+    cols = ", ".join(_ident(c) for c in columns)
+    return fetch_keyed(
+        alias,
+        f"SELECT lower(email) AS k, {cols} FROM hr.employee_profile WHERE lower(email) = ANY(%s)",
+        [(e or "").strip().lower() for e in emails],
+    )
+
+
+def central_users_by_email(emails: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """중앙 users 를 소문자 이메일로. {email: {"id", "email"}}"""
+    return fetch_keyed(
+        getattr(settings, "CENTRAL_DB_ALIAS", "default"),
+        "SELECT lower(email) AS k, id::text AS id, email FROM users WHERE lower(email) = ANY(%s)",
+        [(e or "").strip().lower() for e in emails],
+    )
+
+
+def central_roles_by_email(group_id: str, emails: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """그룹 활성 멤버의 역할을 소문자 이메일로. {email: {"user_id", "role_code", "role_name"}}"""
+    return fetch_keyed(
+        getattr(settings, "CENTRAL_DB_ALIAS", "default"),
+        """
+        SELECT lower(u.email) AS k, u.id::text AS user_id, r.code AS role_code, r.name AS role_name
+          FROM user_group_map ugm
+          JOIN users u ON u.id = ugm.user_id
+          JOIN roles r ON r.id = ugm.role_id
+         WHERE ugm.group_id = %s
+           AND ugm.status   = 'active'
+           AND lower(u.email) = ANY(%s)
+        """,
+        [(e or "").strip().lower() for e in emails],
+        params_before=[group_id],
+    )
+
+
+def central_memberships_by_email(group_id: str, emails: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    그룹 멤버십(상태 무관)을 소문자 이메일로.
+    {email: {"user_id", "member_status", "role_code", "role_name"}}
+    """
+    return fetch_keyed(
+        getattr(settings, "CENTRAL_DB_ALIAS", "default"),
+        """
+        SELECT lower(u.email) AS k, u.id::text AS user_id, ugm.status AS member_status,
+               r.code AS role_code, r.name AS role_name
+          FROM user_group_map ugm
+          JOIN users u      ON u.id = ugm.user_id
+          LEFT JOIN roles r ON r.id = ugm.role_id
+         WHERE ugm.group_id = %s
+           AND lower(u.email) = ANY(%s)
+        """,
+        [(e or "").strip().lower() for e in emails],
+        params_before=[group_id],
+    )
@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.core.mail import send_mail
 
-def send_set_password_email(to_email: str, link: str) -> None:
+def set_password_message(link: str) -> tuple[str, str]:
     subject = "[GeoFlow] 비밀번호 설정 안내"
     body = f"""안녕하세요.
 
@@ -12,4 +12,8 @@ GeoFlow에 접근하실 수 있도록 비밀번호 설정 링크를 보내드립
 
 본인이 요청하지 않은 경우 이 메일을 무시하셔도 됩니다.
 """
+    return subject, body
+
+def send_set_password_email(to_email: str, link: str) -> None:
+    subject, body = set_password_message(link)
     send_mail(subject, body, getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@geoflow.local"), [to_email], fail_silently=False)
@@ -0,0 +1,135 @@
+# control/services/login_bootstrap.py
+"""
+로그인 부트스트랩 — 중앙 왕복 1회
+- users(해시/is_staff) + auth_user(세션 로그인용) + 소속 그룹(db_alias) + 그룹별 역할/권한을 CTE 한 문장으로 읽는다
+  (예전: users 조회 → auth_user get_or_create → list_tenants_for_user → list_roles_for_user_in_group)
+- seed_session(): 읽은 결과로 세션 캐시를 채운다 → 첫 화면에서 중앙 재조회 없음
+  · central_user_id                     : services_identity.ensure_user_from_request
+    (관리자 여부는 넣지 않는다 — is_central_staff 가 요청마다 조회해 회수가 바로 반영된다)
+  · roles / perms                        : context_processors.perms_context, acl_tags.has_perm
+  · gf_authz_ctx                         : gf_authz 미들웨어(project_members 스코프를 쓰면 미들웨어가 직접 조회)
+    (gf_perms / gf_roles 는 세션 엔진 control.session_store 가 gf_authz_ctx 에서 계산)
+- 캐시는 세션 수명 동안 유지(역할/권한 변경은 다음 로그인부터 반영, 기존 perms 세션 캐시와 같다)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, router
+
+# 멤버십/역할/권한: 역할·권한은 활성 멤버십만, 그룹 목록은 list_tenants_for_user 와 같이 상태 무관
+_BOOTSTRAP_SQL = """
+WITH u AS (
+    SELECT id, password_hash, COALESCE(is_staff, FALSE) AS is_staff
+      FROM users
+     WHERE lower(email) = lower(%s)
+     LIMIT 1
+), m AS (
+    SELECT ug.group_id, ug.role_id, COALESCE(ug.status, 'active') = 'active' AS active
+      FROM u JOIN user_group_map ug ON ug.user_id = u.id
+), g AS (
+    SELECT g.id, g.code, g.name, c.db_alias
+      FROM groups g
+      LEFT JOIN group_db_config c ON c.group_id = g.id
+     WHERE g.id IN (SELECT group_id FROM m)
+), r AS (
+    SELECT m.group_id,
+           json_agg(DISTINCT jsonb_build_object('id', r.id::text, 'name', r.name, 'code', r.code)) AS roles
+      FROM m JOIN roles r ON r.id = m.role_id
+     WHERE m.active
+     GROUP BY m.group_id
+), p AS (
+    SELECT m.group_id, array_agg(DISTINCT pm.code::text) AS perms
+      FROM m
+      JOIN role_permissions rp ON rp.role_id = m.role_id
+      JOIN permissions pm      ON pm.id = rp.permission_id
+     WHERE m.active
+     GROUP BY m.group_id
+)
+SELECT u.id::text, u.password_hash, u.is_staff,
+       (SELECT COALESCE(json_agg(json_build_object(
+                    'id', g.id::text, 'code', g.code, 'name', g.name, 'db_alias', g.db_alias,
+                    'roles', COALESCE(r.roles, '[]'::json),
+                    'perms', COALESCE(p.perms, ARRAY[]::text[])) ORDER BY g.name), '[]'::json)
+          FROM g
+          LEFT JOIN r ON r.group_id = g.id
+          LEFT JOIN p ON p.group_id = g.id) AS tenants
+       {auth_cols}
+  FROM u
+  {auth_join}
+"""
+
+
+@dataclass
+class LoginBootstrap:
+    user_id: str
+    password_hash: Optional[str]
+    is_staff: bool
+    tenants: List[Dict[str, Any]]               # [{id, code, name, db_alias, roles:[{id,name,code}], perms:[code]}]
+    auth_user: Any = None                       # auth_user 행이 있으면 모델 인스턴스
+
+    def tenant_list(self) -> List[Dict[str, Any]]:
+        """list_tenants_for_user 와 같은 모양(세션 tenant_candidates 용)"""
+        return [{k: t[k] for k in ("id", "code", "name", "db_alias")} for t in self.tenants]
+
+
+def _central_alias() -> str:
+    return getattr(settings, "CENTRAL_DB_ALIAS", "default")
+
+
+def load(email: str) -> Optional[LoginBootstrap]:
+    """email 로 부트스트랩 1회 조회. 사용자가 없으면 None."""
+    alias = _central_alias()
+    conn = connections[alias]
+    User = get_user_model()
+    fields = [f for f in User._meta.concrete_fields]
+    # auth_user 가 같은 중앙 DB에 있을 때만 같은 문장에서 읽는다
+    with_auth = router.db_for_read(User) == alias
+    auth_cols = auth_join = ""
+    params: List[Any] = [email]
+    if with_auth:
+        auth_cols = "".join(f", au.{conn.ops.quote_name(f.column)}" for f in fields)
+        auth_join = f"LEFT JOIN {conn.ops.quote_name(User._meta.db_table)} au ON au.username = %s"
+        params.append(email)
+
+    with conn.cursor() as cur:
+        cur.execute(_BOOTSTRAP_SQL.format(auth_cols=auth_cols, auth_join=auth_join), params)
+        row = cur.fetchone()
+    if not row:
+        return None
+
+    boot = LoginBootstrap(user_id=row[0], password_hash=row[1], is_staff=bool(row[2]), tenants=row[3] or [])
+    if with_auth and row[4] is not None:
+        boot.auth_user = User.from_db(alias, [f.attname for f in fields], row[4:4 + len(fields)])
+    return boot
+
+
+def django_user(boot: LoginBootstrap, email: str):
+    """세션 로그인용 auth_user(통과용 계정). 없을 때만 생성."""
+    u = boot.auth_user
+    if u is None:
+        u, _ = get_user_model().objects.get_or_create(username=email, defaults={"email": email, "is_active": True})
+    u.backend = "django.contrib.auth.backends.ModelBackend"
+    return u
+
+
+def seed_session(request, boot: LoginBootstrap, tenant: Optional[Dict[str, Any]]) -> None:
+    """login() 뒤에 호출. tenant 가 없으면(중앙/여러 테넌트 선택 전) 신원만 채운다."""
+    s = request.session
+    s["central_user_id"] = boot.user_id
+    request._user_uuid = boot.user_id
+    if tenant is None:
+        if not boot.tenants:                               # 소속 없음(중앙): 권한 컨텍스트도 비어 있다
+            s["gf_authz_ctx"] = {"tenant_id": None, "roles": [], "perms": [], "project_ids": []}
+        return
+
+    roles = sorted(tenant.get("roles") or [], key=lambda r: r.get("name") or "")
+    perms = sorted(tenant.get("perms") or [])
+    s["roles"] = roles                                     # [{id,name,code}, ...]
+    s["perms"] = perms
+    if "project_members" not in getattr(settings, "GF_AUTHZ_TABLES", {}):
+        role_codes = sorted({r["code"] for r in roles if r.get("code")})
+        s["gf_authz_ctx"] = {"tenant_id": tenant["id"], "roles": role_codes, "perms": perms, "project_ids": []}
@@ -0,0 +1,221 @@
+# control/services/login_service.py
+"""
+중앙 users 로그인 검증
+- throttle(): IP/이메일 횟수 제한 — 해시 계산 전에 검사(크리덴셜 스터핑 때 워커가 해시에 묶이지 않도록)
+  · GF_LOGIN_THROTTLE_CACHE 캐시에 창별 카운터(cache.add + incr, 원자적) — 동시 요청이 한도를 넘지 못한다
+  · 검증에 성공하면 succeeded() 가 이번 시도분을 돌려준다 → 실패만 남는다
+    (프록시/NAT 뒤에서 같은 IP 로 보이는 정상 사용자들이 한 창을 나눠 쓰지 않도록)
+- verify()/check(): 구형 bcrypt($2a/$2b/$2y) / Django 형식(PBKDF2, Argon2, BCryptSHA256) 모두 검증
+- 해시 정책(settings.PASSWORD_HASHERS 첫 번째)과 다르면 로그인 응답을 늦추지 않도록
+  재해시를 프로세스 내 큐에 넣고 백그라운드 스레드가 처리(같은 해시일 때만 UPDATE)
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import caches
+from django.db import connections
+
+log = logging.getLogger(__name__)
+
+THROTTLE_CACHE = getattr(settings, "GF_LOGIN_THROTTLE_CACHE", "default")
+THROTTLE_IP = getattr(settings, "GF_LOGIN_THROTTLE_IP", (30, 0.5))
+THROTTLE_EMAIL = getattr(settings, "GF_LOGIN_THROTTLE_EMAIL", (5, 1 / 30))
+TRUST_X_FORWARDED_FOR = getattr(settings, "GF_TRUST_X_FORWARDED_FOR", False)
+REHASH_QUEUE_SIZE = getattr(settings, "GF_LOGIN_REHASH_QUEUE_SIZE", 1000)
+
+_LEGACY_BCRYPT = ("$2a$", "$2b$", "$2y$")
+
+
+class Throttled(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class LoginFailed(Exception):
+    """검증 실패. code: not_found / bad_password / server_error (메시지는 화면 표시용)"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _central_alias() -> str:
+    return getattr(settings, "CENTRAL_DB_ALIAS", "default")
+
+
+# -------------------------------------------------------------------
+# 스로틀
+# -------------------------------------------------------------------
+
+def client_ip(request) -> str:
+    if TRUST_X_FORWARDED_FOR:
+        fwd = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        if fwd:
+            # 맨 끝 = 앞단 프록시가 붙인 주소(그 앞은 클라이언트가 보낸 값일 수 있다)
+            return fwd.split(",")[-1].strip()
+    return request.META.get("REMOTE_ADDR", "") or "-"
+
+
+def _hit(cache, key: str, ttl: int) -> int:
+    """창 카운터 +1(add/incr 모두 원자적). 올린 뒤 값."""
+    if cache.add(key, 1, ttl):
+        return 1
+    try:
+        return cache.incr(key)
+    except ValueError:                             # add 와 incr 사이에 만료됨 → 새 창
+        cache.set(key, 1, ttl)
+        return 1
+
+
+def _take(key: str, capacity: float, rate: float, taken: Optional[list] = None) -> float:
+    """
+    1회 사용. 성공이면 0, 한도를 넘었으면 다시 시도할 수 있을 때까지 남은 초.
+    성공하면 올린 창 키를 taken 에 넣는다(succeeded() 가 되돌릴 때 씀).
+    창(capacity / rate 초)별 카운터 + 직전 창 가중 합(슬라이딩 창) — 읽고-쓰기 경합 없이 워커 간 정확
+    """
+    cache = caches[THROTTLE_CACHE]
+    window = capacity / rate
+    now = time.time()
+    n = int(now // window)
+    elapsed = now - n * window
+    current = f"{key}:{n}"
+    used = _hit(cache, current, int(window * 2) + 1)
+    prev = cache.get(f"{key}:{n - 1}") or 0
+    if prev * (1 - elapsed / window) + used <= capacity:
+        if taken is not None:
+            taken.append(current)
+        return 0.0
+    try:
+        cache.decr(current)                        # 거절된 시도는 세지 않는다
+    except ValueError:
+        pass
+    room = capacity - used + 1                     # 이번 시도를 포함해 남는 자리
+    if prev and room > 0:
+        wait = window * (1 - room / prev) - elapsed
+    else:
+        wait = window - elapsed
+    return max(wait, 0.001)
+
+
+def throttle(request, email: str) -> None:
+    """IP → 이메일 순으로 토큰을 쓴다. 부족하면 Throttled."""
+    taken: list = []
+    request._gf_login_throttled = taken
+    wait = _take(f"gf:login:ip:{client_ip(request)}", *THROTTLE_IP, taken=taken)
+    if not wait and email:
+        wait = _take(f"gf:login:email:{email}", *THROTTLE_EMAIL, taken=taken)
+    if wait:
+        raise Throttled(int(wait) + 1)
+
+
+def succeeded(request) -> None:
+    """검증 성공 — throttle() 이 이 요청에서 올린 카운터를 되돌린다(실패한 시도만 센다)."""
+    cache = caches[THROTTLE_CACHE]
+    for key in getattr(request, "_gf_login_throttled", ()):
+        try:
+            cache.decr(key)
+        except ValueError:                         # 그 사이 창이 만료됨
+            pass
+    request._gf_login_throttled = []
+
+
+# -------------------------------------------------------------------
+# 검증
+# -------------------------------------------------------------------
+
+def _check(password: str, pw_hash: str) -> Tuple[bool, bool]:
+    """(일치?, 재해시 필요?)"""
+    if pw_hash.startswith(_LEGACY_BCRYPT):
+        import bcrypt                                # requirements 에 있음(구형 해시 전용)
+        return bcrypt.checkpw(password.encode(), pw_hash.encode()), True
+    stale = []
+    ok = check_password(password, pw_hash, setter=lambda _pw: stale.append(True))
+    return ok, bool(stale)
+
+
+def check(user_id: str, password: str, pw_hash: Optional[str]) -> None:
+    """이미 읽어 온 해시로 검증(login_bootstrap 경로). 실패는 LoginFailed."""
+    pw_hash = str(pw_hash or "").strip()
+    if not pw_hash:
+        raise LoginFailed("bad_password", "비밀번호가 올바르지 않습니다.")
+    try:
+        ok, stale = _check(password, pw_hash)
+    except Exception:
+        log.exception("[login] password check failed user=%s", user_id)
+        raise LoginFailed("server_error", "비밀번호 검증 중 오류가 발생했습니다.")
+    if not ok:
+        raise LoginFailed("bad_password", "비밀번호가 올바르지 않습니다.")
+    if stale:
+        enqueue_rehash(user_id, password, pw_hash)
+
+
+def verify(email: str, password: str) -> str:
+    """중앙 users 에서 검증하고 users.id 를 돌려준다. 실패는 LoginFailed."""
+    with connections[_central_alias()].cursor() as cur:
+        cur.execute(
+            "SELECT id::text, password_hash FROM users WHERE lower(email) = lower(%s) LIMIT 1",
+            [email],
+        )
+        row = cur.fetchone()
+    if not row:
+        raise LoginFailed("not_found", "사용자를 찾을 수 없습니다.")
+    check(row[0], password, row[1])
+    return row[0]
+
+
+# -------------------------------------------------------------------
+# 재해시(백그라운드)
+# -------------------------------------------------------------------
+
+_rehash_q: "queue.Queue[Tuple[str, str, str]]" = queue.Queue(maxsize=REHASH_QUEUE_SIZE)
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def enqueue_rehash(user_id: str, password: str, old_hash: str) -> None:
+    """큐가 가득 차면 버린다(다음 로그인 때 다시 들어온다)."""
+    try:
+        _rehash_q.put_nowait((user_id, password, old_hash))
+    except queue.Full:
+        return
+    _ensure_worker()
+
+
+def rehash(user_id: str, password: str, old_hash: str) -> bool:
+    """정책 해셔로 다시 저장. 그 사이 비밀번호가 바뀌었으면(해시 불일치) 건드리지 않는다."""
+    with connections[_central_alias()].cursor() as cur:
+        cur.execute(
+            "UPDATE users SET password_hash=%s, updated_at=now() WHERE id=%s AND password_hash=%s",
+            [make_password(password), user_id, old_hash],
+        )
+        return cur.rowcount == 1
+
+
+def _run() -> None:
+    while True:
+        user_id, password, old_hash = _rehash_q.get()
+        try:
+            rehash(user_id, password, old_hash)
+        except Exception:
+            log.exception("[login] rehash failed user=%s", user_id)
+        finally:
+            if _rehash_q.empty():
+                connections.close_all()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="gf-login-rehash", daemon=True)
+            _worker.start()
@@ -0,0 +1,189 @@
+# control/services/mail_outbox.py
+"""
+메일 발송 큐(중앙 DB email_outbox)
+- 요청/작업 중에는 enqueue만 한다(SMTP 지연이 요청 시간에 섞이지 않도록)
+- drain(): 대기 메일을 FOR UPDATE SKIP LOCKED로 가져와 SMTP 연결 1개로 연달아 보낸다
+- 실패는 지수 백오프로 재시도, GF_MAIL_MAX_ATTEMPTS 회 넘으면 failed
+- 중복 발송 방지: SMTP 호출 직전에 행을 sent 로 커밋한다(실패하면 되돌림)
+  → 발송 도중 프로세스가 죽어도 다음 drain 이 같은 메일을 다시 보내지 않는다(최대 1회)
+- 실행: enqueue 직후 프로세스 내 스레드(GF_MAIL_INLINE_WORKER) 또는 `manage.py gf_mail_outbox --loop`
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.urls import reverse
+
+from control.services import emailer
+
+log = logging.getLogger(__name__)
+
+BATCH_SIZE = getattr(settings, "GF_MAIL_BATCH_SIZE", 50)
+MAX_ATTEMPTS = getattr(settings, "GF_MAIL_MAX_ATTEMPTS", 5)
+STALE_SECONDS = getattr(settings, "GF_MAIL_STALE_SECONDS", 600)
+INLINE_WORKER = getattr(settings, "GF_MAIL_INLINE_WORKER", True)
+
+_kick_lock = threading.Lock()
+_kick_running = False
+
+
+def _central_alias() -> str:
+    return getattr(settings, "CENTRAL_DB_ALIAS", "default")
+
+
+def _from_email() -> str:
+    return getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@geoflow.local")
+
+
+# -------------------------------------------------------------------
+# 적재
+# -------------------------------------------------------------------
+
+def enqueue_many(kind: str, messages: Iterable[Tuple[str, str, str]]) -> int:
+    """[(to_email, subject, body)] 를 INSERT 1회로 적재. 적재 건수."""
+    rows = [(to, subj, body) for to, subj, body in messages if to]
+    if not rows:
+        return 0
+    with connections[_central_alias()].cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO email_outbox (kind, to_email, subject, body)
+            SELECT %s, t.to_email, t.subject, t.body
+              FROM unnest(%s::text[], %s::text[], %s::text[]) AS t(to_email, subject, body)
+            """,
+            [kind, [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows]],
+        )
+    return len(rows)
+
+
+def set_password_link(token: str, origin: Optional[str] = None) -> str:
+    base = (origin or getattr(settings, "SITE_ORIGIN", "http://127.0.0.1:8000")).rstrip("/")
+    return f"{base}{reverse('account_set_password', args=[token])}"
+
+
+def enqueue_set_password(pairs: Iterable[Tuple[str, str]], origin: Optional[str] = None) -> int:
+    """[(email, token)] → 비밀번호 설정 안내 메일 적재"""
+    msgs = []
+    for email, token in pairs:
+        subject, body = emailer.set_password_message(set_password_link(token, origin))
+        msgs.append((email, subject, body))
+    return enqueue_many("set_password", msgs)
+
+
+# -------------------------------------------------------------------
+# 발송
+# -------------------------------------------------------------------
+
+_CLAIM_SQL = """
+UPDATE email_outbox
+   SET status = 'sending', locked_at = now(), attempts = attempts + 1
+ WHERE id IN (
+        SELECT id FROM email_outbox
+         WHERE (status = 'queued' AND next_attempt_at <= now())
+            OR (status = 'sending' AND locked_at < now() - make_interval(secs => %s))
+         ORDER BY next_attempt_at, id
+         LIMIT %s
+         FOR UPDATE SKIP LOCKED)
+RETURNING id, to_email, subject, body, attempts
+"""
+
+
+def _claim(limit: int) -> List[tuple]:
+    with transaction.atomic(using=_central_alias()), connections[_central_alias()].cursor() as cur:
+        cur.execute(_CLAIM_SQL, [STALE_SECONDS, limit])
+        return cur.fetchall()
+
+
+def _mark_sent(mid: int) -> None:
+    """발송 직전(자동 커밋). 이후 재수거 대상에서 빠진다."""
+    with connections[_central_alias()].cursor() as cur:
+        cur.execute(
+            "UPDATE email_outbox SET status='sent', sent_at=now(), locked_at=NULL, last_error=NULL WHERE id = %s",
+            [mid],
+        )
+
+
+def _finish(failed: List[Tuple[int, int, str]]) -> None:
+    with connections[_central_alias()].cursor() as cur:
+        if failed:
+            cur.execute(
+                """
+                UPDATE email_outbox o
+                   SET status          = CASE WHEN o.attempts >= %s THEN 'failed' ELSE 'queued' END,
+                       sent_at         = NULL,
+                       next_attempt_at = now() + make_interval(secs => 30 * power(2, o.attempts - 1)),
+                       locked_at       = NULL,
+                       last_error      = t.err
+                  FROM unnest(%s::bigint[], %s::text[]) AS t(id, err)
+                 WHERE o.id = t.id
+                """,
+                [MAX_ATTEMPTS, [f[0] for f in failed], [f[2] for f in failed]],
+            )
+
+
+def drain(limit: Optional[int] = None) -> Tuple[int, int]:
+    """대기 메일을 보낸다. (보낸 수, 실패 수)"""
+    total_sent = total_failed = 0
+    conn = None
+    try:
+        while limit is None or total_sent + total_failed < limit:
+            size = BATCH_SIZE if limit is None else min(BATCH_SIZE, limit - total_sent - total_failed)
+            batch = _claim(size)
+            if not batch:
+                break
+            if conn is None:
+                conn = get_connection(fail_silently=False)
+                conn.open()                      # 배치 전체에서 SMTP 연결 재사용
+            sent, failed = [], []
+            for mid, to, subject, body, attempts in batch:
+                try:
+                    _mark_sent(mid)
+                    EmailMessage(subject, body, _from_email(), [to], connection=conn).send()
+                    sent.append(mid)
+                except Exception as e:
+                    log.warning("[outbox] id=%s to=%s attempt=%s failed: %s", mid, to, attempts, e)
+                    failed.append((mid, attempts, str(e)[:1000]))
+                    try:                          # 끊긴 연결은 다시 연다
+                        conn.close()
+                        conn.open()
+                    except Exception:
+                        pass
+            _finish(failed)
+            total_sent += len(sent)
+            total_failed += len(failed)
+    finally:
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+    return total_sent, total_failed
+
+
+def kick() -> None:
+    """적재 직후 프로세스 내 스레드로 발송(별도 워커가 없을 때). 이미 돌고 있으면 그 스레드가 처리."""
+    global _kick_running
+    if not INLINE_WORKER:
+        return
+    with _kick_lock:
+        if _kick_running:
+            return
+        _kick_running = True
+
+    def _run():
+        global _kick_running
+        try:
+            drain()
+        except Exception:
+            log.exception("[outbox] inline drain failed")
+        finally:
+            with _kick_lock:
+                _kick_running = False
+            connections.close_all()
+
+    threading.Thread(target=_run, name="gf-mail-outbox", daemon=True).start()
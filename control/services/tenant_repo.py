@@ -75,6 +75,8 @@ def ensure_employee(
     with transaction.atomic(using=tenant_alias):
         with connections[tenant_alias].cursor() as cur3:
             cur3.execute(sql, params)
+        from geoflow_ops.services import hr_reference  # 관리자 후보 캐시(순환 import 회피)
+        hr_reference.invalidate(tenant_alias)
 
 def upsert_employee_role(tenant_alias: str, email: str, role_code: str) -> None:
     """
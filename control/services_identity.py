@@ -2,6 +2,9 @@
 from typing import Optional
 from django.db import connections
 
+from control import request_memo
+
+@request_memo.memoize
 def _fetch_user_id_by_email(email: str) -> Optional[str]:
     if not email:
         return None
@@ -10,6 +13,7 @@ def _fetch_user_id_by_email(email: str) -> Optional[str]:
         row = cur.fetchone()
         return row[0] if row else None
 
+@request_memo.memoize
 def _fetch_user_id_by_legacy_id(legacy_id: str) -> Optional[str]:
     if not legacy_id:
         return None
@@ -25,11 +29,24 @@ def ensure_user_from_request(request) -> Optional[str]:
       1) auth_user.email이 있으면 email로 매핑/생성
       2) email이 없으면 auth_user.id를 legacy_id로 매핑/생성
       3) email이 없지만 username이 이메일형식이면 그걸로 생성
+    찾은 값은 request._user_uuid 에 두어 같은 요청의 다른 호출(has_perm, 데코레이터)이 다시 찾지 않는다.
     """
     user = getattr(request, "user", None)
     if not user or not user.is_authenticated:
         return None
 
+    # 0) 로그인 부트스트랩이 채운 세션 캐시(login_bootstrap.seed_session)
+    cached = getattr(request, "_user_uuid", None) or request.session.get("central_user_id")
+    if cached:
+        request._user_uuid = cached
+        return cached
+
+    uid = _resolve_user_uuid(user)
+    if uid:
+        request._user_uuid = uid
+    return uid
+
+def _resolve_user_uuid(user) -> Optional[str]:
     # 1) email로 시도
     email = getattr(user, "email", None) or None
     if email:
@@ -65,6 +82,23 @@ def ensure_user_from_request(request) -> Optional[str]:
 
     return None
 
+@request_memo.memoize
+def _fetch_is_staff(email: str) -> bool:
+    with connections["default"].cursor() as cur:
+        cur.execute("SELECT COALESCE(is_staff, FALSE) FROM users WHERE email=%s LIMIT 1", [email])
+        row = cur.fetchone()
+        return bool(row and row[0])
+
+def is_central_staff(request) -> bool:
+    """
+    중앙 users.is_staff — 요청마다 조회(권한 회수가 바로 반영되도록 세션 값은 쓰지 않는다).
+    같은 요청 안의 반복 호출(데코레이터/has_perm/컨텍스트 프로세서)은 요청 메모로 1회.
+    """
+    user = getattr(request, "user", None)
+    if not user or not user.is_authenticated:
+        return False
+    return _fetch_is_staff(user.username)
+
 def to_group_uuid(group_any) -> Optional[str]:
     """
     세션에서 온 값이 정수(레거시 PK)거나 code거나 이미 UUID인 경우 모두
@@ -2,6 +2,7 @@ from typing import Tuple
 from django.db import connections
 from django.conf import settings
 from control.models import GroupDBConfig
+from control.services import cross_db
 
 VIEW  = settings.TENANT_PROFILE_VIEW          # "people_profile"
 TABLE = settings.TENANT_PROFILE_TABLE         # "hr.employee_profile"
@@ -22,30 +23,22 @@ def list_members(central_group_id, tenant_alias):
         """, [central_group_id])
         rows = cur.fetchall()
 
-    result = []
-    with connections[tenant_alias].cursor() as tcur:
-        for user_id, email, role_code, member_status, last_login in rows:
-            tcur.execute(f"""
-                SELECT name, phone, hire_date, title
-                  FROM {VIEW}
-                 WHERE user_id = %s
-                 LIMIT 1
-            """, [user_id])
-            prow = tcur.fetchone()
-            if prow:
-                name, phone, hire_date, title = prow
-            else:
-                name = phone = title = None
-                hire_date = None
-            result.append({
-                "user_id": user_id,
-                "email": email,
-                "role_code": role_code,
-                "member_status": member_status,
-                "last_login": last_login,
-                "name": name, "phone": phone, "hire_date": hire_date, "title": title,
-            })
-    return result
+    # 테넌트 프로필은 user_id = ANY(...) 한 번(큰 그룹은 청크)으로 읽어 메모리에서 합친다
+    profiles = cross_db.profiles_by_user_id(
+        tenant_alias, [r[0] for r in rows], ("name", "phone", "hire_date", "title"), relation=VIEW,
+    )
+    result = [
+        {
+            "user_id": user_id,
+            "email": email,
+            "role_code": role_code,
+            "member_status": member_status,
+            "last_login": last_login,
+        }
+        for user_id, email, role_code, member_status, last_login in rows
+    ]
+    return cross_db.attach(result, profiles, key=lambda r: r["user_id"],
+                           fields=("name", "phone", "hire_date", "title"))
 
 def ensure_profile(tenant_alias, user_id, email, name=None):
     with connections[tenant_alias].cursor() as cur:
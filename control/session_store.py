@@ -0,0 +1,341 @@
+# control/session_store.py
+# -*- coding: utf-8 -*-
+"""
+세션 엔진(SESSION_ENGINE = "control.session_store")
+- 테넌트/권한 세션 값은 버전이 붙은 구조체 하나("gf")에 짧은 필드로 보관, 중복 키 없음
+  · group_id / group_uuid        → gid      · tenant_db_alias / db_key → db
+  · central_user_id              → uid      · central_is_staff          → staff
+  · roles / perms                → roles / perms
+  · gf_authz_ctx                 → authz    · tenant_candidates         → cands
+  · scope, gf_perms, gf_roles 는 저장하지 않고 db / authz 에서 계산(읽기 전용)
+  호출부는 예전 키 그대로 읽고 쓴다(request.session["group_uuid"] 등). 예전 평면 세션은 읽을 때 변환.
+- 적재 때와 같은 값(JSON 직렬화 비교)을 다시 쓰면 modified 를 세우지 않는다 → 미들웨어가 매 요청 같은 별칭을 써도 저장 없음
+  · 객체가 아니라 적재 시점의 직렬화 결과와 비교하므로 lst = s[k]; lst.append(x); s[k] = lst 도 저장된다
+- 캐시는 세션 캐시(SESSION_CACHE_ALIAS)를 모든 앱 프로세스가 같이 볼 때만 쓴다(cache_shared)
+  · 프로세스 로컬(LocMem/Dummy) → 캐시 없이 DB 에서 직접 읽고 쓴다(db 엔진과 같다)
+  · 호스트 로컬(SQLite 파일/파일 캐시) → 앱 서버가 한 대일 때만(GF_MULTI_HOST=False)
+  · 그 밖(Redis/Memcached) → 공유
+  공유되지 않는 캐시를 먼저 읽으면 다른 워커/호스트의 로그아웃·테넌트 전환·권한 변경이 세션 만료까지 안 보인다
+  GF_SESSION_CACHE_SHARED 로 판단을 직접 지정할 수 있다
+- 공유 캐시일 때 저장: cached_db 와 같이 캐시가 먼저, DB 는
+  · 새 세션/키 교체(login, cycle_key)·삭제(logout) → 즉시(write-through)
+  · 그 밖의 수정 → 세션 키별로 합쳐 GF_SESSION_FLUSH_INTERVAL 초마다 백그라운드 스레드가 upsert(write-behind)
+    (GF_SESSION_WRITE_BEHIND=False 면 항상 write-through)
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+
+from control.cache.sqlite import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = getattr(settings, "GF_SESSION_FLUSH_INTERVAL", 5)
+WRITE_BEHIND = getattr(settings, "GF_SESSION_WRITE_BEHIND", True)     # 공유 캐시일 때만 의미가 있다
+CACHE_SHARED = getattr(settings, "GF_SESSION_CACHE_SHARED", None)     # None: 캐시 종류 + GF_MULTI_HOST 로 결정
+MULTI_HOST = getattr(settings, "GF_MULTI_HOST", False)
+
+_PROCESS_LOCAL = (LocMemCache, DummyCache)
+_HOST_LOCAL = (SQLiteCache, FileBasedCache)
+
+STRUCT_KEY = "gf"
+VERSION = 1
+
+# 예전 세션 키 → 구조체 필드
+FIELDS = {
+    "group_id": "gid",
+    "group_uuid": "gid",
+    "tenant_db_alias": "db",
+    "db_key": "db",
+    "central_user_id": "uid",
+    "central_is_staff": "staff",
+    "roles": "roles",
+    "perms": "perms",
+    "gf_authz_ctx": "authz",
+    "tenant_candidates": "cands",
+}
+DERIVED = ("scope", "gf_perms", "gf_roles")
+
+_MISSING = object()
+
+
+def _central_alias() -> str:
+    return getattr(settings, "CENTRAL_DB_ALIAS", "default")
+
+
+def _fingerprint(value: Any) -> Optional[str]:
+    """값 비교용 직렬화. 직렬화할 수 없으면 None(항상 바뀐 것으로 본다)."""
+    try:
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+
+
+def upgrade(data: Dict[str, Any]) -> Dict[str, Any]:
+    """예전 평면 세션(키가 흩어진 형태) → 구조체. 이미 현재 버전이면 그대로."""
+    st = data.get(STRUCT_KEY)
+    legacy = any(k in data for k in FIELDS) or any(k in data for k in DERIVED)
+    if not legacy and (st is None or (isinstance(st, dict) and st.get("v") == VERSION)):
+        return data
+    st = dict(st) if isinstance(st, dict) else {}
+    st["v"] = VERSION
+    # 별칭 키는 새 이름(group_uuid, tenant_db_alias) 쪽을 우선 — 예전 읽기 순서와 같다
+    for key in ("group_id", "db_key", "group_uuid", "tenant_db_alias",
+                "central_user_id", "central_is_staff", "roles", "perms", "gf_authz_ctx", "tenant_candidates"):
+        if key in data:
+            value = data.pop(key)
+            if value is not None or FIELDS[key] not in st:
+                st[FIELDS[key]] = value
+    for key in DERIVED:
+        data.pop(key, None)
+    data[STRUCT_KEY] = st
+    return data
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# write-behind 버퍼
+
+_pending: Dict[str, Tuple[str, datetime]] = {}    # session_key → (session_data, expire_date)
+_pending_lock = threading.Lock()
+_flush_lock = threading.Lock()                    # DB 쓰기 구간: 삭제/즉시 저장이 진행 중인 flush 를 기다린다
+_flusher: Optional[threading.Thread] = None
+
+
+def flush() -> int:
+    """쌓인 세션 쓰기를 한 번에 upsert. 쓴 건수."""
+    from django.contrib.sessions.models import Session
+
+    with _flush_lock:
+        with _pending_lock:
+            if not _pending:
+                return 0
+            batch = list(_pending.items())
+            _pending.clear()
+        objs = [Session(session_key=k, session_data=d, expire_date=e) for k, (d, e) in batch]
+        try:
+            Session.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=["session_key"],
+                update_fields=["session_data", "expire_date"],
+            )
+        except Exception:
+            logger.exception("SESSION: write-behind flush failed (%d sessions)", len(objs))
+            with _pending_lock:                   # 그 사이 들어온 새 값은 덮지 않는다
+                for k, v in batch:
+                    _pending.setdefault(k, v)
+            return 0
+    return len(objs)
+
+
+def _discard(session_key: str) -> None:
+    with _pending_lock:
+        _pending.pop(session_key, None)
+
+
+def _run() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            if flush():
+                connections.close_all()
+        except Exception:
+            logger.exception("SESSION: flusher error")
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _pending_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_run, name="gf-session-flush", daemon=True)
+            _flusher.start()
+
+
+atexit.register(flush)
+
+
+def cache_shared(cache_alias: str) -> bool:
+    """세션 캐시를 모든 앱 프로세스(모든 호스트)가 같이 보는가."""
+    if CACHE_SHARED is not None:
+        return bool(CACHE_SHARED)
+    cache = caches[cache_alias]
+    if isinstance(cache, _PROCESS_LOCAL):
+        return False
+    if isinstance(cache, _HOST_LOCAL):
+        return not MULTI_HOST
+    return True
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 세션 저장소
+
+class SessionStore(CachedDBStore):
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self.use_cache = cache_shared(settings.SESSION_CACHE_ALIAS)
+        self.write_behind = self.use_cache and bool(WRITE_BEHIND)
+        self._backend = CachedDBStore if self.use_cache else DBStore     # 캐시를 안 쓰면 db 엔진 그대로
+        self._loaded: Dict[Tuple[str, str], Optional[str]] = {}     # (구조체|"", 키) → 적재 때 직렬화
+
+    def _remember_loaded(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        loaded = {("", k): _fingerprint(v) for k, v in data.items() if k != STRUCT_KEY}
+        st = data.get(STRUCT_KEY)
+        if isinstance(st, dict):
+            loaded.update({(STRUCT_KEY, k): _fingerprint(v) for k, v in st.items()})
+        self._loaded = loaded
+        return data
+
+    def _unchanged(self, scope: str, key: str, value: Any) -> bool:
+        fp = _fingerprint(value)
+        return fp is not None and self._loaded.get((scope, key)) == fp
+
+    # -- 구조체 매핑 ---------------------------------------------------------
+
+    def _struct(self) -> Dict[str, Any]:
+        st = self._session.get(STRUCT_KEY)
+        return st if isinstance(st, dict) else {"v": VERSION}
+
+    def _lookup(self, key):
+        if key in FIELDS:
+            return self._struct().get(FIELDS[key], _MISSING)
+        if key == "scope":
+            db = self._struct().get("db")
+            if not db:
+                return _MISSING
+            return "central" if db == _central_alias() else "tenant"
+        if key in ("gf_perms", "gf_roles"):
+            authz = self._struct().get("authz")
+            if not isinstance(authz, dict) or key[3:] not in authz:
+                return _MISSING
+            return authz[key[3:]]
+        return self._session.get(key, _MISSING)
+
+    def _put_field(self, name: str, value: Any) -> None:
+        st = dict(self._struct())
+        st[name] = value
+        self._session[STRUCT_KEY] = st
+        if not self._unchanged(STRUCT_KEY, name, value):
+            self.modified = True
+
+    def _drop_field(self, name: str) -> bool:
+        st = self._struct()
+        if name not in st:
+            return False
+        st = dict(st)
+        del st[name]
+        self._session[STRUCT_KEY] = st
+        self.modified = True
+        return True
+
+    def __contains__(self, key):
+        return self._lookup(key) is not _MISSING
+
+    def __getitem__(self, key):
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def __setitem__(self, key, value):
+        if key in FIELDS:
+            self._put_field(FIELDS[key], value)
+        elif key == "scope":
+            return                                          # db 에서 계산
+        elif key in ("gf_perms", "gf_roles"):
+            authz = self._struct().get("authz")
+            authz = dict(authz) if isinstance(authz, dict) else {}
+            authz[key[3:]] = value
+            self._put_field("authz", authz)
+        else:
+            self._session[key] = value
+            if not self._unchanged("", key, value):
+                self.modified = True
+
+    def __delitem__(self, key):
+        if key in FIELDS:
+            if not self._drop_field(FIELDS[key]):
+                raise KeyError(key)
+        elif key in DERIVED:
+            raise KeyError(key)
+        else:
+            super().__delitem__(key)
+
+    def pop(self, key, *args):
+        if key in FIELDS or key in DERIVED:
+            value = self._lookup(key)
+            if value is _MISSING:
+                if args:
+                    return args[0]
+                raise KeyError(key)
+            if key in FIELDS:
+                self._drop_field(FIELDS[key])
+            return value
+        return super().pop(key, *args)
+
+    def setdefault(self, key, value):
+        current = self._lookup(key)
+        if current is not _MISSING:
+            return current
+        self[key] = value
+        return value
+
+    def update(self, dict_):
+        for k, v in dict_.items():
+            self[k] = v
+
+    # -- 적재/저장 ----------------------------------------------------------
+
+    def load(self):
+        if self._session_key is not None:
+            with _pending_lock:
+                hit = _pending.get(self._session_key)
+            if hit is not None:                     # 캐시에서 밀려났지만 아직 DB 에 안 쓴 세션
+                return self._remember_loaded(upgrade(self.decode(hit[0])))
+        return self._remember_loaded(upgrade(self._backend.load(self)))
+
+    def exists(self, session_key):
+        return self._backend.exists(self, session_key)
+
+    def save(self, must_create=False):
+        if must_create or not self.write_behind or self.session_key is None:
+            if self.session_key is not None:
+                with _flush_lock:
+                    _discard(self.session_key)
+                    return self._backend.save(self, must_create=must_create)
+            return self._backend.save(self, must_create=must_create)
+
+        data = self._get_session()
+        self._cache.set(self.cache_key, data, self.get_expiry_age())
+        with _pending_lock:
+            _pending[self.session_key] = (self.encode(data), self.get_expiry_date())
+        _ensure_flusher()
+
+    def delete(self, session_key=None):
+        key = session_key or self.session_key
+        if key is None:
+            return
+        with _flush_lock:                           # flush 중인 같은 키가 삭제 뒤에 되살아나지 않도록
+            _discard(key)
+            self._backend.delete(self, key)
@@ -0,0 +1,238 @@
+# control/sql_metrics.py
+# -*- coding: utf-8 -*-
+"""
+요청별 SQL 계측(중앙/테넌트 alias 별)
+- SqlMetricsMiddleware: 요청 동안 모든 alias 에 connection.execute_wrapper 를 건다
+  · alias 별 쿼리 수, 합계 시간, 중복(같은 SQL + 같은 파라미터), N+1 후보(같은 지문, 파라미터만 다름)
+  · 지문: 공백 정리 + IN (%s, %s, ...) 를 한 자리로 → 같은 모양의 쿼리끼리 묶인다
+- 응답: Server-Timing 헤더(GF_SQL_METRICS_HEADER: "all" | "staff" | "off")
+    Server-Timing: db-default;dur=12.4;desc="8q 1dup", db-cheonan_db;dur=30.1;desc="14q n+1"
+- 로그: control.sql_metrics 로거에 JSON 한 줄(N+1 이 있으면 WARNING)
+- 뷰 이름별 최근 GF_SQL_METRICS_WINDOW 건을 프로세스 안에 보관 → snapshot() (mgmt/sql-metrics/, 중앙 관리자)
+  · 워커마다 따로 모은다(조회한 워커의 값)
+- 다른 스레드(백그라운드 작업)의 쿼리는 포함하지 않는다
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+from typing import Any, Deque, Dict, List, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+ENABLED = getattr(settings, "GF_SQL_METRICS", True)
+HEADER_MODE = getattr(settings, "GF_SQL_METRICS_HEADER", "staff")
+WINDOW = getattr(settings, "GF_SQL_METRICS_WINDOW", 500)
+NPLUS1_THRESHOLD = getattr(settings, "GF_SQL_NPLUS1_THRESHOLD", 5)
+
+# 쿼리 수/DB 시간(ms) 히스토그램 구간(상한)
+QUERY_BUCKETS = (1, 5, 10, 20, 50, 100, 200)
+MS_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_IN_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    return _IN_LIST.sub("(%s...)", _SPACES.sub(" ", sql).strip())
+
+
+def _params_key(params) -> Any:
+    try:
+        key = tuple(params) if isinstance(params, (list, tuple)) else params
+        hash(key)
+        return key
+    except TypeError:
+        return repr(params)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 요청 1건 수집
+
+class AliasStats:
+    __slots__ = ("count", "seconds", "exact")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.exact: Counter = Counter()          # (지문, 파라미터) → 횟수
+
+    @property
+    def duplicates(self) -> int:
+        return sum(n - 1 for n in self.exact.values() if n > 1)
+
+    def nplus1(self) -> List[Tuple[str, int]]:
+        """파라미터만 다른 같은 지문이 NPLUS1_THRESHOLD 번 이상 — [(지문, 서로 다른 파라미터 수)]"""
+        distinct = Counter(fp for fp, _ in self.exact)
+        return [(fp, n) for fp, n in distinct.most_common() if n >= NPLUS1_THRESHOLD]
+
+
+class _Recorder:
+    def __init__(self, alias: str, stats: AliasStats):
+        self.alias = alias
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            st = self.stats
+            st.seconds += time.perf_counter() - start
+            st.count += 1
+            st.exact[(fingerprint(sql), _params_key(params))] += 1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 뷰 이름별 최근 표본
+
+class _ViewWindow:
+    __slots__ = ("samples", "nplus1")
+
+    def __init__(self):
+        self.samples: Deque[Tuple[int, float, int]] = deque(maxlen=WINDOW)   # (쿼리 수, DB ms, 중복 수)
+        self.nplus1: Counter = Counter()
+
+
+_views: Dict[str, _ViewWindow] = defaultdict(_ViewWindow)
+_views_lock = threading.Lock()
+
+
+def _record_view(view: str, queries: int, db_ms: float, dups: int, nplus1: List[str]) -> None:
+    with _views_lock:
+        w = _views[view]
+        w.samples.append((queries, db_ms, dups))
+        w.nplus1.update(nplus1)
+        if len(w.nplus1) > 50:                   # 지문 목록이 끝없이 커지지 않도록 상위만 유지
+            w.nplus1 = Counter(dict(w.nplus1.most_common(20)))
+
+
+def _histogram(values: List[float], bounds: Tuple[float, ...]) -> Dict[str, int]:
+    out = {f"<={b}": 0 for b in bounds}
+    out[f">{bounds[-1]}"] = 0
+    for v in values:
+        for b in bounds:
+            if v <= b:
+                out[f"<={b}"] += 1
+                break
+        else:
+            out[f">{bounds[-1]}"] += 1
+    return out
+
+
+def _pct(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """{뷰 이름: {requests, queries{p50,p95,max,hist}, db_ms{...}, duplicates, nplus1[[지문, 횟수]]}}"""
+    with _views_lock:
+        copied = {v: (list(w.samples), w.nplus1.most_common(5)) for v, w in _views.items()}
+    out = {}
+    for view, (samples, nplus1) in copied.items():
+        qs = sorted(s[0] for s in samples)
+        ms = sorted(s[1] for s in samples)
+        out[view] = {
+            "requests": len(samples),
+            "queries": {"p50": _pct(qs, 0.5), "p95": _pct(qs, 0.95), "max": qs[-1] if qs else 0,
+                        "hist": _histogram(qs, QUERY_BUCKETS)},
+            "db_ms": {"p50": round(_pct(ms, 0.5), 1), "p95": round(_pct(ms, 0.95), 1),
+                      "max": round(ms[-1], 1) if ms else 0, "hist": _histogram(ms, MS_BUCKETS)},
+            "duplicates": sum(s[2] for s in samples),
+            "nplus1": nplus1,
+        }
+    return out
+
+
+def reset() -> None:
+    with _views_lock:
+        _views.clear()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 미들웨어
+
+def _view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "-"
+    return match.view_name or match._func_path
+
+
+def _show_header(request) -> bool:
+    if HEADER_MODE == "all":
+        return True
+    if HEADER_MODE != "staff":
+        return False
+    user = getattr(request, "user", None)
+    if not user or not user.is_authenticated:
+        return False
+    from control.services_identity import is_central_staff      # 순환 import 회피
+    return is_central_staff(request)
+
+
+class SqlMetricsMiddleware:
+    """가능한 앞쪽에 둔다(세션/인증 미들웨어의 쿼리도 포함)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not ENABLED:
+            return self.get_response(request)
+
+        stats: Dict[str, AliasStats] = {}
+        with ExitStack() as stack:
+            for alias in connections:
+                stats[alias] = AliasStats()
+                stack.enter_context(connections[alias].execute_wrapper(_Recorder(alias, stats[alias])))
+            response = self.get_response(request)
+            header = _show_header(request)               # 세션 조회도 계측 안에서
+
+        used = {a: s for a, s in stats.items() if s.count}
+        view = _view_name(request)
+        total_q = sum(s.count for s in used.values())
+        total_ms = sum(s.seconds for s in used.values()) * 1000
+        nplus1 = [fp for s in used.values() for fp, _ in s.nplus1()]
+        _record_view(view, total_q, total_ms, sum(s.duplicates for s in used.values()), nplus1)
+
+        if header and used:
+            response["Server-Timing"] = ", ".join(self._timing(a, s) for a, s in used.items())
+        self._log(request, response, view, used, nplus1)
+        return response
+
+    @staticmethod
+    def _timing(alias: str, s: AliasStats) -> str:
+        desc = f"{s.count}q"
+        if s.duplicates:
+            desc += f" {s.duplicates}dup"
+        if s.nplus1():
+            desc += " n+1"
+        return f'db-{alias};dur={s.seconds * 1000:.1f};desc="{desc}"'
+
+    @staticmethod
+    def _log(request, response, view: str, used: Dict[str, AliasStats], nplus1: List[str]) -> None:
+        level = logging.WARNING if nplus1 else logging.INFO
+        if not used or not logger.isEnabledFor(level):
+            return
+        line = {
+            "view": view,
+            "path": request.path,
+            "status": response.status_code,
+            "db": {
+                a: {"n": s.count, "ms": round(s.seconds * 1000, 1), "dup": s.duplicates,
+                    "n+1": [[fp[:200], n] for fp, n in s.nplus1()[:3]]}
+                for a, s in used.items()
+            },
+        }
+        logger.log(level, "SQL %s", json.dumps(line, ensure_ascii=False))
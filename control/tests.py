@@ -1,3 +1,252 @@
-from django.test import TestCase
+# control/tests.py
+# -*- coding: utf-8 -*-
+"""
+DB 없이 도는 단위 테스트(SimpleTestCase)
+  python manage.py test control
+"""
+import os
+import sqlite3
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from control import session_store
+from control.cache.sqlite import SQLiteCache
+from control.services import login_service
+from control.session_store import SessionStore, cache_shared, upgrade
+
+_LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+_REDIS = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache",
+                      "LOCATION": "redis://127.0.0.1:6379/1"}}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 세션 저장소
+
+def _loaded(data):
+    """DB 를 읽지 않고 data 를 적재한 것처럼 만든 세션."""
+    s = SessionStore("k" * 32)
+    s._session_cache = s._remember_loaded(upgrade(dict(data)))
+    return s
+
+
+class SessionUpgradeTests(SimpleTestCase):
+
+    def test_legacy_keys_move_into_struct(self):
+        data = upgrade({"group_id": "g-old", "group_uuid": "g-new", "db_key": "cheonan_db",
+                        "central_user_id": "u1", "scope": "tenant", "gf_perms": ["x"], "other": 1})
+        self.assertEqual(data, {"other": 1, "gf": {"v": 1, "gid": "g-new", "db": "cheonan_db", "uid": "u1"}})
+
+    def test_alias_none_does_not_clobber(self):
+        data = upgrade({"group_uuid": None, "group_id": "g1"})
+        self.assertEqual(data["gf"]["gid"], "g1")
+
+    def test_current_version_untouched(self):
+        data = {"gf": {"v": 1, "gid": "g1"}, "other": 1}
+        self.assertIs(upgrade(data), data)
+
+    def test_legacy_reads_through_struct(self):
+        s = _loaded({"tenant_db_alias": "cheonan_db", "gf_authz_ctx": {"perms": ["a"], "roles": ["r"]}})
+        self.assertEqual(s["db_key"], "cheonan_db")
+        self.assertEqual(s["scope"], "tenant")
+        self.assertEqual(s["gf_perms"], ["a"])
+        self.assertNotIn("group_id", s)
+
+
+class SessionNoOpWriteTests(SimpleTestCase):
+
+    def test_same_value_is_not_a_write(self):
+        s = _loaded({"gf": {"v": 1, "gid": "g1", "roles": [{"id": 1}]}, "theme": "dark"})
+        s["group_uuid"] = "g1"
+        s["roles"] = [{"id": 1}]
+        s["theme"] = "dark"
+        self.assertFalse(s.modified)
+
+    def test_changed_value_is_a_write(self):
+        s = _loaded({"gf": {"v": 1, "gid": "g1"}})
+        s["group_id"] = "g2"
+        self.assertTrue(s.modified)
+        self.assertEqual(s["group_uuid"], "g2")
+
+    def test_derived_keys_are_read_only(self):
+        s = _loaded({"gf": {"v": 1, "db": "cheonan_db"}})
+        s["scope"] = "central"
+        self.assertFalse(s.modified)
+        self.assertEqual(s["scope"], "tenant")
+
+
+class SessionCacheSharedTests(SimpleTestCase):
+
+    @override_settings(CACHES=_LOCMEM)
+    def test_process_local_cache_reads_db(self):
+        self.assertFalse(cache_shared("default"))
+        s = SessionStore()
+        self.assertIs(s._backend, DBStore)
+        self.assertFalse(s.write_behind)
+
+    @override_settings(CACHES=_REDIS)
+    def test_shared_cache_uses_cached_db(self):
+        self.assertTrue(cache_shared("default"))
+        s = SessionStore()
+        self.assertIs(s._backend, CachedDBStore)
+        self.assertTrue(s.write_behind)
+
+    def test_host_local_cache_depends_on_multi_host(self):
+        with mock.patch.object(session_store, "MULTI_HOST", False):
+            self.assertTrue(cache_shared("default"))        # 기본 = SQLite 파일
+        with mock.patch.object(session_store, "MULTI_HOST", True):
+            self.assertFalse(cache_shared("default"))
+
+    @override_settings(CACHES=_LOCMEM)
+    def test_explicit_override(self):
+        with mock.patch.object(session_store, "CACHE_SHARED", True):
+            self.assertTrue(cache_shared("default"))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SQLite 공유 캐시
+
+class SQLiteCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "cache.sqlite3")
+        self.cache = self._cache()
+
+    def _cache(self, **options):
+        options.setdefault("CULL_EVERY", 0)
+        return SQLiteCache(self.path, {"OPTIONS": options})
+
+    def test_add_only_when_missing_or_expired(self):
+        self.assertTrue(self.cache.add("k", 1))
+        self.assertFalse(self.cache.add("k", 2))
+        self.cache.set("gone", 1, 0)                        # 이미 만료
+        self.assertTrue(self.cache.add("gone", 2))
+        self.assertEqual(self.cache.get_many(["k", "gone"]), {"k": 1, "gone": 2})
+
+    def test_incr_integers_across_instances(self):
+        self.cache.set("n", 1)
+        self.assertEqual(self.cache.incr("n"), 2)
+        self.assertEqual(self._cache().incr("n", 5), 7)     # 다른 워커(같은 파일)
+        self.assertEqual(self.cache.decr("n", 3), 4)
+        self.cache.set("s", "text")
+        with self.assertRaises(ValueError):
+            self.cache.incr("s")
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+
+    def test_expired_entries_are_invisible(self):
+        self.cache.set("old", 1, 0)
+        self.assertIsNone(self.cache.get("old"))
+        self.assertFalse(self.cache.has_key("old"))
+        self.assertFalse(self.cache.touch("old"))
+        with self.assertRaises(ValueError):
+            self.cache.incr("old")
+
+    def test_values_keep_their_type(self):
+        self.cache.set_many({"b": True, "i": 3, "d": {"x": [1, 2]}})
+        self.assertIs(self.cache.get("b"), True)
+        self.assertEqual(self.cache.get("d"), {"x": [1, 2]})
+
+    def test_cull_evicts_oldest_write_first(self):
+        cache = self._cache(MAX_ENTRIES=3)
+        clock = iter(range(1000, 2000))
+        with mock.patch("control.cache.sqlite.time.time", side_effect=lambda: float(next(clock))):
+            cache.set("forever", 1, None)                   # 만료 없음, 가장 오래됨
+            cache.set("long", 1, 10 ** 6)
+            cache.set("mid", 1, 10 ** 6)
+            cache.add("lock", 1, 5)                         # 곧 만료되지만 방금 씀
+            cache.incr("long")                              # 다시 씀
+            cache._cull(cache._conn())
+        (count,) = cache._conn().execute("SELECT count(*) FROM gf_cache").fetchone()
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            {k for (k,) in cache._conn().execute("SELECT key FROM gf_cache")},
+            {cache.make_key(k) for k in ("long", "mid", "lock")},
+        )
+
+    def test_old_cache_file_gets_written_column(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE gf_cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL) WITHOUT ROWID")
+        conn.commit()
+        conn.close()
+        cache = self._cache()
+        cache.set("k", 1)
+        self.assertEqual(cache.get("k"), 1)
+        self._cache().set("k", 2)                           # 열이 이미 있는 파일을 다시 연다
+        self.assertEqual(cache.get("k"), 2)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 로그인 스로틀
+
+@override_settings(CACHES=_LOCMEM)
+class LoginThrottleTests(SimpleTestCase):
+
+    def setUp(self):
+        caches["default"].clear()
+        patches = [
+            mock.patch.object(login_service, "THROTTLE_CACHE", "default"),
+            mock.patch.object(login_service, "THROTTLE_IP", (3, 0.1)),          # 30초에 3회
+            mock.patch.object(login_service, "THROTTLE_EMAIL", (2, 0.1)),       # 20초에 2회
+            mock.patch.object(login_service, "TRUST_X_FORWARDED_FOR", False),
+            mock.patch.object(login_service.time, "time", return_value=6000.0),  # 창 시작 시각
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _request(self, ip="10.0.0.1", **meta):
+        return RequestFactory().post("/login/", REMOTE_ADDR=ip, **meta)
+
+    def _fail(self, email, ip="10.0.0.1"):
+        login_service.throttle(self._request(ip), email)
+
+    def test_email_limit(self):
+        self._fail("a@x.kr")
+        self._fail("a@x.kr")
+        with self.assertRaises(login_service.Throttled) as cm:
+            self._fail("a@x.kr")
+        self.assertEqual(cm.exception.retry_after, 21)
+        self._fail("b@x.kr", ip="10.0.0.2")                 # 다른 계정은 별도 창
+
+    def test_ip_limit(self):
+        for email in ("a@x.kr", "b@x.kr", "c@x.kr"):
+            self._fail(email)
+        with self.assertRaises(login_service.Throttled):
+            self._fail("d@x.kr")
+        self._fail("d@x.kr", ip="10.0.0.2")
+
+    def test_rejected_attempts_do_not_count(self):
+        self._fail("a@x.kr")
+        self._fail("a@x.kr")
+        for _ in range(5):
+            with self.assertRaises(login_service.Throttled):
+                self._fail("a@x.kr")
+        self.assertEqual(caches["default"].get("gf:login:email:a@x.kr:300"), 2)
+        self.assertEqual(caches["default"].get("gf:login:ip:10.0.0.1:200"), 3)   # 한도에서 멈춘다
+
+    def test_success_is_refunded(self):
+        for i in range(10):                                 # 같은 IP(프록시/NAT) 뒤의 정상 로그인
+            r = self._request()
+            login_service.throttle(r, f"user{i}@x.kr")
+            login_service.succeeded(r)
+        self.assertEqual(caches["default"].get("gf:login:ip:10.0.0.1:200"), 0)
+        for email in ("a@x.kr", "b@x.kr", "c@x.kr"):       # 실패는 그대로 센다
+            self._fail(email)
+        with self.assertRaises(login_service.Throttled):
+            self._fail("d@x.kr")
+
+    def test_succeeded_without_throttle_is_noop(self):
+        login_service.succeeded(self._request())
+
+    def test_forwarded_for_uses_proxy_appended_hop(self):
+        r = self._request(ip="10.9.9.9", HTTP_X_FORWARDED_FOR="1.1.1.1, 203.0.113.7")
+        self.assertEqual(login_service.client_ip(r), "10.9.9.9")
+        with mock.patch.object(login_service, "TRUST_X_FORWARDED_FOR", True):
+            self.assertEqual(login_service.client_ip(r), "203.0.113.7")
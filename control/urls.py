@@ -3,12 +3,13 @@ from django.urls import path, include
 from .views_auth import post_login_redirect, set_password_view, logout_view
 from .views_signup import signup_view
 from .views_groups import group_search_view, group_select_view
-from .views_join import my_join_requests_view, join_requests_pending_view, join_request_decide_view
+from .views_join import my_join_requests_view, join_requests_pending_view, join_request_decide_view, join_requests_bulk_view
 # from .views_people import people_list, people_detail, change_role, people_invite
 from .views_groups_admin import group_list_admin, group_create_admin, group_edit_admin
 from .views_onboarding import no_tenant_view
 from .views_users_admin import users_list_admin, users_detail_admin, users_assign_group_admin, set_password_view, users_delete_admin, dashboard
 from .views_categories import categories_page, category_options
+from .views_metrics import sql_metrics_view, profile_list_view, profile_file_view
 
 app_name = "control"
 
@@ -35,6 +36,7 @@ urlpatterns = [
     # path("join-requests/create/<uuid:group_id>/", join_request_create_view, name="join_request_create"),
     path("join-requests/my/", my_join_requests_view, name="my_join_requests"),
     path("mgmt/join-requests/", join_requests_pending_view, name="join_requests_pending"),
+    path("mgmt/join-requests/bulk/", join_requests_bulk_view, name="join_requests_bulk"),
     path("mgmt/join-requests/<uuid:req_id>/<str:action>/",   join_request_decide_view, name="join_request_decide"),
 
     # (그룹관리자) 대기중 요청 승인/거절
@@ -42,6 +44,9 @@ urlpatterns = [
     path("mgmt/users/<uuid:user_id>/", users_detail_admin, name="users_detail_admin"),
     path("mgmt/users/<uuid:user_id>/assign/", users_assign_group_admin, name="users_assign_group_admin"),
     path("mgmt/users/<uuid:user_id>/delete/", users_delete_admin, name="users_delete_admin"),
+    path("mgmt/sql-metrics/", sql_metrics_view, name="sql_metrics"),
+    path("mgmt/profiles/", profile_list_view, name="profile_list"),
+    path("mgmt/profiles/<str:report_id>/<str:name>", profile_file_view, name="profile_file"),
 
     # group
     path("central/groups/", group_list_admin, name="group_list_admin"),
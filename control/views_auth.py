@@ -1,13 +1,12 @@
 from django.conf import settings
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
-from django.contrib.auth import get_user_model, login, logout
+from django.contrib.auth import login, logout
 from django.shortcuts import render, redirect
 from django.http import HttpResponseForbidden
-from django.db import connections
-from django.contrib.auth.hashers import check_password, make_password, identify_hasher
+from django.contrib.auth.hashers import make_password
 from django.urls import reverse
-from control.services import central_repo as C
+from control.services import central_repo as C, login_bootstrap, login_service
 from django.views.decorators.csrf import csrf_protect, ensure_csrf_cookie
 from django.middleware.csrf import rotate_token
 
@@ -37,94 +36,53 @@ def login_view(request):
         if not email or not pw:
             return render(request, "control/login.html", {"error": "이메일/비밀번호를 입력하세요."})
 
-        central_alias = getattr(settings, "CENTRAL_DB_ALIAS", "default")
-
-        # 1) 중앙 users에서 사용자/해시 조회
-        with connections[central_alias].cursor() as cur:
-            cur.execute("""
-                SELECT id::text, password_hash
-                  FROM users
-                 WHERE lower(email) = lower(%s)
-                 LIMIT 1
-            """, [email])
-            row = cur.fetchone()
-
-        if not row:
-            return render(request, "control/login.html", {"error": "사용자를 찾을 수 없습니다."})
-
-        user_uuid, pw_hash = row
-        if not pw_hash or not str(pw_hash).strip():
-            return render(request, "control/login.html", {"error": "비밀번호가 올바르지 않습니다."})
-
-        # 2) 비밀번호 검증(+구형 bcrypt → pbkdf2로 마이그레이션)
-        migrate_needed = False
+        # 1) 스로틀(해시 계산 전)
         try:
-            if str(pw_hash).startswith(("$2a$", "$2b$", "$2y$")):
-                try:
-                    import bcrypt
-                except Exception:
-                    return render(request, "control/login.html", {"error": "서버 설정 오류(bcrypt 미설치). 관리자에게 문의하세요."})
-                if not bcrypt.checkpw(pw.encode(), pw_hash.encode()):
-                    return render(request, "control/login.html", {"error": "비밀번호가 올바르지 않습니다."})
-                migrate_needed = True
-            else:
-                if not check_password(pw, pw_hash):
-                    return render(request, "control/login.html", {"error": "비밀번호가 올바르지 않습니다."})
-                try:
-                    algo = identify_hasher(pw_hash).algorithm  # 예: 'pbkdf2_sha256'
-                    if algo != "pbkdf2_sha256":
-                        migrate_needed = True
-                except Exception:
-                    pass
+            login_service.throttle(request, email)
+        except login_service.Throttled as e:
+            resp = render(request, "control/login.html",
+                          {"error": f"로그인 시도가 너무 많습니다. {e.retry_after}초 후 다시 시도하세요."}, status=429)
+            resp["Retry-After"] = str(e.retry_after)
+            return resp
+
+        # 2) 사용자/해시/auth_user/소속 그룹/그룹별 역할·권한을 한 번에(중앙 왕복 1회)
+        #    → 비밀번호 검증(정책과 다른 해시는 백그라운드 재해시)
+        try:
+            boot = login_bootstrap.load(email)
         except Exception:
-            return render(request, "control/login.html", {"error": "비밀번호 검증 중 오류가 발생했습니다."})
-
-        if migrate_needed:
-            new_hash = make_password(pw)
-            with connections[central_alias].cursor() as cur:
-                cur.execute(
-                    "UPDATE users SET password_hash=%s, updated_at=now() WHERE id=%s",
-                    [new_hash, user_uuid],
-                )
+            logger.exception("AUTH bootstrap failed: %s", email)
+            return render(request, "control/login.html", {"error": "로그인 처리 중 오류가 발생했습니다."})
+        if boot is None:
+            return render(request, "control/login.html", {"error": "사용자를 찾을 수 없습니다."})
+        try:
+            login_service.check(boot.user_id, pw, boot.password_hash)
+        except login_service.LoginFailed as e:
+            return render(request, "control/login.html", {"error": str(e)})
+        login_service.succeeded(request)           # 스로틀은 실패만 센다
 
         # 3) Django 세션 로그인(auth_user는 통과용 계정)
-        User = get_user_model()
-        u, _ = User.objects.get_or_create(username=email, defaults={"email": email, "is_active": True})
-        u.backend = "django.contrib.auth.backends.ModelBackend"
-        login(request, u)
+        login(request, login_bootstrap.django_user(boot, email))
         rotate_token(request)
-        # return redirect("after_login")
 
-        # 4) 테넌트 자동 선택: 중앙 레포에서 사용자 소속 테넌트 조회
-        # tenants = C.list_tenants_for_user(user_uuid)  # [{'id','code','name','db_alias',...}, ...]
+        # 4) 테넌트 자동 선택(부트스트랩 결과) + 첫 화면용 세션 캐시
         central_alias = getattr(settings, "CENTRAL_DB_ALIAS", "default")
-
-        try:
-            tenants = C.list_tenants_for_user(user_uuid)  # [{'id','code','name','db_alias',...}, ...]
-        except Exception as ex:
-            logger.exception("AUTH tenants lookup failed: %s", ex)
-            tenants = []
+        tenants = boot.tenant_list()  # [{'id','code','name','db_alias'}, ...]
 
         if tenants:
             if len(tenants) == 1:
                 t = tenants[0]
+                # group_id/db_key 는 세션 엔진에서 같은 필드(하위호환 키로 읽어도 같은 값)
                 request.session["group_uuid"]      = t["id"]
-                request.session["group_id"]        = t["id"]        # 하위호환
                 request.session["tenant_db_alias"] = t["db_alias"]
-                request.session["db_key"]          = t["db_alias"]  # 하위호환
-
-                # 여러 역할 조회 → 대표 등급 선정 → 세션에 저장
-                try:
-                    roles = C.list_roles_for_user_in_group(user_uuid, t["id"])
-                except Exception:
-                    roles = []
 
-                request.session["roles"] = roles     # [{id,name,code}, ...]만 저장
+                # 역할([{id,name,code}])/권한 → 세션(perms_context, acl_tags, gf_authz 가 재조회하지 않음)
+                login_bootstrap.seed_session(request, boot, boot.tenants[0])
 
                 return redirect("after_login")
             else:
                 # 여러 테넌트면 선택 화면으로
                 request.session["tenant_candidates"] = tenants
+                login_bootstrap.seed_session(request, boot, None)
                 logger.info(
                     "AUTH: user=%s -> MULTI TENANT candidates=%s",
                     request.user.email, [x["db_alias"] for x in tenants]
@@ -133,6 +91,7 @@ def login_view(request):
         else:
             # 소속 없음 → 중앙
             request.session["tenant_db_alias"] = central_alias
+            login_bootstrap.seed_session(request, boot, None)
             logger.info("AUTH: user=%s -> CENTRAL (no tenant membership)", request.user.email)
             return redirect("after_login")
 
@@ -3,29 +3,35 @@ from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
 from django.contrib.auth import get_user_model, login
 from django.db import connections
-import bcrypt
+
+from control.services import login_service
 
 @csrf_exempt
 def api_login(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST only"}, status=405)
 
-    email = request.POST.get("email")
+    email = (request.POST.get("email") or "").strip().lower()
     password = request.POST.get("password")
     if not email or not password:
         return JsonResponse({"error": "missing email/password"}, status=400)
 
-    with connections["default"].cursor() as cur:
-        # users에서 해시 조회
-        cur.execute("SELECT id::text, password_hash FROM users WHERE email=%s LIMIT 1", [email])
-        row = cur.fetchone()
-        if not row:
-            return JsonResponse({"error": "user not found"}, status=401)
-        user_uuid, pw_hash = row
-
-        if not bcrypt.checkpw(password.encode(), pw_hash.encode()):
-            return JsonResponse({"error": "bad credentials"}, status=401)
+    # 스로틀(해시 계산 전) + 검증(구형 bcrypt / PBKDF2 / Argon2 모두) — login_view 와 같은 서비스
+    try:
+        login_service.throttle(request, email)
+    except login_service.Throttled as e:
+        resp = JsonResponse({"error": "too many attempts", "retry_after": e.retry_after}, status=429)
+        resp["Retry-After"] = str(e.retry_after)
+        return resp
+    try:
+        user_uuid = login_service.verify(email, password)
+    except login_service.LoginFailed as e:
+        if e.code == "server_error":
+            return JsonResponse({"error": "password check failed"}, status=500)
+        return JsonResponse({"error": "user not found" if e.code == "not_found" else "bad credentials"}, status=401)
+    login_service.succeeded(request)               # 스로틀은 실패만 센다
 
+    with connections["default"].cursor() as cur:
         # 멤버십(아무거나 첫 그룹) + alias
         cur.execute("""
             SELECT ugm.group_id::text, gcfg.db_alias
@@ -48,9 +54,7 @@ def api_login(request):
     user_obj.backend = "django.contrib.auth.backends.ModelBackend"
     login(request, user_obj)
 
-    request.session["group_uuid"]      = group_uuid
-    request.session["tenant_db_alias"] = db_alias
-    request.session["group_id"] = group_uuid    # 호환
-    request.session["db_key"]   = db_alias      # 호환
+    request.session["group_uuid"]      = group_uuid    # group_id 로 읽어도 같은 값(세션 엔진)
+    request.session["tenant_db_alias"] = db_alias      # db_key 로 읽어도 같은 값
 
     return JsonResponse({"ok": True, "group_id": group_uuid, "db_alias": db_alias})
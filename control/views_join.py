@@ -1,5 +1,5 @@
 # control/views_join.py
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from django.conf import settings
 from django.shortcuts import render, redirect
@@ -8,9 +8,8 @@ from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_POST, require_http_methods
 from django.db import connections, transaction
 from django.contrib.auth.decorators import login_required
-from django.urls import reverse
 
-from control.services import emailer as Mail
+from control.services import mail_outbox as Outbox
 from control.decorators import require_central_admin  # 중앙 전용 보호 데코레이터
 from control.services import central_repo as C
 from control.services import tenant_repo as T
@@ -28,69 +27,102 @@ def join_requests_pending_view(request):
     return render(request, "control/join_requests_pending.html", {"items": items})
 
 
-# 중앙: 승인/거절 처리
-@require_http_methods(["POST"])
-@require_central_admin
-def join_request_decide_view(request, req_id, action):
+# 한 번에 처리할 수 있는 최대 요청 수
+BULK_MAX = getattr(settings, "GF_JOIN_BULK_MAX", 200)
+
+
+def _decide(req_ids, action, decided_by, origin):
     """
-    중앙 관리자가 권한요청을 승인/거절한다.
+    권한요청 N건을 중앙 트랜잭션 1개에서 집합 단위 SQL로 처리한다.
     - approve:
-        1) 요청 로드
-        2) users get_or_create
-        3) user_group_map upsert
-        4) 요청 상태 approved (decided_by 기록)
-        5) 비밀번호 없으면 set-password 메일 발송
+        1) 대기 요청 잠금 + 역할 id 조회(쿼리 1회)
+        2) users 조회/생성(INSERT ... ON CONFLICT ... RETURNING 1회)
+        3) user_group_map 일괄 upsert
+        4) 요청 상태 approved 일괄 기록(decided_by)
+        5) 비밀번호 없는 사용자만 토큰 일괄 발급 + set-password 메일을 outbox에 적재
     - reject:
-        요청 상태 rejected (decided_by 기록)
+        요청 상태 rejected 일괄 기록
+    반환: (처리 건수, 역할 코드가 유효하지 않아 건너뛴 요청 목록)
     """
-    # 1) 요청 로드
-    jr = C.get_join_request(req_id)  # dict: {id, user_id, group_id, requested_email, requested_role_code, ...}
-    if not jr:
-        messages.error(request, "요청을 찾을 수 없습니다.")
-        return redirect("join_requests_pending")
+    with transaction.atomic(using=_central_alias()):
+        pending = C.lock_pending_join_requests(req_ids)
+        if action == "reject":
+            return C.bulk_mark_join_request_status([j["id"] for j in pending], "rejected", decided_by=decided_by), []
+
+        invalid = [j for j in pending if not j["role_id"] or not j["requested_email"]]
+        ok = [j for j in pending if j["role_id"] and j["requested_email"]]
+        if not ok:
+            return 0, invalid
+
+        user_ids = C.bulk_get_or_create_users([(j["requested_email"], None) for j in ok])
+        C.bulk_upsert_memberships([(user_ids[j["requested_email"]], j["group_id"], j["role_id"]) for j in ok])
+
+        n = C.bulk_mark_join_request_status([j["id"] for j in ok], "approved", decided_by=decided_by)
+
+        tokens = C.bulk_create_set_password_tokens(C.users_without_password(list(user_ids.values())))  # 24시간 유효
+        if tokens:
+            email_of = {uid: e for e, uid in user_ids.items()}
+            Outbox.enqueue_set_password(((email_of[uid], tok) for uid, tok in tokens.items()), origin=origin)
+            transaction.on_commit(Outbox.kick, using=_central_alias())
+    return n, invalid
 
-    requested_email = (jr.get("requested_email") or "").strip().lower()
-    group_id = jr.get("group_id")
-    role_code = (jr.get("requested_role_code") or "").strip()
 
+def _decided_by(request):
     # 중앙 관리자 id (결정자 기록)
     admin_email = (getattr(request.user, "email", None) or getattr(request.user, "username", "")).strip().lower()
-    decided_by = C.get_or_create_user_by_email(admin_email) if admin_email else None
+    return C.get_or_create_user_by_email(admin_email) if admin_email else None
 
-    if action == "reject":
-        # 요청 상태만 'rejected'로
-        C.mark_join_request_status(req_id, "rejected", decided_by=decided_by)
-        messages.success(request, "요청을 거절했습니다.")
-        return redirect("join_requests_pending")
 
-    if action == "approve":
-        # 2) 대상 사용자/역할 준비
-        user_id = C.get_or_create_user_by_email(requested_email)
-        role_id = C.get_role_id_by_code(role_code)
-        if not role_id:
-            messages.error(request, f"역할 코드가 유효하지 않습니다: {role_code}")
-            return redirect("join_requests_pending")
+def _origin(request):
+    return request.build_absolute_uri("/").rstrip("/")
 
-        # 3) 멤버십 upsert (중앙 권한 부여)
-        C.upsert_user_group_membership(user_id=user_id, group_id=group_id, role_id=role_id)
 
-        # (선택) 테넌트 role_code 동기화가 필요하다면 여기서 tenant_repo를 호출하세요.
-        # 예: T.sync_employee_role_by_email(group_id, requested_email, role_code)
+# 중앙: 승인/거절 처리
+@require_http_methods(["POST"])
+@require_central_admin
+def join_request_decide_view(request, req_id, action):
+    """중앙 관리자가 권한요청 1건을 승인/거절한다(_decide 참고)."""
+    if action not in ("approve", "reject"):
+        messages.error(request, "올바르지 않은 요청입니다.")
+        return redirect("join_requests_pending")
 
-        # 4) 요청 상태 'approved'
-        C.mark_join_request_status(req_id, "approved", decided_by=decided_by)
+    n, invalid = _decide([str(req_id)], action, _decided_by(request), _origin(request))
+    if invalid:
+        messages.error(request, f"역할 코드가 유효하지 않습니다: {invalid[0]['requested_role_code']}")
+    elif not n:
+        messages.error(request, "요청을 찾을 수 없습니다.")
+    else:
+        messages.success(request, "승인 완료" if action == "approve" else "요청을 거절했습니다.")
+    return redirect("join_requests_pending")
 
-        # 5) 비밀번호 없으면 set-password 메일 발송
-        if not C.user_has_password(user_id):
-            token = C.create_set_password_token(user_id)  # 24시간 유효
-            link = request.build_absolute_uri(reverse("account_set_password", args=[token]))
-            Mail.send_set_password_email(requested_email, link)
 
-        messages.success(request, "승인 완료")
+# 중앙: 선택한 요청 일괄 승인/거절
+@require_http_methods(["POST"])
+@require_central_admin
+def join_requests_bulk_view(request):
+    action = request.POST.get("action")
+    req_ids = list(dict.fromkeys(request.POST.getlist("ids")))
+    if action not in ("approve", "reject") or not req_ids:
+        messages.error(request, "처리할 요청을 선택하세요.")
+        return redirect("join_requests_pending")
+    if len(req_ids) > BULK_MAX:
+        messages.error(request, f"한 번에 최대 {BULK_MAX}건까지 처리할 수 있습니다.")
+        return redirect("join_requests_pending")
+    try:
+        req_ids = [str(UUID(x)) for x in req_ids]
+    except ValueError:
+        messages.error(request, "올바르지 않은 요청입니다.")
         return redirect("join_requests_pending")
 
-    # 잘못된 action
-    messages.error(request, "올바르지 않은 요청입니다.")
+    n, invalid = _decide(req_ids, action, _decided_by(request), _origin(request))
+    label = "승인" if action == "approve" else "거절"
+    messages.success(request, f"{n}건 {label}했습니다.")
+    skipped = len(req_ids) - n - len(invalid)
+    if invalid:
+        codes = ", ".join(sorted({j["requested_role_code"] or "-" for j in invalid}))
+        messages.error(request, f"역할 코드가 유효하지 않아 {len(invalid)}건을 건너뛰었습니다: {codes}")
+    if skipped:
+        messages.warning(request, f"이미 처리된 요청 {skipped}건은 제외했습니다.")
     return redirect("join_requests_pending")
 
 
@@ -0,0 +1,38 @@
+# control/views_metrics.py
+from django.http import FileResponse, Http404, JsonResponse
+from django.views.decorators.http import require_GET, require_http_methods
+
+from control import profiling, sql_metrics
+from control.decorators import require_central_admin
+
+
+@require_central_admin
+@require_http_methods(["GET", "POST"])
+def sql_metrics_view(request):
+    """
+    뷰 이름별 최근 SQL 비용(이 워커의 값). 쿼리 수 p95 가 큰 순.
+    POST → 초기화
+    """
+    if request.method == "POST":
+        sql_metrics.reset()
+        return JsonResponse({"ok": True})
+    views = sql_metrics.snapshot()
+    ordered = sorted(views.items(), key=lambda kv: (kv[1]["queries"]["p95"], kv[1]["db_ms"]["p95"]), reverse=True)
+    return JsonResponse({"views": [{"view": v, **s} for v, s in ordered]}, json_dumps_params={"ensure_ascii": False})
+
+
+@require_central_admin
+@require_GET
+def profile_list_view(request):
+    """저장된 프로파일 보고서(이 호스트의 GF_PROFILE_DIR). 최신순"""
+    return JsonResponse({"reports": profiling.list_reports()}, json_dumps_params={"ensure_ascii": False})
+
+
+@require_central_admin
+@require_GET
+def profile_file_view(request, report_id, name):
+    """보고서 파일 다운로드(cpu.collapsed / sql.collapsed / cprofile.prof / meta.json)"""
+    path = profiling.report_file(report_id, name)
+    if not path:
+        raise Http404
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=f"{report_id}-{name}")
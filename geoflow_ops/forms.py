@@ -1,7 +1,10 @@
 from __future__ import annotations
 from django import forms
+from django.core.exceptions import ValidationError
+from django.db.models import CharField, F, Func, Value
 from .models import Contract, Partner, Project, MyOrgUnit
 from control.middleware import current_db_alias
+from .services import partner_search
 
 STATUS_CHOICES = [
     ("planned", "계약전"),
@@ -38,6 +41,91 @@ class ISODateInput(forms.DateInput):
         # self.attrs.setdefault("autocomplete", "off")
 
 
+class RemoteSelect(forms.Select):
+    """
+    선택된 값만 <option>으로 렌더하고, 나머지는 data-remote-url(검색 API)에서 불러오는 Select.
+    - 라벨은 RemoteModelChoiceField가 pk로 한 번 조회해 넣어준다(label_lookup)
+    - 검색 UI는 static/geoflow_ops/js/remote-select.js (Choices.js)
+    """
+
+    def __init__(self, url_name, attrs=None, min_chars=0):
+        attrs = {"class": "form-select", **(attrs or {})}
+        super().__init__(attrs)
+        self.url_name = url_name
+        self.min_chars = min_chars
+        self.label_lookup = None
+        self.empty_label = "-"
+
+    def get_context(self, name, value, attrs):
+        from django.urls import reverse
+        ctx = super().get_context(name, value, attrs)
+        ctx["widget"]["attrs"]["data-remote-url"] = reverse(self.url_name)
+        ctx["widget"]["attrs"]["data-remote-min-chars"] = self.min_chars
+        return ctx
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [v for v in value if v not in ("", None)]
+        labels = self.label_lookup(selected) if (selected and self.label_lookup) else {}
+        options = [("", self.empty_label)] + [(v, labels.get(str(v), str(v))) for v in selected]
+        return [
+            (None, [self.create_option(name, v, label, v in selected, i, attrs=attrs)], i)
+            for i, (v, label) in enumerate(options)
+        ]
+
+
+class RemoteModelChoiceField(forms.ModelChoiceField):
+    """
+    원격 검색용 FK 필드. 전체 queryset을 <option>으로 펼치지 않는다.
+    - 검증: 현재 테넌트 alias(또는 using)에서 pk 1건 조회
+    - 렌더: 선택된 pk의 라벨만 조회
+    """
+
+    def __init__(self, queryset, url_name, using=None, label_func=None, min_chars=0, **kwargs):
+        self.using = using
+        self.label_func = label_func
+        kwargs.setdefault("widget", RemoteSelect(url_name, min_chars=min_chars))
+        super().__init__(queryset, **kwargs)
+
+    def _set_queryset(self, queryset):
+        super()._set_queryset(queryset)
+        self.widget.label_lookup = self.labels_for
+
+    queryset = property(forms.ModelChoiceField._get_queryset, _set_queryset)
+
+    def _db(self):
+        return self.using or current_db_alias()
+
+    def label_from_instance(self, obj):
+        return self.label_func(obj) if self.label_func else str(obj)
+
+    def labels_for(self, values):
+        try:
+            rows = self.queryset.using(self._db()).filter(pk__in=list(values))
+            return {str(o.pk): self.label_from_instance(o) for o in rows}
+        except (ValueError, TypeError, ValidationError):
+            return {}
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            return value
+        try:
+            return self.queryset.using(self._db()).get(pk=value)
+        except (ValueError, TypeError, ValidationError, self.queryset.model.DoesNotExist):
+            raise ValidationError(
+                self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value},
+            )
+
+    def validate(self, value):
+        # 선택지 목록을 돌지 않는다(to_python에서 존재 확인 완료)
+        forms.Field.validate(self, value)
+
+
+def _partner_label(p):
+    return f"{p.name} ({p.type or ''})"
+
+
 class ContractForm(forms.ModelForm):
     status = forms.ChoiceField(choices=STATUS_CHOICES, required=False)
     kind = forms.ChoiceField(choices=KIND_CHOICES, required=False)
@@ -56,6 +144,19 @@ class ContractForm(forms.ModelForm):
         localize=False,
     )
 
+    # FK 선택은 원격 검색(선택값만 렌더)
+    client = RemoteModelChoiceField(
+        Partner.objects.all(), "tenant:partner_options", required=False,
+        label_func=_partner_label, widget=RemoteSelect("tenant:partner_options", attrs={"id": "client", "data-placeholder": "발주처 선택"}),
+    )
+    sub_client = RemoteModelChoiceField(
+        Partner.objects.all(), "tenant:partner_options", required=False,
+        label_func=_partner_label, widget=RemoteSelect("tenant:partner_options", attrs={"id": "sub_client", "data-placeholder": "원도급 선택"}),
+    )
+    org_unit = RemoteModelChoiceField(
+        MyOrgUnit.objects.all(), "tenant:myinfo_orgunit_options", required=False,
+    )
+
     class Meta:
         model = Contract
         fields = [
@@ -71,9 +172,6 @@ class ContractForm(forms.ModelForm):
             "end_date": forms.TextInput(attrs={"class": "form-control"}),
             "kind": forms.Select(attrs={"class": "form-select"}),
             "amount": forms.NumberInput(attrs={"class": "form-control"}),
-            "client": forms.Select(attrs={"class": "form-select"}),      # Choices.js가 나중에 덮어씀
-            "sub_client": forms.Select(attrs={"class": "form-select"}),  # 동일
-            "org_unit": forms.Select(attrs={"class": "form-select"}),    # 🔹 우리 회사(본사/지사)
             "description": forms.Textarea(attrs={"class": "form-control", "rows": 3}),
         }
 
@@ -89,11 +187,10 @@ class ContractForm(forms.ModelForm):
         # 상태 필드 재정의(기존 코드 유지)
         self.fields["status"] = forms.ChoiceField(choices=STATUS_CHOICES, required=False)
 
-        # 파트너 선택은 테넌트 DB 기준으로
-        if "client" in self.fields:
-            self.fields["client"].queryset = Partner.objects.using(alias).all().order_by("name")
-        if "sub_client" in self.fields:
-            self.fields["sub_client"].queryset = Partner.objects.using(alias).all().order_by("name")
+        # 파트너/계약자 선택은 테넌트 DB 기준으로(검증 시 pk 1건 조회)
+        for name in ("client", "sub_client", "org_unit"):
+            if name in self.fields:
+                self.fields[name].using = alias
 
     def clean_code(self):
         code = (self.cleaned_data.get('code') or '').strip()
@@ -138,6 +235,22 @@ class PartnerForm(forms.ModelForm):
             "status", "description",
         ]
 
+    def clean_biz_no(self):
+        biz_no = (self.cleaned_data.get("biz_no") or "").strip()
+        digits = partner_search.digits(biz_no)
+        if not digits:
+            return biz_no
+        # 가져오기 키 인덱스(ctr.partners_biz_digits_uq)와 같은 기준: 숫자만 비교
+        qs = (Partner.objects.using(current_db_alias())
+              .annotate(biz_digits=Func(F("biz_no"), Value(r"[^0-9]"), Value(""), Value("g"),
+                                        function="regexp_replace", output_field=CharField()))
+              .filter(biz_digits=digits))
+        if self.instance and self.instance.pk:
+            qs = qs.exclude(pk=self.instance.pk)
+        if qs.exists():
+            raise forms.ValidationError(f"이미 등록된 사업자번호입니다: {biz_no}")
+        return biz_no
+
 
 class ProjectForm(forms.ModelForm):
     # 프로젝트 폼도 동일하게 ISO 위젯을 쓰려면 아래처럼 교체 가능
@@ -176,3 +289,33 @@ class MyOrgUnitForm(forms.ModelForm):
             "description": forms.Textarea(attrs={"class": "form-control", "rows": 2}),
         }
 
+
+
+IMPORT_KIND_CHOICES = [
+    ("partners", "파트너"),
+    ("contracts", "계약"),
+    ("employees", "직원"),
+]
+
+IMPORT_KEY_CHOICES = [
+    ("legacy_id", "기존 ID(legacy_id)"),
+    ("biz_no", "사업자번호(파트너만)"),
+    ("email", "이메일(직원만)"),
+]
+
+
+class ImportUploadForm(forms.Form):
+    kind = forms.ChoiceField(choices=IMPORT_KIND_CHOICES, widget=forms.Select(attrs={"class": "form-select"}))
+    match_key = forms.ChoiceField(choices=IMPORT_KEY_CHOICES, widget=forms.Select(attrs={"class": "form-select"}))
+    file = forms.FileField(widget=forms.ClearableFileInput(attrs={"class": "form-control", "accept": ".csv,.xlsx"}))
+
+    def clean(self):
+        cd = super().clean()
+        kind, key = cd.get("kind"), cd.get("match_key")
+        if kind == "contracts" and key == "biz_no":
+            self.add_error("match_key", "계약은 기존 ID(legacy_id)로만 병합합니다.")
+        elif kind == "employees" and key != "email":
+            self.add_error("match_key", "직원은 이메일로만 병합합니다.")
+        elif kind != "employees" and key == "email":
+            self.add_error("match_key", "이메일 기준은 직원 가져오기에서만 씁니다.")
+        return cd
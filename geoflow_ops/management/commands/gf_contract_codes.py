@@ -0,0 +1,40 @@
+# geoflow_ops/management/commands/gf_contract_codes.py
+"""
+계약번호 카운터 준비/백필
+  python manage.py gf_contract_codes --database cheonan_db
+  python manage.py gf_contract_codes --all-tenants --dry-run
+- ctr.code_counter 테이블/인덱스가 없으면 만든다
+- 기존 계약번호를 현재 형식으로 해석해 scope(연/월 등)별 최대 seq로 카운터를 올린다(내리지는 않음)
+"""
+from geoflow_ops.management.tenant_command import TenantCommand
+from geoflow_ops.models import Contract
+from geoflow_ops.services import contract_codes
+
+
+class Command(TenantCommand):
+    help = "계약번호 카운터(ctr.code_counter) 생성 및 기존 계약번호로 시드"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--dry-run", action="store_true", help="계산 결과만 출력")
+
+    def handle(self, *args, **opts):
+        aliases = self.tenant_aliases(opts)
+
+        for alias in aliases:
+            fmt = contract_codes.format_for(alias)
+            codes = (Contract.objects.using(alias)
+                     .exclude(code__isnull=True)
+                     .values_list("code", flat=True)
+                     .iterator(chunk_size=5000))
+            counters = contract_codes.scan_counters(alias, codes)
+
+            self.stdout.write(f"[{alias}] 형식={fmt.template} scope {len(counters)}개")
+            for scope, seq in sorted(counters.items()):
+                self.stdout.write(f"  {scope:<20} → {seq}")
+            if opts["dry_run"]:
+                continue
+
+            contract_codes.ensure_schema(alias)
+            n = contract_codes.seed_counters(alias, counters)
+            self.stdout.write(self.style.SUCCESS(f"[{alias}] 카운터 {n}건 반영"))
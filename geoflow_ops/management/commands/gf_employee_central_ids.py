@@ -0,0 +1,21 @@
+# geoflow_ops/management/commands/gf_employee_central_ids.py
+"""
+직원 central_user_id 일괄 백필
+  python manage.py gf_employee_central_ids --database cheonan_db
+  python manage.py gf_employee_central_ids --all-tenants
+- hr.employee_profile.central_user_id 가 비어 있는 직원을 이메일로 중앙 users 와 연결
+- 청크(GF_EMPLOYEE_BACKFILL_CHUNK)마다 중앙 조회 1회 + UPDATE 1회
+"""
+from geoflow_ops.management.tenant_command import TenantCommand
+from geoflow_ops.services import employee_directory
+
+
+class Command(TenantCommand):
+    help = "직원 central_user_id 백필"
+
+    def handle(self, *args, **opts):
+        aliases = self.tenant_aliases(opts)
+
+        for alias in aliases:
+            n = employee_directory.backfill_central_user_ids(alias)
+            self.stdout.write(self.style.SUCCESS(f"[{alias}] {n}명 연결"))
@@ -0,0 +1,23 @@
+# geoflow_ops/management/commands/gf_hr_sensitive.py
+"""
+직원 주민번호 마스킹 컬럼 준비
+  python manage.py gf_hr_sensitive --database cheonan_db
+  python manage.py gf_hr_sensitive --all-tenants
+- hr.employee_profile.rrn_masked 가 없으면 추가
+- 비어 있는 기존 행은 UPDATE 한 문장으로 채운다(복호화는 이때 한 번만, RRN_SYM_KEY 필요)
+"""
+from geoflow_ops.management.tenant_command import TenantCommand
+from geoflow_ops.services import hr_sensitive
+
+
+class Command(TenantCommand):
+    help = "직원 주민번호 마스킹 컬럼 추가 및 기존 행 채우기"
+
+    def handle(self, *args, **opts):
+        aliases = self.tenant_aliases(opts)
+        if not hr_sensitive.rrn_key():
+            self.stdout.write(self.style.WARNING("RRN_SYM_KEY 가 없어 뒤 4자리 마스킹으로만 채웁니다."))
+
+        for alias in aliases:
+            n = hr_sensitive.backfill_masked(alias)
+            self.stdout.write(self.style.SUCCESS(f"[{alias}] {n}행 채움"))
@@ -0,0 +1,39 @@
+# geoflow_ops/management/commands/gf_import_worker.py
+"""
+일괄 가져오기 작업 처리기
+  python manage.py gf_import_worker --all-tenants            # 대기 작업을 모두 처리하고 종료
+  python manage.py gf_import_worker --all-tenants --loop     # 계속 대기하며 처리
+- 대기(queued) 작업과, running인데 heartbeat가 멈춘 작업(GF_IMPORT_STALE_SECONDS)을 이어서 처리
+- 여러 워커를 띄워도 FOR UPDATE SKIP LOCKED로 같은 작업을 잡지 않는다
+"""
+import time
+
+from django.db import connections
+
+from geoflow_ops.management.tenant_command import TenantCommand
+from geoflow_ops.services import imports
+
+
+class Command(TenantCommand):
+    help = "일괄 가져오기 대기 작업 처리"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--loop", action="store_true", help="종료하지 않고 계속 처리")
+        parser.add_argument("--sleep", type=float, default=5.0, help="--loop 대기 간격(초)")
+
+    def handle(self, *args, **opts):
+        aliases = self.tenant_aliases(opts)
+
+        while True:
+            total = 0
+            for alias in aliases:
+                n = imports.run_pending(alias)
+                if n:
+                    self.stdout.write(f"[{alias}] 작업 {n}건 처리")
+                total += n
+            if not opts["loop"]:
+                break
+            if not total:
+                connections.close_all()
+                time.sleep(opts["sleep"])
@@ -0,0 +1,27 @@
+# geoflow_ops/management/commands/gf_imports.py
+"""
+일괄 가져오기 테이블/병합 키 인덱스 준비
+  python manage.py gf_imports --database cheonan_db
+  python manage.py gf_imports --all-tenants
+- ops.import_job / ops.import_error / ops.import_central_sync 가 없으면 만든다
+- ON CONFLICT 대상 유니크 인덱스(파트너 legacy_id·사업자번호, 계약 legacy_id, 직원 lower(email))를 만든다
+  기존 데이터에 중복이 있으면 해당 인덱스만 실패로 보고(그 키로는 가져오기 불가)
+"""
+from geoflow_ops.management.tenant_command import TenantCommand
+from geoflow_ops.services import imports
+
+
+class Command(TenantCommand):
+    help = "일괄 가져오기 작업 테이블 및 병합 키 인덱스 생성"
+
+    def handle(self, *args, **opts):
+        aliases = self.tenant_aliases(opts)
+
+        for alias in aliases:
+            imports.ensure_schema(alias)
+            for name, err in imports.ensure_key_indexes(alias).items():
+                if err:
+                    self.stdout.write(self.style.WARNING(f"[{alias}] {name} 실패: {err}"))
+                else:
+                    self.stdout.write(f"[{alias}] {name} OK")
+            self.stdout.write(self.style.SUCCESS(f"[{alias}] 가져오기 테이블 준비 완료"))
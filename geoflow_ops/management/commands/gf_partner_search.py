@@ -0,0 +1,27 @@
+# geoflow_ops/management/commands/gf_partner_search.py
+"""
+파트너 검색 보조 테이블(ctr.partner_search) 준비/재색인
+  python manage.py gf_partner_search --database cheonan_db
+  python manage.py gf_partner_search --all-tenants
+- pg_trgm 확장, 보조 테이블, GIN/접두 인덱스가 없으면 만든다
+- 전체 파트너의 정규화/자모 문자열을 다시 채우고, 삭제된 파트너 행은 정리한다
+"""
+from geoflow_ops.management.tenant_command import TenantCommand
+from geoflow_ops.services import partner_search
+
+
+class Command(TenantCommand):
+    help = "파트너 타입어헤드 검색 인덱스 생성 및 재색인"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        aliases = self.tenant_aliases(opts)
+
+        for alias in aliases:
+            partner_search.ensure_schema(alias)
+            n = partner_search.reindex_partners(alias, chunk_size=opts["chunk_size"])
+            pruned = partner_search.prune(alias)
+            self.stdout.write(self.style.SUCCESS(f"[{alias}] 색인 {n}건, 정리 {pruned}건"))
@@ -0,0 +1,31 @@
+# geoflow_ops/management/tenant_command.py
+"""
+테넌트 DB 대상 관리 명령 공통 기반
+- --database(여러 번) / --all-tenants(중앙 DB 제외 모든 DATABASES 별칭) 옵션
+- tenant_aliases(opts): 대상 별칭 목록(없거나 모르는 별칭이면 CommandError)
+"""
+from typing import List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class TenantCommand(BaseCommand):
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", action="append", dest="aliases", default=[],
+                            help="대상 테넌트 DB 별칭(여러 번 지정 가능)")
+        parser.add_argument("--all-tenants", action="store_true",
+                            help="중앙 DB를 제외한 모든 DATABASES 별칭")
+
+    def tenant_aliases(self, opts) -> List[str]:
+        central = getattr(settings, "CENTRAL_DB_ALIAS", "default")
+        aliases = list(opts["aliases"])
+        if opts["all_tenants"]:
+            aliases += [a for a in settings.DATABASES if a != central and a not in aliases]
+        if not aliases:
+            raise CommandError("--database 또는 --all-tenants 가 필요합니다.")
+        unknown = [a for a in aliases if a not in settings.DATABASES]
+        if unknown:
+            raise CommandError(f"알 수 없는 DB 별칭: {', '.join(unknown)}")
+        return aliases
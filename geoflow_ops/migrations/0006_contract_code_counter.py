@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+# 다른 테넌트 DB는 `manage.py gf_contract_codes --all-tenants`가 같은 DDL을 적용한다
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS ctr.code_counter (
+    scope       text        PRIMARY KEY,
+    last_value  bigint      NOT NULL,
+    updated_at  timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS contracts_code_idx ON ctr.contracts (code);
+"""
+
+DROP_SQL = "DROP TABLE IF EXISTS ctr.code_counter;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webgisapp', '0005_myorgunit_projectscopeitem_delete_prjcategory_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
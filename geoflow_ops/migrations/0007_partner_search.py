@@ -0,0 +1,47 @@
+from django.db import migrations
+
+
+# 다른 테넌트 DB는 `manage.py gf_partner_search --all-tenants`가 같은 DDL을 적용하고 색인까지 채운다
+# (migrate 로 만든 DB 는 아래 RunPython 이 기존 파트너를 바로 색인)
+CREATE_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE TABLE IF NOT EXISTS ctr.partner_search (
+    partner_id  uuid        PRIMARY KEY,
+    name_norm   text        NOT NULL DEFAULT '',
+    name_jamo   text        NOT NULL DEFAULT '',
+    name_cho    text        NOT NULL DEFAULT '',
+    rep_jamo    text        NOT NULL DEFAULT '',
+    biz_digits  text        NOT NULL DEFAULT '',
+    updated_at  timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS partner_search_jamo_trgm ON ctr.partner_search USING gin (name_jamo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS partner_search_cho_trgm  ON ctr.partner_search USING gin (name_cho gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS partner_search_rep_trgm  ON ctr.partner_search USING gin (rep_jamo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS partner_search_biz_trgm  ON ctr.partner_search USING gin (biz_digits gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS partner_search_jamo_prefix ON ctr.partner_search (name_jamo text_pattern_ops);
+CREATE INDEX IF NOT EXISTS partner_search_biz_prefix  ON ctr.partner_search (biz_digits text_pattern_ops);
+"""
+
+DROP_SQL = "DROP TABLE IF EXISTS ctr.partner_search;"
+
+
+def fill_search_rows(apps, schema_editor):
+    """기존 파트너를 색인한다(빈 보조 테이블이면 타입어헤드에서 모든 파트너가 안 보인다).
+    정규화/자모 분해가 파이썬 코드라 SQL 로는 채울 수 없다."""
+    from geoflow_ops.services import partner_search
+
+    alias = schema_editor.connection.alias
+    partner_search.ensure_schema(alias)          # has_index 프로세스 캐시도 비운다
+    partner_search.reindex_partners(alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webgisapp', '0006_contract_code_counter'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+        migrations.RunPython(fill_search_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,98 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+# 다른 테넌트 DB는 `manage.py gf_imports --all-tenants`가 같은 DDL과 병합 키 인덱스를 적용한다
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS ops.import_job (
+    id            uuid        PRIMARY KEY,
+    kind          text        NOT NULL,
+    match_key     text        NOT NULL,
+    filename      text        NOT NULL,
+    fmt           text        NOT NULL,
+    payload       bytea       NOT NULL,
+    status        text        NOT NULL DEFAULT 'queued',
+    last_row      integer     NOT NULL DEFAULT 1,
+    total_rows    integer     NULL,
+    inserted      integer     NOT NULL DEFAULT 0,
+    updated       integer     NOT NULL DEFAULT 0,
+    failed        integer     NOT NULL DEFAULT 0,
+    last_error    text        NULL,
+    created_by    text        NULL,
+    created_at    timestamptz NOT NULL DEFAULT now(),
+    started_at    timestamptz NULL,
+    heartbeat_at  timestamptz NULL,
+    finished_at   timestamptz NULL
+);
+CREATE INDEX IF NOT EXISTS import_job_status_idx ON ops.import_job (status, created_at);
+CREATE TABLE IF NOT EXISTS ops.import_error (
+    id       bigserial PRIMARY KEY,
+    job_id   uuid      NOT NULL REFERENCES ops.import_job (id) ON DELETE CASCADE,
+    row_no   integer   NOT NULL,
+    field    text      NULL,
+    message  text      NOT NULL,
+    raw      jsonb     NULL
+);
+CREATE INDEX IF NOT EXISTS import_error_job_idx ON ops.import_error (job_id, row_no);
+"""
+
+DROP_SQL = "DROP TABLE IF EXISTS ops.import_error; DROP TABLE IF EXISTS ops.import_job;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webgisapp', '0007_partner_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.TextField(db_column='kind')),
+                ('match_key', models.TextField(db_column='match_key')),
+                ('filename', models.TextField(db_column='filename')),
+                ('fmt', models.TextField(db_column='fmt')),
+                ('payload', models.BinaryField(db_column='payload')),
+                ('status', models.TextField(db_column='status', default='queued')),
+                ('last_row', models.IntegerField(db_column='last_row', default=1)),
+                ('total_rows', models.IntegerField(blank=True, db_column='total_rows', null=True)),
+                ('inserted', models.IntegerField(db_column='inserted', default=0)),
+                ('updated', models.IntegerField(db_column='updated', default=0)),
+                ('failed', models.IntegerField(db_column='failed', default=0)),
+                ('last_error', models.TextField(blank=True, db_column='last_error', null=True)),
+                ('created_by', models.TextField(blank=True, db_column='created_by', null=True)),
+                ('created_at', models.DateTimeField(db_column='created_at', default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, db_column='started_at', null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, db_column='heartbeat_at', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, db_column='finished_at', null=True)),
+            ],
+            options={
+                'db_table': '"ops"."import_job"',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportRowError',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('row_no', models.IntegerField(db_column='row_no')),
+                ('field', models.TextField(blank=True, db_column='field', null=True)),
+                ('message', models.TextField(db_column='message')),
+                ('raw', models.JSONField(blank=True, db_column='raw', null=True)),
+                ('job', models.ForeignKey(db_column='job_id', on_delete=django.db.models.deletion.CASCADE,
+                                          related_name='errors', to='webgisapp.importjob')),
+            ],
+            options={
+                'db_table': '"ops"."import_error"',
+                'ordering': ['row_no', 'id'],
+                'managed': False,
+            },
+        ),
+        # 비관리 모델이라 테이블은 직접 만든다
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
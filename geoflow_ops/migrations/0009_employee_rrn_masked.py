@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+# 다른 테넌트 DB는 `manage.py gf_hr_sensitive --all-tenants`가 컬럼을 추가하고 기존 행의 마스킹 값을 채운다
+CREATE_SQL = "ALTER TABLE IF EXISTS hr.employee_profile ADD COLUMN IF NOT EXISTS rrn_masked text;"
+
+DROP_SQL = "ALTER TABLE IF EXISTS hr.employee_profile DROP COLUMN IF EXISTS rrn_masked;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webgisapp', '0008_import_jobs'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
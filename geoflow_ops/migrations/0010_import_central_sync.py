@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+# 다른 테넌트 DB는 `manage.py gf_imports --all-tenants`가 같은 DDL을 적용한다
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS ops.import_central_sync (
+    job_id    uuid        NOT NULL REFERENCES ops.import_job (id) ON DELETE CASCADE,
+    row_no    integer     NOT NULL,
+    group_id  text        NOT NULL,
+    email     text        NOT NULL,
+    name      text        NULL,
+    role_id   text        NOT NULL,
+    done_at   timestamptz NULL,
+    PRIMARY KEY (job_id, row_no)
+);
+"""
+
+DROP_SQL = "DROP TABLE IF EXISTS ops.import_central_sync;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webgisapp', '0009_employee_rrn_masked'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
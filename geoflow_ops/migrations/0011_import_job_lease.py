@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+# 다른 테넌트 DB는 `manage.py gf_imports --all-tenants`가 같은 DDL을 적용한다
+CREATE_SQL = "ALTER TABLE IF EXISTS ops.import_job ADD COLUMN IF NOT EXISTS lease uuid NULL;"
+
+DROP_SQL = "ALTER TABLE IF EXISTS ops.import_job DROP COLUMN IF EXISTS lease;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webgisapp', '0010_import_central_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='lease',
+            field=models.UUIDField(blank=True, db_column='lease', null=True),
+        ),
+        # 비관리 모델이라 열은 직접 추가한다
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
@@ -226,3 +226,55 @@ class ProjectScopeItem(models.Model):
         return f"{self.project_id} / {self.lv2_id} ({self.unit}, {self.design_qty or 0})"
     
 
+
+# =========================
+# 일괄 가져오기 작업 (ops.import_job / ops.import_error)
+# =========================
+class ImportJob(models.Model):
+    """
+    CSV/XLSX 일괄 가져오기 작업 1건. 업로드 파일은 payload(bytea)에 보관하고
+    청크마다 last_row(처리 완료한 마지막 행 번호)를 같은 트랜잭션으로 올린다 → 중단돼도 이어서 처리.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.TextField(db_column="kind")                 # partners / contracts
+    match_key = models.TextField(db_column="match_key")       # legacy_id / biz_no
+    filename = models.TextField(db_column="filename")
+    fmt = models.TextField(db_column="fmt")                   # csv / xlsx
+    payload = models.BinaryField(db_column="payload")
+    status = models.TextField(db_column="status", default="queued")  # queued / running / done / failed
+    last_row = models.IntegerField(db_column="last_row", default=1)  # 1 = 헤더
+    total_rows = models.IntegerField(db_column="total_rows", null=True, blank=True)
+    inserted = models.IntegerField(db_column="inserted", default=0)
+    updated = models.IntegerField(db_column="updated", default=0)
+    failed = models.IntegerField(db_column="failed", default=0)
+    last_error = models.TextField(db_column="last_error", null=True, blank=True)
+    created_by = models.TextField(db_column="created_by", null=True, blank=True)
+    created_at = models.DateTimeField(db_column="created_at", default=timezone.now)
+    started_at = models.DateTimeField(db_column="started_at", null=True, blank=True)
+    heartbeat_at = models.DateTimeField(db_column="heartbeat_at", null=True, blank=True)
+    finished_at = models.DateTimeField(db_column="finished_at", null=True, blank=True)
+    lease = models.UUIDField(db_column="lease", null=True, blank=True)   # claim_job 마다 새로(청크는 이 값으로 잠근다)
+
+    class Meta:
+        db_table = '"ops"."import_job"'
+        managed = False
+        ordering = ["-created_at"]
+
+    @property
+    def processed(self) -> int:
+        return max(self.last_row - 1, 0)
+
+
+class ImportRowError(models.Model):
+    """가져오기 행 단위 오류(오류 리포트 CSV의 원본)."""
+    id = models.BigAutoField(primary_key=True)
+    job = models.ForeignKey(ImportJob, db_column="job_id", related_name="errors", on_delete=models.CASCADE)
+    row_no = models.IntegerField(db_column="row_no")
+    field = models.TextField(db_column="field", null=True, blank=True)
+    message = models.TextField(db_column="message")
+    raw = models.JSONField(db_column="raw", null=True, blank=True)
+
+    class Meta:
+        db_table = '"ops"."import_error"'
+        managed = False
+        ordering = ["row_no", "id"]
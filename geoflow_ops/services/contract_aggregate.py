@@ -0,0 +1,98 @@
+# geoflow_ops/services/contract_aggregate.py
+# -*- coding: utf-8 -*-
+"""
+계약 상세 집계 로더
+- 계약 + 발주처/원도급/계약자(select_related) + 대표 프로젝트(상관 서브쿼리 → jsonb 1컬럼)를 쿼리 1회로
+- 범위(scope) 요약은 scope_cache.get_scope_groups(리비전 캐시) 경로를 그대로 쓴다
+- 상세 화면(contract_detail_page)과 JSON(contract_json)이 같이 쓴다
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from django.core.exceptions import ValidationError
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import JSONObject
+
+from geoflow_ops.models import Contract, Project
+from geoflow_ops.services import scope_cache
+
+# 대표 프로젝트 = 계약에 연결된 프로젝트 중 id 순 첫 번째(기존 .first()와 동일)
+_PROJECT_FIELDS = tuple(f.attname for f in Project._meta.concrete_fields)
+
+
+def _primary_project_json():
+    return Subquery(
+        Project.objects
+        .filter(contract_id=OuterRef("pk"))
+        .order_by("id")
+        .values(j=JSONObject(**{name: name for name in _PROJECT_FIELDS}))[:1]
+    )
+
+
+def aggregate_queryset(alias: str):
+    return (
+        Contract.objects.using(alias)
+        .select_related("client", "sub_client", "org_unit")
+        .annotate(primary_project_json=_primary_project_json())
+    )
+
+
+def _project_from_json(alias: str, data: Optional[Dict[str, Any]]) -> Optional[Project]:
+    """jsonb로 받은 행을 DB에서 읽은 것과 같은 Project 인스턴스로 복원."""
+    if not data:
+        return None
+    values = [Project._meta.get_field(name).to_python(data.get(name)) for name in _PROJECT_FIELDS]
+    return Project.from_db(alias, list(_PROJECT_FIELDS), values)
+
+
+@dataclass
+class ContractAggregate:
+    alias: str
+    contract: Contract
+    project: Optional[Project]
+
+    # select_related로 이미 붙어 있으므로 추가 쿼리 없음
+    @property
+    def client_name(self) -> Optional[str]:
+        return self.contract.client.name if self.contract.client else None
+
+    @property
+    def subclient_name(self) -> Optional[str]:
+        return self.contract.sub_client.name if self.contract.sub_client else None
+
+    @property
+    def org_unit_name(self) -> Optional[str]:
+        return self.contract.org_unit.name if self.contract.org_unit else None
+
+    def scope_groups(self, rev: Optional[scope_cache.ScopeRevision] = None) -> List[Dict[str, Any]]:
+        if self.project is None:
+            return []
+        return scope_cache.get_scope_groups(self.alias, self.project.pk, rev)
+
+    def as_json(self) -> Dict[str, Any]:
+        c, p = self.contract, self.project
+        return {
+            "id": str(c.id),
+            "code": c.code,
+            "name": c.name,
+            "start_date": c.start_date.isoformat() if c.start_date else None,
+            "end_date": c.end_date.isoformat() if c.end_date else None,
+            "amount": c.amount,
+            "status": c.status,
+            "client_name": self.client_name,
+            "sub_client_name": self.subclient_name,
+            "org_unit_name": self.org_unit_name,
+            "project": ({"id": str(p.id), "code": p.code, "name": p.name} if p else None),
+        }
+
+
+def load_contract_aggregate(alias: str, pk) -> Optional[ContractAggregate]:
+    """없으면 None(뷰에서 404)."""
+    try:
+        obj = aggregate_queryset(alias).get(pk=pk)
+    except (Contract.DoesNotExist, ValueError, ValidationError):
+        return None
+    project = _project_from_json(alias, getattr(obj, "primary_project_json", None))
+    return ContractAggregate(alias=alias, contract=obj, project=project)
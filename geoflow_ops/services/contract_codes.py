@@ -0,0 +1,235 @@
+# geoflow_ops/services/contract_codes.py
+# -*- coding: utf-8 -*-
+"""
+계약번호 발급기 (테넌트 DB의 ctr.code_counter 카운터 기반)
+- 형식은 settings로 지정: GF_CONTRACT_CODE_FORMAT(기본) / GF_CONTRACT_CODE_FORMATS[alias](테넌트별)
+  · 사용 가능한 필드: {yyyy} {yy} {mm} {seq[:0Nd]}   예) "{yy}{seq:03d}" → 25001, "{yyyy}-{seq:04d}" → 2025-0001
+- 카운터 키(scope)는 형식에서 seq를 뺀 나머지를 오늘 날짜로 채운 문자열 → 연/월이 바뀌면 자연히 새 카운터
+- 발급은 UPDATE ... RETURNING 1문장(행 잠금은 커밋까지 유지 → 동시 생성도 겹치지 않음)
+- 카운터가 없을 때만 기존 계약번호에서 최대값을 읽어 시드(DB 정규식, 1회)
+"""
+from __future__ import annotations
+
+import re
+import string
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+DEFAULT_FORMAT = getattr(settings, "GF_CONTRACT_CODE_FORMAT", "{yy}{seq:03d}")
+TENANT_FORMATS: Dict[str, str] = getattr(settings, "GF_CONTRACT_CODE_FORMATS", {})
+MAX_SKIP = 20   # 수기로 입력된 번호와 겹칠 때 건너뛸 최대 횟수
+
+DDL = """
+CREATE TABLE IF NOT EXISTS ctr.code_counter (
+    scope       text        PRIMARY KEY,
+    last_value  bigint      NOT NULL,
+    updated_at  timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS contracts_code_idx ON ctr.contracts (code);
+"""
+
+_NEXT_SQL = """
+    UPDATE ctr.code_counter
+       SET last_value = last_value + 1, updated_at = now()
+     WHERE scope = %s
+    RETURNING last_value
+"""
+
+_SEED_SQL = """
+    INSERT INTO ctr.code_counter (scope, last_value)
+    SELECT %s, COALESCE(MAX(substring(code FROM %s)::bigint), 0)
+      FROM ctr.contracts
+     WHERE code ~ %s
+    ON CONFLICT (scope) DO NOTHING
+"""
+
+_RAISE_SQL = """
+    UPDATE ctr.code_counter
+       SET last_value = GREATEST(last_value, %s), updated_at = now()
+     WHERE scope = %s
+"""
+
+_DATE_FIELDS = {"yyyy": r"\d{4}", "yy": r"\d{2}", "mm": r"\d{2}"}
+
+
+@dataclass(frozen=True)
+class CodeFormat:
+    """'{yy}{seq:03d}' 같은 형식 문자열을 (접두, 자릿수, 접미)로 해석."""
+    template: str
+    head: Tuple[Tuple[str, Optional[str]], ...]   # seq 앞 (리터럴, 날짜필드)
+    tail: Tuple[Tuple[str, Optional[str]], ...]   # seq 뒤
+    width: int
+
+    @classmethod
+    def parse(cls, template: str) -> "CodeFormat":
+        head, tail, width, seen_seq = [], [], 0, False
+        for literal, field, spec, _conv in string.Formatter().parse(template):
+            target = tail if seen_seq else head
+            if literal:
+                target.append((literal, None))
+            if field is None:
+                continue
+            if field == "seq":
+                if seen_seq:
+                    raise ValueError(f"계약번호 형식에 {{seq}}가 두 번 있습니다: {template}")
+                seen_seq = True
+                digits = (spec or "").lstrip("0").rstrip("d")
+                width = int(digits) if digits.isdigit() else 0
+            elif field in _DATE_FIELDS:
+                target.append(("", field))
+            else:
+                raise ValueError(f"알 수 없는 계약번호 필드 {{{field}}}: {template}")
+        if not seen_seq:
+            raise ValueError(f"계약번호 형식에 {{seq}}가 없습니다: {template}")
+        return cls(template=template, head=tuple(head), tail=tuple(tail), width=width)
+
+    @staticmethod
+    def _fill(parts, today: date) -> str:
+        values = {"yyyy": f"{today.year:04d}", "yy": f"{today.year % 100:02d}", "mm": f"{today.month:02d}"}
+        return "".join(lit if field is None else values[field] for lit, field in parts)
+
+    def affixes(self, today: Optional[date] = None) -> Tuple[str, str]:
+        today = today or timezone.localdate()
+        return self._fill(self.head, today), self._fill(self.tail, today)
+
+    def render(self, seq: int, today: Optional[date] = None) -> str:
+        prefix, suffix = self.affixes(today)
+        return f"{prefix}{str(seq).zfill(self.width)}{suffix}"
+
+    # ── 정규식(기존 번호 해석용)
+    def seq_regex(self, prefix: str, suffix: str) -> str:
+        """오늘 scope의 번호만 매칭. 첫 번째 그룹이 seq(Postgres substring용)."""
+        return f"^{re.escape(prefix)}([0-9]+){re.escape(suffix)}$"
+
+    def any_regex(self) -> "re.Pattern[str]":
+        """모든 기간의 번호를 매칭(백필용). seq 그룹 이름은 'seq'."""
+        def part(parts):
+            return "".join(re.escape(lit) if field is None else _DATE_FIELDS[field] for lit, field in parts)
+        return re.compile(f"^{part(self.head)}(?P<seq>[0-9]+){part(self.tail)}$")
+
+
+def format_for(alias: str) -> CodeFormat:
+    return CodeFormat.parse(TENANT_FORMATS.get(alias, DEFAULT_FORMAT))
+
+
+def scope_key(prefix: str, suffix: str) -> str:
+    return f"{prefix}#{suffix}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 발급 / 미리보기 / 수기 번호 반영
+
+def peek_contract_code(alias: str) -> str:
+    """다음 번호 미리보기(카운터를 올리지 않음). 새 계약 화면의 초기값용."""
+    fmt = format_for(alias)
+    prefix, suffix = fmt.affixes()
+    with connections[alias].cursor() as cur:
+        cur.execute("SELECT last_value FROM ctr.code_counter WHERE scope = %s", [scope_key(prefix, suffix)])
+        row = cur.fetchone()
+        if row is None:
+            rx = fmt.seq_regex(prefix, suffix)  # re.escape 결과는 Postgres 정규식에서도 그대로 유효
+            cur.execute(
+                "SELECT COALESCE(MAX(substring(code FROM %s)::bigint), 0) FROM ctr.contracts WHERE code ~ %s",
+                [rx, rx],
+            )
+            row = cur.fetchone()
+    return fmt.render(int(row[0]) + 1)
+
+
+def allocate_contract_code(alias: str) -> str:
+    """
+    다음 번호를 발급(카운터 +1). 호출자의 트랜잭션 안에서 쓰면
+    커밋/롤백까지 같은 scope의 다른 발급이 기다린다(번호 중복/누락 없음).
+    """
+    fmt = format_for(alias)
+    prefix, suffix = fmt.affixes()
+    scope = scope_key(prefix, suffix)
+    with connections[alias].cursor() as cur:
+        for _ in range(MAX_SKIP):
+            cur.execute(_NEXT_SQL, [scope])
+            row = cur.fetchone()
+            if row is None:
+                rx = fmt.seq_regex(prefix, suffix)  # re.escape 결과는 Postgres 정규식에서도 그대로 유효
+                cur.execute(_SEED_SQL, [scope, rx, rx])
+                cur.execute(_NEXT_SQL, [scope])
+                row = cur.fetchone()
+            code = fmt.render(int(row[0]))
+            cur.execute("SELECT 1 FROM ctr.contracts WHERE code = %s LIMIT 1", [code])
+            if cur.fetchone() is None:
+                return code
+    raise RuntimeError(f"계약번호를 발급하지 못했습니다(scope={scope}).")
+
+
+def resolve_contract_code(alias: str, code: Optional[str]) -> str:
+    """
+    저장 직전(트랜잭션 안) 호출.
+    - 비어 있으면 새로 발급
+    - 현재 형식의 번호인데 이미 쓰인 번호면(미리보기 번호를 두 사람이 받은 경우) 새로 발급
+    - 현재 형식의 새 번호면 그대로 쓰고 카운터를 그 값 이상으로 올린다
+    - 형식 밖의 수기 번호는 그대로 쓴다
+    """
+    code = (code or "").strip()
+    if not code:
+        return allocate_contract_code(alias)
+    fmt = format_for(alias)
+    prefix, suffix = fmt.affixes()
+    m = re.match(fmt.seq_regex(prefix, suffix), code)
+    if not m:
+        return code
+    with connections[alias].cursor() as cur:
+        cur.execute("SELECT 1 FROM ctr.contracts WHERE code = %s LIMIT 1", [code])
+        if cur.fetchone() is not None:
+            return allocate_contract_code(alias)
+        scope = scope_key(prefix, suffix)
+        cur.execute(_RAISE_SQL, [int(m.group(1)), scope])
+        if cur.rowcount == 0:
+            rx = fmt.seq_regex(prefix, suffix)
+            cur.execute(_SEED_SQL, [scope, rx, rx])
+            cur.execute(_RAISE_SQL, [int(m.group(1)), scope])
+    return code
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 백필(관리 명령용)
+
+def ensure_schema(alias: str) -> None:
+    with connections[alias].cursor() as cur:
+        cur.execute(DDL)
+
+
+def scan_counters(alias: str, codes: Iterable[str]) -> Dict[str, int]:
+    """기존 계약번호를 훑어 scope별 최대 seq를 계산."""
+    fmt = format_for(alias)
+    rx = fmt.any_regex()
+    out: Dict[str, int] = {}
+    for code in codes:
+        m = rx.match((code or "").strip())
+        if not m:
+            continue
+        key = scope_key(code[:m.start("seq")], code[m.end("seq"):])
+        seq = int(m.group("seq"))
+        if seq > out.get(key, 0):
+            out[key] = seq
+    return out
+
+
+def seed_counters(alias: str, counters: Dict[str, int]) -> int:
+    """scope별 카운터를 GREATEST로 올린다(이미 더 크면 그대로). 반영 건수 반환."""
+    if not counters:
+        return 0
+    with connections[alias].cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO ctr.code_counter AS c (scope, last_value)
+            SELECT t.scope, t.v FROM unnest(%s::text[], %s::bigint[]) AS t(scope, v)
+            ON CONFLICT (scope) DO UPDATE
+               SET last_value = GREATEST(c.last_value, EXCLUDED.last_value), updated_at = now()
+            """,
+            [list(counters), list(counters.values())],
+        )
+        return cur.rowcount
@@ -0,0 +1,134 @@
+# geoflow_ops/services/employee_directory.py
+# -*- coding: utf-8 -*-
+"""
+직원 목록 + 중앙 역할/멤버십
+- 목록 한 번에 중앙 조회 1회(cross_db.central_memberships_by_email, 큰 테넌트는 청크)로 역할/멤버십 상태를 붙인다
+- employee_profile.central_user_id 가 비어 있는 행은 백그라운드 스레드가 일괄로 채운다
+  (상세 화면 _resolve_and_cache_central_user_id 의 일괄판: 중앙 조회 1회 + UPDATE ... FROM unnest 1회)
+- 전체 백필: `manage.py gf_employee_central_ids --all-tenants`
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+from control.services import cross_db
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_CHUNK = getattr(settings, "GF_EMPLOYEE_BACKFILL_CHUNK", 1000)
+INLINE_BACKFILL = getattr(settings, "GF_EMPLOYEE_INLINE_BACKFILL", True)
+BACKFILL_INTERVAL = getattr(settings, "GF_EMPLOYEE_BACKFILL_INTERVAL", 300)   # 같은 테넌트 재시도 간격(초)
+
+_running: set = set()                 # 백필 중인 테넌트 alias(같은 테넌트 중복 실행 방지)
+_last_run: Dict[str, float] = {}      # 중앙에 없는 직원 때문에 목록을 열 때마다 조회하지 않도록
+_running_lock = threading.Lock()
+
+
+def list_employees(alias: str, group_id: Optional[str]) -> List[Dict[str, Any]]:
+    """목록 행 + central_role_code/central_role_name/member_status/central_user_id"""
+    with connections[alias].cursor() as cur:
+        cur.execute(
+            "SELECT id::text, email, name, title, role_code, status, phone, central_user_id::text "
+            "FROM hr.employee_profile ORDER BY name"
+        )
+        rows = cur.fetchall()
+
+    employees = [{
+        "id": r[0], "email": r[1], "name": r[2], "title": r[3],
+        "role_code": r[4], "status": r[5], "phone": r[6],
+        "central_user_id": r[7], "needs_link": r[7] is None,
+    } for r in rows]
+
+    members = cross_db.central_memberships_by_email(group_id, [e["email"] for e in employees]) if group_id else {}
+    for e in employees:
+        m = members.get((e["email"] or "").strip().lower()) or {}
+        e["central_role_code"] = m.get("role_code")
+        e["central_role_name"] = m.get("role_name")
+        e["member_status"] = m.get("member_status")
+        if not e["central_user_id"] and m.get("user_id"):
+            e["central_user_id"] = m["user_id"]          # 화면에는 바로 쓰고, 저장은 kick_backfill
+    return employees
+
+
+def link_central_user_ids(alias: str, pairs: Iterable[Tuple[str, str]]) -> int:
+    """[(employee_id, central_user_id)] 를 UPDATE 1회로 기록(비어 있는 행만)."""
+    pairs = [p for p in pairs if p[0] and p[1]]
+    if not pairs:
+        return 0
+    with connections[alias].cursor() as cur:
+        cur.execute(
+            """
+            UPDATE hr.employee_profile e
+               SET central_user_id = t.user_id
+              FROM unnest(%s::uuid[], %s::uuid[]) AS t(id, user_id)
+             WHERE e.id = t.id AND e.central_user_id IS NULL
+            """,
+            [[p[0] for p in pairs], [p[1] for p in pairs]],
+        )
+        return cur.rowcount
+
+
+def _link_by_email(alias: str, batch: List[Tuple[str, str]]) -> int:
+    """[(employee_id, email)] → 중앙 조회 1회(청크) + UPDATE 1회"""
+    users = cross_db.central_users_by_email([email for _, email in batch])
+    return link_central_user_ids(
+        alias, [(eid, users[k]["id"]) for eid, email in batch if (k := (email or "").lower()) in users],
+    )
+
+
+def backfill_central_user_ids(alias: str, limit: Optional[int] = None) -> int:
+    """central_user_id 가 비어 있는 직원 전체를 이메일로 중앙 users 와 연결. 채운 행 수."""
+    total = 0
+    after = "00000000-0000-0000-0000-000000000000"
+    while limit is None or total < limit:
+        with connections[alias].cursor() as cur:
+            cur.execute(
+                """
+                SELECT id::text, email
+                  FROM hr.employee_profile
+                 WHERE central_user_id IS NULL AND email IS NOT NULL AND id > %s::uuid
+                 ORDER BY id
+                 LIMIT %s
+                """,
+                [after, BACKFILL_CHUNK],
+            )
+            batch = cur.fetchall()
+        if not batch:
+            break
+        after = batch[-1][0]
+        total += _link_by_email(alias, batch)
+    return total
+
+
+def kick_backfill(alias: str, employees: List[Dict[str, Any]]) -> None:
+    """목록 행 중 저장된 central_user_id 가 없는 직원을 응답과 별개로 연결."""
+    if not INLINE_BACKFILL:
+        return
+    batch = [(e["id"], e["email"]) for e in employees if e.get("needs_link") and e.get("email")]
+    if not batch:
+        return
+    now = time.monotonic()
+    with _running_lock:
+        if alias in _running or now - _last_run.get(alias, -BACKFILL_INTERVAL) < BACKFILL_INTERVAL:
+            return
+        _running.add(alias)
+        _last_run[alias] = now
+
+    def _run():
+        try:
+            for i in range(0, len(batch), BACKFILL_CHUNK):
+                _link_by_email(alias, batch[i:i + BACKFILL_CHUNK])
+        except Exception:
+            logger.exception("[directory] central_user_id backfill failed alias=%s", alias)
+        finally:
+            with _running_lock:
+                _running.discard(alias)
+            connections.close_all()
+
+    threading.Thread(target=_run, name=f"gf-emp-backfill-{alias}", daemon=True).start()
@@ -0,0 +1,411 @@
+# geoflow_ops/services/exports.py
+# -*- coding: utf-8 -*-
+"""
+목록 내보내기(CSV / XLSX) — 상수 메모리 스트리밍
+- 데이터: 테넌트 alias에서 서버 측 커서로 청크 단위 조회
+    · ORM: values_list(...).iterator(chunk_size=EXPORT_CHUNK)
+    · 원시 SQL(직원): connections[alias].chunked_cursor() + fetchmany
+- 컬럼: 목록 화면 표의 컬럼(data-col 키)과 같은 순서/라벨. ?cols=code,name,... 로 일부만 선택
+- 필터: 목록 화면과 같은 상태 탭(status=all|planned|active|pause|cancel|complete)과 검색어(q)
+- XLSX: zipfile을 비탐색(non-seekable) 스트림에 쓰는 방식으로 시트 XML을 흘려보낸다
+  (inlineStr 셀 → 공유 문자열 표를 메모리에 모으지 않음)
+"""
+from __future__ import annotations
+
+import csv
+import io
+import re
+import zipfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from geoflow_ops.models import Contract, Partner, Project
+
+EXPORT_CHUNK = getattr(settings, "GF_EXPORT_CHUNK_SIZE", 2000)
+FLUSH_ROWS = 500            # 이 행 수마다 응답으로 내보냄
+FORMATS = ("csv", "xlsx")
+
+# 목록 화면(gf-list-core.js / ContractListView 집계)의 상태 탭 동의어
+STATUS_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "planned":  ("planned", "계약전"),
+    "active":   ("active", "진행"),
+    "pause":    ("pause", "paused", "중지"),
+    "cancel":   ("cancel", "canceled", "취소"),
+    "complete": ("complete", "completed", "완료"),
+}
+
+
+@dataclass(frozen=True)
+class Column:
+    key: str                            # 목록 표의 data-col 키
+    label: str                          # 헤더
+    get: Callable[[Dict[str, Any]], Any]
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    status: str = ""
+    q: str = ""
+
+    @classmethod
+    def from_request(cls, request) -> "ExportFilters":
+        status = (request.GET.get("status") or "").strip().lower()
+        return cls(status="" if status == "all" else status, q=(request.GET.get("q") or "").strip())
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    entity: str
+    title: str                          # 파일명/시트명
+    columns: Tuple[Column, ...]
+    rows: Callable[[str, ExportFilters], Iterator[Dict[str, Any]]]
+
+    def select(self, keys: Sequence[str]) -> Tuple[Column, ...]:
+        if not keys:
+            return self.columns
+        by_key = {c.key: c for c in self.columns}
+        picked = tuple(by_key[k] for k in keys if k in by_key)
+        return picked or self.columns
+
+
+def _status_q(field: str, status: str) -> Q:
+    cond = Q()
+    for s in STATUS_SYNONYMS.get(status, (status,)):
+        cond |= Q(**{f"{field}__iexact": s})
+    return cond
+
+
+def _search_q(fields: Iterable[str], q: str) -> Q:
+    cond = Q()
+    for f in fields:
+        cond |= Q(**{f"{f}__icontains": q})
+    return cond
+
+
+def _iter_values(qs, names: Sequence[str]) -> Iterator[Dict[str, Any]]:
+    for row in qs.values_list(*names).iterator(chunk_size=EXPORT_CHUNK):
+        yield dict(zip(names, row))
+
+
+def _client_label(r: Dict[str, Any], prefix: str = "") -> Optional[str]:
+    # 목록과 동일: 하도급이면 원도급(sub_client) 우선, 아니면 발주처
+    if "하도급" in (r.get(prefix + "kind") or ""):
+        return r.get(prefix + "sub_client__name") or r.get(prefix + "client__name")
+    return r.get(prefix + "client__name")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 계약
+
+_CONTRACT_FIELDS = ("code", "name", "start_date", "end_date", "kind", "amount",
+                    "client__name", "sub_client__name", "org_unit__label", "status")
+
+
+def _contract_rows(alias: str, f: ExportFilters) -> Iterator[Dict[str, Any]]:
+    qs = Contract.objects.using(alias).order_by("-code", "name")
+    if f.status:
+        qs = qs.filter(_status_q("status", f.status))
+    if f.q:
+        qs = qs.filter(_search_q(("code", "name", "kind", "client__name", "sub_client__name", "org_unit__label"), f.q))
+    return _iter_values(qs, _CONTRACT_FIELDS)
+
+
+CONTRACTS = ExportSpec(
+    entity="contracts",
+    title="계약",
+    columns=(
+        Column("code", "계약번호", lambda r: r["code"]),
+        Column("name", "계약명", lambda r: r["name"]),
+        Column("start", "시작일", lambda r: r["start_date"]),
+        Column("end", "종료일", lambda r: r["end_date"]),
+        Column("kind", "계약형태", lambda r: r["kind"]),
+        Column("amount", "계약금액", lambda r: r["amount"]),
+        Column("client", "발주처", _client_label),
+        Column("orgunit", "계약자", lambda r: r["org_unit__label"]),
+        Column("status", "상태", lambda r: r["status"]),
+    ),
+    rows=_contract_rows,
+)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 프로젝트(계약 정보 기준으로 표시)
+
+_PROJECT_FIELDS = tuple(f"contract__{n}" for n in _CONTRACT_FIELDS)
+
+
+def _project_rows(alias: str, f: ExportFilters) -> Iterator[Dict[str, Any]]:
+    qs = Project.objects.using(alias).order_by("-contract__code", "contract__name")
+    if f.status:
+        qs = qs.filter(_status_q("contract__status", f.status))
+    if f.q:
+        qs = qs.filter(_search_q(("contract__code", "contract__name", "contract__kind",
+                                  "contract__client__name", "contract__sub_client__name",
+                                  "contract__org_unit__label"), f.q))
+    return _iter_values(qs, _PROJECT_FIELDS)
+
+
+PROJECTS = ExportSpec(
+    entity="projects",
+    title="프로젝트",
+    columns=(
+        Column("code", "계약번호", lambda r: r["contract__code"]),
+        Column("name", "프로젝트 이름", lambda r: r["contract__name"]),
+        Column("start", "시작일", lambda r: r["contract__start_date"]),
+        Column("end", "종료일", lambda r: r["contract__end_date"]),
+        Column("kind", "계약형태", lambda r: r["contract__kind"]),
+        Column("client", "발주처", lambda r: _client_label(r, "contract__")),
+        Column("status", "상태", lambda r: r["contract__status"]),
+        Column("orgunit", "계약자", lambda r: r["contract__org_unit__label"]),
+    ),
+    rows=_project_rows,
+)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 파트너
+
+_PARTNER_FIELDS = ("name", "biz_no", "rep_name", "address", "type", "status", "description")
+
+
+def _partner_rows(alias: str, f: ExportFilters) -> Iterator[Dict[str, Any]]:
+    qs = Partner.objects.using(alias).order_by("name")
+    if f.status:
+        qs = qs.filter(status__iexact=f.status)
+    if f.q:
+        qs = qs.filter(_search_q(("name", "biz_no", "rep_name", "address", "type"), f.q))
+    return _iter_values(qs, _PARTNER_FIELDS)
+
+
+PARTNERS = ExportSpec(
+    entity="partners",
+    title="파트너",
+    columns=(
+        Column("name", "회사명", lambda r: r["name"]),
+        Column("biz_no", "사업자번호", lambda r: r["biz_no"]),
+        Column("rep_name", "대표자", lambda r: r["rep_name"]),
+        Column("address", "주소", lambda r: r["address"]),
+        Column("type", "구분", lambda r: r["type"]),
+        Column("status", "상태", lambda r: r["status"]),
+        Column("description", "비고", lambda r: r["description"]),
+    ),
+    rows=_partner_rows,
+)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 직원(hr.employee_profile, 원시 SQL)
+
+_EMPLOYEE_FIELDS = ("email", "name", "title", "phone", "role_code", "status")
+
+
+def _employee_rows(alias: str, f: ExportFilters) -> Iterator[Dict[str, Any]]:
+    where, params = [], []
+    if f.status:
+        where.append("lower(status) = %s")
+        params.append(f.status)
+    if f.q:
+        like = f"%{f.q}%"
+        where.append("(email ILIKE %s OR name ILIKE %s OR title ILIKE %s OR phone ILIKE %s OR role_code ILIKE %s)")
+        params += [like] * 5
+    sql = (f"SELECT {', '.join(_EMPLOYEE_FIELDS)} FROM hr.employee_profile"
+           + (f" WHERE {' AND '.join(where)}" if where else "")
+           + " ORDER BY name")
+    conn = connections[alias]
+    conn.ensure_connection()
+    with conn.chunked_cursor() as cur:     # 서버 측(named) 커서
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(EXPORT_CHUNK)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(_EMPLOYEE_FIELDS, row))
+
+
+EMPLOYEES = ExportSpec(
+    entity="employees",
+    title="직원",
+    columns=(
+        Column("email", "이메일", lambda r: r["email"]),
+        Column("name", "이름", lambda r: r["name"]),
+        Column("title", "직함", lambda r: r["title"]),
+        Column("phone", "연락처", lambda r: r["phone"]),
+        Column("role", "역할코드", lambda r: r["role_code"]),
+        Column("status", "상태", lambda r: r["status"]),
+    ),
+    rows=_employee_rows,
+)
+
+
+SPECS: Dict[str, ExportSpec] = {s.entity: s for s in (CONTRACTS, PROJECTS, PARTNERS, EMPLOYEES)}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 셀 값
+
+def _text(v: Any) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, datetime):
+        return timezone.localtime(v).strftime("%Y-%m-%d %H:%M") if timezone.is_aware(v) else v.strftime("%Y-%m-%d %H:%M")
+    if isinstance(v, date):
+        return v.isoformat()
+    return str(v)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CSV
+
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_text(v: Any) -> str:
+    """사용자 입력 문자열이 수식으로 실행되지 않도록(CSV 인젝션) 앞에 ' 를 붙인다. 숫자/날짜는 그대로."""
+    s = _text(v)
+    if isinstance(v, str) and s.startswith(_FORMULA_PREFIXES):
+        return "'" + s
+    return s
+
+
+def stream_csv(columns: Sequence[Column], rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    buf.write("\ufeff")                    # 엑셀에서 한글이 깨지지 않도록 BOM
+    w.writerow([c.label for c in columns])
+    n = 0
+    for r in rows:
+        w.writerow([_csv_text(c.get(r)) for c in columns])
+        n += 1
+        if n % FLUSH_ROWS == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate(0)
+    yield buf.getvalue().encode("utf-8")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# XLSX
+
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+class _Sink:
+    """zipfile이 쓰는 비탐색 출력. 쌓인 바이트를 drain()으로 꺼내 응답에 흘려보낸다."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def _cell(v: Any) -> str:
+    if v is None or v == "":
+        return "<c/>"
+    if isinstance(v, (int, float, Decimal)) and not isinstance(v, bool):
+        return f"<c><v>{v}</v></c>"
+    s = _XML_ILLEGAL.sub("", _text(v))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(s)}</t></is></c>'
+
+
+def _row(values: Iterable[Any]) -> str:
+    return "<row>" + "".join(_cell(v) for v in values) + "</row>"
+
+
+def stream_xlsx(columns: Sequence[Column], rows: Iterable[Dict[str, Any]], sheet_name: str = "Sheet1") -> Iterator[bytes]:
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name[:31], {'"': "&quot;"})))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        yield sink.drain()
+
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            parts = [_SHEET_HEAD, _row(c.label for c in columns)]
+            n = 0
+            for r in rows:
+                parts.append(_row(c.get(r) for c in columns))
+                n += 1
+                if n % FLUSH_ROWS == 0:
+                    sheet.write("".join(parts).encode("utf-8"))
+                    parts.clear()
+                    chunk = sink.drain()
+                    if chunk:
+                        yield chunk
+            parts.append(_SHEET_TAIL)
+            sheet.write("".join(parts).encode("utf-8"))
+    yield sink.drain()
+
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def stream(spec: ExportSpec, fmt: str, alias: str, filters: ExportFilters,
+           column_keys: Sequence[str] = ()) -> Iterator[bytes]:
+    columns = spec.select(column_keys)
+    rows = spec.rows(alias, filters)
+    if fmt == "xlsx":
+        return stream_xlsx(columns, rows, sheet_name=spec.title)
+    return stream_csv(columns, rows)
@@ -0,0 +1,278 @@
+# geoflow_ops/services/hr_onboarding.py
+# -*- coding: utf-8 -*-
+"""
+직원 일괄 등록(신규 테넌트 온보딩) — services/imports 의 "employees" 종류 병합 단계
+청크(= 테넌트 트랜잭션 1개)마다
+    1) 참조 해석(소속/부서/관리자 이메일/역할 코드) — 종류별 쿼리 1회
+    2) hr.employee_profile 다중 행 INSERT ... ON CONFLICT (lower(email)) DO UPDATE 1회
+       · 빈 칸은 기존 값을 지우지 않는다(COALESCE), 관리자는 INSERT 뒤 UPDATE ... FROM unnest 1회
+    3) 역할 코드가 있는 행은 ops.import_central_sync 에 (작업, 행 번호) 키로 적재(같은 테넌트 트랜잭션)
+       → 테넌트 커밋 뒤(on_commit) sync_staged() 가 중앙 동기화(중앙 트랜잭션 1개)
+       · 테넌트 청크가 롤백되면 적재분도 사라지므로 중앙에 고아 계정/멤버십이 남지 않는다
+       · 중앙 동기화가 실패하면 적재 행이 남고 작업은 failed → 재개 때 run_job 이 먼저 마저 처리
+       · users: INSERT ... ON CONFLICT ... RETURNING 1회로 조회/생성
+       · user_group_map: unnest 일괄 upsert / user_tokens: 유효한 설정 토큰이 없는 사용자만 일괄 발급(청크 재시도에도 중복 없음)
+       · 비밀번호 설정 메일은 email_outbox 에 적재(발송은 mail_outbox 워커)
+       · 돌려받은 users.id 를 employee_profile.central_user_id 에 일괄 기록 + 적재 행 완료 표시(테넌트 트랜잭션)
+- 주민번호는 일괄 등록 대상이 아니다(직원 상세 화면에서 개별 입력)
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from control.services import central_repo as C
+from control.services import mail_outbox
+from geoflow_ops.models import ImportJob
+from geoflow_ops.services import hr_reference
+from geoflow_ops.services.imports import ParsedRow, RowError, _org_unit_refs
+
+CENTRAL = getattr(settings, "CENTRAL_DB_ALIAS", "default")
+
+# 테넌트에서 부여할 수 없는 중앙/시스템 역할(views_employees 권한요청 화면도 같은 규칙을 쓴다)
+_FORBIDDEN_PREFIXES = ("central_", "sys_", "super_", "root_")
+_FORBIDDEN_EXACT = {"central_admin", "system_admin", "super_admin", "owner"}
+
+# INSERT 대상 열(순서 = VALUES 자리 순서)
+_PROFILE_COLS = ("email", "name", "phone", "title", "position_grade", "emp_type", "emp_no", "status",
+                 "hire_date", "term_date", "org_unit_id", "department_id", "role_code")
+
+
+def is_forbidden_role(role_code: str) -> bool:
+    rc = (role_code or "").strip().lower()
+    return rc.startswith(_FORBIDDEN_PREFIXES) or rc in _FORBIDDEN_EXACT
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 참조 해석
+
+def _departments(alias: str, names: set) -> List[Tuple[str, str, str]]:
+    if not names:
+        return []
+    with connections[alias].cursor() as cur:
+        cur.execute(
+            "SELECT id::text, org_unit_id::text, name FROM hr.departments WHERE name = ANY(%s)",
+            [sorted(names)],
+        )
+        return cur.fetchall()
+
+
+def _existing_emails(alias: str, emails: set) -> set:
+    if not emails:
+        return set()
+    with connections[alias].cursor() as cur:
+        cur.execute("SELECT lower(email) FROM hr.employee_profile WHERE lower(email) = ANY(%s)", [sorted(emails)])
+        return {r[0] for r in cur.fetchall()}
+
+
+def _resolve(alias: str, rows: List[ParsedRow]) -> Tuple[List[ParsedRow], List[RowError], Optional[str], Dict[str, str]]:
+    """(통과 행, 오류, 중앙 group_id, {role_code: role_id})"""
+    org_units = _org_unit_refs(alias) if any(r.values["org_unit"] for r in rows) else {}
+    depts = _departments(alias, {r.values["department"] for r in rows if r.values["department"]})
+    in_file = {r.values["email"] for r in rows}
+    managers = _existing_emails(alias, {r.values["manager"] for r in rows if r.values["manager"]} - in_file)
+
+    codes = {r.values["role_code"] for r in rows if r.values["role_code"]}
+    role_ids = C.role_ids_by_code(sorted(codes)) if codes else {}
+    group_id = C.group_id_for_db_alias(alias) if codes else None
+
+    ok, errors = [], []
+    for r in rows:
+        v, bad = r.values, []
+        ids = org_units.get(v["org_unit"], []) if v["org_unit"] else [None]
+        if len(ids) != 1:
+            bad.append(("org_unit", f"소속(본사/지사)을 찾을 수 없습니다: {v['org_unit']}"))
+        else:
+            v["org_unit_id"] = ids[0]
+
+        v["department_id"] = None
+        if v["department"]:
+            hit = [d for d, ou, n in depts
+                   if n == v["department"] and (v.get("org_unit_id") is None or ou == v["org_unit_id"])]
+            if len(hit) != 1:
+                msg = "부서를 찾을 수 없습니다" if not hit else "같은 이름의 부서가 여러 개입니다(소속을 지정)"
+                bad.append(("department", f"{msg}: {v['department']}"))
+            else:
+                v["department_id"] = hit[0]
+
+        m = v["manager"]
+        if m and m != v["email"] and m not in in_file and m not in managers:
+            bad.append(("manager", f"관리자(직원 이메일)를 찾을 수 없습니다: {m}"))
+
+        rc = v["role_code"]
+        if rc:
+            if is_forbidden_role(rc):
+                bad.append(("role_code", f"테넌트에서 부여할 수 없는 역할입니다: {rc}"))
+            elif rc not in role_ids:
+                bad.append(("role_code", f"유효하지 않은 역할 코드입니다: {rc}"))
+            elif not group_id:
+                bad.append(("role_code", f"이 테넌트({alias})의 중앙 그룹을 찾을 수 없습니다"))
+
+        if bad:
+            errors += [RowError(r.row_no, k, msg, r.raw) for k, msg in bad]
+        else:
+            ok.append(r)
+    return ok, errors, group_id, role_ids
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 테넌트 병합
+
+_UPDATE_SET = ",\n       ".join(
+    f"{c} = COALESCE(EXCLUDED.{c}, e.{c})" for c in _PROFILE_COLS if c != "email"
+)
+
+
+def _upsert_profiles(cur, rows: List[ParsedRow]) -> List[Tuple[str, str, Optional[str], bool]]:
+    """다중 행 INSERT 1회. [(id, email, central_user_id, 새로 추가?)]"""
+    row_sql = "(" + ", ".join(["%s"] * len(_PROFILE_COLS)) + ", now())"
+    params: List = []
+    for r in rows:
+        params += [r.values[c] for c in _PROFILE_COLS]
+    cur.execute(
+        f"""
+        INSERT INTO hr.employee_profile AS e ({", ".join(_PROFILE_COLS)}, updated_at)
+        VALUES {", ".join([row_sql] * len(rows))}
+        ON CONFLICT ((lower(email))) WHERE email IS NOT NULL DO UPDATE SET
+               {_UPDATE_SET},
+               updated_at = now()
+        RETURNING e.id::text, lower(e.email), e.central_user_id::text, (e.xmax = 0)
+        """,
+        params,
+    )
+    return cur.fetchall()
+
+
+def _set_managers(cur, rows: List[ParsedRow]) -> None:
+    pairs = [(r.values["email"], r.values["manager"]) for r in rows
+             if r.values["manager"] and r.values["manager"] != r.values["email"]]
+    if not pairs:
+        return
+    cur.execute(
+        """
+        UPDATE hr.employee_profile e
+           SET manager_id = m.id, updated_at = now()
+          FROM unnest(%s::text[], %s::text[]) AS t(email, manager)
+          JOIN hr.employee_profile m ON lower(m.email) = t.manager
+         WHERE lower(e.email) = t.email
+        """,
+        [[p[0] for p in pairs], [p[1] for p in pairs]],
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 중앙 동기화
+
+def sync_central(group_id: str, people: List[Tuple[str, str, str]]) -> Dict[str, str]:
+    """
+    [(email, name, role_id)] → 중앙 계정/멤버십/토큰 일괄 처리, {email: users.id}
+    비밀번호가 없고 유효한 설정 토큰도 없는 사용자에게만 설정 메일을 적재한다(재시도해도 한 번).
+    """
+    if not people:
+        return {}
+    with transaction.atomic(using=CENTRAL):
+        user_ids = C.bulk_get_or_create_users([(e, n) for e, n, _ in people])
+        C.bulk_upsert_user_group_memberships(
+            group_id, [(user_ids[e], role_id) for e, _, role_id in people if e in user_ids],
+        )
+        # 같은 적재 행을 다시 처리할 수 있다(완료 표시 전에 중단 → 재개)
+        # → 유효한 설정 토큰이 남아 있는 사용자는 토큰/메일을 다시 만들지 않는다
+        need = C.users_without_password(list(user_ids.values()))
+        pending = C.users_with_pending_token(need, "set_password")
+        need = [uid for uid in need if uid not in pending]
+        tokens = C.bulk_create_set_password_tokens(need)
+        email_of = {uid: e for e, uid in user_ids.items()}
+        if tokens:
+            mail_outbox.enqueue_set_password((email_of[uid], tok) for uid, tok in tokens.items())
+            transaction.on_commit(mail_outbox.kick, using=CENTRAL)
+    return user_ids
+
+
+def _link_central_ids(cur, user_ids: Dict[str, str]) -> None:
+    if not user_ids:
+        return
+    cur.execute(
+        """
+        UPDATE hr.employee_profile e
+           SET central_user_id = t.user_id
+          FROM unnest(%s::text[], %s::uuid[]) AS t(email, user_id)
+         WHERE lower(e.email) = t.email
+           AND e.central_user_id IS DISTINCT FROM t.user_id
+        """,
+        [list(user_ids.keys()), list(user_ids.values())],
+    )
+
+
+def _stage_central(cur, job_id: str, group_id: str, rows: List[ParsedRow], role_ids: Dict[str, str]) -> None:
+    rows = [r for r in rows if r.values["role_code"]]
+    if not rows:
+        return
+    cur.execute(
+        """
+        INSERT INTO ops.import_central_sync (job_id, row_no, group_id, email, name, role_id)
+        SELECT %s, t.row_no, %s, t.email, t.name, t.role_id
+          FROM unnest(%s::int[], %s::text[], %s::text[], %s::text[]) AS t(row_no, email, name, role_id)
+        ON CONFLICT (job_id, row_no) DO UPDATE SET
+               group_id = EXCLUDED.group_id, email = EXCLUDED.email, name = EXCLUDED.name,
+               role_id = EXCLUDED.role_id, done_at = NULL
+        """,
+        [job_id, group_id, [r.row_no for r in rows], [r.values["email"] for r in rows],
+         [r.values["name"] for r in rows], [role_ids[r.values["role_code"]] for r in rows]],
+    )
+
+
+def sync_staged(alias: str, job_id) -> int:
+    """
+    적재됐지만 아직 중앙에 반영하지 않은 행을 처리(청크 커밋 뒤 / 작업 재개 때). 처리한 행 수.
+    중앙 동기화는 (이메일 기준) 몇 번을 다시 해도 결과가 같다 → 완료 표시 전에 중단돼도 안전
+    """
+    with connections[alias].cursor() as cur:
+        cur.execute(
+            "SELECT row_no, group_id, email, name, role_id FROM ops.import_central_sync "
+            "WHERE job_id = %s AND done_at IS NULL ORDER BY row_no",
+            [str(job_id)],
+        )
+        staged = cur.fetchall()
+    if not staged:
+        return 0
+
+    # 그룹별, 같은 이메일은 마지막 행이 이긴다(청크가 달라 적재가 두 번 된 경우)
+    by_group: Dict[str, Dict[str, Tuple[str, str, str]]] = {}
+    for _, group_id, email, name, role_id in staged:
+        by_group.setdefault(group_id, {})[email] = (email, name, role_id)
+    user_ids: Dict[str, str] = {}
+    for group_id, people in by_group.items():
+        user_ids.update(sync_central(group_id, list(people.values())))
+
+    with transaction.atomic(using=alias), connections[alias].cursor() as cur:
+        _link_central_ids(cur, user_ids)
+        cur.execute(
+            "UPDATE ops.import_central_sync SET done_at = now() WHERE job_id = %s AND row_no = ANY(%s)",
+            [str(job_id), [r[0] for r in staged]],
+        )
+    return len(staged)
+
+
+def merge_chunk(alias: str, job: ImportJob, rows: List[ParsedRow]) -> Tuple[int, int, List[RowError]]:
+    """imports._process_chunk 가 테넌트 트랜잭션 안에서 부른다. (추가, 수정, 오류)"""
+    # 같은 이메일이 여러 번 나오면 마지막 행이 이긴다(ON CONFLICT 한 문장에서 같은 행을 두 번 못 건드림)
+    rows = list({r.values["email"]: r for r in rows}.values())
+    rows, errors, group_id, role_ids = _resolve(alias, rows)
+    if not rows:
+        return 0, 0, errors
+
+    with connections[alias].cursor() as cur:
+        result = _upsert_profiles(cur, rows)
+        _set_managers(cur, rows)
+
+        if group_id:
+            _stage_central(cur, str(job.id), group_id, rows, role_ids)
+
+    if group_id:
+        # 중앙은 테넌트 청크가 커밋된 뒤에만(롤백되면 적재분도 없다)
+        transaction.on_commit(lambda: sync_staged(alias, job.id), using=alias)
+    hr_reference.invalidate(alias)      # 관리자 후보 캐시(청크 커밋 뒤)
+    inserted = sum(1 for r in result if r[3])
+    return inserted, len(result) - inserted, errors
@@ -0,0 +1,104 @@
+# geoflow_ops/services/hr_reference.py
+# -*- coding: utf-8 -*-
+"""
+직원 화면 참조 데이터(본사/지점, 부서, 관리자 후보) 캐시
+- 공유 캐시(control.cache) 네임스페이스 "hrref", 테넌트별 버전 키 → 쓰기 후 invalidate(alias) 로 버전만 올린다
+  (ops.my_org_units / hr.departments / hr.employee_profile 를 쓰는 곳에서 호출)
+- 상세 화면은 본사/지점·부서 목록을 캐시에서, 관리자는 현재 선택값 1건만 렌더
+  → 나머지는 원격 검색(employees_manager_options)이 캐시된 후보 목록에서 찾는다
+- 앱 밖에서 직접 고친 행은 GF_HR_REF_TTL 안에 반영된다
+- HR 옵션(직급/고용형태/상태)은 중앙 카탈로그(control.catalog.hr_reference)에서 온다
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from control import cache as shared_cache
+
+HR_REF_TTL = getattr(settings, "GF_HR_REF_TTL", 60 * 10)
+MANAGER_OPTIONS_LIMIT = getattr(settings, "GF_MANAGER_OPTIONS_LIMIT", 20)
+
+_NS = "hrref"
+
+
+def invalidate(alias: str) -> None:
+    """참조 테이블 쓰기 후 호출. 트랜잭션 안이면 커밋 뒤에 버전을 올린다(롤백되면 그대로)."""
+    transaction.on_commit(lambda: shared_cache.bump(_NS, alias), using=alias)
+
+
+def _cached(alias: str, name: str, loader: Callable[[], Any]) -> Any:
+    return shared_cache.get_or_set(_NS, name, loader, HR_REF_TTL, scope=alias)
+
+
+def _fetch(alias: str, sql: str) -> List[tuple]:
+    with connections[alias].cursor() as cur:
+        cur.execute(sql)
+        return cur.fetchall()
+
+
+# -----------------------------
+# 본사/지점, 부서
+# -----------------------------
+def org_units(alias: str) -> List[Dict[str, str]]:
+    return _cached(alias, "org_units", lambda: [
+        {"id": r[0], "name": r[1]}
+        for r in _fetch(alias, "SELECT id::text, name FROM ops.my_org_units ORDER BY name")
+    ])
+
+
+def _departments_by_org_unit(alias: str) -> Dict[str, List[Dict[str, str]]]:
+    def load():
+        out: Dict[str, List[Dict[str, str]]] = {}
+        for dept_id, ou_id, name in _fetch(
+            alias, "SELECT id::text, org_unit_id::text, name FROM hr.departments ORDER BY name"
+        ):
+            out.setdefault(ou_id or "", []).append({"id": dept_id, "name": name})
+        return out
+    return _cached(alias, "departments", load)
+
+
+def departments(alias: str, org_unit_id: Optional[str]) -> List[Dict[str, str]]:
+    if not org_unit_id:
+        return []
+    return _departments_by_org_unit(alias).get(str(org_unit_id), [])
+
+
+# -----------------------------
+# 관리자 후보
+# -----------------------------
+def _manager_candidates(alias: str) -> List[Tuple[str, str, str]]:
+    """[(id, 표시 이름, 검색용 소문자 문자열)] — 이름순"""
+    def load():
+        return [
+            (eid, name or email or eid, f"{name or ''} {email or ''}".lower())
+            for eid, name, email in _fetch(
+                alias, "SELECT id::text, name, email FROM hr.employee_profile ORDER BY name"
+            )
+        ]
+    return _cached(alias, "managers", load)
+
+
+def search_managers(alias: str, q: str = "", exclude: Optional[str] = None,
+                    limit: Optional[int] = None) -> Tuple[List[Dict[str, str]], bool]:
+    """이름/이메일 부분 일치. ([{id,text}], 더 있음?)"""
+    limit = limit or MANAGER_OPTIONS_LIMIT
+    q = (q or "").strip().lower()
+    out: List[Dict[str, str]] = []
+    for eid, label, haystack in _manager_candidates(alias):
+        if eid == exclude or (q and q not in haystack):
+            continue
+        if len(out) == limit:
+            return out, True
+        out.append({"id": eid, "text": label})
+    return out, False
+
+
+def manager_labels(alias: str, ids: Iterable[str]) -> List[Dict[str, str]]:
+    """선택값 라벨 복원용. [{id,text}] (없는 id는 빠진다)"""
+    wanted = {str(i) for i in ids if i}
+    if not wanted:
+        return []
+    return [{"id": eid, "text": label} for eid, label, _ in _manager_candidates(alias) if eid in wanted]
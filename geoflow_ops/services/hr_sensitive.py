@@ -0,0 +1,136 @@
+# geoflow_ops/services/hr_sensitive.py
+# -*- coding: utf-8 -*-
+"""
+직원 민감정보(주민번호) 쓰기/표시
+- 쓰기: 암호문/해시/뒤 4자리/마스킹 문자열을 INSERT·UPDATE 한 문장에 같이 넣는다(별도 UPDATE 없음)
+- 표시: 쓰기 시점에 만든 rrn_masked 를 그대로 읽는다 → 화면 조회 때 pgp_sym_decrypt 를 돌리지 않음
+  · rrn_masked 가 아직 비어 있는 기존 행만 같은 SELECT 안에서 복호화해 마스킹(추가 왕복 없음)
+  · 기존 행 채우기: `manage.py gf_hr_sensitive --all-tenants`
+- 마스킹 형식: 앞 6자리 + '-' + 7번째 자리 + '******' (7자리 미만이면 '*******-' + 뒤 4자리)
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+_MASKED_COLUMN_CACHE: Dict[str, bool] = {}
+
+DDL = "ALTER TABLE IF EXISTS hr.employee_profile ADD COLUMN IF NOT EXISTS rrn_masked text"
+
+# 복호화 결과(d: 숫자만)로 마스킹 — mask() 와 같은 규칙
+_MASK_FROM_DIGITS_SQL = (
+    "CASE WHEN length(d) >= 7 THEN substr(d, 1, 6) || '-' || substr(d, 7, 1) || '******' END"
+)
+
+
+def rrn_key() -> Optional[str]:
+    return getattr(settings, "RRN_SYM_KEY", None)
+
+
+def mask(digits: str) -> Optional[str]:
+    if len(digits) >= 7:
+        return f"{digits[:6]}-{digits[6]}******"
+    if digits:
+        return "*******-" + digits[-4:]
+    return None
+
+
+@dataclass(frozen=True)
+class Rrn:
+    """입력 주민번호(하이픈/공백 제거 후 숫자만)"""
+    digits: str
+
+    @classmethod
+    def parse(cls, plain: Optional[str]) -> Optional["Rrn"]:
+        digits = re.sub(r"\D", "", plain or "")
+        return cls(digits) if digits else None
+
+    @property
+    def last4(self) -> str:
+        return self.digits[-4:]
+
+    @property
+    def hash(self) -> bytes:
+        return sha256(self.digits.encode("utf-8")).digest()
+
+    @property
+    def masked(self) -> Optional[str]:
+        return mask(self.digits)
+
+
+def has_masked_column(alias: str) -> bool:
+    if alias not in _MASKED_COLUMN_CACHE:
+        with connections[alias].cursor() as cur:
+            cur.execute("""
+                SELECT 1
+                  FROM information_schema.columns
+                 WHERE table_schema='hr' AND table_name='employee_profile' AND column_name='rrn_masked'
+                 LIMIT 1
+            """)
+            _MASKED_COLUMN_CACHE[alias] = cur.fetchone() is not None
+    return _MASKED_COLUMN_CACHE[alias]
+
+
+def assignments(alias: str, rrn: Rrn) -> List[Tuple[str, str, list]]:
+    """
+    INSERT/UPDATE 에 끼워 넣을 [(컬럼, 자리표시 SQL, 파라미터)].
+    키가 없으면 암호문은 NULL(해시/뒤 4자리/마스킹만 저장).
+    """
+    key = rrn_key()
+    out: List[Tuple[str, str, list]] = [
+        ("rrn_cipher", "pgp_sym_encrypt(%s, %s)", [rrn.digits, key]) if key else ("rrn_cipher", "NULL", []),
+        ("rrn_hash", "%s", [rrn.hash]),
+        ("rrn_last4", "%s", [rrn.last4]),
+    ]
+    if has_masked_column(alias):
+        out.append(("rrn_masked", "%s", [rrn.masked]))
+    return out
+
+
+def masked_projection(alias: str, table_alias: str = "") -> Tuple[str, list]:
+    """
+    SELECT 목록에 넣을 `... AS rrn_masked` 식과 파라미터.
+    저장된 마스킹 → (없으면) 같은 SELECT 안에서 복호화 → (키 없으면) 뒤 4자리.
+    """
+    p = f"{table_alias}." if table_alias else ""
+    last4 = f"CASE WHEN {p}rrn_last4 IS NOT NULL THEN '*******-' || {p}rrn_last4 END"
+    key = rrn_key()
+    if key:
+        fallback = (f"COALESCE((SELECT {_MASK_FROM_DIGITS_SQL} FROM (SELECT regexp_replace("
+                    f"pgp_sym_decrypt({p}rrn_cipher, %s), '\\D', '', 'g') AS d) x), {last4})")
+        params = [key]
+    else:
+        fallback, params = last4, []
+    if not has_masked_column(alias):
+        return f"{fallback} AS rrn_masked", params
+    return (f"CASE WHEN {p}rrn_masked IS NOT NULL THEN {p}rrn_masked "
+            f"WHEN {p}rrn_cipher IS NULL THEN {last4} ELSE {fallback} END AS rrn_masked"), params
+
+
+def ensure_schema(alias: str) -> None:
+    with connections[alias].cursor() as cur:
+        cur.execute(DDL)
+    _MASKED_COLUMN_CACHE.pop(alias, None)
+
+
+def backfill_masked(alias: str) -> int:
+    """rrn_masked 가 비어 있는 기존 행을 한 문장으로 채운다. 채운 행 수."""
+    ensure_schema(alias)
+    expr, params = masked_projection(alias)
+    expr = expr.rsplit(" AS ", 1)[0]
+    with connections[alias].cursor() as cur:
+        cur.execute(
+            f"""
+            UPDATE hr.employee_profile
+               SET rrn_masked = {expr}
+             WHERE rrn_masked IS NULL
+               AND (rrn_cipher IS NOT NULL OR rrn_last4 IS NOT NULL)
+            """,
+            params,
+        )
+        return cur.rowcount
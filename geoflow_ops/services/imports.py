@@ -0,0 +1,976 @@
+# geoflow_ops/services/imports.py
+# -*- coding: utf-8 -*-
+"""
+파트너/계약/직원 일괄 가져오기(CSV/XLSX)
+- 업로드 파일은 ops.import_job.payload에 보관, 백그라운드 작업으로 처리(재개 가능)
+- 처리 흐름(청크 단위, 청크 = 트랜잭션 1개)
+    1) 스트리밍 파싱(CSV: csv.reader / XLSX: iterparse) → 헤더 매핑
+    2) 행 검증(형식/필수값) + 청크 단위 참조 해석(발주처/계약자, 계약번호 중복)
+    3) 임시 테이블(ON COMMIT DROP)에 COPY
+    4) INSERT ... ON CONFLICT (legacy_id | 사업자번호 숫자) DO UPDATE 로 병합
+       · 빈 칸은 기존 값을 지우지 않는다(COALESCE)
+       · 같은 키가 여러 번 나오면 마지막 행이 이긴다
+    5) 행 오류(ops.import_error) 기록 + last_row 체크포인트 갱신
+- 직원(hr.employee_profile)은 services/hr_onboarding 이 병합 + 중앙 계정/멤버십 동기화를 맡는다
+  · 중앙 동기화는 청크 커밋 뒤에 하고(ops.import_central_sync), 남은 분은 작업 재개/완료 전에 마저 처리
+- 작업 실행: 업로드 직후 프로세스 내 스레드(GF_IMPORT_INLINE_WORKER) 또는 `manage.py gf_import_worker`
+  · running인데 heartbeat가 GF_IMPORT_STALE_SECONDS 이상 멈춘 작업은 다른 워커가 이어받는다
+  · 가져갈 때마다 새 lease 를 발급, 청크 트랜잭션은 작업 행을 lease 로 잠그고 시작(FOR UPDATE)
+    → 오래 걸리는 청크는 잠금 때문에 다시 가져가지 못하고(SKIP LOCKED), lease 를 잃은 워커는 청크를 버린다
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import json
+import logging
+import re
+import threading
+import uuid
+import zipfile
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from xml.etree.ElementTree import iterparse
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connections, transaction
+from django.utils import timezone
+
+from geoflow_ops.forms import STATUS_CHOICES
+from geoflow_ops.models import ImportJob, ImportRowError
+from geoflow_ops.services import contract_codes, partner_search
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = getattr(settings, "GF_IMPORT_CHUNK_SIZE", 1000)
+MAX_UPLOAD_BYTES = getattr(settings, "GF_IMPORT_MAX_BYTES", 20 * 1024 * 1024)
+STALE_SECONDS = getattr(settings, "GF_IMPORT_STALE_SECONDS", 300)
+INLINE_WORKER = getattr(settings, "GF_IMPORT_INLINE_WORKER", True)
+FORMATS = ("csv", "xlsx")
+
+
+class ImportFileError(Exception):
+    """파일 자체를 처리할 수 없음(형식/헤더). 작업 전체를 failed로."""
+
+
+class LeaseLost(Exception):
+    """다른 워커가 작업을 이어받았다(이 워커는 작업 상태를 건드리지 않고 손을 뗀다)."""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 스키마
+
+DDL = """
+CREATE TABLE IF NOT EXISTS ops.import_job (
+    id            uuid        PRIMARY KEY,
+    kind          text        NOT NULL,
+    match_key     text        NOT NULL,
+    filename      text        NOT NULL,
+    fmt           text        NOT NULL,
+    payload       bytea       NOT NULL,
+    status        text        NOT NULL DEFAULT 'queued',
+    last_row      integer     NOT NULL DEFAULT 1,
+    total_rows    integer     NULL,
+    inserted      integer     NOT NULL DEFAULT 0,
+    updated       integer     NOT NULL DEFAULT 0,
+    failed        integer     NOT NULL DEFAULT 0,
+    last_error    text        NULL,
+    created_by    text        NULL,
+    created_at    timestamptz NOT NULL DEFAULT now(),
+    started_at    timestamptz NULL,
+    heartbeat_at  timestamptz NULL,
+    finished_at   timestamptz NULL,
+    lease         uuid        NULL
+);
+ALTER TABLE ops.import_job ADD COLUMN IF NOT EXISTS lease uuid NULL;
+CREATE INDEX IF NOT EXISTS import_job_status_idx ON ops.import_job (status, created_at);
+CREATE TABLE IF NOT EXISTS ops.import_error (
+    id       bigserial PRIMARY KEY,
+    job_id   uuid      NOT NULL REFERENCES ops.import_job (id) ON DELETE CASCADE,
+    row_no   integer   NOT NULL,
+    field    text      NULL,
+    message  text      NOT NULL,
+    raw      jsonb     NULL
+);
+CREATE INDEX IF NOT EXISTS import_error_job_idx ON ops.import_error (job_id, row_no);
+CREATE TABLE IF NOT EXISTS ops.import_central_sync (
+    job_id    uuid        NOT NULL REFERENCES ops.import_job (id) ON DELETE CASCADE,
+    row_no    integer     NOT NULL,
+    group_id  text        NOT NULL,
+    email     text        NOT NULL,
+    name      text        NULL,
+    role_id   text        NOT NULL,
+    done_at   timestamptz NULL,
+    PRIMARY KEY (job_id, row_no)
+);
+"""
+
+# ON CONFLICT 대상 인덱스(기존 데이터에 중복이 있으면 만들 수 없으므로 작업 테이블과 분리)
+# 키: (종류, 병합 키) → (스키마 포함 인덱스명, DDL)
+BIZ_DIGITS_SQL = "regexp_replace(biz_no, '[^0-9]', '', 'g')"
+KEY_INDEXES = {
+    ("partners", "legacy_id"): (
+        "ctr.partners_legacy_id_uq",
+        "CREATE UNIQUE INDEX IF NOT EXISTS partners_legacy_id_uq ON ctr.partners (legacy_id) "
+        "WHERE legacy_id IS NOT NULL",
+    ),
+    ("partners", "biz_no"): (
+        "ctr.partners_biz_digits_uq",
+        f"CREATE UNIQUE INDEX IF NOT EXISTS partners_biz_digits_uq ON ctr.partners (({BIZ_DIGITS_SQL})) "
+        "WHERE biz_no IS NOT NULL AND biz_no <> ''",
+    ),
+    ("contracts", "legacy_id"): (
+        "ctr.contracts_legacy_id_uq",
+        "CREATE UNIQUE INDEX IF NOT EXISTS contracts_legacy_id_uq ON ctr.contracts (legacy_id) "
+        "WHERE legacy_id IS NOT NULL",
+    ),
+    ("employees", "email"): (
+        "hr.employee_profile_email_uq",
+        "CREATE UNIQUE INDEX IF NOT EXISTS employee_profile_email_uq ON hr.employee_profile ((lower(email))) "
+        "WHERE email IS NOT NULL",
+    ),
+}
+
+
+def ensure_schema(alias: str) -> None:
+    with connections[alias].cursor() as cur:
+        cur.execute(DDL)
+
+
+def ensure_key_indexes(alias: str) -> Dict[str, Optional[str]]:
+    """키 인덱스를 만든다. {인덱스명: None(성공) | 오류 메시지(기존 중복 등)}"""
+    out: Dict[str, Optional[str]] = {}
+    for name, sql in KEY_INDEXES.values():
+        try:
+            with transaction.atomic(using=alias), connections[alias].cursor() as cur:
+                cur.execute(sql)
+            out[name] = None
+        except Exception as e:  # 기존 데이터 중복 → 해당 키로는 가져오기 불가
+            out[name] = str(e).strip().splitlines()[0]
+    return out
+
+
+def has_key_index(alias: str, kind: str, match_key: str) -> bool:
+    name, _ = KEY_INDEXES[(kind, match_key)]
+    with connections[alias].cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        return bool(cur.fetchone()[0])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 파일 읽기(스트리밍)
+
+def _decode_lines(data: bytes) -> io.TextIOBase:
+    """UTF-8(BOM 포함) 우선, 아니면 엑셀 기본 저장 형식인 CP949."""
+    head = data[:65536]
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError:
+        encoding = "cp949"
+    return io.TextIOWrapper(io.BytesIO(data), encoding=encoding, errors="replace", newline="")
+
+
+def _iter_csv(data: bytes) -> Iterator[Tuple[int, List[str]]]:
+    reader = csv.reader(_decode_lines(data))
+    for row in reader:
+        yield reader.line_num, row
+
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_COL_RE = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _col_index(ref: str) -> int:
+    n = 0
+    for ch in ref:
+        n = n * 26 + (ord(ch) - 64)
+    return n - 1
+
+
+def _first_sheet_path(zf: zipfile.ZipFile) -> str:
+    try:
+        rid = None
+        for _, el in iterparse(zf.open("xl/workbook.xml")):
+            if el.tag == f"{_NS}sheet":
+                rid = el.get(f"{_REL_NS}id")
+                break
+        if rid:
+            for _, el in iterparse(zf.open("xl/_rels/workbook.xml.rels")):
+                if el.get("Id") == rid:
+                    target = el.get("Target").lstrip("/")
+                    return target if target.startswith("xl/") else f"xl/{target}"
+    except KeyError:
+        pass
+    return "xl/worksheets/sheet1.xml"
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    out: List[str] = []
+    for _, el in iterparse(zf.open("xl/sharedStrings.xml")):
+        if el.tag == f"{_NS}si":
+            out.append("".join(t.text or "" for t in el.iter(f"{_NS}t")))
+            el.clear()
+    return out
+
+
+def _iter_xlsx(data: bytes) -> Iterator[Tuple[int, List[str]]]:
+    try:
+        zf = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        raise ImportFileError("XLSX 파일을 열 수 없습니다.")
+    try:
+        sst = _shared_strings(zf)
+        sheet = zf.open(_first_sheet_path(zf))
+    except KeyError:                            # 통합 문서에 시트 파일이 없음
+        raise ImportFileError("XLSX 파일에서 시트를 찾을 수 없습니다.")
+    seq = 0
+    for _, el in iterparse(sheet):
+        if el.tag != f"{_NS}row":
+            continue
+        seq += 1
+        row_no = int(el.get("r") or seq)
+        values: Dict[int, str] = {}
+        for i, c in enumerate(el.iter(f"{_NS}c")):
+            m = _COL_RE.match(c.get("r") or "")
+            col = _col_index(m.group(1)) if m else i
+            t = c.get("t")
+            if t == "inlineStr":
+                v = "".join(x.text or "" for x in c.iter(f"{_NS}t"))
+            else:
+                ve = c.find(f"{_NS}v")
+                v = ve.text if ve is not None and ve.text is not None else ""
+                if t == "s" and v:
+                    v = sst[int(v)]
+            values[col] = v
+        el.clear()
+        width = max(values) + 1 if values else 0
+        yield row_no, [values.get(i, "") for i in range(width)]
+
+
+def iter_rows(fmt: str, data: bytes) -> Iterator[Tuple[int, List[str]]]:
+    """(행 번호, 셀 문자열 목록). 첫 행이 헤더."""
+    return _iter_xlsx(data) if fmt == "xlsx" else _iter_csv(data)
+
+
+def detect_format(filename: str) -> Optional[str]:
+    ext = (filename or "").rsplit(".", 1)[-1].lower()
+    return ext if ext in FORMATS else None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 셀 값 변환(ValueError 메시지가 곧 행 오류 메시지)
+
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+
+def _text(v: str) -> Optional[str]:
+    v = (v or "").strip()
+    return v or None
+
+
+def _int(v: str) -> Optional[int]:
+    v = (v or "").strip().replace(",", "")
+    if not v:
+        return None
+    try:
+        d = Decimal(v)
+    except InvalidOperation:
+        raise ValueError("정수가 아닙니다")
+    if d != d.to_integral_value():
+        raise ValueError("정수가 아닙니다")
+    return int(d)
+
+
+def _date(v: str) -> Optional[date]:
+    v = (v or "").strip()
+    if not v:
+        return None
+    s = re.sub(r"[./]", "-", v)
+    try:
+        return date.fromisoformat(s[:10])
+    except ValueError:
+        pass
+    if len(v) == 8 and v.isdigit():
+        try:
+            return date(int(v[:4]), int(v[4:6]), int(v[6:]))
+        except ValueError:
+            raise ValueError("날짜 형식이 아닙니다")
+    try:
+        serial = float(v)                       # XLSX 날짜 셀(일련번호)
+    except ValueError:
+        raise ValueError("날짜 형식이 아닙니다(YYYY-MM-DD)")
+    if not 1 <= serial < 2958466:
+        raise ValueError("날짜 형식이 아닙니다(YYYY-MM-DD)")
+    return _EXCEL_EPOCH + timedelta(days=int(serial))
+
+
+def _amount(v: str) -> Optional[int]:
+    v = re.sub(r"[,\s원₩]", "", v or "")
+    if not v:
+        return None
+    try:
+        d = Decimal(v)
+    except InvalidOperation:
+        raise ValueError("금액이 숫자가 아닙니다")
+    n = int(d.to_integral_value())
+    if abs(n) >= 10 ** 14:
+        raise ValueError("금액이 너무 큽니다")
+    return n
+
+
+def _biz_no(v: str) -> Optional[str]:
+    v = _text(v)
+    if v is None:
+        return None
+    if len(partner_search.digits(v)) != 10:
+        raise ValueError("사업자번호는 숫자 10자리여야 합니다")
+    return v
+
+
+def _email(v: str) -> Optional[str]:
+    v = _text(v)
+    if v is None:
+        return None
+    try:
+        validate_email(v)
+    except ValidationError:
+        raise ValueError("이메일 형식이 아닙니다")
+    return v
+
+
+def _lower_email(v: str) -> Optional[str]:
+    v = _email(v)
+    return v.lower() if v else None
+
+
+_STATUS_BY_LABEL = {label: code for code, label in STATUS_CHOICES}
+
+
+def _contract_status(v: str) -> Optional[str]:
+    v = _text(v)
+    return _STATUS_BY_LABEL.get(v, v) if v else None
+
+
+@dataclass(frozen=True)
+class Field:
+    key: str
+    aliases: Tuple[str, ...]            # 헤더로 인정하는 이름(목록/내보내기 라벨 포함)
+    parse: Callable[[str], Any] = _text
+    required: bool = False
+
+
+def _norm_header(h: str) -> str:
+    return re.sub(r"[\s_\-*]+", "", (h or "").strip().lstrip("\ufeff")).lower()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 종류별 정의
+
+@dataclass(frozen=True)
+class ImportKind:
+    kind: str
+    title: str
+    fields: Tuple[Field, ...]
+    match_keys: Tuple[str, ...]
+
+    def field(self, key: str) -> Field:
+        return next(f for f in self.fields if f.key == key)
+
+    def map_header(self, header: Sequence[str]) -> Dict[str, int]:
+        names = {}
+        for f in self.fields:
+            for a in (f.key,) + f.aliases:
+                names[_norm_header(a)] = f.key
+        out: Dict[str, int] = {}
+        for i, h in enumerate(header):
+            key = names.get(_norm_header(h))
+            if key and key not in out:
+                out[key] = i
+        missing = [f.key for f in self.fields if f.required and f.key not in out]
+        if missing:
+            labels = ", ".join(f"{self.field(k).aliases[0]}({k})" for k in missing)
+            raise ImportFileError(f"필수 열이 없습니다: {labels}")
+        return out
+
+
+PARTNERS = ImportKind(
+    kind="partners",
+    title="파트너",
+    fields=(
+        Field("legacy_id", ("기존ID", "레거시ID"), _int),
+        Field("name", ("회사명", "업체명", "상호"), _text, required=True),
+        Field("type", ("구분",)),
+        Field("biz_no", ("사업자번호", "사업자등록번호"), _biz_no),
+        Field("rep_name", ("대표자", "대표자명")),
+        Field("phone", ("연락처", "전화번호")),
+        Field("email", ("이메일",), _email),
+        Field("address", ("주소",)),
+        Field("status", ("상태",)),
+        Field("description", ("비고",)),
+    ),
+    match_keys=("legacy_id", "biz_no"),
+)
+
+CONTRACTS = ImportKind(
+    kind="contracts",
+    title="계약",
+    fields=(
+        Field("legacy_id", ("기존ID", "레거시ID"), _int, required=True),
+        Field("code", ("계약번호",)),
+        Field("name", ("계약명", "프로젝트 이름"), _text, required=True),
+        Field("start_date", ("시작일", "계약일"), _date),
+        Field("end_date", ("종료일",), _date),
+        Field("amount", ("계약금액", "금액"), _amount),
+        Field("status", ("상태",), _contract_status),
+        Field("kind", ("계약형태",)),
+        Field("division", ("부서", "사업부")),
+        Field("client", ("발주처",)),            # 파트너 legacy_id / 사업자번호 / 정확한 회사명
+        Field("sub_client", ("원도급",)),
+        Field("org_unit", ("계약자",)),          # 본사/지사 이름 또는 별칭
+        Field("description", ("비고",)),
+    ),
+    match_keys=("legacy_id",),
+)
+
+EMPLOYEES = ImportKind(
+    kind="employees",
+    title="직원",
+    fields=(
+        Field("email", ("이메일",), _lower_email, required=True),
+        Field("name", ("이름", "성명"), _text, required=True),
+        Field("phone", ("연락처", "전화번호", "휴대폰")),
+        Field("title", ("직함", "직책")),
+        Field("position_grade", ("직급",)),
+        Field("emp_type", ("고용형태", "고용구분")),
+        Field("emp_no", ("사번", "사원번호")),
+        Field("status", ("상태", "재직상태")),
+        Field("hire_date", ("입사일",), _date),
+        Field("term_date", ("퇴사일",), _date),
+        Field("org_unit", ("소속", "본사/지사")),     # 본사/지사 이름 또는 별칭
+        Field("department", ("부서",)),               # 소속 본사/지사의 부서명
+        Field("manager", ("관리자", "상급자"), _lower_email),   # 관리자 이메일(같은 파일 안도 가능)
+        Field("role_code", ("역할코드", "역할", "role")),       # 있으면 중앙 계정/멤버십까지 동기화
+    ),
+    match_keys=("email",),
+)
+
+KINDS: Dict[str, ImportKind] = {k.kind: k for k in (PARTNERS, CONTRACTS, EMPLOYEES)}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 검증 결과
+
+@dataclass
+class RowError:
+    row_no: int
+    field: Optional[str]
+    message: str
+    raw: Dict[str, str]
+
+
+@dataclass
+class ParsedRow:
+    row_no: int
+    values: Dict[str, Any]
+    raw: Dict[str, str]
+
+
+def _parse_row(spec: ImportKind, cols: Dict[str, int], row_no: int, cells: List[str],
+               match_key: str) -> Tuple[Optional[ParsedRow], List[RowError]]:
+    raw = {k: (cells[i] if i < len(cells) else "") for k, i in cols.items()}
+    values: Dict[str, Any] = {}
+    errors: List[RowError] = []
+    for f in spec.fields:
+        try:
+            values[f.key] = f.parse(raw.get(f.key, "")) if f.key in raw else None
+        except ValueError as e:
+            errors.append(RowError(row_no, f.key, str(e), raw))
+            continue
+        if f.required and values[f.key] is None:
+            errors.append(RowError(row_no, f.key, "필수 값이 비어 있습니다", raw))
+    if not errors and values.get(match_key) is None:
+        errors.append(RowError(row_no, match_key, "병합 키가 비어 있습니다", raw))
+    return (None if errors else ParsedRow(row_no, values, raw)), errors
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 청크 병합(파트너)
+
+_PARTNER_STAGE = """
+CREATE TEMP TABLE gf_import_partners (
+    row_no integer, match_key text, legacy_id bigint, name text, type text, biz_no text,
+    rep_name text, phone text, email text, address text, status text, description text
+) ON COMMIT DROP
+"""
+_PARTNER_COLS = ("row_no", "match_key", "legacy_id", "name", "type", "biz_no",
+                 "rep_name", "phone", "email", "address", "status", "description")
+
+_PARTNER_CONFLICT = {
+    "legacy_id": "(legacy_id) WHERE legacy_id IS NOT NULL",
+    "biz_no": f"(({BIZ_DIGITS_SQL})) WHERE biz_no IS NOT NULL AND biz_no <> ''",
+}
+
+_PARTNER_MERGE = """
+INSERT INTO ctr.partners AS p
+       (id, legacy_id, name, type, biz_no, rep_name, phone, email, address, status, description,
+        created_at, updated_at)
+SELECT gen_random_uuid(), s.legacy_id, s.name, s.type, s.biz_no, s.rep_name, s.phone, s.email,
+       s.address, s.status, s.description, now(), now()
+  FROM (SELECT DISTINCT ON (match_key) * FROM gf_import_partners ORDER BY match_key, row_no DESC) s
+ON CONFLICT {conflict} DO UPDATE SET
+       legacy_id   = COALESCE(EXCLUDED.legacy_id, p.legacy_id),
+       name        = EXCLUDED.name,
+       type        = COALESCE(EXCLUDED.type, p.type),
+       biz_no      = COALESCE(EXCLUDED.biz_no, p.biz_no),
+       rep_name    = COALESCE(EXCLUDED.rep_name, p.rep_name),
+       phone       = COALESCE(EXCLUDED.phone, p.phone),
+       email       = COALESCE(EXCLUDED.email, p.email),
+       address     = COALESCE(EXCLUDED.address, p.address),
+       status      = COALESCE(EXCLUDED.status, p.status),
+       description = COALESCE(EXCLUDED.description, p.description),
+       updated_at  = now()
+RETURNING p.id, p.name, p.rep_name, p.biz_no, (p.xmax = 0)
+"""
+
+
+def _copy(cur, table: str, cols: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    for r in rows:
+        w.writerow(["" if v is None else v for v in r])   # 따옴표 없는 빈 칸 = NULL
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(cols)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def _partner_key(v: Dict[str, Any], key: str) -> Optional[str]:
+    if v[key] is None:
+        return None
+    return str(v["legacy_id"]) if key == "legacy_id" else partner_search.digits(v["biz_no"])
+
+
+def _check_partner_keys(alias: str, match_key: str, rows: List[ParsedRow]) -> Tuple[List[ParsedRow], List[RowError]]:
+    """
+    병합 키가 아닌 쪽 키(legacy_id ↔ 사업자번호)가 다른 파트너와 겹치는 행을 걸러낸다.
+    (그대로 두면 유니크 인덱스 위반으로 청크 전체가 실패) 그 키의 인덱스가 없으면 검사하지 않는다.
+    """
+    other = "biz_no" if match_key == "legacy_id" else "legacy_id"
+    wanted = {_partner_key(r.values, other) for r in rows} - {None}
+    if not wanted or not has_key_index(alias, "partners", other):
+        return rows, []
+    with connections[alias].cursor() as cur:
+        if other == "biz_no":
+            cur.execute(
+                f"SELECT {BIZ_DIGITS_SQL}, legacy_id::text FROM ctr.partners "
+                f"WHERE biz_no IS NOT NULL AND biz_no <> '' AND {BIZ_DIGITS_SQL} = ANY(%s)",
+                [list(wanted)],
+            )
+        else:
+            cur.execute(
+                f"SELECT legacy_id::text, {BIZ_DIGITS_SQL} FROM ctr.partners WHERE legacy_id = ANY(%s::bigint[])",
+                [[int(x) for x in wanted]],
+            )
+        owner: Dict[str, Optional[str]] = dict(cur.fetchall())      # 다른 키 → 그 파트너의 병합 키
+
+    label = PARTNERS.field(other).aliases[0]
+    ok, errors = [], []
+    for r in rows:
+        mine, theirs = _partner_key(r.values, match_key), _partner_key(r.values, other)
+        if theirs is not None and theirs in owner and owner[theirs] != mine:
+            errors.append(RowError(r.row_no, other, f"이미 다른 파트너가 쓰는 {label}입니다: {r.values[other]}", r.raw))
+            continue
+        if theirs is not None:
+            owner[theirs] = mine                        # 같은 청크 안의 다음 행과도 비교
+        ok.append(r)
+    return ok, errors
+
+
+def _merge_partners(alias: str, job: ImportJob, rows: List[ParsedRow]) -> Tuple[int, int, List[RowError]]:
+    rows, errors = _check_partner_keys(alias, job.match_key, rows)
+    if not rows:
+        return 0, 0, errors
+    staged = [(r.row_no, _partner_key(r.values, job.match_key)) + tuple(r.values[c] for c in _PARTNER_COLS[2:])
+              for r in rows]
+    with connections[alias].cursor() as cur:
+        cur.execute(_PARTNER_STAGE)
+        _copy(cur, "gf_import_partners", _PARTNER_COLS, staged)
+        cur.execute(_PARTNER_MERGE.format(conflict=_PARTNER_CONFLICT[job.match_key]))
+        result = cur.fetchall()
+    partner_search.upsert_rows(alias, [(pid, name, rep, biz) for pid, name, rep, biz, _ in result])
+    inserted = sum(1 for r in result if r[4])
+    return inserted, len(result) - inserted, errors
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 청크 병합(계약)
+
+_CONTRACT_STAGE = """
+CREATE TEMP TABLE gf_import_contracts (
+    row_no integer, legacy_id bigint, code text, name text, start_date date, end_date date,
+    amount numeric(14,0), status text, kind text, division text,
+    client_id uuid, sub_client_id uuid, org_unit_id uuid, description text
+) ON COMMIT DROP
+"""
+_CONTRACT_COLS = ("row_no", "legacy_id", "code", "name", "start_date", "end_date", "amount", "status",
+                  "kind", "division", "client_id", "sub_client_id", "org_unit_id", "description")
+
+_CONTRACT_MERGE = """
+INSERT INTO ctr.contracts AS c
+       (id, legacy_id, code, name, start_date, end_date, amount, status, kind, division,
+        client_id, sub_client_id, org_unit_id, description, ext, created_at, updated_at)
+SELECT gen_random_uuid(), s.legacy_id, s.code, s.name, s.start_date, s.end_date, s.amount, s.status,
+       s.kind, s.division, s.client_id, s.sub_client_id, s.org_unit_id, s.description, '{}'::jsonb,
+       now(), now()
+  FROM (SELECT DISTINCT ON (legacy_id) * FROM gf_import_contracts ORDER BY legacy_id, row_no DESC) s
+ON CONFLICT (legacy_id) WHERE legacy_id IS NOT NULL DO UPDATE SET
+       code          = COALESCE(EXCLUDED.code, c.code),
+       name          = EXCLUDED.name,
+       start_date    = COALESCE(EXCLUDED.start_date, c.start_date),
+       end_date      = COALESCE(EXCLUDED.end_date, c.end_date),
+       amount        = COALESCE(EXCLUDED.amount, c.amount),
+       status        = COALESCE(EXCLUDED.status, c.status),
+       kind          = COALESCE(EXCLUDED.kind, c.kind),
+       division      = COALESCE(EXCLUDED.division, c.division),
+       client_id     = COALESCE(EXCLUDED.client_id, c.client_id),
+       sub_client_id = COALESCE(EXCLUDED.sub_client_id, c.sub_client_id),
+       org_unit_id   = COALESCE(EXCLUDED.org_unit_id, c.org_unit_id),
+       description   = COALESCE(EXCLUDED.description, c.description),
+       updated_at    = now()
+RETURNING c.id, c.code, (c.xmax = 0)
+"""
+
+
+def _partner_refs(alias: str, refs: set) -> Dict[str, List[str]]:
+    """참조 문자열 → 후보 파트너 id 목록(legacy_id / 사업자번호 숫자 / 정확한 회사명). 쿼리 1회."""
+    if not refs:
+        return {}
+    ints = [int(r) for r in refs if r.isdigit() and len(r) < 19]
+    bizs = [d for d in (partner_search.digits(r) for r in refs) if len(d) == 10]
+    with connections[alias].cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT id::text, legacy_id, {BIZ_DIGITS_SQL}, name
+              FROM ctr.partners
+             WHERE legacy_id = ANY(%s::bigint[]) OR {BIZ_DIGITS_SQL} = ANY(%s) OR name = ANY(%s)
+            """,
+            [ints, bizs, list(refs)],
+        )
+        rows = cur.fetchall()
+    out: Dict[str, List[str]] = {}
+    for ref in refs:
+        d = partner_search.digits(ref)
+        hit = ([pid for pid, lid, _, _ in rows if lid is not None and str(lid) == ref]
+               or ([pid for pid, _, biz, _ in rows if len(d) == 10 and biz == d])
+               or [pid for pid, _, _, name in rows if name == ref])
+        out[ref] = sorted(set(hit))
+    return out
+
+
+def _org_unit_refs(alias: str) -> Dict[str, List[str]]:
+    with connections[alias].cursor() as cur:
+        cur.execute("SELECT id::text, name, label FROM ops.my_org_units")
+        out: Dict[str, List[str]] = {}
+        for oid, name, label in cur.fetchall():
+            for k in {name, label} - {None, ""}:
+                out.setdefault(k, []).append(oid)
+    return out
+
+
+def _resolve_contract_refs(alias: str, rows: List[ParsedRow]) -> Tuple[List[ParsedRow], List[RowError]]:
+    refs = {r.values[k] for r in rows for k in ("client", "sub_client") if r.values[k]}
+    partners = _partner_refs(alias, refs)
+    org_units = _org_unit_refs(alias) if any(r.values["org_unit"] for r in rows) else {}
+
+    codes = [r.values["code"] for r in rows if r.values["code"]]
+    taken: Dict[str, Optional[int]] = {}
+    in_chunk: Dict[str, Optional[int]] = {}            # 계약번호 → 파일에서 처음 쓴 legacy_id
+    if codes:
+        with connections[alias].cursor() as cur:
+            cur.execute("SELECT code, legacy_id FROM ctr.contracts WHERE code = ANY(%s)", [codes])
+            taken = dict(cur.fetchall())
+
+    ok, errors = [], []
+    for r in rows:
+        v, bad = r.values, []
+        for k in ("client", "sub_client"):
+            ids = partners.get(v[k], []) if v[k] else [None]
+            if not ids:
+                bad.append((k, f"파트너를 찾을 수 없습니다: {v[k]}"))
+            elif len(ids) > 1:
+                bad.append((k, f"같은 이름의 파트너가 여러 개입니다(사업자번호로 지정): {v[k]}"))
+            else:
+                v[f"{k}_id"] = ids[0]
+        ids = org_units.get(v["org_unit"], []) if v["org_unit"] else [None]
+        if len(ids) != 1:
+            bad.append(("org_unit", f"계약자(본사/지사)를 찾을 수 없습니다: {v['org_unit']}"))
+        else:
+            v["org_unit_id"] = ids[0]
+        if v["code"] in taken and taken[v["code"]] != v["legacy_id"]:
+            bad.append(("code", f"이미 다른 계약이 쓰는 계약번호입니다: {v['code']}"))
+        elif v["code"]:
+            owner = in_chunk.setdefault(v["code"], v["legacy_id"])
+            if owner != v["legacy_id"]:
+                bad.append(("code", f"파일 안에서 다른 계약(legacy_id {owner})이 먼저 쓴 계약번호입니다: {v['code']}"))
+        if bad:
+            errors += [RowError(r.row_no, k, msg, r.raw) for k, msg in bad]
+        else:
+            ok.append(r)
+    return ok, errors
+
+
+def _merge_contracts(alias: str, job: ImportJob, rows: List[ParsedRow]) -> Tuple[int, int, List[RowError]]:
+    rows, errors = _resolve_contract_refs(alias, rows)
+    if not rows:
+        return 0, 0, errors
+    staged = [(r.row_no,) + tuple(r.values[c] for c in _CONTRACT_COLS[1:]) for r in rows]
+    with connections[alias].cursor() as cur:
+        cur.execute(_CONTRACT_STAGE)
+        _copy(cur, "gf_import_contracts", _CONTRACT_COLS, staged)
+        cur.execute(_CONTRACT_MERGE)
+        result = cur.fetchall()
+
+        # 계약번호 없이 새로 들어온 계약은 발급기로 번호를 붙인다
+        missing = [cid for cid, code, ins in result if ins and not code]
+        if missing:
+            new_codes = [contract_codes.allocate_contract_code(alias) for _ in missing]
+            cur.execute(
+                "UPDATE ctr.contracts c SET code = t.code FROM unnest(%s::uuid[], %s::text[]) AS t(id, code) "
+                "WHERE c.id = t.id",
+                [[str(x) for x in missing], new_codes],
+            )
+    # 가져온 번호가 현재 형식이면 카운터를 그 이상으로 올린다
+    contract_codes.seed_counters(alias, contract_codes.scan_counters(alias, [c for _, c, _ in result if c]))
+    inserted = sum(1 for r in result if r[2])
+    return inserted, len(result) - inserted, errors
+
+
+def _merge_employees(alias: str, job: ImportJob, rows: List[ParsedRow]) -> Tuple[int, int, List[RowError]]:
+    from geoflow_ops.services import hr_onboarding     # hr_onboarding이 이 모듈을 쓰므로 지연 import
+    return hr_onboarding.merge_chunk(alias, job, rows)
+
+
+def _sync_employees(alias: str, job: ImportJob) -> None:
+    from geoflow_ops.services import hr_onboarding
+    hr_onboarding.sync_staged(alias, job.id)
+
+
+_MERGERS = {"partners": _merge_partners, "contracts": _merge_contracts, "employees": _merge_employees}
+# 청크 커밋 뒤 후속 처리 중 남은 분(중단/실패) — 작업 시작(재개)과 완료 직전에 부른다
+_FOLLOW_UPS: Dict[str, Callable[[str, ImportJob], None]] = {"employees": _sync_employees}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 작업
+
+def create_job(alias: str, kind: str, match_key: str, upload, created_by: Optional[str] = None,
+               deny_fields: Sequence[str] = ()) -> ImportJob:
+    """
+    업로드 파일을 검증해 작업을 만든다(처리는 run_job). 잘못된 입력은 ValueError.
+    deny_fields: 업로더 권한으로 가져올 수 없는 열(헤더에 있으면 거부)
+    """
+    spec = KINDS.get(kind)
+    if spec is None or match_key not in spec.match_keys:
+        raise ValueError("지원하지 않는 가져오기 종류/키입니다.")
+    fmt = detect_format(upload.name)
+    if fmt is None:
+        raise ValueError("CSV 또는 XLSX 파일만 가져올 수 있습니다.")
+    if upload.size > MAX_UPLOAD_BYTES:
+        raise ValueError(f"파일이 너무 큽니다(최대 {MAX_UPLOAD_BYTES // (1024 * 1024)}MB).")
+    data = b"".join(upload.chunks())
+
+    # 헤더만 먼저 확인(업로드 화면에서 바로 알려줌)
+    try:
+        first = next(iter(iter_rows(fmt, data)), None)
+    except ImportFileError as e:
+        raise ValueError(str(e))
+    if first is None:
+        raise ValueError("빈 파일입니다.")
+    try:
+        cols = spec.map_header(first[1])
+    except ImportFileError as e:
+        raise ValueError(str(e))
+    denied = [spec.field(k).aliases[0] for k in deny_fields if k in cols]
+    if denied:
+        raise ValueError(f"이 열을 가져올 권한이 없습니다: {', '.join(denied)}")
+
+    job = ImportJob(kind=kind, match_key=match_key, filename=upload.name, fmt=fmt,
+                    payload=data, created_by=created_by)
+    job.save(using=alias, force_insert=True)
+    return job
+
+
+_CLAIM_SQL = """
+UPDATE ops.import_job
+   SET status = 'running', started_at = COALESCE(started_at, now()), heartbeat_at = now(), last_error = NULL,
+       lease = %s
+ WHERE id = (
+        SELECT id FROM ops.import_job
+         WHERE (%s::uuid IS NULL OR id = %s::uuid)
+           AND (status = 'queued'
+                OR (status = 'running' AND heartbeat_at < now() - make_interval(secs => %s)))
+         ORDER BY created_at
+         LIMIT 1
+         FOR UPDATE SKIP LOCKED)
+RETURNING id
+"""
+
+
+def claim_job(alias: str, job_id=None) -> Optional[Tuple[str, str]]:
+    """대기 중(또는 멈춘) 작업 1건을 running으로 가져온다. (작업 id, lease)"""
+    lease = str(uuid.uuid4())
+    with transaction.atomic(using=alias), connections[alias].cursor() as cur:
+        jid = str(job_id) if job_id else None
+        cur.execute(_CLAIM_SQL, [lease, jid, jid, STALE_SECONDS])
+        row = cur.fetchone()
+    return (str(row[0]), lease) if row else None
+
+
+def _hold_lease(cur, job_id: str, lease: str) -> None:
+    """청크 트랜잭션 처음에: 작업 행을 잠근다(커밋까지 다시 가져가기 불가). lease 가 바뀌었으면 LeaseLost."""
+    cur.execute("SELECT 1 FROM ops.import_job WHERE id = %s AND lease = %s FOR UPDATE", [job_id, lease])
+    if cur.fetchone() is None:
+        raise LeaseLost(job_id)
+
+
+def _record_errors(cur, job_id: str, errors: List[RowError]) -> None:
+    if not errors:
+        return
+    cur.execute(
+        """
+        INSERT INTO ops.import_error (job_id, row_no, field, message, raw)
+        SELECT %s, t.row_no, t.field, t.message, t.raw::jsonb
+          FROM unnest(%s::int[], %s::text[], %s::text[], %s::text[]) AS t(row_no, field, message, raw)
+        """,
+        [job_id, [e.row_no for e in errors], [e.field for e in errors], [e.message for e in errors],
+         [json.dumps(e.raw, ensure_ascii=False) for e in errors]],
+    )
+
+
+def _process_chunk(alias: str, job: ImportJob, lease: str, spec: ImportKind, cols: Dict[str, int],
+                   chunk: List[Tuple[int, List[str]]]) -> None:
+    parsed, errors = [], []
+    for row_no, cells in chunk:
+        if not any((c or "").strip() for c in cells):
+            continue                                   # 빈 줄
+        row, errs = _parse_row(spec, cols, row_no, cells, job.match_key)
+        errors += errs
+        if row is not None:
+            parsed.append(row)
+
+    with transaction.atomic(using=alias):
+        with connections[alias].cursor() as cur:
+            _hold_lease(cur, str(job.id), lease)
+        ins = upd = 0
+        if parsed:
+            ins, upd, more = _MERGERS[job.kind](alias, job, parsed)
+            errors += more
+        failed_rows = len({e.row_no for e in errors})
+        with connections[alias].cursor() as cur:
+            _record_errors(cur, str(job.id), errors)
+            cur.execute(
+                """
+                UPDATE ops.import_job
+                   SET last_row = %s, inserted = inserted + %s, updated = updated + %s,
+                       failed = failed + %s, heartbeat_at = now()
+                 WHERE id = %s
+                """,
+                [chunk[-1][0], ins, upd, failed_rows, str(job.id)],
+            )
+
+
+def run_job(alias: str, job_id, lease: str) -> ImportJob:
+    """claim_job으로 가져온 작업을 last_row 다음 행부터 끝까지 처리."""
+    job = ImportJob.objects.using(alias).get(pk=job_id)
+    mine = ImportJob.objects.using(alias).filter(pk=job.pk, lease=lease)
+    spec = KINDS[job.kind]
+    try:
+        if not has_key_index(alias, job.kind, job.match_key):
+            raise ImportFileError(
+                f"병합 키 인덱스가 없습니다. `manage.py gf_imports --database {alias}`로 만들고 "
+                f"기존 데이터의 중복 {job.match_key}를 정리하세요."
+            )
+        rows = iter_rows(job.fmt, bytes(job.payload))
+        header = next(rows, None)
+        if header is None:
+            raise ImportFileError("빈 파일입니다.")
+        cols = spec.map_header(header[1])
+        follow_up = _FOLLOW_UPS.get(job.kind)
+        if follow_up:
+            follow_up(alias, job)
+
+        chunk: List[Tuple[int, List[str]]] = []
+        last_no = header[0]
+        for row_no, cells in rows:
+            last_no = row_no
+            if row_no <= job.last_row:
+                continue                               # 이미 처리한 청크(재개)
+            chunk.append((row_no, cells))
+            if len(chunk) >= CHUNK_SIZE:
+                _process_chunk(alias, job, lease, spec, cols, chunk)
+                chunk = []
+        if chunk:
+            _process_chunk(alias, job, lease, spec, cols, chunk)
+        if follow_up:
+            follow_up(alias, job)
+
+        mine.update(status="done", total_rows=max(last_no - header[0], 0), finished_at=timezone.now())
+    except LeaseLost:
+        logger.warning("[import] job=%s alias=%s taken over by another worker", job_id, alias)
+    except Exception as e:
+        logger.exception("[import] job=%s alias=%s failed", job_id, alias)
+        mine.update(status="failed", last_error=str(e)[:2000], finished_at=timezone.now())
+    return ImportJob.objects.using(alias).defer("payload").get(pk=job.pk)
+
+
+def run_pending(alias: str, job_id=None, limit: Optional[int] = None) -> int:
+    """대기 작업을 차례로 처리. 처리한 작업 수."""
+    n = 0
+    while limit is None or n < limit:
+        claimed = claim_job(alias, job_id)
+        if claimed is None:
+            break
+        run_job(alias, *claimed)
+        n += 1
+        if job_id:
+            break
+    return n
+
+
+def resume_job(alias: str, job_id) -> bool:
+    """실패한 작업을 last_row 다음부터 다시 대기열로."""
+    return bool(ImportJob.objects.using(alias)
+                .filter(pk=job_id, status="failed")
+                .update(status="queued", finished_at=None))
+
+
+def kick(alias: str, job_id) -> None:
+    """업로드 직후 프로세스 내 스레드로 바로 처리(별도 워커가 없을 때)."""
+    if not INLINE_WORKER:
+        return
+
+    def _run():
+        try:
+            run_pending(alias, job_id)
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=_run, name=f"gf-import-{job_id}", daemon=True).start()
+
+
+def iter_errors(alias: str, job_id) -> Iterator[Dict[str, Any]]:
+    """오류 리포트용(서버 측 커서)."""
+    qs = (ImportRowError.objects.using(alias).filter(job_id=job_id)
+          .order_by("row_no", "id").values("row_no", "field", "message", "raw"))
+    for e in qs.iterator(chunk_size=2000):
+        raw = e.pop("raw") or {}
+        e["value"] = raw.get(e["field"], "") if e["field"] else ""
+        e["raw"] = json.dumps(raw, ensure_ascii=False)
+        yield e
@@ -0,0 +1,283 @@
+# geoflow_ops/services/partner_search.py
+# -*- coding: utf-8 -*-
+"""
+파트너 타입어헤드 검색
+- 검색용 보조 테이블 ctr.partner_search(파트너 1행당 1행)에 정규화 문자열을 저장
+  · name_norm : 소문자 + 공백/기호/법인표기((주), 주식회사 …) 제거
+  · name_jamo : name_norm을 한글 자모로 분해(겹받침/겹모음도 분해) → 입력 중인 음절('한구' → '한국')도 접두 매칭
+  · name_cho  : 초성만('ㅎㄱ' 같은 초성 검색용)
+  · rep_jamo  : 대표자명 자모
+  · biz_digits: 사업자번호 숫자만
+- pg_trgm GIN 인덱스로 '%x%' 부분 일치, text_pattern_ops 인덱스로 접두 일치
+- 순위: 완전 일치 → 접두 일치 → 초성 접두 → 부분 일치 → 대표자 일치, 같은 순위는 유사도/이름순
+- 보조 테이블이 아직 없으면(관리 명령 전) 기존 icontains 검색으로 대체
+"""
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+
+from geoflow_ops.models import Partner
+
+PAGE_SIZE = getattr(settings, "GF_PARTNER_SEARCH_PAGE_SIZE", 20)
+MAX_PAGE_SIZE = getattr(settings, "GF_PARTNER_SEARCH_MAX_PAGE_SIZE", 50)
+MAX_PAGE = 20   # 타입어헤드는 깊게 넘기지 않는다(그 이상은 검색어를 좁히도록)
+
+DDL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE TABLE IF NOT EXISTS ctr.partner_search (
+    partner_id  uuid        PRIMARY KEY,
+    name_norm   text        NOT NULL DEFAULT '',
+    name_jamo   text        NOT NULL DEFAULT '',
+    name_cho    text        NOT NULL DEFAULT '',
+    rep_jamo    text        NOT NULL DEFAULT '',
+    biz_digits  text        NOT NULL DEFAULT '',
+    updated_at  timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS partner_search_jamo_trgm ON ctr.partner_search USING gin (name_jamo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS partner_search_cho_trgm  ON ctr.partner_search USING gin (name_cho gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS partner_search_rep_trgm  ON ctr.partner_search USING gin (rep_jamo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS partner_search_biz_trgm  ON ctr.partner_search USING gin (biz_digits gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS partner_search_jamo_prefix ON ctr.partner_search (name_jamo text_pattern_ops);
+CREATE INDEX IF NOT EXISTS partner_search_biz_prefix  ON ctr.partner_search (biz_digits text_pattern_ops);
+"""
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 정규화 / 자모 분해
+
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+         "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+_JONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+         "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 단독으로 입력된 겹자모(호환 자모)도 같은 규칙으로 분해
+_COMPAT_SPLIT = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+_CHO_SET = set(_CHO)
+
+_CORP_RE = re.compile(r"\(주\)|\(유\)|\(사\)|\(재\)|㈜|주식회사|유한회사|유한책임회사")
+_STRIP_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize(text: Optional[str]) -> str:
+    """NFC → 소문자 → 법인 표기/공백/기호 제거."""
+    s = unicodedata.normalize("NFC", text or "").lower()
+    s = _CORP_RE.sub("", s)
+    return _STRIP_RE.sub("", s)
+
+
+def to_jamo(s: str) -> str:
+    out: List[str] = []
+    for ch in s:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+            out.append(_JUNG[(code % 588) // 28])
+            out.append(_JONG[code % 28])
+        else:
+            out.append(_COMPAT_SPLIT.get(ch, ch))
+    return "".join(out)
+
+
+def to_choseong(s: str) -> str:
+    out: List[str] = []
+    for ch in s:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+        elif ch in _CHO_SET or not ("ㄱ" <= ch <= "ㆎ"):
+            out.append(ch)
+    return "".join(out)
+
+
+def digits(s: Optional[str]) -> str:
+    return re.sub(r"\D", "", s or "")
+
+
+def _like_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 보조 테이블 유지
+
+_UPSERT_SQL = """
+    INSERT INTO ctr.partner_search AS s (partner_id, name_norm, name_jamo, name_cho, rep_jamo, biz_digits, updated_at)
+    SELECT t.id, t.nn, t.nj, t.nc, t.rj, t.bd, now()
+      FROM unnest(%s::uuid[], %s::text[], %s::text[], %s::text[], %s::text[], %s::text[])
+           AS t(id, nn, nj, nc, rj, bd)
+    ON CONFLICT (partner_id) DO UPDATE
+       SET name_norm = EXCLUDED.name_norm, name_jamo = EXCLUDED.name_jamo, name_cho = EXCLUDED.name_cho,
+           rep_jamo = EXCLUDED.rep_jamo, biz_digits = EXCLUDED.biz_digits, updated_at = now()
+"""
+
+
+def search_row(name: Optional[str], rep_name: Optional[str], biz_no: Optional[str]) -> tuple:
+    nn = normalize(name)
+    return nn, to_jamo(nn), to_choseong(nn), to_jamo(normalize(rep_name)), digits(biz_no)
+
+
+def upsert_rows(alias: str, rows: Sequence[tuple]) -> int:
+    """rows = [(partner_id, name, rep_name, biz_no), ...] → 보조 테이블 upsert(1문장)."""
+    if not rows or not has_index(alias):
+        return 0
+    cols: List[List[str]] = [[], [], [], [], [], []]
+    for pid, name, rep_name, biz_no in rows:
+        cols[0].append(str(pid))
+        for i, v in enumerate(search_row(name, rep_name, biz_no), start=1):
+            cols[i].append(v)
+    with connections[alias].cursor() as cur:
+        cur.execute(_UPSERT_SQL, cols)
+        return cur.rowcount
+
+
+def reindex_partners(alias: str, partner_ids: Optional[Iterable] = None, chunk_size: int = 2000) -> int:
+    """지정 파트너(없으면 전체)의 검색 행을 다시 만든다. 처리 건수 반환."""
+    qs = Partner.objects.using(alias).all()
+    if partner_ids is not None:
+        qs = qs.filter(id__in=list(partner_ids))
+    total, batch = 0, []
+    for row in qs.values_list("id", "name", "rep_name", "biz_no").iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            total += upsert_rows(alias, batch)
+            batch = []
+    total += upsert_rows(alias, batch)
+    return total
+
+
+def prune(alias: str) -> int:
+    """삭제된 파트너의 검색 행 정리."""
+    with connections[alias].cursor() as cur:
+        cur.execute("""
+            DELETE FROM ctr.partner_search s
+             WHERE NOT EXISTS (SELECT 1 FROM ctr.partners p WHERE p.id = s.partner_id)
+        """)
+        return cur.rowcount
+
+
+def ensure_schema(alias: str) -> None:
+    with connections[alias].cursor() as cur:
+        cur.execute(DDL)
+    _has_index.pop(alias, None)
+
+
+_has_index: Dict[str, bool] = {}
+_has_index_lock = threading.Lock()
+
+
+def has_index(alias: str) -> bool:
+    """보조 테이블 존재 여부(프로세스 내 캐시)."""
+    v = _has_index.get(alias)
+    if v is None:
+        with connections[alias].cursor() as cur:
+            cur.execute("SELECT to_regclass('ctr.partner_search') IS NOT NULL")
+            v = bool(cur.fetchone()[0])
+        with _has_index_lock:
+            _has_index[alias] = v
+    return v
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 검색
+
+@dataclass
+class PartnerHit:
+    id: str
+    name: str
+    type: Optional[str]
+    biz_no: Optional[str]
+    rep_name: Optional[str]
+
+    @property
+    def text(self) -> str:
+        return f"{self.name} ({self.type or ''})"
+
+
+@dataclass
+class SearchPage:
+    results: List[PartnerHit]
+    page: int
+    more: bool
+
+
+def clamp_paging(page, limit) -> tuple:
+    try:
+        page = int(page or 1)
+    except (TypeError, ValueError):
+        page = 1
+    try:
+        limit = int(limit or PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = PAGE_SIZE
+    return min(max(page, 1), MAX_PAGE), min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+_SEARCH_SQL = """
+    SELECT p.id, p.name, p.type, p.biz_no, p.rep_name
+      FROM ctr.partner_search s
+      JOIN ctr.partners p ON p.id = s.partner_id
+     WHERE (s.name_jamo LIKE %(j_sub)s
+            OR s.rep_jamo LIKE %(j_sub)s
+            OR (%(cho)s <> '' AND s.name_cho LIKE %(c_sub)s)
+            OR (%(d)s <> '' AND s.biz_digits LIKE %(d_sub)s))
+       AND (%(type)s = '' OR p.type = %(type)s)
+     ORDER BY CASE
+                WHEN s.name_norm = %(n)s OR (%(d)s <> '' AND s.biz_digits = %(d)s) THEN 0
+                WHEN s.name_jamo LIKE %(j_pre)s OR (%(d)s <> '' AND s.biz_digits LIKE %(d_pre)s) THEN 1
+                WHEN %(cho)s <> '' AND s.name_cho LIKE %(c_pre)s THEN 2
+                WHEN s.name_jamo LIKE %(j_sub)s THEN 3
+                ELSE 4
+              END,
+              similarity(s.name_jamo, %(j)s) DESC,
+              p.name
+     LIMIT %(limit)s OFFSET %(offset)s
+"""
+
+
+def search_partners(alias: str, q: str, page=1, limit=None, type_filter: str = "") -> SearchPage:
+    page, limit = clamp_paging(page, limit)
+    offset = (page - 1) * limit
+    n = normalize(q)
+
+    if not n:
+        qs = Partner.objects.using(alias).all()
+        if type_filter:
+            qs = qs.filter(type=type_filter)
+        rows = list(qs.order_by("name").values_list("id", "name", "type", "biz_no", "rep_name")[offset:offset + limit + 1])
+    elif not has_index(alias):
+        qs = Partner.objects.using(alias).filter(
+            Q(name__icontains=q) | Q(type__icontains=q) | Q(biz_no__icontains=q) | Q(rep_name__icontains=q)
+        )
+        if type_filter:
+            qs = qs.filter(type=type_filter)
+        rows = list(qs.order_by("name").values_list("id", "name", "type", "biz_no", "rep_name")[offset:offset + limit + 1])
+    else:
+        j = to_jamo(n)
+        cho = n if all(ch in _CHO_SET for ch in n) else ""
+        d = digits(q) if len(digits(q)) >= 3 else ""
+        params = {
+            "n": n, "j": j,
+            "j_pre": _like_escape(j) + "%", "j_sub": "%" + _like_escape(j) + "%",
+            "cho": cho, "c_pre": _like_escape(cho) + "%", "c_sub": "%" + _like_escape(cho) + "%",
+            "d": d, "d_pre": d + "%", "d_sub": "%" + d + "%",
+            "type": type_filter or "",
+            "limit": limit + 1, "offset": offset,
+        }
+        with connections[alias].cursor() as cur:
+            cur.execute(_SEARCH_SQL, params)
+            rows = cur.fetchall()
+
+    more = len(rows) > limit and page < MAX_PAGE
+    hits = [PartnerHit(id=str(r[0]), name=r[1], type=r[2], biz_no=r[3], rep_name=r[4]) for r in rows[:limit]]
+    return SearchPage(results=hits, page=page, more=more)
@@ -0,0 +1,127 @@
+# geoflow_ops/services/scope_cache.py
+# -*- coding: utf-8 -*-
+"""
+프로젝트 업무범위(scope) 조각(fragment) 캐시
+- 리비전 = (scope_item 행 수, 최종 updated_at) + 저장 시 올리는 세대(generation) 번호
+  (세대 = 공유 캐시 네임스페이스 "scope" 의 프로젝트별 버전, control.cache.bump)
+- 조각 HTML/스코프 그룹 데이터는 (alias, project, 리비전) 키로 캐시 — 같은 키 동시 미스는 한 번만 계산
+- 같은 리비전이면 ETag/Last-Modified로 304 응답 → scope-linker.js가 재다운로드 생략
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.template.loader import render_to_string
+
+from control import cache as shared_cache
+from control.catalog.changes import catalog_version
+from geoflow_ops.models import ProjectScopeItem
+
+SCOPE_CACHE_TTL = getattr(settings, "GF_SCOPE_FRAGMENT_TTL", 60 * 60)
+
+
+@dataclass(frozen=True)
+class ScopeRevision:
+    token: str                         # 캐시 키/ETag에 쓰는 리비전 문자열
+    last_modified: Optional[datetime]  # scope_item 최종 수정 시각(없으면 None)
+
+
+_NS = "scope"
+
+
+def _scope(alias: str, project_id) -> str:
+    return f"{alias}:{project_id}"
+
+
+def _generation(alias: str, project_id) -> int:
+    return shared_cache.version(_NS, _scope(alias, project_id))
+
+
+def scope_revision(alias: str, project_id) -> ScopeRevision:
+    """집계 쿼리 1회로 현재 리비전을 계산한다."""
+    agg = (
+        ProjectScopeItem.objects.using(alias)
+        .filter(project_id=project_id)
+        .aggregate(n=Count("id"), ts=Max("updated_at"))
+    )
+    ts = agg["ts"]
+    gen = _generation(alias, project_id)
+    # 카탈로그(옵션 이름/순서)가 바뀌어도 조각이 달라지므로 카탈로그 버전도 포함
+    token = f"{agg['n']}.{int(ts.timestamp() * 1000) if ts else 0}.{gen}.c{catalog_version()}"
+    return ScopeRevision(token=token, last_modified=ts)
+
+
+def invalidate_scope(alias: str, project_id) -> None:
+    """스코프 저장 후 호출: 세대 번호를 올려 기존 조각을 모두 무효화."""
+    shared_cache.bump(_NS, _scope(alias, project_id))
+
+
+def get_scope_groups(alias: str, project_id, rev: Optional[ScopeRevision] = None) -> List[Dict[str, Any]]:
+    """build_scope_groups 결과를 리비전 단위로 캐시해서 반환."""
+    from geoflow_ops.views_catalog import build_scope_groups  # 순환 import 회피
+
+    rev = rev or scope_revision(alias, project_id)
+    return shared_cache.get_or_set(
+        _NS, f"groups:{rev.token}", lambda: build_scope_groups(alias, project_id),
+        SCOPE_CACHE_TTL, scope=_scope(alias, project_id),
+    )
+
+
+def render_scope_fragment(
+    template_name: str,
+    alias: str,
+    project,
+    rev: Optional[ScopeRevision] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    요청별 값(csrf 토큰 등)이 없는 읽기 전용 조각을 렌더링 결과째 캐시한다.
+    (폼이 들어간 편집 모달은 get_scope_groups로 데이터만 캐시)
+    """
+    rev = rev or scope_revision(alias, project.pk)
+
+    def render():
+        ctx = {"project": project, "scope_groups": get_scope_groups(alias, project.pk, rev)}
+        ctx.update(extra or {})
+        return render_to_string(template_name, ctx)
+
+    return shared_cache.get_or_set(
+        _NS, f"html:{rev.token}:{template_name}", render, SCOPE_CACHE_TTL, scope=_scope(alias, project.pk),
+    )
+
+
+def request_revision(request, alias: str, project_id) -> ScopeRevision:
+    """요청 1회당 리비전은 한 번만 계산(etag/last_modified/뷰 본문에서 공유)."""
+    rev = getattr(request, "_gf_scope_rev", None)
+    if rev is None:
+        rev = scope_revision(alias, project_id)
+        request._gf_scope_rev = rev
+    return rev
+
+
+def scope_etag(request, alias: str, project_id, rev: ScopeRevision, variant: str) -> str:
+    """
+    조각 ETag. 편집 모달은 csrf 토큰을 포함하므로 세션의 csrf 비밀값도 섞는다.
+    """
+    csrf_secret = request.META.get("CSRF_COOKIE") or request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+    raw = f"{alias}|{project_id}|{variant}|{rev.token}|{csrf_secret}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# ── django.views.decorators.http.condition 에 넘길 함수들
+def etag_func(variant: str, alias_func):
+    def _etag(request, pk, *args, **kwargs):
+        alias = alias_func(request)
+        return scope_etag(request, alias, pk, request_revision(request, alias, pk), variant)
+    return _etag
+
+
+def last_modified_func(alias_func):
+    def _last_modified(request, pk, *args, **kwargs):
+        return request_revision(request, alias_func(request), pk).last_modified
+    return _last_modified
@@ -290,6 +290,25 @@ GeoFlow.utils.sortOptionsByCompany = function (items) {
 
   }
 
+  // 6) 내보내기 링크(a[data-gf-export]): 현재 상태 탭/검색어를 붙여서 이동
+  //    <a data-gf-export data-table="datatables-contracts" href="{% url 'tenant:contract_export' 'xlsx' %}">
+  document.addEventListener("click", function(e){
+    var a = e.target.closest && e.target.closest("a[data-gf-export]");
+    if (!a) return;
+    e.preventDefault();
+    var url = new URL(a.getAttribute("href"), window.location.origin);
+    var tableId = a.getAttribute("data-table");
+    var hasDT = (typeof window.$==="function") && $.fn && (typeof $.fn.DataTable==="function");
+    if (tableId && hasDT && $.fn.DataTable.isDataTable("#"+tableId)) {
+      var q = ($("#"+tableId).DataTable().search() || "").trim();
+      if (q) url.searchParams.set("q", q);
+    }
+    var tab = document.querySelector((a.getAttribute("data-status-sel") || "#statusButtons") + " .gf-tab.active");
+    var k = tab ? tab.getAttribute("data-k") : "";
+    if (k && k !== "all") url.searchParams.set("status", k);
+    window.location.assign(url.toString());
+  });
+
   document.addEventListener("DOMContentLoaded", function(){
     if (document.getElementById("datatables-contracts")) initTable({ tableId:"datatables-contracts", statusSel:"#statusButtons" });
     if (document.getElementById("datatables-projects"))  initTable({ tableId:"datatables-projects",  statusSel:"#statusButtons" });
@@ -0,0 +1,68 @@
+// geoflow_ops/static/geoflow_ops/js/remote-select.js
+// RemoteSelect 위젯(select[data-remote-url]) 공용 초기화
+// - 서버는 선택된 값의 <option>만 렌더 → 여기서 Choices.js를 붙이고 검색어로 원격 조회
+// - 응답 형식: {"results": [{"id","text"}], "pagination": {"more": bool}}
+(function (global) {
+  "use strict";
+
+  function fetchOptions(baseUrl, params) {
+    var url = new URL(baseUrl, global.location.origin);
+    Object.keys(params || {}).forEach(function (k) { url.searchParams.set(k, params[k]); });
+    return fetch(url.toString(), { credentials: "same-origin" })
+      .then(function (r) { return r.json(); })
+      .then(function (data) { return data.results || []; })
+      .catch(function () { return []; });
+  }
+
+  function toChoices(sel, items) {
+    var selected = sel.value;
+    return items.map(function (it) {
+      return { value: String(it.id), label: it.text || "", selected: String(it.id) === selected };
+    });
+  }
+
+  function initOne(sel) {
+    if (!sel || sel.dataset.remoteInited === "1") return;
+    sel.dataset.remoteInited = "1";
+
+    var url = sel.getAttribute("data-remote-url");
+    var minChars = parseInt(sel.getAttribute("data-remote-min-chars") || "0", 10) || 0;
+
+    if (global.Choices) {
+      sel._choices = new Choices(sel, {
+        searchEnabled: true,
+        searchChoices: false,       // 검색은 서버가 한다
+        shouldSort: false,
+        itemSelectText: "",
+        removeItemButton: false,
+        placeholder: true,
+        placeholderValue: sel.getAttribute("data-placeholder") || ""
+      });
+    }
+
+    function load(q) {
+      return fetchOptions(url, q ? { q: q } : {}).then(function (items) {
+        if (!sel._choices) return;
+        // 현재 선택값은 유지하고 목록만 교체
+        sel._choices.setChoices(toChoices(sel, items), "value", "label", true);
+      });
+    }
+
+    if (!minChars) load("");
+
+    var timer = null;
+    sel.addEventListener("search", function (ev) {
+      var q = ((ev.detail && ev.detail.value) || "").trim();
+      clearTimeout(timer);
+      if (q.length < minChars) return;
+      timer = setTimeout(function () { load(q); }, 250);
+    });
+  }
+
+  function init(root) {
+    (root || document).querySelectorAll("select[data-remote-url]").forEach(initOne);
+  }
+
+  global.GeoFlowRemoteSelect = { init: init, initOne: initOne };
+  document.addEventListener("DOMContentLoaded", function () { init(document); });
+})(window);
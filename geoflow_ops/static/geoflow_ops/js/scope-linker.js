@@ -21,9 +21,24 @@ async function gfFetch(url, opts={}){
 }
 
 function $(sel, root) { return (root || document).querySelector(sel); }
+// ===== HTML 조각 캐시: ETag 재검증(304)이면 이전 본문 재사용 =====
+const GFFragments = new Map(); // url -> { etag, html }
 async function fetchHtml(url) {
-  const r = await gfFetch(url, { headers: { "X-Requested-With": "XMLHttpRequest" } });
-  return await r.text();
+  const cached = GFFragments.get(url);
+  const headers = { "X-Requested-With": "XMLHttpRequest" };
+  if (cached && cached.etag) headers["If-None-Match"] = cached.etag;
+  const r = await gfFetch(url, { headers, credentials: "same-origin", cache: "no-store" });
+  if (r.status === 304 && cached) return cached.html;
+  const html = await r.text();
+  const etag = r.headers.get("ETag");
+  if (r.ok && etag) GFFragments.set(url, { etag, html });
+  else GFFragments.delete(url);
+  return html;
+}
+function dropFragments(projectId) {
+  for (const url of GFFragments.keys()) {
+    if (url.includes(projectId)) GFFragments.delete(url);
+  }
 }
 function ensureScopeModal() {
   let el = document.getElementById("scopeModal");
@@ -276,6 +291,7 @@ function attachScopeSaveHandler(projectId, modalEl) {
         alert("저장 실패: " + (data.error || resp.status));
         return;
       }
+      dropFragments(projectId);
       alert("업무범위를 저장했습니다.");
       location.reload();
     } catch (err) {
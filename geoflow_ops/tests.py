@@ -1,3 +1,115 @@
-from django.test import TestCase
+# geoflow_ops/tests.py
+# -*- coding: utf-8 -*-
+"""
+  python manage.py test geoflow_ops
+- ImportClaimTests 는 테넌트 DB(PostgreSQL, FOR UPDATE SKIP LOCKED)가 필요하다
+"""
+from unittest import mock
 
-# Create your tests here.
+from django.db import connections
+from django.test import SimpleTestCase, TestCase
+
+from geoflow_ops.models import ImportJob
+from geoflow_ops.services import imports
+from geoflow_ops.services.imports import ParsedRow
+
+TENANT = "cheonan_db"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 가져오기 작업 점유/재점유
+
+class ImportClaimTests(TestCase):
+    databases = {"default", TENANT}              # 테스트 DB 는 중앙(default)에 의존
+
+    @classmethod
+    def setUpTestData(cls):
+        with connections[TENANT].cursor() as cur:
+            cur.execute("CREATE SCHEMA IF NOT EXISTS ops")
+        imports.ensure_schema(TENANT)
+
+    def _job(self, **kw) -> ImportJob:
+        job = ImportJob(kind="partners", match_key="legacy_id", filename="p.csv", fmt="csv",
+                        payload=b"legacy_id\n1\n", **kw)
+        job.save(using=TENANT, force_insert=True)
+        return job
+
+    def _stall(self, job: ImportJob) -> None:
+        with connections[TENANT].cursor() as cur:
+            cur.execute(
+                "UPDATE ops.import_job SET heartbeat_at = now() - make_interval(secs => %s) WHERE id = %s",
+                [imports.STALE_SECONDS + 60, str(job.id)],
+            )
+
+    def _hold(self, job_id: str, lease: str) -> None:
+        with connections[TENANT].cursor() as cur:
+            imports._hold_lease(cur, job_id, lease)
+
+    def test_queued_job_is_claimed_once(self):
+        job = self._job()
+        claimed = imports.claim_job(TENANT)
+        self.assertIsNotNone(claimed)
+        job_id, lease = claimed
+        self.assertEqual(job_id, str(job.id))
+        job.refresh_from_db(using=TENANT)
+        self.assertEqual((job.status, str(job.lease)), ("running", lease))
+        self.assertIsNone(imports.claim_job(TENANT))            # heartbeat 가 살아 있음
+        self._hold(job_id, lease)
+
+    def test_claim_by_id(self):
+        self._job()
+        other = self._job()
+        job_id, _ = imports.claim_job(TENANT, other.id)
+        self.assertEqual(job_id, str(other.id))
+
+    def test_stale_job_is_reclaimed_with_new_lease(self):
+        job = self._job()
+        job_id, old = imports.claim_job(TENANT)
+        self._stall(job)
+        reclaimed = imports.claim_job(TENANT)
+        self.assertIsNotNone(reclaimed)
+        self.assertEqual(reclaimed[0], job_id)
+        self.assertNotEqual(reclaimed[1], old)
+        with self.assertRaises(imports.LeaseLost):               # 먼저 잡았던 워커는 청크를 버린다
+            self._hold(job_id, old)
+        self._hold(job_id, reclaimed[1])
+
+    def test_done_and_failed_jobs_are_not_claimed(self):
+        self._job(status="done")
+        self._job(status="failed")
+        self.assertIsNone(imports.claim_job(TENANT))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 계약 참조 해석(DB 조회는 대체)
+
+def _contract(row_no, legacy_id, code):
+    values = {"legacy_id": legacy_id, "code": code, "client": None, "sub_client": None, "org_unit": None}
+    return ParsedRow(row_no, values, {"code": code or ""})
+
+
+class ContractCodeTests(SimpleTestCase):
+
+    def _resolve(self, rows, taken=()):
+        cur = mock.MagicMock()
+        cur.fetchall.return_value = list(taken)
+        conns = mock.MagicMock()
+        conns.__getitem__.return_value.cursor.return_value.__enter__.return_value = cur
+        with mock.patch.object(imports, "connections", conns), \
+                mock.patch.object(imports, "_partner_refs", return_value={}):
+            return imports._resolve_contract_refs(TENANT, rows)
+
+    def test_duplicate_code_in_chunk_is_row_error(self):
+        ok, errors = self._resolve([_contract(2, 1, "C-1"), _contract(3, 2, "C-1"), _contract(4, 3, "C-2")])
+        self.assertEqual([r.row_no for r in ok], [2, 4])
+        self.assertEqual([(e.row_no, e.field) for e in errors], [(3, "code")])
+
+    def test_same_contract_repeated_keeps_its_code(self):
+        ok, errors = self._resolve([_contract(2, 1, "C-1"), _contract(3, 1, "C-1")])
+        self.assertEqual(len(ok), 2)
+        self.assertEqual(errors, [])
+
+    def test_code_taken_by_other_contract(self):
+        ok, errors = self._resolve([_contract(2, 1, "C-9"), _contract(3, 9, "C-9")], taken=[("C-9", 9)])
+        self.assertEqual([r.row_no for r in ok], [3])
+        self.assertEqual([e.row_no for e in errors], [2])
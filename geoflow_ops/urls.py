@@ -1,6 +1,6 @@
 from django.urls import path
 from . import views
-from . import views_contracts, views_projects, views_employees, views_catalog, views_myinfo
+from . import views_contracts, views_projects, views_employees, views_catalog, views_myinfo, views_exports, views_imports
 
 app_name = "tenant"
 
@@ -12,18 +12,21 @@ urlpatterns = [
     path("contracts/new/", views_contracts.contract_create, name="contract_create"),
     path("contracts/<uuid:pk>/", views_contracts.contract_detail_page, name="contract_detail"),
     path("contracts/<uuid:pk>/json/", views_contracts.contract_json, name="contract_json"),
+    path("contracts/export/<str:fmt>/", views_exports.export_contracts, name="contract_export"),
 
     path('partners/', views_contracts.partner_list, name='partner_list'),
     path("partners/new/", views_contracts.partner_create, name="partner_create"),
     path('partners/<uuid:pk>/', views_contracts.partner_detail_page, name='partner_detail'),
     path('partners/<uuid:pk>/json/', views_contracts.partner_detail_json, name='partner_detail_json'),
     path('partners/options/', views_contracts.partners_options, name='partner_options'),
+    path("partners/export/<str:fmt>/", views_exports.export_partners, name="partner_export"),
 
     path("catalog/board/", views_catalog.catalog_board, name="catalog_board"),
 
     path("projects/", views_projects.ProjectListView.as_view(), name="project_list"),
     path("projects/<uuid:pk>/", views_projects.project_detail_page, name="project_detail"),
     path("projects/<uuid:pk>/json/", views_projects.project_json, name="project_detail_json"),
+    path("projects/export/<str:fmt>/", views_exports.export_projects, name="project_export"),
 
     # 프로젝트 요약/편집 단일 페이지 & 저장
     path("projects/<uuid:pk>/summary/", views_projects.project_summary, name="project_summary"),
@@ -37,13 +40,23 @@ urlpatterns = [
 
     path("employees/", views_employees.employees_list, name="employees_list"),
     path("employees/new/", views_employees.employees_create, name="employees_create"),
+    path("employees/managers/options/", views_employees.manager_options, name="employees_manager_options"),
+    path("employees/export/<str:fmt>/", views_exports.export_employees, name="employees_export"),
     path("employees/<uuid:emp_id>/", views_employees.employees_detail, name="employees_detail"),
     path("employees/<uuid:emp_id>/request-role/", views_employees.employees_request_role, name="employees_request_role"),
 
     # ▼ HR 참조 옵션 (로컬 → 이후 중앙으로 대체)
     path("api/hr/options/<str:category>/", views_employees.hr_options, name="hr_options"),
 
+    # 일괄 가져오기
+    path("imports/", views_imports.import_list, name="import_list"),
+    path("imports/template/<str:kind>/", views_imports.import_template_csv, name="import_template"),
+    path("imports/<uuid:pk>/", views_imports.import_detail, name="import_detail"),
+    path("imports/<uuid:pk>/resume/", views_imports.import_resume, name="import_resume"),
+    path("imports/<uuid:pk>/errors.csv", views_imports.import_errors_csv, name="import_errors"),
+
     path("myinfo/org-units/", views_myinfo.orgunit_list,  name="myinfo_orgunit_list"),
+    path("myinfo/org-units/options/", views_myinfo.orgunit_options, name="myinfo_orgunit_options"),
     path("myinfo/org-units/new/", views_myinfo.orgunit_create, name="myinfo_orgunit_create"),
     path("myinfo/org-units/<uuid:pk>/", views_myinfo.orgunit_detail, name="myinfo_orgunit_detail"),
     path("myinfo/org-units/<uuid:pk>/edit/", views_myinfo.orgunit_update, name="myinfo_orgunit_update"),
@@ -4,9 +4,10 @@ import json
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse
 from control.gf_authz.permissions import gf_perm_required
-from django.views.decorators.http import require_POST, require_GET
+from django.views.decorators.http import require_POST, require_GET, condition
+from django.views.decorators.cache import cache_control
 
 # ── 멀티테넌트 alias 헬퍼 (views_projects와 동일한 방식)
 from control.middleware import current_db_alias
@@ -17,6 +18,7 @@ def _alias(request):
 from .models import Project, ProjectScopeItem
 from control.catalog.models import CategoryNode, CategoryFacetOption, CategoryParent
 from control.catalog import services_tenant as cat_svc
+from .services import scope_cache
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from typing import Any, Dict, List, Set
 
@@ -178,12 +180,13 @@ def project_scope_data(request, pk):
     l1_nodes = cat_svc.fetch_l1_list()  # NodeDTO 리스트 (id, code, name, ord)
     l1_list = [{"id": x.id, "code": x.code, "name": x.name, "ord": getattr(x, "ord", 0)} for x in l1_nodes]
 
-    # 2) L1별 L2 + L2별 L3 수집
+    # 2) L1별 L2 + L2별 L3 수집 (테넌트 선택/비활성 상태는 리졸버로 1회만 적재)
+    resolver = cat_svc.TenantOptionResolver(alias, str(pk))
     l2_by_l1 = {}
     l3_by_l2 = {}
     for l1 in l1_nodes:
         panel = cat_svc.build_l2_panel_data(
-            tenant_alias=alias, l1_id=l1.id, project_id=str(pk)
+            tenant_alias=alias, l1_id=l1.id, project_id=str(pk), resolver=resolver
         )
         l2_items = panel.get("l2") or []
         l2_list = []
@@ -304,18 +307,29 @@ def project_scope_save(request, pk):
             defaults=defaults,
         )
 
+    # 요약 조각 캐시 무효화(세대 번호 증가)
+    scope_cache.invalidate_scope(alias, project.pk)
     return JsonResponse({"ok": True})
 
+@login_required
+@gf_perm_required("projects.view")
+@cache_control(private=True, no_cache=True)
+@condition(
+    etag_func=scope_cache.etag_func("scope_summary", _alias),
+    last_modified_func=scope_cache.last_modified_func(_alias),
+)
 def project_scope_summary(request, pk):
+    """
+    읽기 전용 업무범위 요약 조각.
+    - 렌더링된 HTML 자체를 (alias, project, 리비전) 키로 캐시
+    - 리비전이 같으면 condition()이 304로 응답
+    """
     alias = _alias(request)
     prj = get_object_or_404(Project.objects.using(alias)
                             .select_related("contract"), pk=pk)
-    # 기존 project_detail의 scope_groups 구성 로직을 재사용/함수화해서 가져오기
-    scope_groups = build_scope_groups(alias, prj.pk)  # <- 기존 로직 함수화 가정
-    return render(request, "geoflow_ops/projects/_scope_summary.html", {
-        "project": prj,
-        "scope_groups": scope_groups,
-    })
+    rev = scope_cache.request_revision(request, alias, prj.pk)
+    html = scope_cache.render_scope_fragment("geoflow_ops/projects/_scope_summary.html", alias, prj, rev)
+    return HttpResponse(html)
 
 # ── 수량 표시 규칙 (views_projects와 동일)
 def format_qty(val):
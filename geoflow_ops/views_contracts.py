@@ -10,6 +10,7 @@ from typing import Any
 
 from django.conf import settings
 from django.contrib import messages
+from django.core.exceptions import ValidationError
 from django.db import connections, transaction, IntegrityError
 from django.db.models import Q, Count
 from django.http import JsonResponse, Http404
@@ -22,17 +23,15 @@ from django.views.generic import ListView
 
 from control.services import central_repo as C   # 표준 접속/조회
 from control.middleware import current_db_alias
-from .models import Contract, Partner, Project, MyOrgUnit
+from .models import Contract, Partner, Project
 from .forms import ContractForm, PartnerForm
-from .views_catalog import build_scope_groups  # ← 프로젝트 범위 SSR용
+from .services import contract_aggregate, contract_codes, partner_search
 
 
-from .utils.ctr_utils import next_contract_code
 
 from control.gf_authz.permissions import gf_perm_required
 from control.gf_authz.query import gf_scope_queryset
 
-# from .services.contract_utils import next_contract_code
 
 logger = logging.getLogger(__name__)
 
@@ -102,29 +101,17 @@ def contract_list(request):
 def contract_detail_page(request, pk):
     alias = _alias(request)
     logger.info(f"[DETAIL] alias={alias} pk={pk} method={request.method}")
-    obj = get_object_or_404(Contract.objects.using(alias), pk=pk)
-
-    # 연관 파트너 표시용(보기/편집 공통)
-    client_name, subclient_name = None, None
-    if getattr(obj, "client_id", None):
-        p = Partner.objects.using(alias).filter(id=obj.client_id).first()
-        client_name = p.name if p else None
-    if getattr(obj, "sub_client_id", None):
-        p = Partner.objects.using(alias).filter(id=obj.sub_client_id).first()
-        subclient_name = p.name if p else None
+    agg = contract_aggregate.load_contract_aggregate(alias, pk)  # 계약+파트너+계약자+대표 프로젝트 1쿼리
+    if agg is None:
+        raise Http404("계약을 찾을 수 없습니다.")
+    obj = agg.contract
+    client_name, subclient_name = agg.client_name, agg.subclient_name
 
     # ----- POST: 편집 저장 -----
     if request.method == "POST":
         form = ContractForm(request.POST, instance=obj)
 
-        # ✅ 중요: 폼 검증 전에 alias-aware 쿼리셋 주입
-        if "client" in form.fields:
-            form.fields["client"].queryset = Partner.objects.using(alias).all()
-        if "sub_client" in form.fields:
-            form.fields["sub_client"].queryset = Partner.objects.using(alias).all()
-        if "org_unit" in form.fields:
-            form.fields["org_unit"].queryset = MyOrgUnit.objects.using(alias).all()
-
+        # client/sub_client/org_unit은 RemoteModelChoiceField가 현재 alias에서 pk로 검증
         logger.info("[DETAIL] POST to detail (edit?)")
         if form.is_valid():
             inst = form.save(commit=False)
@@ -150,8 +137,6 @@ def contract_detail_page(request, pk):
                 "edit_mode": True,
                 "form": form,
                 "errors": flat_errors,  # ← 추가: 화면에 이유가 보입니다
-                "client_selected": form["client"].value() or "",
-                "subclient_selected": form["sub_client"].value() or "",
             },
         )
 
@@ -164,66 +149,23 @@ def contract_detail_page(request, pk):
         "edit_mode": edit_mode,
     }
 
-    # 🔹 (추가) 이 계약과 연결된 프로젝트 1건 + 범위 그룹(SSR용)
-    prj = Project.objects.using(alias).filter(contract=obj).first()
-    context["project_for_scope"] = prj
-    context["scope_groups"] = build_scope_groups(alias, prj.id) if prj else []
+    # 🔹 이 계약의 대표 프로젝트 + 범위 그룹(SSR용, 리비전 캐시 경유)
+    context["project_for_scope"] = agg.project
+    context["scope_groups"] = agg.scope_groups()
 
     if edit_mode:
         form = ContractForm(instance=obj)
-        # ✅ 권장: 편집 폼의 선택지도 alias에 맞추기
-        if "client" in form.fields:
-            form.fields["client"].queryset = Partner.objects.using(alias).all()
-        if "sub_client" in form.fields:
-            form.fields["sub_client"].queryset = Partner.objects.using(alias).all()
-        if "org_unit" in form.fields:
-            form.fields["org_unit"].queryset = MyOrgUnit.objects.using(alias).all()
-
-        context.update({
-            "form": form,
-            "client_selected": obj.client_id or "",
-            "subclient_selected": getattr(obj, "sub_client_id", "") or "",
-        })
+        context["form"] = form
 
     return render(request, "geoflow_ops/contracts/contract_detail.html", context)
 
 @require_GET
 def contract_json(request, pk):
     alias = _alias(request)
-    obj = get_object_or_404(
-        Contract.objects.using(alias).select_related("client", "sub_client", "org_unit"),
-        pk=pk,
-    )
-
-    client_name = None
-    subclient_name = None
-    if getattr(obj, "client_id", None):
-        p = Partner.objects.using(alias).filter(id=obj.client_id).first()
-        client_name = p.name if p else None
-    if getattr(obj, "sub_client_id", None):
-        p = Partner.objects.using(alias).filter(id=obj.sub_client_id).first()
-        subclient_name = p.name if p else None
-
-    org_unit_name = None
-    if getattr(obj, "org_unit_id", None):
-        # select_related를 썼으면 obj.org_unit.name으로 바로 가능
-        try:
-            org_unit_name = obj.org_unit.name
-        except MyOrgUnit.DoesNotExist:
-            org_unit_name = None
-
-    return JsonResponse({
-        "id": str(obj.id),
-        "code": getattr(obj, "code", None),
-        "name": getattr(obj, "name", None),
-        "start_date": (obj.start_date.isoformat() if getattr(obj, "start_date", None) else None),
-        "end_date": (obj.end_date.isoformat() if getattr(obj, "end_date", None) else None),
-        "amount": getattr(obj, "amount", None),
-        "status": getattr(obj, "status", None),
-        "client_name": client_name,
-        "sub_client_name": subclient_name,
-        "org_unit_name": org_unit_name,
-    })
+    agg = contract_aggregate.load_contract_aggregate(alias, pk)
+    if agg is None:
+        raise Http404("계약을 찾을 수 없습니다.")
+    return JsonResponse(agg.as_json())
 
 
 @login_required
@@ -234,14 +176,8 @@ def contract_create(request):
 
     # ---------------------- GET: 새 계약 화면 ----------------------
     if request.method == "GET":
-        initial_code = next_contract_code(alias)
+        initial_code = contract_codes.peek_contract_code(alias)  # 미리보기(저장 시 확정)
         form = ContractForm(initial={"code": initial_code})
-        if "client" in form.fields:
-            form.fields["client"].queryset = Partner.objects.using(alias).all()
-        if "sub_client" in form.fields:
-            form.fields["sub_client"].queryset = Partner.objects.using(alias).all()
-        if "org_unit" in form.fields:
-            form.fields["org_unit"].queryset = MyOrgUnit.objects.using(alias).all()
         return render(
             request,
             "geoflow_ops/contracts/contract_detail.html",
@@ -251,20 +187,11 @@ def contract_create(request):
                 "edit_mode": True,
                 "force_create": True,   # 사용 중이면 유지
                 "errors": [],
-                "client_selected": None,
-                "subclient_selected": None,
             },
         )
 
     # ---------------------- POST: 저장 처리 ----------------------
     form = ContractForm(request.POST)
-    if "client" in form.fields:
-        form.fields["client"].queryset = Partner.objects.using(alias).all()
-    if "sub_client" in form.fields:
-        form.fields["sub_client"].queryset = Partner.objects.using(alias).all()
-    if "org_unit" in form.fields:
-        form.fields["org_unit"].queryset = MyOrgUnit.objects.using(alias).all()
-        
     if not form.is_valid():
         # 에러 메시지 평탄화(선택)
         errors_json = form.errors.get_json_data()
@@ -278,8 +205,6 @@ def contract_create(request):
                 "edit_mode": True,
                 "force_create": True,
                 "errors": flat_errors,
-                "client_selected": request.POST.get("client"),
-                "subclient_selected": request.POST.get("sub_client"),
             },
         )
 
@@ -294,6 +219,8 @@ def contract_create(request):
 
     try:
         with transaction.atomic(using=alias):
+            # 번호 확정: 비었거나 이미 쓰인 미리보기 번호면 카운터에서 새로 발급
+            obj.code = contract_codes.resolve_contract_code(alias, obj.code)
             obj.save(using=alias)
 
             # (선택) 프로젝트 자동 생성/동기화가 기존에 있었다면 유지
@@ -341,8 +268,6 @@ def contract_create(request):
                 "edit_mode": True,
                 "force_create": True,
                 "errors": flat_errors,
-                "client_selected": request.POST.get("client"),
-                "subclient_selected": request.POST.get("sub_client"),
             },
         )
 
@@ -370,6 +295,7 @@ def contract_form(request, pk=None):
         sub_client_id = request.POST.get("sub_client_id") or None
 
         with transaction.atomic(using=alias):
+            creating = inst is None
             if inst is None:
                 inst = Contract()
             inst.name = name
@@ -382,8 +308,8 @@ def contract_form(request, pk=None):
             inst.client_id = client_id   # UUID 문자열이면 Django가 변환
             inst.sub_client_id = sub_client_id
 
-            if not code:
-                code = next_contract_code(alias)
+            if creating or not code:
+                code = contract_codes.resolve_contract_code(alias, code)
             inst.code = code
 
             inst.save(using=alias)
@@ -451,6 +377,7 @@ def partner_detail_page(request, pk):
         if form.is_valid():
             inst = form.save(commit=False)
             inst.save(using=alias)
+            partner_search.upsert_rows(alias, [(inst.id, inst.name, inst.rep_name, inst.biz_no)])
             messages.success(request, "저장했습니다.")
             return redirect("tenant:partner_detail", pk=obj.pk)  # ← 네임스페이스 정정
         # 유효성 실패 → 편집모드로 재렌더
@@ -517,6 +444,7 @@ def partner_create(request):
     obj.updated_at = now
 
     obj.save(using=alias)
+    partner_search.upsert_rows(alias, [(obj.id, obj.name, obj.rep_name, obj.biz_no)])
     messages.success(request, "파트너를 생성했습니다.")
     return redirect("tenant:partner_detail", pk=obj.id)
 
@@ -524,19 +452,35 @@ def partner_create(request):
 @gf_perm_required("partners.view")
 def partners_options(request):
     """Select2 등에서 파트너 자동완성/옵션 로딩용 API.
-    - 같은 alias DB에서 Partner를 조회
-    - q가 있으면 name/type LIKE 검색
-    - limit으로 갯수 제한
+    - 같은 alias DB에서 services/partner_search로 검색(이름/대표자/사업자번호, 자모·초성 포함)
+    - 완전/접두 일치가 먼저, 이후 부분 일치(유사도순)
+    - limit은 최대 GF_PARTNER_SEARCH_MAX_PAGE_SIZE, page로 이어받기
+    응답: {"results": [{"id","text"}], "pagination": {"more": bool}}
     """
     alias = _alias(request)
-    q = (request.GET.get("q") or "").strip()
-    limit = int(request.GET.get("limit") or 50)
 
-    qs = Partner.objects.using(alias).all()
-    if q:
-        qs = qs.filter(Q(name__icontains=q) | Q(type__icontains=q))
-    qs = qs.order_by("name")[:limit]
+    # 선택값 라벨 복원용: ?ids=a,b → pk로만 조회
+    ids = [x for x in (request.GET.get("ids") or "").split(",") if x.strip()]
+    if ids:
+        try:
+            rows = list(Partner.objects.using(alias)
+                        .filter(pk__in=ids[:partner_search.MAX_PAGE_SIZE])
+                        .values_list("id", "name", "type"))
+        except (ValueError, ValidationError):
+            rows = []
+        return JsonResponse({
+            "results": [{"id": str(i), "text": f"{n} ({t or ''})"} for i, n, t in rows],
+            "pagination": {"more": False},
+        })
 
+    res = partner_search.search_partners(
+        alias,
+        (request.GET.get("q") or "").strip(),
+        page=request.GET.get("page"),
+        limit=request.GET.get("limit"),
+        type_filter=(request.GET.get("type") or "").strip(),
+    )
     return JsonResponse({
-        "results": [{"id": p.id, "text": f"{p.name} ({p.type or ''})"} for p in qs]
-    })  # 텍스트 라벨은 UI에서 그대로 쓰면 됩니다.  :contentReference[oaicite:9]{index=9}
\ No newline at end of file
+        "results": [{"id": h.id, "text": h.text, "biz_no": h.biz_no} for h in res.results],
+        "pagination": {"more": res.more},
+    })
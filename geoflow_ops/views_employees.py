@@ -1,71 +1,63 @@
 from typing import List
 from datetime import date
-from hashlib import sha256
 from django.conf import settings
-from django.db import transaction
 
 from django.contrib.auth.decorators import login_required
 from django.db import connections
 from django.contrib import messages
 from django.shortcuts import render, redirect
-from django.http import HttpResponseBadRequest, HttpResponseForbidden
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseNotModified
 
+from control.catalog import hr_reference as hr_catalog
 from control.services import central_repo as C
 from control.middleware import current_db_alias
 
 from control.gf_authz.permissions import gf_perm_required
 from control.decorators import require_perm
 
+from .services import employee_directory, hr_onboarding, hr_reference, hr_sensitive
+
 from django.http import JsonResponse
 
-import re
 
-# -----------------------------
-# 로컬 옵션(중앙 이관시, 이 파트를 중앙 조회로 교체)
-# -----------------------------
+@require_perm("directory.view")
+def hr_options(request, category: str):
+    """
+    HR 참조 옵션 목록 반환(JSON).
+    - 중앙 ref.hr_reference + 테넌트 덮어쓰기(ref.tenant_enabled_values)를 컴파일해 둔 응답
+    - If-None-Match 가 맞으면 304
+    응답: {results:[{id,text,code,ord},...]} / 모르는 카테고리는 404
+    """
+    if category not in hr_catalog.CATEGORIES:
+        raise Http404("unknown HR option category")
+    group_id = request.session.get("group_uuid") or request.session.get("group_id")
+    compiled = hr_catalog.options(group_id, category)
+    if compiled.etag in request.headers.get("If-None-Match", ""):
+        resp = HttpResponseNotModified()
+    else:
+        resp = HttpResponse(compiled.body, content_type="application/json")
+    resp["ETag"] = compiled.etag
+    resp["Cache-Control"] = "private, no-cache"
+    return resp
 
-HR_LOCAL_OPTIONS = {
-    "position_grade": [
-        {"code":"임원", "name":"임원", "ord":10},
-        {"code":"부장", "name":"부장", "ord":20},
-        {"code":"차장", "name":"차장", "ord":30},
-        {"code":"과장", "name":"과장", "ord":40},
-        {"code":"대리", "name":"대리", "ord":50},
-        {"code":"주임", "name":"주임", "ord":60},
-        {"code":"사원", "name":"사원", "ord":70},
-        {"code":"인턴", "name":"인턴", "ord":80},
-    ],
-    "employment_type": [
-        {"code":"정규직", "name":"정규직"},
-        {"code":"계약직", "name":"계약직"},
-        {"code":"파견",   "name":"파견"},
-        {"code":"용역",   "name":"용역"},
-        {"code":"프리랜서","name":"프리랜서"},
-        {"code":"인턴",   "name":"인턴"},
-    ],
-    "status": [
-        {"code":"재직", "name":"재직"},
-        {"code":"휴직", "name":"휴직"},
-        {"code":"퇴사", "name":"퇴사"},
-    ],
-}
 
+@login_required
 @require_perm("directory.view")
-def hr_options(request, category: str):
+def manager_options(request):
     """
-    HR 참조 옵션 목록 반환(JSON). 
-    - 지금은 로컬 상수에서 반환
-    - 추후 중앙(ref.hr_reference + tenant_enabled_values) 조회로 교체
-    응답: {results:[{id,text,code,ord},...]}
+    직속 관리자 원격 선택용(캐시된 후보 목록에서 검색).
+    ?ids=a,b → 선택값 라벨 복원 / ?q=… → 이름·이메일 부분 일치 / ?exclude=<직원 id> → 본인 제외
+    응답: {"results": [{"id","text"}], "pagination": {"more": bool}}
     """
-    items = HR_LOCAL_OPTIONS.get(category, [])
-    items = sorted(items, key=lambda x: x.get("ord", 9999))
-    return JsonResponse({
-        "results": [
-            {"id": it["code"], "text": it["name"], "code": it["code"], "ord": it.get("ord", 0)}
-            for it in items
-        ]
-    })
+    alias = _alias(request)
+    ids = [x.strip() for x in (request.GET.get("ids") or "").split(",") if x.strip()]
+    if ids:
+        results, more = hr_reference.manager_labels(alias, ids[:hr_reference.MANAGER_OPTIONS_LIMIT]), False
+    else:
+        results, more = hr_reference.search_managers(
+            alias, request.GET.get("q") or "", exclude=(request.GET.get("exclude") or "").strip() or None,
+        )
+    return JsonResponse({"results": results, "pagination": {"more": more}})
 
 
 # -----------------------------
@@ -78,10 +70,7 @@ def _is_forbidden_central_role(role_code: str) -> bool:
     """테넌트가 요청해서는 안 되는 중앙/시스템 권한 필터"""
     if not role_code:
         return True
-    rc = role_code.strip().lower()
-    forbidden_prefixes = ("central_", "sys_", "super_", "root_")
-    forbidden_exact = {"central_admin", "system_admin", "super_admin", "owner"}
-    return rc.startswith(forbidden_prefixes) or rc in forbidden_exact
+    return hr_onboarding.is_forbidden_role(role_code)
 
 def _require_role_code_column(alias: str) -> None:
     """테넌트에 role_code가 없으면 명확한 에러 메시지로 안내"""
@@ -139,14 +128,11 @@ def _empty_profile():
 @require_perm("directory.view")
 def employees_list(request):
     alias = _alias(request)
-    with connections[alias].cursor() as cur:
-        cur.execute("SELECT id::text, email, name, title, role_code, status, phone FROM hr.employee_profile ORDER BY name")
-        rows = cur.fetchall()
+    group_id = request.session.get("group_uuid") or request.session.get("group_id")
 
-    employees = [{
-        "id": r[0], "email": r[1], "name": r[2], "title": r[3],
-        "role_code": r[4], "status": r[5], "phone": r[6],
-    } for r in rows]
+    # 중앙 역할/멤버십은 목록 전체에 대해 한 번에(행마다 조회하지 않음)
+    employees = employee_directory.list_employees(alias, group_id)
+    employee_directory.kick_backfill(alias, employees)
 
     return render(request, "geoflow_ops/employees/employee_list.html", {"employees": employees})
 
@@ -172,9 +158,9 @@ def employees_detail(request, emp_id):
                 "profile": profile,
                 "create_mode": True,
                 "pending_request": False,
-                "org_units": _load_org_units(alias),
+                "org_units": hr_reference.org_units(alias),
                 "departments": [],
-                "managers": _load_managers(alias),
+                "managers": [],
                 "edit_mode": True,  # 신규 생성은 곧바로 편집
             },
         )
@@ -205,77 +191,52 @@ def employees_detail(request, emp_id):
         department_id  = _nz(request.POST.get("department_id"))
         manager_id     = _nz(request.POST.get("manager_id"))
 
-        rrn_plain      = _nz(request.POST.get("rrn_plain"))
-        rrn_key        = getattr(settings, "RRN_SYM_KEY", None)
+        rrn = hr_sensitive.Rrn.parse(request.POST.get("rrn_plain"))
+
+        sets = [
+            ("title", "%s", [title]),
+            ("phone", "%s", [phone]),
+            ("position_grade", "%s", [position_grade]),
+            ("emp_type", "%s", [emp_type]),
+            ("status", "%s", [status]),
+            ("hire_date", "%s::date", [hire_date]),
+            ("term_date", "%s::date", [term_date]),
+            ("emp_no", "%s", [emp_no]),
+            ("org_unit_id", "NULLIF(%s,'')::uuid", [org_unit_id]),
+            ("department_id", "NULLIF(%s,'')::uuid", [department_id]),
+            ("manager_id", "NULLIF(%s,'')::uuid", [manager_id]),
+            ("updated_at", "now()", []),
+        ]
+        # 주민번호(선택): 같은 UPDATE 한 문장에 암호문/해시/마스킹까지
+        if rrn:
+            sets += hr_sensitive.assignments(alias, rrn)
 
         with connections[alias].cursor() as cur:
-            cur.execute("""
-                UPDATE hr.employee_profile
-                SET title           = %s,
-                    phone           = %s,
-                    position_grade  = %s,
-                    emp_type        = %s,
-                    status          = %s,
-                    hire_date       = %s::date,
-                    term_date       = %s::date,
-                    emp_no          = %s,
-                    org_unit_id     = NULLIF(%s,'')::uuid,
-                    department_id   = NULLIF(%s,'')::uuid,
-                    manager_id      = NULLIF(%s,'')::uuid,
-                    updated_at      = now()
-                WHERE id = %s
-            """, [title, phone, position_grade, emp_type, status, hire_date, term_date,
-                emp_no, org_unit_id, department_id, manager_id, str(emp_id)])
-
-            rrn_plain = _nz(request.POST.get("rrn_plain"))
-            rrn_key   = getattr(settings, "RRN_SYM_KEY", None)
-
-            if rrn_plain:
-                digits_only = re.sub(r"\D", "", rrn_plain)
-                last4 = digits_only[-4:] if len(digits_only) >= 4 else digits_only
-                rrn_hash = sha256(digits_only.encode("utf-8")).digest()
-
-                with connections[alias].cursor() as cur:
-                    if rrn_key:
-                        cur.execute(
-                            """
-                            UPDATE hr.employee_profile
-                            SET rrn_cipher = pgp_sym_encrypt(%s, %s),
-                                rrn_hash   = %s,
-                                rrn_last4  = %s
-                            WHERE id = %s
-                            """,
-                            [digits_only, rrn_key, rrn_hash, last4, str(emp_id)]
-                        )
-                    else:
-                        cur.execute(
-                            """
-                            UPDATE hr.employee_profile
-                            SET rrn_cipher = NULL,
-                                rrn_hash   = %s,
-                                rrn_last4  = %s
-                            WHERE id = %s
-                            """,
-                            [rrn_hash, last4, str(emp_id)]
-                        )
+            cur.execute(
+                f"UPDATE hr.employee_profile SET {', '.join(f'{c} = {ph}' for c, ph, _ in sets)} WHERE id = %s",
+                [v for _, _, vals in sets for v in vals] + [str(emp_id)],
+            )
+        hr_reference.invalidate(alias)   # 관리자 후보(이름) 캐시
 
         return redirect("tenant:employees_detail", emp_id=emp_id)
 
     # ------------------------
     # GET: DB에서 직원 조회
     # ------------------------
+    # 주민번호 마스킹은 같은 SELECT 안에서(저장된 rrn_masked 우선, 화면 조회 때 복호화 없음)
+    rrn_sql, rrn_params = hr_sensitive.masked_projection(alias)
     with connections[alias].cursor() as cur:
         cur.execute(
-            """
+            f"""
             SELECT id::text, email, name, title, role_code, status, phone,
                    hire_date, term_date,
                    org_unit_id::text, department_id::text,
                    position_grade, emp_type, emp_no,
-                   manager_id::text, rrn_last4,
+                   manager_id::text, {rrn_sql},
                    central_user_id::text
             FROM hr.employee_profile
             WHERE id=%s LIMIT 1
-            """, [str(emp_id)]
+            """, rrn_params + [str(emp_id)]
         )
         row = cur.fetchone()
 
@@ -299,37 +260,16 @@ def employees_detail(request, emp_id):
         "emp_type": row[12] or "",
         "emp_no": row[13] or "",
         "manager_id": row[14] or "",
-        "rrn_masked": ("*******-" + row[15]) if row[15] else None,
+        "rrn_masked": row[15],
         "central_user_id": row[16],
     }
 
-    rrn_key = getattr(settings, "RRN_SYM_KEY", None)
-
-    if rrn_key:
-        # pgcrypto 필요: CREATE EXTENSION IF NOT EXISTS pgcrypto;
-        with connections[alias].cursor() as cur2:
-            cur2.execute(
-                "SELECT pgp_sym_decrypt(rrn_cipher, %s) FROM hr.employee_profile WHERE id=%s",
-                [rrn_key, profile["id"]],
-            )
-            row = cur2.fetchone()
-        rrn_plain = (row[0] or "") if row else ""
-        digits = re.sub(r"\D", "", rrn_plain)
-
-        # 원하는 형식: 앞 6자리 + '-' + 7번째 자리 + '******'
-        if len(digits) >= 7:
-            profile["rrn_masked"] = f"{digits[:6]}-{digits[6]}******"
-        else:
-            # 복호화 불가·불완전 시 기존 표시 유지(없음)
-            profile["rrn_masked"] = profile.get("rrn_masked")  # 템플릿에서 default 처리
-
-
     # ------------------------
-    # 조직/부서/관리자 옵션 로딩
+    # 조직/부서 옵션(테넌트 캐시), 관리자는 현재 선택값만(나머지는 원격 검색)
     # ------------------------
-    org_units = _load_org_units(alias)
-    departments = _load_departments(alias, profile["org_unit_id"])
-    managers = _load_managers(alias)
+    org_units = hr_reference.org_units(alias)
+    departments = hr_reference.departments(alias, profile["org_unit_id"])
+    managers = hr_reference.manager_labels(alias, [profile["manager_id"]])
 
     employee_roles = _get_employee_roles_for_central(
         request, alias, profile["id"], profile["email"], profile["central_user_id"]
@@ -356,28 +296,6 @@ def employees_detail(request, emp_id):
     )
 
 
-def _load_org_units(alias):
-    with connections[alias].cursor() as cur:
-        cur.execute("SELECT id::text, name FROM ops.my_org_units ORDER BY name")
-        return [{"id": r[0], "name": r[1]} for r in cur.fetchall()]
-
-
-def _load_departments(alias, org_unit_id):
-    if not org_unit_id:
-        return []
-    with connections[alias].cursor() as cur:
-        cur.execute(
-            "SELECT id::text, name FROM hr.departments WHERE org_unit_id=%s ORDER BY name",
-            [org_unit_id],
-        )
-        return [{"id": r[0], "name": r[1]} for r in cur.fetchall()]
-
-
-def _load_managers(alias):
-    with connections[alias].cursor() as cur:
-        cur.execute("SELECT id::text, name FROM hr.employee_profile ORDER BY name")
-        return [{"id": r[0], "name": r[1]} for r in cur.fetchall()]
-
 # -----------------------------
 # Employee Create (간단 생성)
 # -----------------------------
@@ -407,8 +325,7 @@ def employees_create(request):
 
         manager_id   = (request.POST.get("manager_id") or "").strip()
 
-        rrn_plain    = (request.POST.get("rrn_plain") or "").strip()
-        rrn_key      = getattr(settings, "RRN_SYM_KEY", None)
+        rrn          = hr_sensitive.Rrn.parse(request.POST.get("rrn_plain"))
 
         if not email:
             return HttpResponseBadRequest("이메일은 필수입니다.")
@@ -444,45 +361,20 @@ def employees_create(request):
         add("emp_no", emp_no)
         add("manager_id", manager_id, cast="uuid")
 
-        with transaction.atomic(using=alias):
-            # 1) INSERT (rrn 제외)
-            sql = f"""
-                INSERT INTO hr.employee_profile ({", ".join(cols)})
-                VALUES ({", ".join(placeholders)})
-                RETURNING id::text
-            """
-            with connections[alias].cursor() as cur:
-                cur.execute(sql, params)
-                new_id = cur.fetchone()[0]
-
-            # 2) 주민번호 (선택)
-            if rrn_plain:
-                last4 = rrn_plain[-4:] if len(rrn_plain) >= 4 else rrn_plain
-                rrn_hash = sha256(rrn_plain.encode("utf-8")).digest()
-
-                with connections[alias].cursor() as cur:
-                    if rrn_key:
-                        cur.execute(
-                            """
-                            UPDATE hr.employee_profile
-                               SET rrn_cipher = pgp_sym_encrypt(%s, %s),
-                                   rrn_hash   = %s,
-                                   rrn_last4  = %s
-                             WHERE id = %s
-                            """,
-                            [rrn_plain, rrn_key, rrn_hash, last4, new_id]
-                        )
-                    else:
-                        cur.execute(
-                            """
-                            UPDATE hr.employee_profile
-                               SET rrn_cipher = NULL,
-                                   rrn_hash   = %s,
-                                   rrn_last4  = %s
-                             WHERE id = %s
-                            """,
-                            [rrn_hash, last4, new_id]
-                        )
+        # 주민번호(선택): 같은 INSERT에 암호문/해시/마스킹까지
+        if rrn:
+            for col, ph, vals in hr_sensitive.assignments(alias, rrn):
+                cols.append(col); placeholders.append(ph); params.extend(vals)
+
+        sql = f"""
+            INSERT INTO hr.employee_profile ({", ".join(cols)})
+            VALUES ({", ".join(placeholders)})
+            RETURNING id::text
+        """
+        with connections[alias].cursor() as cur:
+            cur.execute(sql, params)
+            new_id = cur.fetchone()[0]
+        hr_reference.invalidate(alias)   # 관리자 후보 캐시
 
         return redirect("tenant:employees_detail", emp_id=new_id)
 
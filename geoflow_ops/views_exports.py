@@ -0,0 +1,63 @@
+# geoflow_ops/views_exports.py
+"""
+목록 내보내기(CSV/XLSX) 엔드포인트
+  GET /exports/<entity>.<fmt>?status=active&q=검색어&cols=code,name,amount
+- entity: contracts | projects | partners | employees (services/exports.SPECS)
+- 권한은 각 목록 화면과 동일
+"""
+from urllib.parse import quote
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from control.decorators import require_perm
+from control.gf_authz.permissions import gf_perm_required
+from control.middleware import current_db_alias
+
+from .services import exports
+
+
+def _export(request, entity: str, fmt: str):
+    spec = exports.SPECS.get(entity)
+    if spec is None or fmt not in exports.FORMATS:
+        raise Http404("지원하지 않는 내보내기 형식입니다.")
+
+    cols = [c.strip() for c in (request.GET.get("cols") or "").split(",") if c.strip()]
+    body = exports.stream(spec, fmt, current_db_alias(), exports.ExportFilters.from_request(request), cols)
+
+    resp = StreamingHttpResponse(body, content_type=exports.CONTENT_TYPES[fmt])
+    filename = f"{spec.title}_{timezone.localdate():%Y%m%d}.{fmt}"
+    resp["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(filename)}"
+    resp["Cache-Control"] = "no-store"
+    resp["X-Accel-Buffering"] = "no"   # 프록시(nginx) 버퍼링 없이 바로 흘려보냄
+    return resp
+
+
+@login_required
+@require_GET
+@gf_perm_required("contracts.view")
+def export_contracts(request, fmt):
+    return _export(request, "contracts", fmt)
+
+
+@login_required
+@require_GET
+@gf_perm_required("projects.view")
+def export_projects(request, fmt):
+    return _export(request, "projects", fmt)
+
+
+@login_required
+@require_GET
+@gf_perm_required("partners.view")
+def export_partners(request, fmt):
+    return _export(request, "partners", fmt)
+
+
+@login_required
+@require_GET
+@require_perm("directory.view")
+def export_employees(request, fmt):
+    return _export(request, "employees", fmt)
@@ -0,0 +1,155 @@
+# geoflow_ops/views_imports.py
+"""
+파트너/계약/직원 일괄 가져오기 화면
+- 업로드 → 작업 생성(ops.import_job) → 백그라운드 처리(services/imports)
+- 상세 화면은 ?format=json 으로 진행 상황을 폴링
+- 행 오류 리포트는 CSV로 스트리밍
+- 직원은 directory 권한 체계(control.decorators), 역할 열은 directory.roles.assign 이 있어야 가져온다
+"""
+from urllib.parse import quote
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_GET, require_POST, require_http_methods
+
+from control.decorators import has_perm
+from control.gf_authz.permissions import gf_has_perm
+from control.middleware import current_db_alias
+
+from .forms import ImportUploadForm
+from .models import ImportJob
+from .services import exports, imports
+
+# 가져오기 종류별로 필요한 권한(생성 화면과 동일)
+IMPORT_PERMS = {"partners": "partners.create", "contracts": "contracts.create", "employees": "directory.edit"}
+DIRECTORY_KINDS = {"employees"}
+
+ERROR_COLUMNS = (
+    exports.Column("row_no", "행", lambda r: r["row_no"]),
+    exports.Column("field", "열", lambda r: r["field"]),
+    exports.Column("value", "값", lambda r: r["value"]),
+    exports.Column("message", "오류", lambda r: r["message"]),
+    exports.Column("raw", "원본", lambda r: r["raw"]),
+)
+
+
+def _alias(request):
+    return current_db_alias()
+
+
+def _can_import(request, kind: str) -> bool:
+    perm = IMPORT_PERMS[kind]
+    return has_perm(request, perm) if kind in DIRECTORY_KINDS else gf_has_perm(request, perm)
+
+
+def _job_or_404(request, pk):
+    job = get_object_or_404(ImportJob.objects.using(_alias(request)).defer("payload"), pk=pk)
+    if not _can_import(request, job.kind):
+        return None
+    return job
+
+
+def _job_json(job: ImportJob) -> dict:
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "status": job.status,
+        "processed": job.processed,
+        "total_rows": job.total_rows,
+        "inserted": job.inserted,
+        "updated": job.updated,
+        "failed": job.failed,
+        "last_error": job.last_error,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+@login_required
+@require_http_methods(["GET", "POST"])
+def import_list(request):
+    alias = _alias(request)
+    kinds = [k for k in IMPORT_PERMS if _can_import(request, k)]
+    if not kinds:
+        return HttpResponseForbidden("Permission denied")
+    form = ImportUploadForm(request.POST or None, request.FILES or None)
+    if request.method == "POST" and form.is_valid():
+        kind = form.cleaned_data["kind"]
+        if kind not in kinds:
+            return HttpResponseForbidden("Permission denied")
+        deny = ()
+        if kind == "employees" and not has_perm(request, "directory.roles.assign"):
+            deny = ("role_code",)
+        try:
+            job = imports.create_job(
+                alias, kind, form.cleaned_data["match_key"], form.cleaned_data["file"],
+                created_by=getattr(request.user, "email", None) or request.user.get_username(),
+                deny_fields=deny,
+            )
+        except ValueError as e:
+            form.add_error("file", str(e))
+        else:
+            imports.kick(alias, job.id)
+            messages.success(request, "가져오기 작업을 등록했습니다.")
+            return redirect("tenant:import_detail", pk=job.id)
+
+    jobs = ImportJob.objects.using(alias).defer("payload").filter(kind__in=kinds)[:30]
+    return render(request, "geoflow_ops/imports/import_list.html", {
+        "form": form,
+        "jobs": jobs,
+        "kinds": [imports.KINDS[k] for k in kinds],
+    })
+
+
+@login_required
+@require_GET
+def import_detail(request, pk):
+    job = _job_or_404(request, pk)
+    if job is None:
+        return HttpResponseForbidden("Permission denied")
+    if request.GET.get("format") == "json":
+        return JsonResponse(_job_json(job))
+    return render(request, "geoflow_ops/imports/import_detail.html", {
+        "job": job,
+        "spec": imports.KINDS[job.kind],
+        "errors": job.errors.using(_alias(request)).all()[:50],
+    })
+
+
+@login_required
+@require_POST
+def import_resume(request, pk):
+    job = _job_or_404(request, pk)
+    if job is None:
+        return HttpResponseForbidden("Permission denied")
+    alias = _alias(request)
+    if imports.resume_job(alias, job.id):
+        imports.kick(alias, job.id)
+        messages.success(request, f"{job.processed}행 이후부터 다시 처리합니다.")
+    return redirect("tenant:import_detail", pk=job.id)
+
+
+@login_required
+@require_GET
+def import_errors_csv(request, pk):
+    job = _job_or_404(request, pk)
+    if job is None:
+        return HttpResponseForbidden("Permission denied")
+    body = exports.stream_csv(ERROR_COLUMNS, imports.iter_errors(_alias(request), job.id))
+    resp = StreamingHttpResponse(body, content_type=exports.CONTENT_TYPES["csv"])
+    resp["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(f'오류_{job.filename}')}.csv"
+    return resp
+
+
+@login_required
+@require_GET
+def import_template_csv(request, kind):
+    spec = imports.KINDS.get(kind)
+    if spec is None or not _can_import(request, kind):
+        return HttpResponseForbidden("Permission denied")
+    columns = [exports.Column(f.key, f.aliases[0] + (" *" if f.required else ""), lambda r: "")
+               for f in spec.fields]
+    resp = StreamingHttpResponse(exports.stream_csv(columns, []), content_type=exports.CONTENT_TYPES["csv"])
+    resp["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(spec.title + '_양식.csv')}"
+    return resp
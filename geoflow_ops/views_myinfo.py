@@ -2,11 +2,17 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 
 from geoflow_ops.models import MyOrgUnit
 from geoflow_ops.forms import MyOrgUnitForm
+from geoflow_ops.services import hr_reference
 from geoflow_ops.views_contracts import _alias  # 이미 있는 헬퍼 재사용
 
+ORGUNIT_OPTIONS_LIMIT = 20
+
 @login_required
 def orgunit_list(request):
     alias = _alias(request)
@@ -14,6 +20,36 @@ def orgunit_list(request):
     return render(request, "geoflow_ops/myinfo/orgunit_list.html", {"items": qs})
 
 
+@login_required
+@require_GET
+def orgunit_options(request):
+    """
+    계약 폼의 org_unit 원격 선택용.
+    ?ids=a,b → 선택값 라벨 복원 / ?q=… → 이름 부분 일치(최대 ORGUNIT_OPTIONS_LIMIT건)
+    응답: {"results": [{"id","text"}], "pagination": {"more": bool}}
+    """
+    alias = _alias(request)
+    qs = MyOrgUnit.objects.using(alias)
+    ids = [x for x in (request.GET.get("ids") or "").split(",") if x.strip()]
+    if ids:
+        try:
+            rows = list(qs.filter(pk__in=ids[:ORGUNIT_OPTIONS_LIMIT]).values_list("id", "name"))
+        except (ValueError, ValidationError):
+            rows = []
+        more = False
+    else:
+        q = (request.GET.get("q") or "").strip()
+        if q:
+            qs = qs.filter(name__icontains=q)
+        rows = list(qs.order_by("name").values_list("id", "name")[:ORGUNIT_OPTIONS_LIMIT + 1])
+        more = len(rows) > ORGUNIT_OPTIONS_LIMIT
+        rows = rows[:ORGUNIT_OPTIONS_LIMIT]
+    return JsonResponse({
+        "results": [{"id": str(i), "text": n} for i, n in rows],
+        "pagination": {"more": more},
+    })
+
+
 @login_required
 def orgunit_detail(request, pk):
     alias = _alias(request)
@@ -29,6 +65,7 @@ def orgunit_create(request):
         if form.is_valid():
             obj = form.save(commit=False)
             obj.save(using=alias)             # 🔹 테넌트 DB에 저장
+            hr_reference.invalidate(alias)    # 직원 화면 본사/지점 목록 캐시
             messages.success(request, "회사 정보를 추가했습니다.")
             return redirect("tenant:myinfo_orgunit_detail", pk=obj.pk)
     else:
@@ -51,6 +88,7 @@ def orgunit_update(request, pk):
         if form.is_valid():
             obj = form.save(commit=False)
             obj.save(using=alias)             # 🔹 같은 테넌트 DB에 업데이트
+            hr_reference.invalidate(alias)
             messages.success(request, "회사 정보를 수정했습니다.")
             return redirect("tenant:myinfo_orgunit_detail", pk=obj.pk)
     else:
@@ -12,7 +12,8 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
-from django.views.decorators.http import require_POST, require_http_methods
+from django.views.decorators.http import require_POST, require_http_methods, condition
+from django.views.decorators.cache import cache_control
 from django.views.generic import ListView
 from django.contrib.auth.decorators import login_required
 
@@ -25,8 +26,8 @@ from collections import defaultdict
 
 from control.gf_authz.permissions import gf_perm_required
 from control.gf_authz.query import gf_scope_queryset
-from .views_catalog import build_scope_groups
 from control.catalog import services_tenant as cat_svc
+from .services import scope_cache
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
 def _alias(request):
@@ -146,7 +147,7 @@ def project_detail_page(request, pk):
     if edit_mode:
         context["form"] = ProjectNoteForm(instance=obj)
 
-    context["scope_groups"] = build_scope_groups(alias, obj.pk)
+    context["scope_groups"] = scope_cache.get_scope_groups(alias, obj.pk)
     return render(request, "geoflow_ops/projects/project_detail.html", context)
 
 
@@ -163,10 +164,21 @@ def _to_decimal(v):
 
 @login_required
 @gf_perm_required("projects.edit")
+@cache_control(private=True, no_cache=True)
+@condition(
+    etag_func=scope_cache.etag_func("summary", _alias),
+    last_modified_func=scope_cache.last_modified_func(_alias),
+)
 def project_summary(request, pk):
+    """
+    현재 업무 편집 모달 조각.
+    - 폼(csrf 토큰)이 들어가므로 HTML 대신 scope_groups 데이터만 리비전 캐시
+    - 리비전이 같으면 condition()이 304로 응답
+    """
     alias = _alias(request)
     prj = get_object_or_404(Project.objects.using(alias), pk=pk)
-    scope_groups = build_scope_groups(alias, prj.pk)
+    rev = scope_cache.request_revision(request, alias, prj.pk)
+    scope_groups = scope_cache.get_scope_groups(alias, prj.pk, rev)
     return render(request, "geoflow_ops/projects/project_summary.html", {
         "project": prj,
         "scope_groups": scope_groups,
@@ -248,6 +260,7 @@ def project_summary_save(request, pk):
                 update_fields.append("note")
 
             if update_fields:
+                update_fields.append("updated_at")   # 조각 캐시 리비전(max(updated_at)) 갱신
                 psi.save(update_fields=update_fields)
             continue
 
@@ -283,6 +296,7 @@ def project_summary_save(request, pk):
         if defaults:
             ProjectScopeItem.objects.using(alias).update_or_create(**base, defaults=defaults)
 
+    scope_cache.invalidate_scope(alias, project.pk)   # 요약 조각 캐시 무효화
     messages.success(request, "현재 업무를 저장했습니다.")
     # 모달 제출은 AJAX로 가로채므로 리다이렉트 응답을 반환해도 OK
     return redirect("tenant:project_summary", pk=project.pk)
@@ -60,18 +60,26 @@ DATABASE_ROUTERS = ['control.db_router.TenantRouter']
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'control.sql_metrics.SqlMetricsMiddleware',        # 요청별 alias SQL 계측(Server-Timing, 로그)
+    'control.request_memo.RequestMemoMiddleware',      # 요청 범위 중앙 조회 메모(X-GF-Memo 헤더)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'control.profiling.ProfilingMiddleware',           # ?_profile=1(중앙 관리자) / 표본 추출 프로파일
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'control.middleware.TenantMiddleware',           # A. alias/scope 설정
     'control.middleware.CentralGuardMiddleware',     # B. 중앙이면 테넌트 URL 차단  ✅ 추가
     'control.middleware.EnsureTenantAliasMiddleware', # C. 안전망
     'control.gf_authz.middleware.GFAuthzContextMiddleware',
+    'control.catalog.middleware.CatalogSyncMiddleware',  # 카탈로그 변경 피드 → 워커 캐시 무효화
 ]
 
+# 카탈로그 변경 구독 방식: "poll"(요청 때 N초마다 버전 확인) | "listen"(LISTEN 스레드) | "off"
+GF_CATALOG_SUBSCRIBER = "poll"
+GF_CATALOG_POLL_INTERVAL = 2.0
+
 # 중앙 DB 별칭(기본이 중앙이면 그대로 'default')
 GF_AUTHZ_CENTRAL_ALIAS = "default"
 
@@ -120,6 +128,11 @@ CENTRAL_DB_ALIAS = "default"            # 중앙 DB 별칭
 DEFAULT_TENANT_DB_ALIAS = "cheonan_db"  # 세션이 비어있을 때 사용할 테넌트 기본값
 
 
+# 계약번호 형식: {yyyy} {yy} {mm} {seq:0Nd}  (테넌트별로 다르면 GF_CONTRACT_CODE_FORMATS = {"cheonan_db": "..."})
+GF_CONTRACT_CODE_FORMAT = "{yy}{seq:03d}"
+GF_CONTRACT_CODE_FORMATS = {}
+
+
 # 테넌트 인사 프로필
 TENANT_PROFILE_VIEW = "people_profile"          # 조회 전용
 TENANT_PROFILE_TABLE = "hr.employee_profile"    # 쓰기/업서트 대상
@@ -177,11 +190,77 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
-PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.PBKDF2PasswordHasher",          # 기본(신규 저장은 이것)
+# 비밀번호 해시 정책: "pbkdf2"(반복 횟수 GF_PBKDF2_ITERATIONS) | "argon2"(argon2-cffi 필요)
+# 목록 첫 번째가 신규 저장용, 나머지는 읽기용 → 로그인 성공 시 백그라운드에서 첫 번째로 다시 해시
+GF_PASSWORD_HASHER = os.environ.get("GF_PASSWORD_HASHER", "pbkdf2")
+GF_PBKDF2_ITERATIONS = int(os.environ.get("GF_PBKDF2_ITERATIONS", "1000000"))
+
+PASSWORD_HASHERS = (["django.contrib.auth.hashers.Argon2PasswordHasher"] if GF_PASSWORD_HASHER == "argon2" else []) + [
+    "control.hashers.TunedPBKDF2PasswordHasher",                  # 기본(신규 저장은 이것)
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",     # 과거 bcrypt 읽기용
 ]
 
+# 로그인 스로틀(슬라이딩 창 카운터, 해시 검증 전에 검사): (창당 허용 횟수, 초당 허용 횟수)
+#   창 길이 = 허용 횟수 / 초당 허용 횟수
+GF_LOGIN_THROTTLE_CACHE = "default"
+GF_LOGIN_THROTTLE_IP = (30, 0.5)        # IP당 60초에 30회
+GF_LOGIN_THROTTLE_EMAIL = (5, 1 / 30)   # 계정당 150초에 5회
+#   실패한 시도만 센다(성공하면 되돌림). IP 는 REMOTE_ADDR 기준 → 리버스 프록시(nginx 등) 뒤에 두면
+#   모든 요청이 프록시 주소 하나로 보이므로 GF_TRUST_X_FORWARDED_FOR=1 로 X-Forwarded-For 마지막 주소
+#   (프록시 한 단이 붙인 클라이언트 주소)를 쓴다 — 프록시 없이 직접 노출된 서버에서 켜면 위조 가능
+GF_TRUST_X_FORWARDED_FOR = os.environ.get("GF_TRUST_X_FORWARDED_FOR", "0") == "1"
+
+# 캐시: 기본은 호스트 로컬 공유 캐시(SQLite WAL 파일 하나를 모든 워커가 같이 씀, control/cache/sqlite.py)
+#   GF_CACHE_BACKEND=redis + GF_CACHE_URL 이면 Redis(redis 패키지 필요), locmem 은 프로세스별(개발용)
+#   sqlite/locmem 은 호스트 간에 공유되지 않는다 → 앱 서버를 여러 대로 나눠 띄우면 redis + GF_MULTI_HOST=1
+#   (write-behind 와 상관없이 호스트 로컬 캐시는 다른 호스트의 무효화를 못 본다,
+#    공유되지 않는 캐시에서는 세션 저장소가 캐시를 쓰지 않고 DB 에서 직접 읽는다)
+GF_CACHE_BACKEND = os.environ.get("GF_CACHE_BACKEND", "sqlite")
+GF_CACHE_DIR = os.environ.get("GF_CACHE_DIR", os.path.join(BASE_DIR, "var", "cache"))
+_CACHE_BACKENDS = {
+    "sqlite": {
+        "BACKEND": "control.cache.sqlite.SQLiteCache",
+        "LOCATION": os.path.join(GF_CACHE_DIR, "geoflow_cache.sqlite3"),
+        "OPTIONS": {"MAX_ENTRIES": 100000, "CULL_EVERY": 100},
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("GF_CACHE_URL", "redis://127.0.0.1:6379/1"),
+    },
+    "locmem": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+CACHES = {"default": _CACHE_BACKENDS[GF_CACHE_BACKEND]}
+GF_CACHE_LOCK_WAIT = 5.0                # 다른 워커가 같은 값을 계산 중일 때 기다리는 한도(초)
+GF_CACHE_STATS_INTERVAL = 10            # 네임스페이스 적중/미스 카운터 합산 간격(초)
+
+# 요청별 SQL 계측(control/sql_metrics.py): Server-Timing 헤더는 "all" | "staff" | "off"
+GF_SQL_METRICS = True
+GF_SQL_METRICS_HEADER = "all" if DEBUG else "staff"
+GF_SQL_METRICS_WINDOW = 500             # 뷰 이름별로 보관할 최근 요청 수(워커별)
+GF_SQL_NPLUS1_THRESHOLD = 5             # 같은 모양 쿼리가 파라미터만 바꿔 이 횟수 이상이면 N+1 후보
+
+# 프로파일링(control/profiling.py): 허용 뷰만, 중앙 관리자 ?_profile=1|cprofile 또는 표본 추출
+GF_PROFILE_VIEWS = ["project_scope_data", "project_scope_save", "categories_board"]
+GF_PROFILE_SAMPLE_RATE = float(os.environ.get("GF_PROFILE_SAMPLE_RATE", "0"))
+GF_PROFILE_MODE = "sample"              # "sample"(스택 표본) | "cprofile"(결정적)
+GF_PROFILE_INTERVAL = 0.005             # 표본 간격(초)
+GF_PROFILE_DIR = os.environ.get("GF_PROFILE_DIR", os.path.join(BASE_DIR, "var", "profiles"))
+GF_PROFILE_KEEP = 50                    # 보관 개수
+GF_PROFILE_RETENTION_DAYS = 7
+
+# 요청 범위 메모(control/request_memo.py) 적중/미스 응답 헤더
+GF_REQUEST_MEMO_HEADER = DEBUG
+
+# 세션: 구조체 하나로 압축(control/session_store.py)
+#   세션 캐시를 모든 앱 프로세스가 같이 볼 때만 캐시 우선 + DB write-behind, 아니면 DB 에서 직접 읽고 쓴다
+#   (locmem → 항상 DB, sqlite → 앱 서버 한 대일 때만 캐시, redis → 캐시)
+SESSION_ENGINE = "control.session_store"
+SESSION_CACHE_ALIAS = "default"
+GF_MULTI_HOST = os.environ.get("GF_MULTI_HOST", "0") == "1"     # 앱 서버가 여러 대(호스트 로컬 캐시는 공유 아님)
+GF_SESSION_CACHE_SHARED = None          # None: 캐시 종류 + GF_MULTI_HOST 로 판단, True/False 로 강제
+GF_SESSION_WRITE_BEHIND = True          # 공유 캐시일 때 수정분을 모아 쓰기(False 면 write-through)
+GF_SESSION_FLUSH_INTERVAL = 5           # write-behind 모아 쓰기 간격(초)
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 